@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+方块代码生成的基准测试
+"""
+
+import os
+import json
+import random
+import struct
+import shutil
+import tempfile
+from functools import partial
+
+from common import add_benchmark, measure, headless_main_window, create_pack, quiet_message_boxes, temp_dir
+from generate_pack import generate_pack, check_sources, MDK_DIR_NAME, _png_bytes
+from javacheck import JavaChecker
+from assetcheck import AssetValidator
+from textureimport import BatchTextureImporter
+from blockpreview import BlockPreviewRenderer
+from blockstates import deduplicate_models
+from resourcesync import ResourceSync
+from recipetable import RecipeEngine, SHAPES as RECIPE_SHAPES
+from itemfamily import ItemGenerator, expand_tiers
+from commandgen import CommandGenerator
+from soundimport import SoundRegistry, page_crc
+from specs import BlockSpec
+import journal
+
+# generate_block_code生成的方块数量
+GENERATE_BLOCK_COUNTS = (1, 10, 50)
+
+# 向已有大量方块的合成项目中再添加一个方块
+LARGE_PACK_BLOCK_COUNTS = (1000, 5000)
+
+# add_block_to_mod_blocks增长曲线：ModBlocks.java中已有的方块数量
+MOD_BLOCKS_SIZES = (10, 100, 1000)
+
+# Java预检查：ModBlocks.java中已有的方块数量
+JAVA_CHECK_SIZES = (100, 1000)
+
+# 资源文件验证：合成项目中的方块数量
+ASSET_VALIDATION_BLOCK_COUNTS = (1000,)
+
+# 贴图批量导入：目录中的图片数量（32x32，缩小为16x16）
+TEXTURE_IMPORT_COUNTS = (1000,)
+
+# 方块缩略图：合成项目中的方块数量
+BLOCK_PREVIEW_COUNTS = (1000,)
+
+# 语言文件和标签同步：合成项目中的方块数量（每个方块都加入两个标签）
+SYNC_RESOURCE_COUNTS = (1000,)
+
+# 配方表中的材料数（每个材料展开为所有形状的合成和切石配方）
+RECIPE_TABLE_MATERIALS = (500,)
+
+# 等级表行数（每行展开为工具、盔甲、锭/粒共11个物品）
+ITEM_TIER_COUNTS = (100,)
+
+# 命令数（每个命令3个参数，其中2个可选）
+COMMAND_COUNTS = (500,)
+
+# 音效导入：目录中的.ogg文件数（每3个是同一个事件的变体，每个约1秒）
+SOUND_IMPORT_COUNTS = (300,)
+
+# 方块模型去重：合成项目中的方块数量（每个方块复制一份重复的模型）
+DEDUPE_MODEL_COUNTS = (1000,)
+
+
+def _block_spec(index):
+    """
+    generate_block_code / add_block_to_mod_blocks共用的方块
+    """
+    return BlockSpec(f"bench_block_{index}", "Block", f"基准方块{index}", "ROCK",
+                     1.5, 6.0, 1, "PICKAXE", 0, "STONE", requires_tool=True)
+
+
+def bench_generate_block_code(count, repeat):
+    """
+    在新项目中连续生成count个方块（ModBlocks.java、mod.json和资源文件）
+    """
+    window = headless_main_window()
+    with temp_dir() as root:
+        template_mod_json = create_pack(os.path.join(root, "template"))
+        template_pack = os.path.dirname(template_mod_json)
+
+        def setup():
+            pack_dir = os.path.join(tempfile.mkdtemp(dir=root), "benchmodpack")
+            shutil.copytree(template_pack, pack_dir)
+            mod_json_path = os.path.join(pack_dir, "mod.json")
+            window.editor.read(mod_json_path)
+            window.current_item_group_class_name = "BenchItemGroup"
+            return ()
+
+        def run():
+            with quiet_message_boxes():
+                for i in range(count):
+                    window.generate_block_code(_block_spec(i))
+
+        return measure(run, setup, repeat)
+
+
+def bench_generate_block_code_in_pack(blocks, repeat):
+    """
+    向已包含blocks个方块（及按比例的物品、配方）的合成项目中添加一个方块
+    """
+    window = headless_main_window()
+    with temp_dir() as root:
+        template_mod_json = generate_pack(os.path.join(root, "template"), blocks=blocks,
+                                          items=blocks // 2, recipes=blocks, textures=False)
+        template_pack = os.path.dirname(template_mod_json)
+
+        def setup():
+            pack_dir = os.path.join(tempfile.mkdtemp(dir=root), "benchmodpack")
+            shutil.copytree(template_pack, pack_dir)
+            window.editor.read(os.path.join(pack_dir, "mod.json"))
+            window.current_item_group_class_name = "Bench0ItemGroup"
+            return ()
+
+        def run():
+            with quiet_message_boxes():
+                window.generate_block_code(_block_spec(blocks))
+
+        return measure(run, setup, repeat)
+
+
+def bench_add_block_to_mod_blocks(existing, repeat):
+    """
+    向已包含existing个方块的ModBlocks.java再添加一个方块
+    """
+    window = headless_main_window()
+    with temp_dir() as root:
+        base_path = os.path.join(root, "ModBlocks.base.java")
+        window.create_mod_blocks_file(base_path, "com.example.benchmodmod.block", "benchmodmod", "BenchItemGroup")
+        for i in range(existing):
+            window.add_block_to_mod_blocks(base_path, _block_spec(i))
+
+        file_path = os.path.join(root, "ModBlocks.java")
+
+        def setup():
+            shutil.copyfile(base_path, file_path)
+            return ()
+
+        return measure(lambda: window.add_block_to_mod_blocks(file_path, _block_spec(existing)), setup, repeat)
+
+
+def bench_java_check(existing, incremental, repeat):
+    """
+    检查包含existing个方块的ModBlocks.java
+    incremental为True时，检查器已缓存上一版本，只测量添加一个方块后的增量检查
+    """
+    window = headless_main_window()
+    with temp_dir() as root:
+        file_path = os.path.join(root, "ModBlocks.java")
+        window.create_mod_blocks_file(file_path, "com.example.benchmodmod.block", "benchmodmod", "BenchItemGroup")
+        for i in range(existing):
+            window.add_block_to_mod_blocks(file_path, _block_spec(i))
+        with open(file_path, 'r', encoding='utf-8') as f:
+            before = f.read()
+        window.add_block_to_mod_blocks(file_path, _block_spec(existing))
+        with open(file_path, 'r', encoding='utf-8') as f:
+            after = f.read()
+
+        def setup():
+            checker = JavaChecker()
+            if incremental:
+                checker.check_text(before, file_path)
+            return (checker,)
+
+        return measure(lambda checker: checker.check_text(after, file_path), setup, repeat)
+
+
+def bench_validate_assets(blocks, cached, repeat):
+    """
+    验证包含blocks个方块的合成项目的所有资源文件
+    cached为True时缓存中已有上次的结果，只修改了一个文件
+    """
+    with temp_dir() as root:
+        mod_json_path = generate_pack(root, blocks=blocks, items=blocks // 2, recipes=blocks, textures=False)
+        validator = AssetValidator.for_mod_json(mod_json_path)
+        lang_path = os.path.join(validator.resources_dir, "assets", "benchmodmod", "lang", "en_us.json")
+
+        def setup():
+            if cached:
+                validator.validate()
+                with open(lang_path, 'a', encoding='utf-8') as f:
+                    f.write("\n")
+            return ()
+
+        return measure(lambda: validator.validate(use_cache=cached), setup, repeat)
+
+
+def bench_import_textures(count, repeat):
+    """
+    从目录批量导入count张贴图（检查、缩小、匹配并在一个事务中写入）
+    """
+    with temp_dir() as root:
+        mod_json_path = generate_pack(os.path.join(root, "pack"), blocks=count, textures=False)
+        images_dir = os.path.join(root, "images")
+        os.makedirs(images_dir)
+        importer = BatchTextureImporter(mod_json_path)
+        for index, name in enumerate(importer.names["block"][:count]):
+            with open(os.path.join(images_dir, f"{name}.png"), 'wb') as f:
+                f.write(_png_bytes(32, 32, (index % 256, index * 7 % 256, index * 13 % 256)))
+        textures_dir = os.path.join(importer.resources_dir, "assets", importer.mod_id, "textures")
+
+        def setup():
+            shutil.rmtree(textures_dir, ignore_errors=True)
+            return ()
+
+        def run():
+            plan = importer.scan(images_dir, max_size=16)
+            with journal.ProjectJournal.for_mod_json(mod_json_path).transaction("批量导入贴图"):
+                importer.apply(plan)
+            importer.store.save()
+
+        return measure(run, setup, repeat)
+
+
+def bench_block_previews(blocks, cached, repeat):
+    """
+    获取合成项目中所有方块的缩略图
+    cached为True时缩略图已经渲染过，只需计算缓存键
+    """
+    with temp_dir() as root:
+        mod_json_path = generate_pack(root, blocks=blocks, items=0, recipes=0)
+        with open(mod_json_path, 'r', encoding='utf-8') as f:
+            models = [block["model"] for block in json.load(f)["blocks"]]
+        renderer = BlockPreviewRenderer.for_mod_json(mod_json_path)
+
+        def setup():
+            if cached:
+                renderer.thumbnails(models)
+            else:
+                shutil.rmtree(renderer.cache_dir, ignore_errors=True)
+            return ()
+
+        return measure(lambda: renderer.thumbnails(models), setup, repeat)
+
+
+def bench_deduplicate_models(blocks, repeat):
+    """
+    合并合成项目中重复的方块模型（每个方块都有一份内容相同、被blockstate引用的副本）
+    """
+    with temp_dir() as root:
+        mod_json_path = generate_pack(root, blocks=blocks, items=0, recipes=0, textures=False)
+        project_dir = os.path.dirname(mod_json_path)
+        with open(mod_json_path, 'r', encoding='utf-8') as f:
+            mod_id = json.load(f)["blocks"][0]["registryName"].split(":")[0]
+        assets_dir = os.path.join(project_dir, "forge-1.16.5-36.2.34-mdk", "src", "main", "resources", "assets", mod_id)
+        models_dir = os.path.join(assets_dir, "models", "block")
+        pristine = os.path.join(root, "pristine")
+        shutil.copytree(assets_dir, pristine)
+        names = [name[:-len(".json")] for name in os.listdir(models_dir)]
+
+        def setup():
+            shutil.rmtree(assets_dir)
+            shutil.copytree(pristine, assets_dir)
+            for name in names:
+                shutil.copyfile(os.path.join(models_dir, f"{name}.json"), os.path.join(models_dir, f"{name}_copy.json"))
+                blockstate_path = os.path.join(assets_dir, "blockstates", f"{name}.json")
+                if os.path.exists(blockstate_path):
+                    with open(blockstate_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                    with open(blockstate_path, 'w', encoding='utf-8') as f:
+                        f.write(content.replace(f"block/{name}\"", f"block/{name}_copy\""))
+            return ()
+
+        def run():
+            with journal.ProjectJournal.for_mod_json(mod_json_path).transaction("合并重复的方块模型"):
+                deduplicate_models(project_dir, mod_id)
+
+        return measure(run, setup, repeat)
+
+
+def bench_sync_resources(blocks, unchanged, repeat):
+    """
+    从mod.json同步语言文件和标签文件
+    unchanged为True时上次同步后没有变化，只需比较内容
+    """
+    with temp_dir() as root:
+        mod_json_path = generate_pack(root, blocks=blocks, items=blocks // 2, recipes=0, textures=False)
+        with open(mod_json_path, 'r', encoding='utf-8') as f:
+            mod_data = json.load(f)
+        mod_id = mod_data["blocks"][0]["registryName"].split(":")[0]
+        for index, block in enumerate(mod_data["blocks"]):
+            block["displayName"] = f"基准方块{index}"
+            block["tags"] = {"blocks": [f"forge:bench_{index % 20}"], "items": [f"forge:bench_{index % 20}"]}
+        sync = ResourceSync.for_mod_json(mod_json_path, mod_id)
+        bench_journal = journal.ProjectJournal.for_mod_json(mod_json_path)
+
+        def run():
+            with bench_journal.transaction("同步语言文件和标签"):
+                sync.sync(mod_data)
+            sync.save()
+
+        def setup():
+            if unchanged:
+                run()
+            else:
+                shutil.rmtree(os.path.join(sync.resources_dir, "data", "forge", "tags"), ignore_errors=True)
+                if os.path.exists(sync.manifest_path):
+                    os.remove(sync.manifest_path)
+                sync.manifest = {}
+            return ()
+
+        return measure(run, setup, repeat)
+
+
+def bench_recipe_tables(materials, repeat):
+    """
+    展开配方表（每个材料使用全部形状并生成切石配方），检查冲突并写入配方文件
+    """
+    with temp_dir() as root:
+        mod_json_path = generate_pack(root, blocks=100, items=50, recipes=200, textures=False)
+        with open(mod_json_path, 'r', encoding='utf-8') as f:
+            mod_data = json.load(f)
+        mod_id = mod_data["blocks"][0]["registryName"].split(":")[0]
+        mod_data["recipeTables"] = [{
+            "name": "bench",
+            "materials": {f"material_{index}": f"{mod_id}:material_{index}" for index in range(materials)},
+            # 活板门与墙的原料图案相同，不能同时选择
+            "shapes": sorted(shape for shape in RECIPE_SHAPES if shape != "trapdoor"),
+            "stonecutting": True,
+        }]
+        bench_journal = journal.ProjectJournal.for_mod_json(mod_json_path)
+        engine = None
+
+        def run():
+            with bench_journal.transaction("生成配方"):
+                engine.apply(engine.plan(mod_data))
+            engine.save()
+
+        def setup():
+            nonlocal engine
+            engine = RecipeEngine.for_mod_json(mod_json_path, mod_id)
+            if os.path.exists(engine.manifest_path):
+                os.remove(engine.manifest_path)
+            engine.generated = set()
+            shutil.rmtree(engine.recipes_dir, ignore_errors=True)
+            return ()
+
+        return measure(run, setup, repeat)
+
+
+def bench_item_families(tiers, repeat):
+    """
+    展开等级表，渲染ModItems.java、枚举和物品模型并写入（语言文件和标签的同步见sync_resources）
+    """
+    with temp_dir() as root:
+        mod_json_path = generate_pack(root, blocks=100, items=50, recipes=0, textures=False)
+        with open(mod_json_path, 'r', encoding='utf-8') as f:
+            mod_data = json.load(f)
+        mod_id = mod_data["blocks"][0]["registryName"].split(":")[0]
+        mod_data["itemTiers"] = [{"name": f"material_{index}", "families": ["tools", "armor", "resources"]}
+                                 for index in range(tiers)]
+        base_package, main_class_name = headless_main_window().find_main_class(mod_json_path, mod_id)
+        bench_journal = journal.ProjectJournal.for_mod_json(mod_json_path)
+        generator = None
+
+        def run():
+            with bench_journal.transaction("生成物品代码"):
+                expand_tiers(mod_data, mod_id)
+                outputs, _ = generator.render(mod_data)
+                generator.apply(outputs)
+            generator.save()
+
+        def setup():
+            nonlocal generator
+            generator = ItemGenerator.for_mod_json(mod_json_path, mod_id, base_package, "Bench0ItemGroup",
+                                                   main_class_name)
+            if os.path.exists(generator.manifest_path):
+                os.remove(generator.manifest_path)
+            generator.generated = set()
+            shutil.rmtree(generator.models_dir, ignore_errors=True)
+            return ()
+
+        # 先生成一次并检查（import、主类和javacheck），生成的代码有错误时基准测试没有意义
+        setup()
+        run()
+        check_sources(os.path.join(os.path.dirname(mod_json_path), MDK_DIR_NAME), base_package)
+        return measure(run, setup, repeat)
+
+
+def bench_generate_commands(commands, incremental, repeat):
+    """
+    生成ModCommands.java和执行类存根
+    incremental为True时只修改了一个命令，其他命令复用缓存的注册代码
+    """
+    with temp_dir() as root:
+        mod_json_path = generate_pack(root, blocks=10, items=10, recipes=0, textures=False)
+        with open(mod_json_path, 'r', encoding='utf-8') as f:
+            mod_data = json.load(f)
+        mod_id = mod_data["blocks"][0]["registryName"].split(":")[0]
+        types = ["string", "integer", "player", "position", "boolean", "double"]
+        mod_data["commands"] = [{
+            "name": f"bench_command_{index}",
+            "description": f"基准命令{index}",
+            "permissionLevel": index % 3,
+            "aliases": [f"bc{index}"],
+            "parameters": [
+                {"name": "first", "type": types[index % len(types)], "required": True},
+                {"name": "second", "type": types[(index + 1) % len(types)], "required": False},
+                {"name": "third", "type": types[(index + 2) % len(types)], "required": False},
+            ],
+        } for index in range(commands)]
+        base_package, main_class_name = headless_main_window().find_main_class(mod_json_path, mod_id)
+        bench_journal = journal.ProjectJournal.for_mod_json(mod_json_path)
+        generator = None
+
+        def run():
+            with bench_journal.transaction("生成命令代码"):
+                generator.apply(generator.render(mod_data)[0])
+            generator.save()
+
+        def setup():
+            nonlocal generator
+            generator = CommandGenerator.for_mod_json(mod_json_path, mod_id, base_package, main_class_name)
+            if incremental:
+                run()
+                generator = CommandGenerator.for_mod_json(mod_json_path, mod_id, base_package, main_class_name)
+                mod_data["commands"][0]["description"] += "!"
+            else:
+                generator.cache = {}
+                shutil.rmtree(os.path.dirname(generator.commands_path), ignore_errors=True)
+            return ()
+
+        # 先生成一次并检查（import、主类和javacheck）
+        setup()
+        run()
+        check_sources(os.path.join(os.path.dirname(mod_json_path), MDK_DIR_NAME), base_package)
+        return measure(run, setup, repeat)
+
+
+def _ogg_bytes(seconds, channels=1, sample_rate=44100, seed=0):
+    """
+    生成结构有效的Ogg Vorbis文件（识别头有效、页校验和正确，音频数据是随机字节，仅用于测试导入）
+    """
+    rng = random.Random(seed)
+    serial = rng.getrandbits(32)
+    pages = []
+
+    def page(flags, granule, data):
+        lacing = [255] * (len(data) // 255) + [len(data) % 255]
+        header = struct.pack("<4sBBqIIIB", b"OggS", 0, flags, granule, serial, len(pages), 0, len(lacing))
+        raw = bytearray(header + bytes(lacing) + data)
+        raw[22:26] = struct.pack("<I", page_crc(bytes(raw)))
+        pages.append(bytes(raw))
+
+    page(0x02, 0, b"\x01vorbis" + struct.pack("<IBIiiiBB", 0, channels, sample_rate, 0, 64000, 0, 0xB8, 1))
+    page(0, 0, b"\x03vorbis" + bytes(rng.getrandbits(8) for _ in range(200)))
+    samples = int(seconds * sample_rate)
+    chunks = max(1, int(seconds * 2))
+    for index in range(1, chunks + 1):
+        data = bytes(rng.getrandbits(8) for _ in range(4000))
+        page(0x04 if index == chunks else 0, samples * index // chunks, data)
+    return b"".join(pages)
+
+
+def bench_import_sounds(count, cached, repeat):
+    """
+    从目录导入count个音效（检查文件头、复制文件、更新mod.json并生成sounds.json和ModSounds.java）
+    cached为True时所有文件都已经导入过，检查结果来自缓存，不写入任何文件
+    """
+    with temp_dir() as root:
+        mod_json_path = generate_pack(os.path.join(root, "pack"), blocks=1, items=0, recipes=0, textures=False)
+        sounds_dir = os.path.join(root, "sounds")
+        for index in range(count):
+            category = ("block", "entity", "ambient")[index % 3]
+            path = os.path.join(sounds_dir, category, f"sound{index // 3}_{index % 3 + 1}.ogg")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(_ogg_bytes(1.0, seed=index))
+        project_dir = os.path.dirname(mod_json_path)
+        window = headless_main_window()
+        mod_id = window.get_modid_from_mods_toml(mod_json_path)
+        base_package, main_class_name = window.find_main_class(mod_json_path, mod_id)
+        state = {}
+
+        def run():
+            registry = SoundRegistry(project_dir, mod_id, base_package, main_class_name)
+            plan = registry.scan(sounds_dir)
+            with journal.ProjectJournal.for_mod_json(mod_json_path).transaction("导入音效"):
+                mod_data = journal.load_json(mod_json_path)
+                registry.apply(plan, mod_data)
+                journal.dump_json(mod_json_path, mod_data)
+                registry.write(registry.render(mod_data)[0])
+            registry.save()
+
+        def setup():
+            if not cached:
+                shutil.rmtree(os.path.join(project_dir, ".forgecreator"), ignore_errors=True)
+                shutil.rmtree(os.path.join(project_dir, MDK_DIR_NAME, "src", "main", "resources",
+                                           "assets", mod_id, "sounds"), ignore_errors=True)
+            elif not state:
+                run()
+                state["warm"] = True
+            return ()
+
+        # 先导入一次并检查生成的ModSounds.java（import、主类和javacheck）
+        run()
+        check_sources(os.path.join(project_dir, MDK_DIR_NAME), base_package)
+        return measure(run, setup, repeat)
+
+
+for _count in GENERATE_BLOCK_COUNTS:
+    add_benchmark(f"codegen.generate_block_code[{_count}]", partial(bench_generate_block_code, _count))
+
+for _blocks in LARGE_PACK_BLOCK_COUNTS:
+    add_benchmark(f"codegen.generate_block_code_in_pack[{_blocks}]", partial(bench_generate_block_code_in_pack, _blocks))
+
+for _size in MOD_BLOCKS_SIZES:
+    add_benchmark(f"codegen.add_block_to_mod_blocks[{_size}]", partial(bench_add_block_to_mod_blocks, _size))
+
+for _size in JAVA_CHECK_SIZES:
+    add_benchmark(f"codegen.java_check[{_size}]", partial(bench_java_check, _size, False))
+    add_benchmark(f"codegen.java_check_incremental[{_size}]", partial(bench_java_check, _size, True))
+
+for _blocks in ASSET_VALIDATION_BLOCK_COUNTS:
+    add_benchmark(f"assets.validate[{_blocks}]", partial(bench_validate_assets, _blocks, False))
+    add_benchmark(f"assets.validate_cached[{_blocks}]", partial(bench_validate_assets, _blocks, True))
+
+for _count in TEXTURE_IMPORT_COUNTS:
+    add_benchmark(f"assets.import_textures[{_count}]", partial(bench_import_textures, _count))
+
+for _blocks in BLOCK_PREVIEW_COUNTS:
+    add_benchmark(f"assets.block_previews[{_blocks}]", partial(bench_block_previews, _blocks, False))
+    add_benchmark(f"assets.block_previews_cached[{_blocks}]", partial(bench_block_previews, _blocks, True))
+
+for _blocks in SYNC_RESOURCE_COUNTS:
+    add_benchmark(f"codegen.sync_resources[{_blocks}]", partial(bench_sync_resources, _blocks, False))
+    add_benchmark(f"codegen.sync_resources_unchanged[{_blocks}]", partial(bench_sync_resources, _blocks, True))
+
+for _blocks in DEDUPE_MODEL_COUNTS:
+    add_benchmark(f"assets.deduplicate_models[{_blocks}]", partial(bench_deduplicate_models, _blocks))
+
+for _materials in RECIPE_TABLE_MATERIALS:
+    add_benchmark(f"codegen.recipe_tables[{_materials}]", partial(bench_recipe_tables, _materials))
+
+for _tiers in ITEM_TIER_COUNTS:
+    add_benchmark(f"codegen.item_families[{_tiers}]", partial(bench_item_families, _tiers))
+
+for _commands in COMMAND_COUNTS:
+    add_benchmark(f"codegen.generate_commands[{_commands}]", partial(bench_generate_commands, _commands, False))
+    add_benchmark(f"codegen.generate_commands_incremental[{_commands}]", partial(bench_generate_commands, _commands, True))
+
+for _count in SOUND_IMPORT_COUNTS:
+    add_benchmark(f"assets.import_sounds[{_count}]", partial(bench_import_sounds, _count, False))
+    add_benchmark(f"assets.import_sounds_cached[{_count}]", partial(bench_import_sounds, _count, True))
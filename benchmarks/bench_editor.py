@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON编辑器加载mod.json的基准测试
+"""
+
+import os
+from functools import partial
+
+from common import add_benchmark, measure, get_app, temp_dir
+from generate_pack import write_synthetic_mod_json
+
+# 合成mod.json的树节点数
+EDITOR_NODE_COUNTS = (1000, 10000, 100000)
+
+# 从快照再次打开：合成mod.json的树节点数（小于SNAPSHOT_MIN_SIZE的文件不使用快照）
+SNAPSHOT_NODE_COUNTS = (100000,)
+
+
+def bench_editor_read(nodes, snapshot, repeat):
+    """
+    Editor.read：json.load加上完整的树构建
+    snapshot为True时文件未变化，从上次保存的快照读取解析结果和树的布局
+    """
+    get_app()
+    from editor import Editor
+
+    editor = Editor()
+    with temp_dir() as root:
+        mod_json_path = os.path.join(root, "mod.json")
+        write_synthetic_mod_json(mod_json_path, nodes)
+        snapshot_path = editor._snapshot_path(mod_json_path)
+
+        def setup():
+            if snapshot:
+                editor.read(mod_json_path)
+            elif os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+            return ()
+
+        return measure(lambda: editor.read(mod_json_path), setup, repeat)
+
+
+for _nodes in EDITOR_NODE_COUNTS:
+    add_benchmark(f"editor.read[{_nodes}]", partial(bench_editor_read, _nodes, False))
+
+for _nodes in SNAPSHOT_NODE_COUNTS:
+    add_benchmark(f"editor.read_snapshot[{_nodes}]", partial(bench_editor_read, _nodes, True))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+项目数据库的基准测试：向大型项目添加一个方块（mod.json整体读写与数据库单行修改对比），
+以及编辑器从数据库分页读取
+"""
+
+import os
+import json
+import shutil
+import tempfile
+from functools import partial
+
+from common import add_benchmark, measure, headless_main_window, temp_dir
+from generate_pack import generate_pack
+from projectstore import ProjectStore
+from specs import BlockSpec
+import journal
+
+# mod.json中的方块数（物品、配方各为方块数的一半）
+STORE_BLOCK_COUNTS = (20000,)
+
+
+def _large_pack(root, blocks):
+    """
+    生成一个小项目，再把其中的方块、物品和配方复制扩充到指定数量（比直接生成快得多）
+    """
+    mod_json_path = generate_pack(os.path.join(root, "template"), blocks=20, items=10, recipes=10, textures=False)
+    with open(mod_json_path, 'r', encoding='utf-8') as f:
+        mod_data = json.load(f)
+    for key, count in (("blocks", blocks), ("items", blocks // 2), ("recipes", blocks // 2)):
+        templates = mod_data[key]
+        entries = []
+        for index in range(count):
+            entry = dict(templates[index % len(templates)])
+            entry["name"] = f"{entry['name']}_{index}"
+            if "registryName" in entry:
+                entry["registryName"] = f"{entry['registryName']}_{index}"
+            entries.append(entry)
+        mod_data[key] = entries
+    journal.dump_json(mod_json_path, mod_data)
+    return mod_json_path
+
+
+def bench_update_mod_json(blocks, use_store, repeat):
+    """
+    update_mod_json向已包含blocks个方块的mod.json添加一个方块（在事务中，包括提交）
+    """
+    window = headless_main_window()
+    with temp_dir() as root:
+        template_mod_json = _large_pack(root, blocks)
+        if use_store:
+            ProjectStore.create(template_mod_json).close()
+        template_pack = os.path.dirname(template_mod_json)
+
+        def setup():
+            pack_dir = os.path.join(tempfile.mkdtemp(dir=root), "benchmodpack")
+            shutil.copytree(template_pack, pack_dir)
+            mod_json_path = os.path.join(pack_dir, "mod.json")
+            if use_store:
+                # 复制后修改时间变化，先打开一次（重新导入）使其不计入
+                ProjectStore.for_mod_json(mod_json_path).close()
+            return (mod_json_path,)
+
+        def run(mod_json_path):
+            store = ProjectStore.for_mod_json(mod_json_path)
+            with journal.ProjectJournal.for_mod_json(mod_json_path).transaction("添加方块"):
+                window.update_mod_json(mod_json_path, BlockSpec("bench_store_block", material="ROCK", hardness=1.5,
+                                                                resistance=6.0, harvest_level=1, tool_type="PICKAXE"),
+                                       "benchmodmod", store=store)
+            if store is not None:
+                store.save()
+                store.close()
+
+        return measure(run, setup, repeat)
+
+
+def bench_editor_read_store(blocks, repeat):
+    """
+    编辑器从项目数据库读取（只构建每个数组的第一页）
+    """
+    window = headless_main_window()
+    with temp_dir() as root:
+        mod_json_path = _large_pack(root, blocks)
+        ProjectStore.create(mod_json_path).close()
+        return measure(lambda: window.editor.read(mod_json_path), repeat=repeat)
+
+
+for _blocks in STORE_BLOCK_COUNTS:
+    add_benchmark(f"store.update_mod_json_json[{_blocks}]", partial(bench_update_mod_json, _blocks, False))
+    add_benchmark(f"store.update_mod_json[{_blocks}]", partial(bench_update_mod_json, _blocks, True))
+    add_benchmark(f"store.editor_read[{_blocks}]", partial(bench_editor_read_store, _blocks))
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模组创建向导的基准测试
+"""
+
+import os
+import shutil
+import tempfile
+
+from common import benchmark, measure, headless_mod_creator, create_pack, quiet_message_boxes, temp_dir
+
+
+@benchmark("wizard.create_mod")
+def bench_create_mod(repeat):
+    """
+    完整的项目创建流程（复制模板、fix_build_pack、replace_file_dir_name、删除资源），不包括Gradle
+    """
+    creator = headless_mod_creator()
+    with temp_dir() as root:
+        def setup():
+            save_dir = tempfile.mkdtemp(dir=root)
+            return (save_dir,)
+
+        return measure(lambda save_dir: create_pack(save_dir, creator=creator), setup, repeat)
+
+
+@benchmark("wizard.replace_file_dir_name")
+def bench_replace_file_dir_name(repeat):
+    """
+    模板复制之后的重命名与内容替换步骤
+    """
+    creator = headless_mod_creator()
+    source_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "res", "nullpack")
+    with temp_dir() as root:
+        def setup():
+            target_dir = os.path.join(tempfile.mkdtemp(dir=root), "benchmodpack")
+            shutil.copytree(source_dir, target_dir)
+            return (target_dir,)
+
+        def run(target_dir):
+            with quiet_message_boxes():
+                creator.replace_file_dir_name(target_dir, "benchmod", "example", "BenchmodMod", "Benchmark Mod")
+
+        return measure(run, setup, repeat)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工作区索引的基准测试
+"""
+
+import os
+import shutil
+from functools import partial
+
+from common import add_benchmark, measure, temp_dir
+from generate_pack import generate_pack
+from workspace import WorkspaceIndex
+from conflicts import ConflictAnalyzer
+
+# 工作区中的项目数（每个项目200个方块、100个物品，带占位贴图）
+WORKSPACE_PACK_COUNTS = (50,)
+
+
+def _create_workspace(root, packs):
+    """
+    生成一个项目并复制为packs个项目
+    """
+    template = os.path.dirname(generate_pack(os.path.join(root, "template"), blocks=200, items=100, recipes=0))
+    workspace = os.path.join(root, "workspace")
+    for index in range(packs):
+        shutil.copytree(template, os.path.join(workspace, f"bench{index:03d}pack"))
+    return workspace
+
+
+def bench_workspace_update(packs, mode, repeat):
+    """
+    更新工作区索引
+    mode为"cold"时每次都从空索引开始，"unchanged"时没有任何文件变化，"touched"时只有一个项目的mod.json变化
+    """
+    with temp_dir() as root:
+        workspace = _create_workspace(root, packs)
+        db_path = os.path.join(workspace, ".forgecreator", "workspace.db")
+        touched = os.path.join(workspace, "bench000pack", "mod.json")
+
+        def setup():
+            if mode == "cold":
+                if os.path.exists(db_path):
+                    os.remove(db_path)
+            else:
+                index = WorkspaceIndex(workspace)
+                index.update()
+                index.close()
+                if mode == "touched":
+                    os.utime(touched, ns=(os.stat(touched).st_atime_ns, os.stat(touched).st_mtime_ns + 1000))
+            return ()
+
+        def run():
+            index = WorkspaceIndex(workspace)
+            index.update()
+            index.close()
+
+        return measure(run, setup, repeat)
+
+
+def bench_workspace_query(packs, repeat):
+    """
+    查询使用了Material.ROCK的项目
+    """
+    with temp_dir() as root:
+        index = WorkspaceIndex(_create_workspace(root, packs))
+        index.update()
+        try:
+            return measure(lambda: index.search("Material.ROCK"), repeat=repeat)
+        finally:
+            index.close()
+
+
+def bench_workspace_conflicts(packs, repeat):
+    """
+    在已更新的索引上检查跨项目冲突（所有项目都是同一个项目的副本，每个注册名、类和标签都冲突）
+    """
+    with temp_dir() as root:
+        index = WorkspaceIndex(_create_workspace(root, packs))
+        index.update()
+        try:
+            return measure(lambda: ConflictAnalyzer(index).analyze(), repeat=repeat)
+        finally:
+            index.close()
+
+
+for _packs in WORKSPACE_PACK_COUNTS:
+    add_benchmark(f"workspace.update[{_packs}]", partial(bench_workspace_update, _packs, "cold"))
+    add_benchmark(f"workspace.update_unchanged[{_packs}]", partial(bench_workspace_update, _packs, "unchanged"))
+    add_benchmark(f"workspace.update_touched[{_packs}]", partial(bench_workspace_update, _packs, "touched"))
+    add_benchmark(f"workspace.query[{_packs}]", partial(bench_workspace_query, _packs))
+    add_benchmark(f"workspace.conflicts[{_packs}]", partial(bench_workspace_conflicts, _packs))
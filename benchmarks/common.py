@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能基准测试公共模块
+负责设置无界面（offscreen）的Qt环境、计时，以及提供不弹窗、不调用Gradle的窗口子类
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import statistics
+from contextlib import contextmanager
+
+# 基准测试必须在导入PyQt5之前设置为offscreen模式，才能在没有显示器的环境中运行
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARKS_DIR)
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox  # noqa: E402
+
+
+# 已注册的基准测试：[(名称, 函数)]，函数接收repeat参数并返回计时结果
+BENCHMARKS = []
+
+# 保持QApplication的引用，否则会被垃圾回收
+_app = None
+
+
+def add_benchmark(name, func):
+    """
+    注册一个基准测试
+
+    :param name: 基准测试名称，如"editor.read[1000]"
+    :param func: 测试函数，参数为repeat，返回measure()的结果
+    """
+    BENCHMARKS.append((name, func))
+
+
+def benchmark(name):
+    """
+    注册基准测试的装饰器
+    """
+    def decorator(func):
+        add_benchmark(name, func)
+        return func
+    return decorator
+
+
+def get_app():
+    """
+    获取（必要时创建）QApplication实例
+    """
+    global _app
+    if _app is None:
+        _app = QApplication.instance() or QApplication([])
+    return _app
+
+
+def measure(func, setup=None, repeat=5):
+    """
+    多次执行func并统计耗时，setup的耗时不计入
+
+    :param func: 被测函数，参数为setup的返回值
+    :param setup: 每次执行前调用的准备函数，返回传给func的参数元组
+    :param repeat: 执行次数
+    :return: {"median": 秒, "min": 秒, "max": 秒, "repeat": 次数}
+    """
+    times = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return {
+        "median": statistics.median(times),
+        "min": min(times),
+        "max": max(times),
+        "repeat": repeat,
+    }
+
+
+@contextmanager
+def quiet_message_boxes():
+    """
+    临时把QMessageBox的静态方法替换为直接返回，避免基准测试被对话框阻塞
+    """
+    names = ("information", "warning", "critical", "question")
+    originals = {name: getattr(QMessageBox, name) for name in names}
+    for name in names:
+        setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: QMessageBox.Yes))
+    try:
+        yield
+    finally:
+        for name, original in originals.items():
+            setattr(QMessageBox, name, original)
+
+
+@contextmanager
+def temp_dir(prefix="forgecreator_bench_"):
+    """
+    创建临时目录，退出时删除
+    """
+    path = tempfile.mkdtemp(prefix=prefix)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def headless_mod_creator():
+    """
+    创建不检查Java、不修改环境变量、不执行Gradle的模组创建向导
+    """
+    get_app()
+    from wizard import ForgeModCreator
+
+    class HeadlessModCreator(ForgeModCreator):
+        def has_java8(self):
+            return os.path.join(sys.prefix, "bin")
+
+        def set_environment_variables(self):
+            return True
+
+        def execute_build(self, directory):
+            return True
+
+    return HeadlessModCreator()
+
+
+def headless_main_window():
+    """
+    创建不申请管理员权限、不弹出贴图选择对话框的主窗口
+    """
+    get_app()
+    from main import MainWindow
+    from editor import Editor
+
+    class HeadlessMainWindow(MainWindow):
+        def __init__(self):
+            QMainWindow.__init__(self)
+            self.lang = {}
+            self.editor = Editor()
+
+        def log_message(self, message):
+            pass
+
+        def select_and_copy_texture(self, mdk_path, mod_id, block_name):
+            pass
+
+    return HeadlessMainWindow()
+
+
+def create_pack(save_dir, modid="benchmod", creator=None):
+    """
+    使用向导在save_dir下创建一个模组项目（不执行Gradle）
+
+    :param save_dir: 保存位置
+    :param modid: 模组ID
+    :param creator: 可复用的无界面向导实例
+    :return: mod.json路径
+    """
+    creator = creator or headless_mod_creator()
+    creator.save_path.setText(save_dir)
+    creator.modid_input.setText(modid)
+    creator.mod_name.setText("Benchmark Mod")
+    with quiet_message_boxes():
+        creator.create_mod()
+    return os.path.join(save_dir, f"{modid}pack", "mod.json")
+
@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成大型模组项目生成器
+按可配置的规模生成结构与真实项目一致的模组项目：mod.json、Java源码、资源与数据文件，
+用于在生产环境的规模下对编辑器、代码生成和构建做基准测试与性能分析
+
+生成的内容（相同参数和种子总是生成相同的项目）:
+    - 方块：普通方块、带axis变种的柱状方块、带lit变种的灯，部分方块带tileEntity
+    - 物品：按材料生成锭、粒和工具系列
+    - 配方：有序合成、无序合成、熔炼和切石
+    - 命令：与example_commands.json相同结构的命令定义
+    - ItemGroup：多个ItemGroup类，物品轮流放入
+
+用法:
+    python benchmarks/generate_pack.py 输出目录 --blocks 5000 --items 2000 --recipes 3000
+    python benchmarks/generate_pack.py 输出目录 --scale 10     # 按默认比例放大10倍
+"""
+
+import os
+import re
+import sys
+import json
+import zlib
+import struct
+import random
+import argparse
+
+import common
+import javacheck
+from specs import BlockSpec
+
+# 默认规模（--scale按此比例放大）
+DEFAULT_COUNTS = {
+    "blocks": 1000,
+    "items": 500,
+    "recipes": 1000,
+    "commands": 50,
+    "item_groups": 4,
+}
+
+# 带tileEntity的方块比例
+TILE_ENTITY_RATIO = 0.05
+
+# 方块材质 -> (挖掘工具, 音效类型, 名称前缀)
+BLOCK_MATERIALS = [
+    ("ROCK", "PICKAXE", "STONE", ["granite", "marble", "basalt", "slate", "limestone", "shale"]),
+    ("IRON", "PICKAXE", "METAL", ["steel", "bronze", "brass", "pewter"]),
+    ("WOOD", "AXE", "WOOD", ["maple", "cedar", "willow", "ebony"]),
+    ("EARTH", "SHOVEL", "GROUND", ["loam", "peat", "silt"]),
+    ("GLASS", "", "GLASS", ["tinted", "frosted", "stained"]),
+]
+
+# 方块样式：(样式名, 基础方块类, 变种定义, 默认状态)
+BLOCK_STYLES = [
+    ("bricks", "Block", [], {}),
+    ("tiles", "Block", [], {}),
+    ("pillar", "RotatedPillarBlock", [{"name": "axis", "values": ["x", "y", "z"]}], {"axis": "y"}),
+    ("lamp", "RedstoneLampBlock", [{"name": "lit", "values": ["false", "true"]}], {"lit": "false"}),
+]
+
+# 物品材料与物品种类
+ITEM_MATERIALS = ["copper", "tin", "silver", "lead", "nickel", "zinc", "cobalt", "osmium", "iridium", "platinum"]
+ITEM_KINDS = [
+    # (种类, 工具类型, 攻击伤害, 攻击速度, 最大堆叠)
+    ("ingot", None, None, None, 64),
+    ("nugget", None, None, None, 64),
+    ("pickaxe", "pickaxe", 1.0, -2.8, 1),
+    ("axe", "axe", 6.0, -3.1, 1),
+    ("shovel", "shovel", 1.5, -3.0, 1),
+    ("sword", None, 3.0, -2.4, 1),
+    ("hoe", "hoe", 0.0, -1.0, 1),
+]
+
+RECIPE_TYPES = ["crafting_shaped", "crafting_shapeless", "smelting", "stonecutting"]
+
+COMMAND_PARAMETER_TYPES = ["string", "integer", "player"]
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+
+def _numbered(words, index):
+    """
+    从词表中取名称，词表用完后加数字后缀，保证名称唯一
+    """
+    word = words[index % len(words)]
+    round_ = index // len(words)
+    return f"{word}{round_}" if round_ else word
+
+
+def build_blocks(mod_id, count, rng):
+    """
+    生成方块定义（mod.json中blocks数组的元素）
+    """
+    blocks = []
+    for i in range(count):
+        material, tool, sound, words = BLOCK_MATERIALS[i % len(BLOCK_MATERIALS)]
+        style, base_class, variants, default_state = BLOCK_STYLES[(i // len(BLOCK_MATERIALS)) % len(BLOCK_STYLES)]
+        name = f"{_numbered(words, i // (len(BLOCK_MATERIALS) * len(BLOCK_STYLES)))}_{style}"
+        block = {
+            "name": name,
+            "registryName": f"{mod_id}:{name}",
+            "unlocalizedName": f"tile.{mod_id}.{name}",
+            "material": material,
+            "hardness": round(rng.uniform(0.5, 5.0), 1),
+            "resistance": round(rng.uniform(1.0, 12.0), 1),
+            "harvestLevel": rng.randint(0, 3) if tool else 0,
+            "harvestTool": tool.lower(),
+            "lightValue": 15 if style == "lamp" else 0,
+            "lightOpacity": 0 if material == "GLASS" else 255,
+            "creativeTab": mod_id,
+            "textureName": f"{mod_id}:blocks/{name}",
+            "model": f"{mod_id}:block/{name}",
+            "defaultState": dict(default_state),
+            "variants": [dict(v, values=list(v["values"])) for v in variants],
+            # 以下字段仅供生成Java代码使用，写入mod.json前会去掉
+            "_baseClass": base_class,
+            "_sound": sound,
+        }
+        if rng.random() < TILE_ENTITY_RATIO:
+            block["tileEntity"] = {
+                "type": f"{mod_id}:{name}_entity",
+                "class": "net.minecraft.tileentity.TileEntityType"
+            }
+        blocks.append(block)
+    return blocks
+
+
+def build_items(mod_id, count, item_group_names):
+    """
+    生成物品定义（mod.json中items数组的元素）
+    """
+    items = []
+    for i in range(count):
+        kind, tool, damage, speed, stack = ITEM_KINDS[i % len(ITEM_KINDS)]
+        material = _numbered(ITEM_MATERIALS, i // len(ITEM_KINDS))
+        name = f"{material}_{kind}"
+        item = {
+            "name": name,
+            "registryName": f"{mod_id}:{name}",
+            "unlocalizedName": f"item.{mod_id}.{name}",
+            "material": material,
+            "maxStackSize": stack,
+            "creativeTab": item_group_names[i % len(item_group_names)],
+            "textureName": f"{mod_id}:items/{name}",
+            "model": "item/handheld" if damage is not None else "item/generated",
+            "rarity": "COMMON",
+        }
+        if tool:
+            item["toolClass"] = {tool: 2}
+        if damage is not None:
+            item["attackDamage"] = damage
+            item["attackSpeed"] = speed
+        items.append(item)
+    return items
+
+
+def build_recipes(mod_id, count, blocks, items):
+    """
+    生成配方定义（mod.json中recipes数组的元素），配方引用的方块和物品都存在于项目中
+    """
+    recipes = []
+    ingots = [item["name"] for item in items if item["name"].endswith("_ingot")] or ["minecraft:iron_ingot"]
+    block_names = [block["name"] for block in blocks] or ["minecraft:stone"]
+    results = block_names + [item["name"] for item in items]
+
+    def ref(name):
+        return name if ":" in name else f"{mod_id}:{name}"
+
+    for i in range(count):
+        recipe_type = RECIPE_TYPES[i % len(RECIPE_TYPES)]
+        result = results[i % len(results)]
+        ingredient = ingots[i % len(ingots)]
+        recipe = {"name": f"{result.split(':')[-1]}_from_{recipe_type}_{i}", "type": f"minecraft:{recipe_type}"}
+        if recipe_type == "crafting_shaped":
+            recipe["pattern"] = ["XXX", "X#X", "XXX"]
+            recipe["key"] = {"X": {"item": ref(ingredient)}, "#": {"item": "minecraft:stick"}}
+            recipe["result"] = {"item": ref(result), "count": 1}
+        elif recipe_type == "crafting_shapeless":
+            recipe["ingredients"] = [{"item": ref(ingredient)}, {"item": ref(block_names[i % len(block_names)])}]
+            recipe["result"] = {"item": ref(result), "count": 2}
+        elif recipe_type == "smelting":
+            recipe["ingredient"] = {"item": ref(block_names[i % len(block_names)])}
+            recipe["result"] = ref(result)
+            recipe["experience"] = 0.1
+            recipe["cookingtime"] = 200
+        else:
+            recipe["ingredient"] = {"item": ref(block_names[(i + 1) % len(block_names)])}
+            recipe["result"] = ref(result)
+            recipe["count"] = 1
+        recipes.append(recipe)
+    return recipes
+
+
+def build_commands(mod_id, base_package, count):
+    """
+    生成命令定义（与res/nullpack/example_commands.json结构相同）
+    """
+    commands = []
+    for i in range(count):
+        name = f"bench_command_{i}"
+        class_name = "".join(part.title() for part in name.split("_")) + "Command"
+        parameters = []
+        for p in range(i % 4):
+            param_type = COMMAND_PARAMETER_TYPES[(i + p) % len(COMMAND_PARAMETER_TYPES)]
+            parameter = {
+                "name": f"param{p + 1}",
+                "type": param_type,
+                "required": p == 0,
+                "description": f"Parameter {p + 1}"
+            }
+            if p > 0 and param_type == "integer":
+                parameter["default"] = 10
+            parameters.append(parameter)
+        usage_args = " ".join(f"<{p['name']}>" if p["required"] else f"[{p['name']}]" for p in parameters)
+        commands.append({
+            "name": name,
+            "registryName": f"{mod_id}:{name}",
+            "unlocalizedName": f"command.{mod_id}.{name}",
+            "description": f"Benchmark command {i}",
+            "usage": f"/{name} {usage_args}".rstrip(),
+            "permissionLevel": i % 3,
+            "requiresOP": i % 3 == 2,
+            "aliases": [f"bc{i}"] if i % 2 == 0 else [],
+            "executorClass": f"{base_package}.command.{class_name}",
+            "parameters": parameters
+        })
+    return commands
+
+
+def build_mod_data(mod_id, blocks=0, items=0, recipes=0, commands=0, item_groups=1,
+                   base_package=None, seed=0):
+    """
+    生成完整的mod.json数据
+
+    :param mod_id: 模组ID（mods.toml中的modId）
+    :param blocks: 方块数量
+    :param items: 物品数量
+    :param recipes: 配方数量
+    :param commands: 命令数量
+    :param item_groups: ItemGroup数量
+    :param base_package: 基础包名（用于命令的executorClass）
+    :param seed: 随机种子
+    :return: mod.json数据（方块中带有以"_"开头的代码生成字段）
+    """
+    rng = random.Random(seed)
+    base_package = base_package or f"com.example.{mod_id}"
+    item_group_names = [f"Bench{i}ItemGroup" for i in range(max(1, item_groups))]
+    block_list = build_blocks(mod_id, blocks, rng)
+    item_list = build_items(mod_id, items, item_group_names)
+    return {
+        "blocks": block_list,
+        "items": item_list,
+        "recipes": build_recipes(mod_id, recipes, block_list, item_list),
+        "entities": [],
+        "biomes": [],
+        "creativeTabs": [],
+        "events": [],
+        "commands": build_commands(mod_id, base_package, commands),
+        "itemGroups": [{"name": name} for name in item_group_names],
+    }
+
+
+def public_mod_data(mod_data):
+    """
+    去掉方块中仅供代码生成使用的"_"字段，得到写入mod.json的数据
+    """
+    data = dict(mod_data)
+    data["blocks"] = [{k: v for k, v in block.items() if not k.startswith("_")} for block in mod_data["blocks"]]
+    return data
+
+
+def count_nodes(value) -> int:
+    """
+    统计JSON数据在编辑器树中的节点数（每个键或数组元素一个节点）
+    """
+    if isinstance(value, dict):
+        return sum(1 + count_nodes(v) for v in value.values())
+    if isinstance(value, list):
+        return sum(1 + count_nodes(v) for v in value)
+    return 0
+
+
+def scaled_counts(scale):
+    """
+    按默认比例放大各类内容的数量
+    """
+    return {key: max(1, int(round(value * scale))) for key, value in DEFAULT_COUNTS.items()}
+
+
+def write_synthetic_mod_json(path, nodes, seed=0):
+    """
+    按默认比例写入一个大约包含nodes个树节点的mod.json（不生成其他项目文件）
+
+    :param path: 输出路径
+    :param nodes: 目标节点数
+    :param seed: 随机种子
+    """
+    unit = count_nodes(public_mod_data(build_mod_data("benchmod", seed=seed, **scaled_counts(0.1))))
+    data = build_mod_data("benchmod", seed=seed, **scaled_counts(0.1 * nodes / unit))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(public_mod_data(data), f, ensure_ascii=False, indent=2)
+
+
+def _png_bytes(width, height, rgb):
+    """
+    生成纯色带网格的RGBA PNG（仅用于占位贴图）
+    """
+    r, g, b = rgb
+    rows = []
+    for y in range(height):
+        row = bytearray(b"\x00")
+        for x in range(width):
+            shade = 0.8 if x % 4 == 0 or y % 4 == 0 else 1.0
+            row += bytes((int(r * shade), int(g * shade), int(b * shade), 255))
+        rows.append(bytes(row))
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(b"".join(rows), 9)) + chunk(b"IEND", b""))
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def _write_bytes(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def check_sources(mdk_path, base_package):
+    """
+    检查生成的Java源码：javacheck的错误，以及项目包内无法解析的import
+
+    :raises RuntimeError: 源码有错误
+    """
+    java_src_path = os.path.join(mdk_path, "src", "main", "java")
+    issues = javacheck.JavaChecker().check_tree(java_src_path)
+    lines = javacheck.format_issues([issue for issue in issues if issue.severity == "error"],
+                                    relative_to=java_src_path)
+    for directory, _dirnames, filenames in os.walk(java_src_path):
+        for filename in filenames:
+            if not filename.endswith(".java"):
+                continue
+            path = os.path.join(directory, filename)
+            with open(path, 'r', encoding='utf-8') as f:
+                imports = re.findall(rf"^import\s+({re.escape(base_package)}\.[\w.]+)\s*;", f.read(), re.MULTILINE)
+            for name in imports:
+                if not os.path.isfile(os.path.join(java_src_path, *name.split(".")) + ".java"):
+                    lines.append(f"{os.path.relpath(path, java_src_path)}: 无法解析的import {name}")
+    if lines:
+        raise RuntimeError("生成的Java源码有错误:\n" + "\n".join(lines))
+
+
+def write_mod_blocks(window, mod_blocks_path, package_path, mod_id, main_class_name, item_group_class_name, blocks):
+    """
+    一次性写入包含所有方块的ModBlocks.java（注册代码与MainWindow.add_block_to_mod_blocks生成的相同）
+    """
+    window.create_mod_blocks_file(mod_blocks_path, package_path, mod_id, item_group_class_name, main_class_name)
+    with open(mod_blocks_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    registries = []
+    for block in blocks:
+        registries.append(BlockSpec.from_json(
+            block, base_class=block["_baseClass"], sound_type=block["_sound"],
+            not_solid=block["material"] == "GLASS", requires_tool=block["harvestLevel"] > 0).registry_code())
+
+    imports = ["import net.minecraft.block.AbstractBlock;", "import net.minecraft.block.SoundType;"]
+    imports += sorted({f"import net.minecraft.block.{block['_baseClass']};"
+                       for block in blocks if block["_baseClass"] != "Block"})
+    content = content.replace("import net.minecraft.block.AbstractBlock;", "\n".join(imports))
+
+    register_index = content.find("    public static void register(IEventBus eventBus) {")
+    content = content[:register_index] + "\n".join(registries) + "\n" + content[register_index:]
+    with open(mod_blocks_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def write_mod_items(mod_items_path, base_package, main_class_name, items):
+    """
+    写入ModItems.java（包含ItemGroup图标使用的EXAMPLE物品）
+    """
+    lines = [
+        f"package {base_package}.item;",
+        "",
+        f"import {base_package}.{main_class_name};",
+    ]
+    lines += sorted({f"import {base_package}.group.{item['creativeTab']};" for item in items})
+    lines += [
+        "",
+        "import net.minecraft.item.Item;",
+        "import net.minecraftforge.eventbus.api.IEventBus;",
+        "import net.minecraftforge.fml.RegistryObject;",
+        "import net.minecraftforge.registries.DeferredRegister;",
+        "import net.minecraftforge.registries.ForgeRegistries;",
+        "",
+        "public class ModItems {",
+        f"    public static final DeferredRegister<Item> ITEMS = DeferredRegister.create(ForgeRegistries.ITEMS, {main_class_name}.MOD_ID);",
+        "",
+        "    public static final RegistryObject<Item> EXAMPLE = ITEMS.register(\"example\", () -> new Item(new Item.Properties()));",
+        "",
+    ]
+    for item in items:
+        lines.append(f"    public static final RegistryObject<Item> {item['name'].upper()} = ITEMS.register(")
+        lines.append(f"        \"{item['name']}\",")
+        lines.append(f"        () -> new Item(new Item.Properties().group({item['creativeTab']}.TAB).maxStackSize({item['maxStackSize']}))")
+        lines.append("    );")
+    lines += [
+        "",
+        "    public static void register(IEventBus eventBus) {",
+        "        ITEMS.register(eventBus);",
+        "    }",
+        "}",
+        "",
+    ]
+    _write_bytes(mod_items_path, "\n".join(lines).encode("utf-8"))
+
+
+def write_block_assets(window, mdk_path, mod_id, block, textures):
+    """
+    写入单个方块的blockstate、模型、战利品表和贴图
+    普通方块与MainWindow生成方块时的文件相同，带变种的方块按变种生成blockstate
+    """
+    name = block["name"]
+    assets_dir = os.path.join(mdk_path, "src", "main", "resources", "assets", mod_id)
+    variant_names = [v["name"] for v in block["variants"]]
+
+    if "axis" in variant_names:
+        _write_json(os.path.join(assets_dir, "blockstates", f"{name}.json"), {"variants": {
+            "axis=y": {"model": f"{mod_id}:block/{name}"},
+            "axis=z": {"model": f"{mod_id}:block/{name}", "x": 90},
+            "axis=x": {"model": f"{mod_id}:block/{name}", "x": 90, "y": 90},
+        }})
+        _write_json(os.path.join(assets_dir, "models", "block", f"{name}.json"), {
+            "parent": "block/cube_column",
+            "textures": {"end": f"{mod_id}:block/{name}_top", "side": f"{mod_id}:block/{name}"}
+        })
+        texture_names = [name, f"{name}_top"]
+    elif "lit" in variant_names:
+        _write_json(os.path.join(assets_dir, "blockstates", f"{name}.json"), {"variants": {
+            "lit=false": {"model": f"{mod_id}:block/{name}"},
+            "lit=true": {"model": f"{mod_id}:block/{name}_on"},
+        }})
+        for suffix in ("", "_on"):
+            _write_json(os.path.join(assets_dir, "models", "block", f"{name}{suffix}.json"), {
+                "parent": "block/cube_all",
+                "textures": {"all": f"{mod_id}:block/{name}{suffix}"}
+            })
+        texture_names = [name, f"{name}_on"]
+    else:
+        window.create_blockstate_file(mdk_path, mod_id, name)
+        window.create_block_model_file(mdk_path, mod_id, name)
+        texture_names = [name]
+
+    window.create_item_model_file(mdk_path, mod_id, name)
+    window.create_loot_table_file(mdk_path, mod_id, name)
+
+    if textures:
+        for texture_name in texture_names:
+            rgb = tuple(zlib.crc32(texture_name.encode("utf-8")).to_bytes(4, "big")[:3])
+            _write_bytes(os.path.join(assets_dir, "textures", "block", f"{texture_name}.png"), _png_bytes(16, 16, rgb))
+
+
+def write_item_assets(mdk_path, mod_id, item, textures):
+    """
+    写入单个物品的模型和贴图
+    """
+    name = item["name"]
+    assets_dir = os.path.join(mdk_path, "src", "main", "resources", "assets", mod_id)
+    _write_json(os.path.join(assets_dir, "models", "item", f"{name}.json"), {
+        "parent": item["model"],
+        "textures": {"layer0": f"{mod_id}:item/{name}"}
+    })
+    if textures:
+        rgb = tuple(zlib.crc32(name.encode("utf-8")).to_bytes(4, "big")[:3])
+        _write_bytes(os.path.join(assets_dir, "textures", "item", f"{name}.png"), _png_bytes(16, 16, rgb))
+
+
+def write_lang(mdk_path, mod_id, mod_data):
+    """
+    写入en_us语言文件
+    """
+    lang = {f"itemGroup.{mod_id}_tab": "Benchmark"}
+    for block in mod_data["blocks"]:
+        lang[f"block.{mod_id}.{block['name']}"] = block["name"].replace("_", " ").title()
+    for item in mod_data["items"]:
+        lang[f"item.{mod_id}.{item['name']}"] = item["name"].replace("_", " ").title()
+    _write_json(os.path.join(mdk_path, "src", "main", "resources", "assets", mod_id, "lang", "en_us.json"), lang)
+
+
+def generate_pack(save_dir, modid="benchmod", blocks=None, items=None, recipes=None, commands=None,
+                  item_groups=None, textures=True, seed=0, check=True):
+    """
+    生成一个完整的合成模组项目
+
+    先用模组创建向导从模板创建项目（不执行Gradle），再一次性写入所有内容
+
+    :param save_dir: 保存位置，项目生成在{save_dir}/{modid}pack
+    :param modid: 向导中填写的模组ID
+    :param blocks: 方块数量（None表示使用默认值，下同）
+    :param items: 物品数量
+    :param recipes: 配方数量
+    :param commands: 命令数量
+    :param item_groups: ItemGroup数量
+    :param textures: 是否生成占位贴图
+    :param seed: 随机种子
+    :param check: 生成后检查Java源码（包名、import和javacheck），有错误时抛出RuntimeError
+    :return: mod.json路径
+    """
+    counts = dict(DEFAULT_COUNTS)
+    for key, value in (("blocks", blocks), ("items", items), ("recipes", recipes),
+                       ("commands", commands), ("item_groups", item_groups)):
+        if value is not None:
+            counts[key] = value
+
+    mod_json_path = common.create_pack(save_dir, modid)
+    window = common.headless_main_window()
+
+    # modId从mods.toml读取，包名和主类名取自向导实际生成的@Mod主类
+    mod_id = window.get_modid_from_mods_toml(mod_json_path)
+    mdk_path = os.path.join(os.path.dirname(mod_json_path), MDK_DIR_NAME)
+    base_package, main_class_name = window.find_main_class(mod_json_path, mod_id)
+    package_dir = os.path.join(mdk_path, "src", "main", "java", *base_package.split("."))
+    data_dir = os.path.join(mdk_path, "src", "main", "resources", "data", mod_id)
+
+    mod_data = build_mod_data(mod_id, base_package=base_package, seed=seed, **counts)
+    item_group_names = [group["name"] for group in mod_data["itemGroups"]]
+
+    # Java源码
+    for name in item_group_names:
+        window.create_item_group_file(mod_json_path, base_package, mod_id, main_class_name, name)
+    write_mod_blocks(window, os.path.join(package_dir, "block", "ModBlocks.java"),
+                     f"{base_package}.block", mod_id, main_class_name, item_group_names[0], mod_data["blocks"])
+    write_mod_items(os.path.join(package_dir, "item", "ModItems.java"), base_package, main_class_name,
+                    mod_data["items"])
+
+    # 资源与数据文件
+    for block in mod_data["blocks"]:
+        write_block_assets(window, mdk_path, mod_id, block, textures)
+    for item in mod_data["items"]:
+        write_item_assets(mdk_path, mod_id, item, textures)
+    for recipe in mod_data["recipes"]:
+        _write_json(os.path.join(data_dir, "recipes", f"{recipe['name']}.json"),
+                    {k: v for k, v in recipe.items() if k != "name"})
+    write_lang(mdk_path, mod_id, mod_data)
+
+    with open(mod_json_path, 'w', encoding='utf-8') as f:
+        json.dump(public_mod_data(mod_data), f, ensure_ascii=False, indent=2)
+    if check:
+        check_sources(mdk_path, base_package)
+    return mod_json_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="生成用于基准测试的大型合成模组项目")
+    parser.add_argument("save_dir", help="保存位置，项目生成在{save_dir}/{modid}pack")
+    parser.add_argument("--modid", default="benchmod", help="模组ID")
+    parser.add_argument("--scale", type=float, default=1.0, help="按默认比例放大各类内容的数量")
+    for key in DEFAULT_COUNTS:
+        parser.add_argument(f"--{key.replace('_', '-')}", type=int, dest=key,
+                            help=f"{key}数量（覆盖--scale，默认{DEFAULT_COUNTS[key]}）")
+    parser.add_argument("--no-textures", action="store_true", help="不生成占位贴图")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args(argv)
+
+    counts = scaled_counts(args.scale)
+    for key in DEFAULT_COUNTS:
+        if getattr(args, key) is not None:
+            counts[key] = getattr(args, key)
+
+    os.makedirs(args.save_dir, exist_ok=True)
+    mod_json_path = generate_pack(args.save_dir, args.modid, textures=not args.no_textures, seed=args.seed, **counts)
+    summary = ", ".join(f"{key}={value}" for key, value in counts.items())
+    print(f"已生成项目: {os.path.dirname(mod_json_path)} ({summary})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
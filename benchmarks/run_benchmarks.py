@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能基准测试入口
+无界面运行所有基准测试，与JSON基线比较并标记超过阈值的性能回退
+
+用法:
+    python benchmarks/run_benchmarks.py                   # 运行并与基线比较
+    python benchmarks/run_benchmarks.py --save-baseline   # 运行并把结果保存为新基线
+    python benchmarks/run_benchmarks.py -k editor         # 只运行名称包含editor的基准测试
+"""
+
+import os
+import sys
+import json
+import argparse
+import platform
+import datetime
+
+import common
+from common import BENCHMARKS
+
+# 导入即注册
+import bench_wizard  # noqa: F401
+import bench_codegen  # noqa: F401
+import bench_editor  # noqa: F401
+import bench_workspace  # noqa: F401
+import bench_store  # noqa: F401
+
+DEFAULT_BASELINE = os.path.join(common.BENCHMARKS_DIR, "baseline.json")
+
+
+def load_baseline(path):
+    """
+    读取基线文件，不存在时返回空字典
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("results", {})
+
+
+def save_results(path, results):
+    """
+    保存结果（附带运行环境信息，方便判断基线是否可比）
+    """
+    data = {
+        "created": datetime.datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def compare(results, baseline, threshold):
+    """
+    与基线比较
+
+    :param results: 本次结果
+    :param baseline: 基线结果
+    :param threshold: 允许的相对变慢比例，如0.2表示慢20%以内不算回退
+    :return: 回退的基准测试名称列表
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]["median"]
+        ratio = result["median"] / base if base > 0 else 1.0
+        result["baseline_median"] = base
+        result["ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ForgeCreator性能基准测试")
+    parser.add_argument("-k", "--filter", default="", help="只运行名称包含该字符串的基准测试")
+    parser.add_argument("--repeat", type=int, default=5, help="每个基准测试的执行次数")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线文件路径")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--threshold", type=float, default=0.2, help="判定为回退的相对变慢比例")
+    parser.add_argument("--output", help="把本次结果写入指定JSON文件")
+    args = parser.parse_args(argv)
+
+    common.get_app()
+    baseline = load_baseline(args.baseline)
+
+    results = {}
+    for name, func in BENCHMARKS:
+        if args.filter and args.filter not in name:
+            continue
+        result = func(args.repeat)
+        results[name] = result
+        print(f"{name:45s} median {result['median'] * 1000:10.2f} ms   min {result['min'] * 1000:10.2f} ms", flush=True)
+
+    regressions = compare(results, baseline, args.threshold)
+    if baseline:
+        print()
+        for name, result in results.items():
+            if "ratio" in result:
+                mark = "  <-- 回退" if name in regressions else ""
+                print(f"{name:45s} {result['ratio']:6.2f}x 基线{mark}")
+
+    if args.output:
+        save_results(args.output, results)
+    if args.save_baseline:
+        merged = dict(baseline)
+        merged.update(results)
+        save_results(args.baseline, merged)
+        print(f"\n已保存基线: {args.baseline}")
+
+    if regressions and not args.save_baseline:
+        print(f"\n{len(regressions)}个基准测试超过阈值{args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
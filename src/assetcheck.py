@@ -0,0 +1,957 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+资源文件验证模块
+用预编译的JSON Schema验证src/main/resources下1.16.5的所有资源/数据文件
+（blockstate、方块/物品模型、语言文件、sounds.json、战利品表、标签、配方、pack.mcmeta），
+并交叉检查引用：
+    - 模型 -> 贴图、父模型存在
+    - blockstate -> 模型存在
+    - 战利品表、配方、标签 -> 物品/方块已在Java代码中注册，引用的标签存在
+
+Schema使用JSON Schema的一个子集书写，导入模块时编译为嵌套的Python闭包，验证时不再解释Schema。
+每个文件的验证结果按sha256缓存在.forgecreator/asset_validation.json中，
+再次验证时只有内容变化的文件需要重新解析；需要验证的文件较多时分发到进程池并行处理。
+交叉引用检查每次都基于缓存中的引用列表重新计算（只是集合查询，开销很小）
+"""
+
+import os
+import re
+import json
+import hashlib
+import concurrent.futures
+
+import tracing
+from journal import get_state_dir
+
+
+# 缓存文件名
+CACHE_FILE = "asset_validation.json"
+
+# Schema或引用提取规则变化时修改，使旧缓存失效
+CACHE_VERSION = 1
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+# 需要验证的文件数量不少于该值时才使用进程池（启动进程本身需要几百毫秒）
+POOL_MIN_FILES = 64
+
+# 无法检查的外部命名空间
+EXTERNAL_NAMESPACES = {"minecraft", "forge"}
+
+# 1.16.5资源包格式
+PACK_FORMAT = 6
+
+
+class AssetIssue:
+    """
+    一条验证结果
+    """
+
+    __slots__ = ("path", "severity", "message")
+
+    def __init__(self, path, severity, message):
+        self.path = path
+        self.severity = severity  # "error" 或 "warning"
+        self.message = message
+
+    def __str__(self):
+        kind = "错误" if self.severity == "error" else "警告"
+        return f"{self.path}: {kind}: {self.message}"
+
+    def __repr__(self):
+        return f"AssetIssue({self})"
+
+
+# ---------------------------------------------------------------------------
+# Schema编译
+# ---------------------------------------------------------------------------
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool)) or (isinstance(v, float) and v.is_integer()),
+}
+
+_TYPE_NAMES = {"object": "对象", "array": "数组", "string": "字符串", "boolean": "布尔值",
+               "number": "数字", "integer": "整数"}
+
+
+def _describe_type(value):
+    if isinstance(value, bool):
+        return "布尔值"
+    if isinstance(value, dict):
+        return "对象"
+    if isinstance(value, list):
+        return "数组"
+    if isinstance(value, str):
+        return "字符串"
+    if value is None:
+        return "null"
+    return "数字"
+
+
+def _child(where, key):
+    """
+    对象成员的位置描述：$.a.b，键不是标识符时为$.a["b c"]
+    """
+    if key.isidentifier():
+        return f"{where}.{key}"
+    return f"{where}[{json.dumps(key, ensure_ascii=False)}]"
+
+
+def compile_schema(schema):
+    """
+    把Schema编译为验证函数
+
+    支持的关键字：type、enum、properties、required、additionalProperties、items、minItems、maxItems、
+    minLength、maxLength、pattern、minimum、maximum、anyOf、oneOf、allOf、if/then
+
+    :param schema: Schema字典
+    :return: 验证函数validate(value, where, errors)，把(位置, 说明)追加到errors
+    """
+    checks = []
+
+    types = schema.get("type")
+    if types is not None:
+        type_list = [types] if isinstance(types, str) else list(types)
+        type_funcs = [_TYPE_CHECKS[t] for t in type_list]
+        expected = "或".join(_TYPE_NAMES[t] for t in type_list)
+
+        def check_type(value, where, errors):
+            for func in type_funcs:
+                if func(value):
+                    return True
+            errors.append((where, f"应为{expected}，实际为{_describe_type(value)}"))
+            return False
+    else:
+        check_type = None
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+        allowed_text = "、".join(json.dumps(v, ensure_ascii=False) for v in allowed)
+
+        def check_enum(value, where, errors):
+            if value not in allowed or isinstance(value, bool) != any(isinstance(v, bool) and v == value for v in allowed):
+                errors.append((where, f"取值应为{allowed_text}之一，实际为{json.dumps(value, ensure_ascii=False)}"))
+        checks.append(check_enum)
+
+    if "pattern" in schema:
+        regex = re.compile(schema["pattern"])
+
+        def check_pattern(value, where, errors):
+            if isinstance(value, str) and not regex.match(value):
+                errors.append((where, f"格式不正确: {value!r}"))
+        checks.append(check_pattern)
+
+    for keyword, compare, text in (("minLength", lambda v, n: len(v) >= n, "长度不能小于"),
+                                   ("maxLength", lambda v, n: len(v) <= n, "长度不能大于")):
+        if keyword in schema:
+            def check_length(value, where, errors, limit=schema[keyword], compare=compare, text=text):
+                if isinstance(value, str) and not compare(value, limit):
+                    errors.append((where, f"{text}{limit}"))
+            checks.append(check_length)
+
+    for keyword, compare, text in (("minimum", lambda v, n: v >= n, "不能小于"),
+                                   ("maximum", lambda v, n: v <= n, "不能大于")):
+        if keyword in schema:
+            def check_range(value, where, errors, limit=schema[keyword], compare=compare, text=text):
+                if _TYPE_CHECKS["number"](value) and not compare(value, limit):
+                    errors.append((where, f"{text}{limit}，实际为{value}"))
+            checks.append(check_range)
+
+    if "required" in schema:
+        required = list(schema["required"])
+
+        def check_required(value, where, errors):
+            if isinstance(value, dict):
+                for key in required:
+                    if key not in value:
+                        errors.append((where, f"缺少必需的字段\"{key}\""))
+        checks.append(check_required)
+
+    if "properties" in schema or "additionalProperties" in schema:
+        properties = {key: compile_schema(sub) for key, sub in schema.get("properties", {}).items()}
+        additional = schema.get("additionalProperties", True)
+        if isinstance(additional, dict):
+            additional = compile_schema(additional)
+
+        def check_properties(value, where, errors):
+            if not isinstance(value, dict):
+                return
+            for key, item in value.items():
+                validate = properties.get(key)
+                if validate is not None:
+                    validate(item, _child(where, key), errors)
+                elif additional is False:
+                    errors.append((where, f"未知的字段\"{key}\""))
+                elif additional is not True:
+                    additional(item, _child(where, key), errors)
+        checks.append(check_properties)
+
+    if "items" in schema or "minItems" in schema or "maxItems" in schema:
+        validate_item = compile_schema(schema["items"]) if "items" in schema else None
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+
+        def check_items(value, where, errors):
+            if not isinstance(value, list):
+                return
+            if min_items is not None and len(value) < min_items:
+                errors.append((where, f"至少需要{min_items}个元素，实际为{len(value)}个"))
+            if max_items is not None and len(value) > max_items:
+                errors.append((where, f"最多只能有{max_items}个元素，实际为{len(value)}个"))
+            if validate_item is not None:
+                for index, item in enumerate(value):
+                    validate_item(item, f"{where}[{index}]", errors)
+        checks.append(check_items)
+
+    if "allOf" in schema:
+        for sub in schema["allOf"]:
+            checks.append(compile_schema(sub))
+
+    if "anyOf" in schema:
+        branches = [(sub.get("type"), compile_schema(sub)) for sub in schema["anyOf"]]
+
+        def check_any(value, where, errors):
+            results = []
+            for branch_type, validate in branches:
+                branch_errors = []
+                validate(value, where, branch_errors)
+                if not branch_errors:
+                    return
+                results.append((branch_type, branch_errors))
+            # 只有一个分支的类型与值相符时，报告该分支的具体错误
+            matching = [branch_errors for branch_type, branch_errors in results
+                        if branch_type is not None and _TYPE_CHECKS[branch_type](value)]
+            if len(matching) == 1:
+                errors.extend(matching[0])
+            else:
+                errors.append((where, "不符合任何一种允许的格式"))
+        checks.append(check_any)
+
+    if "oneOf" in schema:
+        branches = [compile_schema(sub) for sub in schema["oneOf"]]
+
+        def check_one(value, where, errors):
+            passed = 0
+            for validate in branches:
+                branch_errors = []
+                validate(value, where, branch_errors)
+                if not branch_errors:
+                    passed += 1
+            if passed != 1:
+                errors.append((where, "应恰好符合一种格式" if passed else "不符合任何一种允许的格式"))
+        checks.append(check_one)
+
+    if "if" in schema:
+        condition = compile_schema(schema["if"])
+        then = compile_schema(schema.get("then", {}))
+
+        def check_if(value, where, errors):
+            condition_errors = []
+            condition(value, where, condition_errors)
+            if not condition_errors:
+                then(value, where, errors)
+        checks.append(check_if)
+
+    def validate(value, where, errors):
+        if check_type is not None and not check_type(value, where, errors):
+            return
+        for check in checks:
+            check(value, where, errors)
+
+    return validate
+
+
+# ---------------------------------------------------------------------------
+# 1.16.5资源文件Schema
+# ---------------------------------------------------------------------------
+
+_RESOURCE_LOCATION = r"(?:[a-z0-9_.-]+:)?[a-z0-9_./-]+"
+_RL = {"type": "string", "pattern": f"^{_RESOURCE_LOCATION}$"}
+_TAG_ENTRY = {"type": "string", "pattern": f"^#?{_RESOURCE_LOCATION}$"}
+_TEXTURE_REF = {"type": "string", "pattern": f"^(?:#[A-Za-z0-9_]+|{_RESOURCE_LOCATION})$"}
+_ROTATION = {"enum": [0, 90, 180, 270]}
+_BOOLEAN = {"type": "boolean"}
+_NUMBER = {"type": "number"}
+_INTEGER = {"type": "integer"}
+_VEC3 = {"type": "array", "minItems": 3, "maxItems": 3, "items": _NUMBER}
+_DIRECTIONS = ["down", "up", "north", "south", "west", "east"]
+
+_BLOCKSTATE_MODEL = {
+    "type": "object",
+    "required": ["model"],
+    "properties": {"model": _RL, "x": _ROTATION, "y": _ROTATION, "uvlock": _BOOLEAN,
+                   "weight": {"type": "integer", "minimum": 1}},
+    "additionalProperties": False,
+}
+_BLOCKSTATE_MODELS = {"anyOf": [_BLOCKSTATE_MODEL, {"type": "array", "minItems": 1, "items": _BLOCKSTATE_MODEL}]}
+
+BLOCKSTATE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "variants": {"type": "object", "additionalProperties": _BLOCKSTATE_MODELS},
+        "multipart": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["apply"],
+                "properties": {"when": {"type": "object"}, "apply": _BLOCKSTATE_MODELS},
+                "additionalProperties": False,
+            },
+        },
+    },
+    "additionalProperties": False,
+    "oneOf": [{"required": ["variants"]}, {"required": ["multipart"]}],
+}
+
+_FACE = {
+    "type": "object",
+    "required": ["texture"],
+    "properties": {
+        "uv": {"type": "array", "minItems": 4, "maxItems": 4, "items": _NUMBER},
+        "texture": _TEXTURE_REF,
+        "cullface": {"enum": _DIRECTIONS + ["bottom"]},
+        "rotation": _ROTATION,
+        "tintindex": _INTEGER,
+    },
+    "additionalProperties": False,
+}
+
+_ELEMENT = {
+    "type": "object",
+    "required": ["from", "to", "faces"],
+    "properties": {
+        "from": _VEC3,
+        "to": _VEC3,
+        "rotation": {
+            "type": "object",
+            "required": ["origin", "axis", "angle"],
+            "properties": {"origin": _VEC3, "axis": {"enum": ["x", "y", "z"]},
+                           "angle": {"enum": [-45, -22.5, 0, 22.5, 45]}, "rescale": _BOOLEAN},
+            "additionalProperties": False,
+        },
+        "shade": _BOOLEAN,
+        "faces": {"type": "object", "properties": {d: _FACE for d in _DIRECTIONS}, "additionalProperties": False},
+        "name": {"type": "string"},
+    },
+}
+
+_DISPLAY_POSITIONS = ["thirdperson_righthand", "thirdperson_lefthand", "firstperson_righthand",
+                      "firstperson_lefthand", "gui", "head", "ground", "fixed"]
+
+# 根对象允许其他字段（Forge的自定义模型加载器使用loader等字段）
+MODEL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "parent": _RL,
+        "ambientocclusion": _BOOLEAN,
+        "gui_light": {"enum": ["front", "side"]},
+        "textures": {"type": "object", "additionalProperties": _TEXTURE_REF},
+        "elements": {"type": "array", "items": _ELEMENT},
+        "display": {
+            "type": "object",
+            "properties": {position: {"type": "object",
+                                      "properties": {"rotation": _VEC3, "translation": _VEC3, "scale": _VEC3},
+                                      "additionalProperties": False}
+                           for position in _DISPLAY_POSITIONS},
+            "additionalProperties": False,
+        },
+        "overrides": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["predicate", "model"],
+                "properties": {"predicate": {"type": "object", "additionalProperties": _NUMBER}, "model": _RL},
+                "additionalProperties": False,
+            },
+        },
+    },
+}
+
+LANG_SCHEMA = {"type": "object", "additionalProperties": {"type": "string"}}
+
+SOUNDS_SCHEMA = {
+    "type": "object",
+    "additionalProperties": {
+        "type": "object",
+        "properties": {
+            "replace": _BOOLEAN,
+            "subtitle": {"type": "string"},
+            "sounds": {
+                "type": "array",
+                "items": {"anyOf": [
+                    _RL,
+                    {
+                        "type": "object",
+                        "required": ["name"],
+                        "properties": {"name": _RL, "volume": _NUMBER, "pitch": _NUMBER,
+                                       "weight": {"type": "integer", "minimum": 1}, "stream": _BOOLEAN,
+                                       "attenuation_distance": _INTEGER, "preload": _BOOLEAN,
+                                       "type": {"enum": ["sound", "event"]}},
+                        "additionalProperties": False,
+                    },
+                ]},
+            },
+        },
+        "additionalProperties": False,
+    },
+}
+
+_NUMBER_PROVIDER = {"anyOf": [_NUMBER, {"type": "object"}]}
+_CONDITIONS = {"type": "array", "items": {"type": "object", "required": ["condition"], "properties": {"condition": _RL}}}
+_FUNCTIONS = {"type": "array", "items": {"type": "object", "required": ["function"],
+                                        "properties": {"function": _RL, "conditions": _CONDITIONS}}}
+_NAMED_ENTRY_TYPES = ["minecraft:item", "item", "minecraft:tag", "tag", "minecraft:loot_table", "loot_table"]
+
+_LOOT_ENTRY = {
+    "type": "object",
+    "required": ["type"],
+    "properties": {
+        "type": _RL,
+        "name": _RL,
+        "weight": {"type": "integer", "minimum": 1},
+        "quality": _INTEGER,
+        "expand": _BOOLEAN,
+        "conditions": _CONDITIONS,
+        "functions": _FUNCTIONS,
+        "children": {"type": "array", "items": {"type": "object", "required": ["type"]}},
+    },
+    "if": {"properties": {"type": {"enum": _NAMED_ENTRY_TYPES}}},
+    "then": {"required": ["name"]},
+}
+
+LOOT_TABLE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "type": _RL,
+        "pools": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["rolls", "entries"],
+                "properties": {
+                    "name": {"type": "string"},
+                    "rolls": _NUMBER_PROVIDER,
+                    "bonus_rolls": _NUMBER_PROVIDER,
+                    "entries": {"type": "array", "items": _LOOT_ENTRY},
+                    "conditions": _CONDITIONS,
+                    "functions": _FUNCTIONS,
+                },
+            },
+        },
+        "functions": _FUNCTIONS,
+    },
+}
+
+TAG_SCHEMA = {
+    "type": "object",
+    "required": ["values"],
+    "properties": {
+        "replace": _BOOLEAN,
+        "values": {"type": "array", "items": {"anyOf": [
+            _TAG_ENTRY,
+            {"type": "object", "required": ["id"], "properties": {"id": _TAG_ENTRY, "required": _BOOLEAN},
+             "additionalProperties": False},
+        ]}},
+    },
+    "additionalProperties": False,
+}
+
+_INGREDIENT_OBJECT = {"type": "object", "properties": {"item": _RL, "tag": _RL}}
+_INGREDIENT = {"anyOf": [_INGREDIENT_OBJECT, {"type": "array", "minItems": 1, "items": _INGREDIENT_OBJECT}]}
+_RESULT_STACK = {
+    "type": "object",
+    "required": ["item"],
+    "properties": {"item": _RL, "count": {"type": "integer", "minimum": 1, "maximum": 64}},
+}
+_COOKING_TYPES = ["minecraft:smelting", "minecraft:blasting", "minecraft:smoking", "minecraft:campfire_cooking"]
+
+
+def _recipe_case(types, schema):
+    return {"if": {"properties": {"type": {"enum": types}}}, "then": schema}
+
+
+RECIPE_SCHEMA = {
+    "type": "object",
+    "required": ["type"],
+    "properties": {"type": _RL, "group": {"type": "string"}},
+    "allOf": [
+        _recipe_case(["minecraft:crafting_shaped"], {
+            "required": ["pattern", "key", "result"],
+            "properties": {
+                "pattern": {"type": "array", "minItems": 1, "maxItems": 3,
+                            "items": {"type": "string", "minLength": 1, "maxLength": 3}},
+                "key": {"type": "object", "additionalProperties": _INGREDIENT},
+                "result": _RESULT_STACK,
+            },
+        }),
+        _recipe_case(["minecraft:crafting_shapeless"], {
+            "required": ["ingredients", "result"],
+            "properties": {
+                "ingredients": {"type": "array", "minItems": 1, "maxItems": 9, "items": _INGREDIENT},
+                "result": _RESULT_STACK,
+            },
+        }),
+        _recipe_case(_COOKING_TYPES, {
+            "required": ["ingredient", "result"],
+            "properties": {"ingredient": _INGREDIENT, "result": _RL, "experience": _NUMBER,
+                           "cookingtime": {"type": "integer", "minimum": 1}},
+        }),
+        _recipe_case(["minecraft:stonecutting"], {
+            "required": ["ingredient", "result", "count"],
+            "properties": {"ingredient": _INGREDIENT, "result": _RL, "count": {"type": "integer", "minimum": 1}},
+        }),
+        _recipe_case(["minecraft:smithing"], {
+            "required": ["base", "addition", "result"],
+            "properties": {"base": _INGREDIENT, "addition": _INGREDIENT, "result": _RESULT_STACK},
+        }),
+    ],
+}
+
+PACK_MCMETA_SCHEMA = {
+    "type": "object",
+    "required": ["pack"],
+    "properties": {
+        "pack": {
+            "type": "object",
+            "required": ["pack_format", "description"],
+            "properties": {"pack_format": {"type": "integer", "minimum": 1}},
+        },
+    },
+}
+
+# 文件类型 -> 编译后的验证函数（导入模块时编译一次，进程池中的每个进程也只编译一次）
+VALIDATORS = {
+    "blockstate": compile_schema(BLOCKSTATE_SCHEMA),
+    "model": compile_schema(MODEL_SCHEMA),
+    "lang": compile_schema(LANG_SCHEMA),
+    "sounds": compile_schema(SOUNDS_SCHEMA),
+    "loot_table": compile_schema(LOOT_TABLE_SCHEMA),
+    "tag": compile_schema(TAG_SCHEMA),
+    "recipe": compile_schema(RECIPE_SCHEMA),
+    "pack": compile_schema(PACK_MCMETA_SCHEMA),
+}
+
+
+# ---------------------------------------------------------------------------
+# 单个文件的验证（在进程池中执行）
+# ---------------------------------------------------------------------------
+
+def classify(rel_path):
+    """
+    根据相对于resources目录的路径判断文件类型
+
+    :return: VALIDATORS中的类型、"json"（只检查语法）或None（不是JSON文件）
+    """
+    if rel_path == "pack.mcmeta":
+        return "pack"
+    if not rel_path.endswith(".json"):
+        return None
+    parts = rel_path.split("/")
+    if len(parts) >= 4 and parts[0] == "assets":
+        if parts[2] == "blockstates":
+            return "blockstate"
+        if parts[2] == "models":
+            return "model"
+        if parts[2] == "lang":
+            return "lang"
+    if len(parts) == 3 and parts[0] == "assets" and parts[2] == "sounds.json":
+        return "sounds"
+    if len(parts) >= 4 and parts[0] == "data":
+        if parts[2] == "loot_tables":
+            return "loot_table"
+        if parts[2] == "tags" and len(parts) >= 5:
+            return "tag"
+        if parts[2] == "recipes":
+            return "recipe"
+    return "json"
+
+
+def normalize_location(location):
+    """
+    补全资源位置的命名空间（默认为minecraft）
+    """
+    return location if ":" in location else f"minecraft:{location}"
+
+
+def _ingredient_refs(ingredient, where, refs):
+    for index, option in enumerate(ingredient if isinstance(ingredient, list) else [ingredient]):
+        if not isinstance(option, dict):
+            continue
+        option_where = f"{where}[{index}]" if isinstance(ingredient, list) else where
+        if isinstance(option.get("item"), str):
+            refs.append(("item", normalize_location(option["item"]), option_where))
+        if isinstance(option.get("tag"), str):
+            refs.append(("tag:items", normalize_location(option["tag"]), option_where))
+
+
+def _loot_entry_refs(entries, where, refs):
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        entry_where = f"{where}[{index}]"
+        entry_type = normalize_location(str(entry.get("type", "")))
+        name = entry.get("name")
+        if isinstance(name, str):
+            if entry_type == "minecraft:item":
+                refs.append(("item", normalize_location(name), entry_where))
+            elif entry_type == "minecraft:tag":
+                refs.append(("tag:items", normalize_location(name), entry_where))
+        if isinstance(entry.get("children"), list):
+            _loot_entry_refs(entry["children"], f"{entry_where}.children", refs)
+
+
+def extract_refs(kind, rel_path, data):
+    """
+    提取文件中对其他资源的引用
+
+    :return: [(引用类型, 资源位置, 位置)]，引用类型为texture、model、item、block或tag:<注册表>
+    """
+    refs = []
+    if kind == "blockstate":
+        groups = []
+        if isinstance(data.get("variants"), dict):
+            groups += [(_child("$.variants", key), value) for key, value in data["variants"].items()]
+        if isinstance(data.get("multipart"), list):
+            groups += [(f"$.multipart[{index}].apply", part.get("apply"))
+                       for index, part in enumerate(data["multipart"]) if isinstance(part, dict)]
+        for where, models in groups:
+            for model in models if isinstance(models, list) else [models]:
+                if isinstance(model, dict) and isinstance(model.get("model"), str):
+                    refs.append(("model", normalize_location(model["model"]), where))
+    elif kind == "model":
+        parent = data.get("parent")
+        if isinstance(parent, str) and not parent.startswith("builtin/"):
+            refs.append(("model", normalize_location(parent), "$.parent"))
+        if isinstance(data.get("textures"), dict):
+            for key, texture in data["textures"].items():
+                if isinstance(texture, str) and not texture.startswith("#"):
+                    refs.append(("texture", normalize_location(texture), _child("$.textures", key)))
+        if isinstance(data.get("overrides"), list):
+            for index, override in enumerate(data["overrides"]):
+                if isinstance(override, dict) and isinstance(override.get("model"), str):
+                    refs.append(("model", normalize_location(override["model"]), f"$.overrides[{index}].model"))
+    elif kind == "loot_table":
+        for pool_index, pool in enumerate(data.get("pools") or []):
+            if isinstance(pool, dict) and isinstance(pool.get("entries"), list):
+                _loot_entry_refs(pool["entries"], f"$.pools[{pool_index}].entries", refs)
+    elif kind == "tag":
+        registry = rel_path.split("/")[3]
+        for index, value in enumerate(data.get("values") or []):
+            if isinstance(value, dict):
+                value = value.get("id")
+            if not isinstance(value, str):
+                continue
+            if value.startswith("#"):
+                refs.append((f"tag:{registry}", normalize_location(value[1:]), f"$.values[{index}]"))
+            elif registry == "items":
+                refs.append(("item", normalize_location(value), f"$.values[{index}]"))
+            elif registry == "blocks":
+                refs.append(("block", normalize_location(value), f"$.values[{index}]"))
+    elif kind == "recipe":
+        result = data.get("result")
+        if isinstance(result, dict) and isinstance(result.get("item"), str):
+            refs.append(("item", normalize_location(result["item"]), "$.result"))
+        elif isinstance(result, str):
+            refs.append(("item", normalize_location(result), "$.result"))
+        for field in ("ingredient", "base", "addition"):
+            if field in data:
+                _ingredient_refs(data[field], f"$.{field}", refs)
+        if isinstance(data.get("ingredients"), list):
+            for index, ingredient in enumerate(data["ingredients"]):
+                _ingredient_refs(ingredient, f"$.ingredients[{index}]", refs)
+        if isinstance(data.get("key"), dict):
+            for key, ingredient in data["key"].items():
+                _ingredient_refs(ingredient, _child("$.key", key), refs)
+    return refs
+
+
+def _semantic_issues(kind, data):
+    """
+    Schema无法表达的检查
+    """
+    issues = []
+    if kind == "recipe" and data.get("type") == "minecraft:crafting_shaped" \
+            and isinstance(data.get("pattern"), list) and isinstance(data.get("key"), dict):
+        pattern = [row for row in data["pattern"] if isinstance(row, str)]
+        if len({len(row) for row in pattern}) > 1:
+            issues.append(("error", "$.pattern: 每一行的长度必须相同"))
+        used = {char for row in pattern for char in row if char != " "}
+        for char in sorted(used - set(data["key"])):
+            issues.append(("error", f"$.pattern: 符号\"{char}\"没有在key中定义"))
+        for char in sorted(set(data["key"]) - used):
+            issues.append(("error", f"{_child('$.key', char)}: 在pattern中没有使用"))
+    elif kind == "pack":
+        pack_format = data.get("pack", {}).get("pack_format") if isinstance(data.get("pack"), dict) else None
+        if isinstance(pack_format, int) and pack_format != PACK_FORMAT:
+            issues.append(("warning", f"$.pack.pack_format: 1.16.5应为{PACK_FORMAT}，实际为{pack_format}"))
+    return issues
+
+
+def validate_file(rel_path, content):
+    """
+    验证单个文件（进程池的工作函数）
+
+    :param rel_path: 相对于resources目录的路径（/分隔）
+    :param content: 文件内容（bytes）
+    :return: (issues, refs)，issues为[(严重程度, 说明)]
+    """
+    kind = classify(rel_path)
+    try:
+        data = json.loads(content.decode("utf-8"))
+    except UnicodeDecodeError as e:
+        return [("error", f"不是UTF-8编码: {e}")], []
+    except ValueError as e:
+        return [("error", f"JSON语法错误: {e}")], []
+
+    issues = []
+    validator = VALIDATORS.get(kind)
+    if validator is not None:
+        errors = []
+        validator(data, "$", errors)
+        issues += [("error", f"{where}: {message}") for where, message in errors]
+        if isinstance(data, dict):
+            issues += _semantic_issues(kind, data)
+    refs = extract_refs(kind, rel_path, data) if isinstance(data, dict) else []
+    return issues, refs
+
+
+def _validate_batch(batch):
+    """
+    在工作进程中验证一批文件
+    """
+    return [validate_file(rel_path, content) for rel_path, content in batch]
+
+
+# ---------------------------------------------------------------------------
+# 整个项目的验证
+# ---------------------------------------------------------------------------
+
+# Java代码中注册的名称：registerBlock("name", ...)、ITEMS.register("name", ...)等
+_REGISTER_PATTERN = re.compile(r"\bregister\w*\(\s*\"([a-z0-9_./-]+)\"")
+
+
+class ValidationReport:
+    """
+    一次验证的结果
+    """
+
+    def __init__(self, issues, files, validated):
+        self.issues = issues        # AssetIssue列表
+        self.files = files          # 检查的文件总数
+        self.validated = validated  # 本次重新解析验证的文件数（其余使用缓存）
+
+    @property
+    def errors(self):
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+    @property
+    def warnings(self):
+        return [issue for issue in self.issues if issue.severity == "warning"]
+
+    def format_lines(self, limit=200):
+        """
+        格式化为文本行，最多limit条问题
+        """
+        lines = [str(issue) for issue in self.issues[:limit]]
+        if len(self.issues) > limit:
+            lines.append(f"……还有{len(self.issues) - limit}条")
+        return lines
+
+
+class AssetValidator:
+    """
+    项目的资源文件验证器
+    """
+
+    def __init__(self, project_dir):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.mdk_path = os.path.join(self.project_dir, MDK_DIR_NAME)
+        self.resources_dir = os.path.join(self.mdk_path, "src", "main", "resources")
+        self.java_dir = os.path.join(self.mdk_path, "src", "main", "java")
+        self.cache_path = os.path.join(get_state_dir(self.project_dir), CACHE_FILE)
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path):
+        """
+        根据mod.json路径获取项目的资源文件验证器
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)))
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("version") != CACHE_VERSION:
+            return {}
+        return cache.get("files", {})
+
+    def _save_cache(self, files):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        temp_path = self.cache_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"version": CACHE_VERSION, "files": files}, ensure_ascii=False))
+        os.replace(temp_path, self.cache_path)
+
+    def _scan(self):
+        """
+        遍历resources目录
+
+        :return: ({相对路径: os.DirEntry}（需要验证的文件）, 所有文件的相对路径集合)
+        """
+        to_check = {}
+        all_files = set()
+        stack = [(self.resources_dir, "")]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                rel_path = prefix + entry.name
+                if entry.is_dir():
+                    stack.append((entry.path, rel_path + "/"))
+                else:
+                    all_files.add(rel_path)
+                    if classify(rel_path) is not None:
+                        to_check[rel_path] = entry
+        return to_check, all_files
+
+    def registered_names(self):
+        """
+        从Java源码中收集已注册的方块/物品名称（不含命名空间）
+        """
+        names = set()
+        for directory, dirnames, filenames in os.walk(self.java_dir):
+            for filename in filenames:
+                if filename.endswith(".java"):
+                    with open(os.path.join(directory, filename), 'r', encoding='utf-8', errors='replace') as f:
+                        names.update(_REGISTER_PATTERN.findall(f.read()))
+        return names
+
+    @tracing.traced(category="assets")
+    def validate(self, workers=None, use_cache=True):
+        """
+        验证所有资源文件并检查交叉引用
+
+        :param workers: 进程池大小，为None时使用CPU核数；为1时不使用进程池
+        :param use_cache: 是否使用并更新按文件哈希缓存的结果
+        :return: ValidationReport
+        """
+        to_check, all_files = self._scan()
+        cache = self._load_cache() if use_cache else {}
+
+        results = {}
+        pending = []
+        with tracing.span("hash_resources", "assets", files=len(to_check)):
+            for rel_path, dir_entry in sorted(to_check.items()):
+                stat = dir_entry.stat()
+                entry = cache.get(rel_path)
+                # 大小和修改时间都没变时连哈希也不必重新计算
+                if entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime_ns:
+                    results[rel_path] = entry
+                    continue
+                with open(dir_entry.path, 'rb') as f:
+                    content = f.read()
+                digest = hashlib.sha256(content).hexdigest()
+                if entry and entry.get("sha256") == digest:
+                    results[rel_path] = dict(entry, size=stat.st_size, mtime=stat.st_mtime_ns)
+                    continue
+                results[rel_path] = {"sha256": digest, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+                pending.append((rel_path, content))
+
+        with tracing.span("validate_files", "assets", files=len(pending)):
+            for (rel_path, _), (issues, refs) in zip(pending, self._run(pending, workers)):
+                results[rel_path]["issues"] = issues
+                results[rel_path]["refs"] = refs
+
+        # 没有任何变化时不必重写缓存
+        if use_cache and results != cache:
+            self._save_cache(results)
+
+        issues = []
+        for rel_path in sorted(results):
+            issues += [AssetIssue(rel_path, severity, message) for severity, message in results[rel_path]["issues"]]
+        with tracing.span("check_references", "assets"):
+            issues += self._check_references(results, all_files)
+        return ValidationReport(issues, len(results), len(pending))
+
+    def _run(self, pending, workers):
+        """
+        验证需要重新解析的文件，文件较多时使用进程池
+
+        :return: 与pending顺序相同的[(issues, refs)]
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(pending) < POOL_MIN_FILES:
+            return [validate_file(rel_path, content) for rel_path, content in pending]
+
+        # 分批提交，减少进程间通信的次数
+        batch_size = max(16, len(pending) // (workers * 4))
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        results = []
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                for batch_result in executor.map(_validate_batch, batches):
+                    results.extend(batch_result)
+        except (OSError, concurrent.futures.process.BrokenProcessPool):
+            # 无法创建子进程时退回单进程验证
+            results = [validate_file(rel_path, content) for rel_path, content in pending]
+        return results
+
+    def _check_references(self, results, all_files):
+        """
+        检查交叉引用
+
+        :param results: {相对路径: 缓存条目（含refs）}
+        :param all_files: resources目录下所有文件的相对路径
+        :return: AssetIssue列表
+        """
+        namespaces = set()
+        defined = {"texture": set(), "model": set()}
+        for rel_path in all_files:
+            parts = rel_path.split("/")
+            if len(parts) < 3 or parts[0] not in ("assets", "data"):
+                continue
+            namespaces.add(parts[1])
+            rest = "/".join(parts[3:])
+            if parts[0] == "assets" and parts[2] == "textures" and rest.endswith(".png"):
+                defined["texture"].add(f"{parts[1]}:{rest[:-4]}")
+            elif parts[0] == "assets" and parts[2] == "models" and rest.endswith(".json"):
+                defined["model"].add(f"{parts[1]}:{rest[:-5]}")
+            elif parts[0] == "data" and parts[2] == "tags" and len(parts) >= 5 and rel_path.endswith(".json"):
+                registry = parts[3]
+                defined.setdefault(f"tag:{registry}", set()).add(f"{parts[1]}:{'/'.join(parts[4:])[:-5]}")
+        local_namespaces = namespaces - EXTERNAL_NAMESPACES
+        registered = self.registered_names()
+
+        issues = []
+        for rel_path in sorted(results):
+            for kind, location, where in results[rel_path].get("refs", []):
+                namespace, name = location.split(":", 1)
+                if namespace not in local_namespaces:
+                    continue
+                if kind in ("item", "block"):
+                    if registered and name not in registered:
+                        text = "物品" if kind == "item" else "方块"
+                        issues.append(AssetIssue(rel_path, "error", f"{where}: {text}{location}没有在Java代码中注册"))
+                elif location not in defined.get(kind, ()):
+                    if kind == "texture":
+                        message = f"贴图不存在: assets/{namespace}/textures/{name}.png"
+                    elif kind == "model":
+                        message = f"模型不存在: assets/{namespace}/models/{name}.json"
+                    else:
+                        message = f"标签不存在: data/{namespace}/tags/{kind[4:]}/{name}.json"
+                    issues.append(AssetIssue(rel_path, "error", f"{where}: {message}"))
+        return issues
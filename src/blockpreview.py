@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+方块预览模块
+根据方块模型JSON和贴图无界面地渲染物品栏风格的等轴测缩略图（上、北、西三个面，分别按1.0/0.8/0.6调暗），
+支持cube_all、cube_column、cube_bottom_top、orientable等整块模型及本地父模型链；
+缺少的贴图按游戏中的紫黑格子显示。
+
+每个输出像素对应哪个面的哪个贴图坐标只与缩略图尺寸有关，预先算好后渲染只是一次数组取值；
+安装了NumPy时整张图向量化计算，否则逐像素处理。
+缩略图按“模型内容+贴图哈希”缓存在.forgecreator/thumbnails中，模型和贴图都没变化时直接使用缓存
+"""
+
+import os
+import json
+import hashlib
+
+try:
+    import numpy as np
+except ImportError:  # 没有NumPy时使用纯Python实现
+    np = None
+
+import tracing
+import pngcodec
+from journal import get_state_dir
+from texturestore import TextureStore, MDK_DIR_NAME
+
+
+# 缓存目录名（位于.forgecreator下）
+CACHE_DIR_NAME = "thumbnails"
+
+# 渲染方式变化时修改，使旧缩略图失效
+RENDERER_VERSION = 1
+
+# 默认缩略图边长
+THUMBNAIL_SIZE = 64
+
+# 缩略图PNG的zlib压缩级别（缓存文件，速度优先）
+COMPRESS_LEVEL = 1
+
+# 可见的三个面及其亮度
+FACES = (("up", 1.0), ("north", 0.8), ("west", 0.6))
+
+# 原版整块父模型：面 -> 贴图变量
+BUILTIN_PARENTS = {
+    "block/cube_all": {"up": "#all", "north": "#all", "west": "#all"},
+    "block/cube_mirrored_all": {"up": "#all", "north": "#all", "west": "#all"},
+    "block/leaves": {"up": "#all", "north": "#all", "west": "#all"},
+    "block/cube": {"up": "#up", "north": "#north", "west": "#west"},
+    "block/cube_column": {"up": "#end", "north": "#side", "west": "#side"},
+    "block/cube_column_horizontal": {"up": "#side", "north": "#end", "west": "#side"},
+    "block/cube_bottom_top": {"up": "#top", "north": "#side", "west": "#side"},
+    "block/cube_top": {"up": "#top", "north": "#side", "west": "#side"},
+    "block/orientable": {"up": "#top", "north": "#front", "west": "#side"},
+    "block/orientable_with_bottom": {"up": "#top", "north": "#front", "west": "#side"},
+}
+
+# 父模型链的最大深度（防止循环引用）
+MAX_PARENT_DEPTH = 16
+
+
+def _location(value, default_namespace="minecraft"):
+    """
+    把资源位置拆分为(命名空间, 路径)
+    """
+    if ":" in value:
+        namespace, path = value.split(":", 1)
+        return namespace, path
+    return default_namespace, value
+
+
+def _missing_texture():
+    """
+    缺失贴图：16x16的紫黑格子
+    """
+    image = pngcodec.Image(16, 16)
+    for y in range(16):
+        for x in range(16):
+            color = b"\xf8\x00\xf8\xff" if (x < 8) != (y < 8) else b"\x00\x00\x00\xff"
+            position = (y * 16 + x) * 4
+            image.pixels[position:position + 4] = color
+    return image
+
+
+_MISSING = _missing_texture()
+
+# 缩略图尺寸 -> 各面的像素映射
+_MAPPINGS = {}
+
+
+def _face_mapping(size):
+    """
+    计算每个输出像素落在哪个面以及该面上的(u, v)（0~1）
+
+    立方体按2:1等轴测投影，上面是菱形，北面和西面是下方左右两个平行四边形。
+    以像素中心反解平行四边形坐标：P = 原点 + u * 边1 + v * 边2
+
+    :return: {面: [(像素序号, u, v)]}
+    """
+    if size in _MAPPINGS:
+        return _MAPPINGS[size]
+    half = size / 2
+    quarter = size / 4
+    # 顶面四个角（从西北方上空看）：西北角在菱形下方，东北角在左，西南角在右
+    north_west = (half, half)
+    north_east = (0.0, quarter)
+    south_west = (float(size), quarter)
+    down = (0.0, half)
+    parallelograms = {
+        "up": (north_west, (north_east[0] - north_west[0], north_east[1] - north_west[1]),
+               (south_west[0] - north_west[0], south_west[1] - north_west[1])),
+        "north": (north_east, (north_west[0] - north_east[0], north_west[1] - north_east[1]), down),
+        "west": (north_west, (south_west[0] - north_west[0], south_west[1] - north_west[1]), down),
+    }
+    mapping = {face: [] for face in parallelograms}
+    for y in range(size):
+        for x in range(size):
+            px, py = x + 0.5, y + 0.5
+            for face, (origin, (ax, ay), (bx, by)) in parallelograms.items():
+                dx, dy = px - origin[0], py - origin[1]
+                determinant = ax * by - ay * bx
+                u = (dx * by - dy * bx) / determinant
+                v = (ax * dy - ay * dx) / determinant
+                if 0 <= u < 1 and 0 <= v < 1:
+                    mapping[face].append((y * size + x, u, v))
+                    break
+    if np is not None:
+        mapping = {face: (np.array([p for p, _, _ in items], dtype=np.intp),
+                          np.array([u for _, u, _ in items]),
+                          np.array([v for _, _, v in items]))
+                   for face, items in mapping.items()}
+    _MAPPINGS[size] = mapping
+    return mapping
+
+
+def render(face_images, size=THUMBNAIL_SIZE):
+    """
+    渲染等轴测缩略图
+
+    :param face_images: {"up"/"north"/"west": Image}，贴图只使用最上面的正方形区域（动画贴图的第一帧）
+    :param size: 缩略图边长
+    :return: Image
+    """
+    mapping = _face_mapping(size)
+    if np is not None:
+        out = np.zeros((size * size, 4), dtype=np.uint8)
+        for face, shade in FACES:
+            image = face_images[face]
+            frame = min(image.width, image.height)
+            texture = np.frombuffer(bytes(image.pixels), dtype=np.uint8).reshape(image.height, image.width, 4)
+            pixels, u, v = mapping[face]
+            colors = texture[(v * frame).astype(np.intp), (u * frame).astype(np.intp)].astype(np.float32)
+            colors[:, :3] *= shade
+            out[pixels] = (colors + 0.5).astype(np.uint8)
+        return pngcodec.Image(size, size, bytearray(out.tobytes()))
+
+    result = pngcodec.Image(size, size)
+    out = result.pixels
+    for face, shade in FACES:
+        image = face_images[face]
+        frame = min(image.width, image.height)
+        source = image.pixels
+        for pixel, u, v in mapping[face]:
+            position = (int(v * frame) * image.width + int(u * frame)) * 4
+            target = pixel * 4
+            out[target] = int(source[position] * shade + 0.5)
+            out[target + 1] = int(source[position + 1] * shade + 0.5)
+            out[target + 2] = int(source[position + 2] * shade + 0.5)
+            out[target + 3] = source[position + 3]
+    return result
+
+
+class BlockPreviewRenderer:
+    """
+    项目方块的缩略图渲染与缓存
+    """
+
+    def __init__(self, project_dir, size=THUMBNAIL_SIZE):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        :param size: 缩略图边长
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.size = size
+        self.assets_dir = os.path.join(self.project_dir, MDK_DIR_NAME, "src", "main", "resources", "assets")
+        self.cache_dir = os.path.join(get_state_dir(self.project_dir), CACHE_DIR_NAME)
+        self.store = TextureStore(self.project_dir)
+        self.rendered = 0
+        self.cached = 0
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path, size=THUMBNAIL_SIZE):
+        """
+        根据mod.json路径获取项目的缩略图渲染器
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)), size)
+
+    def _asset_path(self, location, kind, extension):
+        namespace, path = _location(location)
+        return os.path.join(self.assets_dir, namespace, kind, *f"{path}{extension}".split("/"))
+
+    def resolve(self, model_location):
+        """
+        沿父模型链解析出三个可见面的贴图
+
+        :param model_location: 模型位置，如"modid:block/name"
+        :return: ({面: 贴图位置或None}, 参与解析的本地模型内容列表)，不是整块模型时返回(None, 内容列表)
+        """
+        textures = {}
+        contents = []
+        location = model_location
+        for _ in range(MAX_PARENT_DEPTH):
+            namespace, path = _location(location)
+            if namespace == "minecraft" and path in BUILTIN_PARENTS:
+                faces = BUILTIN_PARENTS[path]
+                break
+            try:
+                with open(self._asset_path(location, "models", ".json"), 'rb') as f:
+                    content = f.read()
+                model = json.loads(content.decode("utf-8"))
+            except (OSError, ValueError):
+                return None, contents
+            contents.append(content)
+            for key, value in model.get("textures", {}).items():
+                textures.setdefault(key, value)
+            if "elements" in model or "parent" not in model:
+                return None, contents
+            location = model["parent"]
+        else:
+            return None, contents
+
+        resolved = {}
+        for face, variable in faces.items():
+            value = variable
+            # 贴图变量可以互相引用，如"particle": "#all"
+            for _ in range(MAX_PARENT_DEPTH):
+                if not value.startswith("#"):
+                    break
+                value = textures.get(value[1:], "#")
+                if value == "#":
+                    break
+            resolved[face] = None if value.startswith("#") else value
+        return resolved, contents
+
+    def _load_texture(self, location, cache):
+        if location is None:
+            return _MISSING
+        if location not in cache:
+            try:
+                with open(self._asset_path(location, "textures", ".png"), 'rb') as f:
+                    cache[location] = pngcodec.decode(f.read())[0]
+            except (OSError, pngcodec.PNGError):
+                cache[location] = _MISSING
+        return cache[location]
+
+    def _cache_key(self, faces, contents):
+        """
+        缩略图的缓存键：渲染版本、尺寸、模型内容和三个面贴图的哈希
+        """
+        digest = hashlib.sha256(f"{RENDERER_VERSION}:{self.size}".encode("utf-8"))
+        for content in contents:
+            digest.update(hashlib.sha256(content).digest())
+        for face, _ in FACES:
+            path = self._asset_path(faces[face], "textures", ".png") if faces[face] else None
+            texture_digest = self.store.hash_file(path) if path and os.path.exists(path) else "missing"
+            digest.update(f"{face}={faces[face]}@{texture_digest};".encode("utf-8"))
+        return digest.hexdigest()
+
+    def thumbnail(self, model_location, textures=None):
+        """
+        获取模型的缩略图，缓存中没有时渲染
+
+        :param model_location: 模型位置
+        :param textures: 已解码贴图的缓存字典（批量渲染时共用），为None时不缓存
+        :return: 缩略图PNG的路径，模型不是整块模型或不存在时返回None
+        """
+        faces, contents = self.resolve(model_location)
+        if faces is None:
+            return None
+        key = self._cache_key(faces, contents)
+        path = os.path.join(self.cache_dir, key[:2], f"{key}.png")
+        if os.path.exists(path):
+            self.cached += 1
+            return path
+
+        textures = {} if textures is None else textures
+        image = render({face: self._load_texture(faces[face], textures) for face, _ in FACES}, self.size)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(pngcodec.encode(image, COMPRESS_LEVEL))
+        os.replace(temp_path, path)
+        self.rendered += 1
+        return path
+
+    def thumbnails(self, model_locations):
+        """
+        批量获取缩略图（同一次调用中共用已解码的贴图）
+
+        :return: {模型位置: 缩略图路径或None}
+        """
+        textures = {}
+        with tracing.span("block_thumbnails", "assets", models=len(model_locations)):
+            result = {location: self.thumbnail(location, textures) for location in model_locations}
+        self.store.save()
+        return result
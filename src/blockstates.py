@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+方块状态生成模块
+根据方块类（沿父类链查找）选择blockstate模板，生成blockstate和方块模型文件：
+    - 属性组合按需展开，每个状态映射到一个共享模型及其旋转
+    - 与外观无关的属性（如waterlogged、powered）不参与展开
+    - 每个状态只对应一个模型时可以写成variants，否则（如栅栏、墙的多个部件）必须写成multipart；
+      两种写法都可用时选择序列化后更小的一种
+    - 内容完全相同的方块模型只保留一份：新模型与已有模型相同时直接引用已有模型，
+      也可以对整个项目去重，把引用改到保留的模型上并删除重复文件
+
+已有模型的内容摘要保存在.forgecreator/model_index.json中，文件大小和修改时间不变时不需要重新读取
+"""
+
+import os
+import json
+import hashlib
+import itertools
+
+import tracing
+import journal
+from journal import get_state_dir
+
+
+# 模型摘要缓存文件名
+INDEX_FILE = "model_index.json"
+
+# 缓存格式变化时修改，使旧缓存失效
+INDEX_VERSION = 1
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+# 水平朝向的角度（与Direction.getHorizontalAngle相同）
+HORIZONTAL_ANGLE = {"south": 0, "west": 90, "north": 180, "east": 270}
+
+HORIZONTAL = ("north", "east", "south", "west")
+
+BOOLEAN = ("false", "true")
+
+
+class Part:
+    """
+    blockstate中的一个模型引用及其生效条件
+    """
+
+    __slots__ = ("model", "when", "x", "y", "uvlock")
+
+    def __init__(self, model, when=None, x=0, y=0, uvlock=False):
+        """
+        :param model: 模型后缀（""表示方块本身的模型）
+        :param when: 生效条件{属性: 值}，None表示总是生效
+        """
+        self.model = model
+        self.when = when or {}
+        self.x = x % 360
+        self.y = y % 360
+        self.uvlock = uvlock
+
+    def matches(self, state):
+        return all(state.get(name) == value for name, value in self.when.items())
+
+    def apply(self, models):
+        """
+        :param models: {模型后缀: 模型位置}
+        :return: blockstate中的模型对象
+        """
+        entry = {"model": models[self.model]}
+        if self.x:
+            entry["x"] = self.x
+        if self.y:
+            entry["y"] = self.y
+        if self.uvlock:
+            entry["uvlock"] = True
+        return entry
+
+
+class BlockStateTemplate:
+    """
+    一类方块的blockstate模板
+    """
+
+    __slots__ = ("properties", "default", "models", "parts", "item_model")
+
+    def __init__(self, properties, default, models, parts, item_model=""):
+        """
+        :param properties: ((属性名, (取值, ...)), ...)
+        :param default: 默认状态{属性名: 值}
+        :param models: {模型后缀: (父模型, (贴图变量, ...))}，为None时使用用户选择的父模型
+        :param parts: Part列表
+        :param item_model: 物品模型使用的模型后缀
+        """
+        self.properties = properties
+        self.default = default
+        self.models = models
+        self.parts = parts
+        self.item_model = item_model
+
+    def variant_properties(self):
+        """
+        mod.json中variants字段的内容
+        """
+        return [{"name": name, "values": list(values)} for name, values in self.properties]
+
+    def relevant_properties(self):
+        """
+        影响外观的属性（出现在某个Part的条件中）
+        """
+        used = {name for part in self.parts for name in part.when}
+        return [(name, values) for name, values in self.properties if name in used]
+
+
+def expand_states(properties):
+    """
+    按需展开属性的所有组合
+
+    :param properties: ((属性名, (取值, ...)), ...)
+    :return: 状态字典的生成器
+    """
+    names = [name for name, _ in properties]
+    for values in itertools.product(*(values for _, values in properties)):
+        yield dict(zip(names, values))
+
+
+def _horizontal_template(models, lit=False):
+    """
+    水平朝向的方块（模型正面朝北），lit为True时点亮状态使用"_on"模型
+    """
+    properties = [("facing", HORIZONTAL)]
+    if lit:
+        properties.append(("lit", BOOLEAN))
+    parts = []
+    for state in expand_states(properties):
+        model = "_on" if state.get("lit") == "true" else ""
+        parts.append(Part(model, state, y=HORIZONTAL_ANGLE[state["facing"]] + 180))
+    default = {"facing": "north", "lit": "false"} if lit else {"facing": "north"}
+    return BlockStateTemplate(tuple(properties), default, models, parts)
+
+
+def _directional_template():
+    parts = []
+    for facing in ("down", "up") + HORIZONTAL:
+        if facing in HORIZONTAL:
+            parts.append(Part("", {"facing": facing}, x=90, y=HORIZONTAL_ANGLE[facing] + 180))
+        else:
+            parts.append(Part("", {"facing": facing}, x=180 if facing == "down" else 0))
+    return BlockStateTemplate((("facing", ("down", "up") + HORIZONTAL),), {"facing": "north"},
+                              {"": None}, parts)
+
+
+def _stairs_template():
+    textures = ("bottom", "top", "side")
+    shapes = ("straight", "inner_left", "inner_right", "outer_left", "outer_right")
+    properties = (("facing", HORIZONTAL), ("half", ("bottom", "top")), ("shape", shapes), ("waterlogged", BOOLEAN))
+    parts = []
+    for state in expand_states(properties[:3]):
+        shape = state["shape"]
+        top = state["half"] == "top"
+        # 楼梯模型本身朝东，左侧的内外角再转270度，上半的内外角再转90度
+        y = HORIZONTAL_ANGLE[state["facing"]] + 90
+        if shape.endswith("_left"):
+            y += 270
+        if shape != "straight" and top:
+            y += 90
+        model = "" if shape == "straight" else "_" + shape.split("_")[0]
+        parts.append(Part(model, state, x=180 if top else 0, y=y, uvlock=y % 360 != 0 or top))
+    return BlockStateTemplate(properties, {"facing": "north", "half": "bottom", "shape": "straight",
+                                           "waterlogged": "false"},
+                              {"": ("block/stairs", textures), "_inner": ("block/inner_stairs", textures),
+                               "_outer": ("block/outer_stairs", textures)}, parts)
+
+
+def _slab_template():
+    textures = ("bottom", "top", "side")
+    return BlockStateTemplate(
+        (("type", ("bottom", "top", "double")), ("waterlogged", BOOLEAN)),
+        {"type": "bottom", "waterlogged": "false"},
+        {"": ("block/slab", textures), "_top": ("block/slab_top", textures), "_double": None},
+        [Part("", {"type": "bottom"}), Part("_top", {"type": "top"}), Part("_double", {"type": "double"})])
+
+
+def _fence_template():
+    side_properties = tuple((direction, BOOLEAN) for direction in HORIZONTAL)
+    parts = [Part("_post")]
+    for direction in HORIZONTAL:
+        parts.append(Part("_side", {direction: "true"}, y=HORIZONTAL_ANGLE[direction] + 180, uvlock=True))
+    default = {direction: "false" for direction in HORIZONTAL}
+    default["waterlogged"] = "false"
+    return BlockStateTemplate(side_properties + (("waterlogged", BOOLEAN),), default,
+                              {"_post": ("block/fence_post", ("texture",)),
+                               "_side": ("block/fence_side", ("texture",)),
+                               "_inventory": ("block/fence_inventory", ("texture",))},
+                              parts, item_model="_inventory")
+
+
+def _wall_template():
+    heights = ("none", "low", "tall")
+    parts = [Part("_post", {"up": "true"})]
+    for direction in HORIZONTAL:
+        y = HORIZONTAL_ANGLE[direction] + 180
+        parts.append(Part("_side", {direction: "low"}, y=y, uvlock=True))
+        parts.append(Part("_side_tall", {direction: "tall"}, y=y, uvlock=True))
+    default = {"up": "true", "waterlogged": "false"}
+    default.update((direction, "none") for direction in HORIZONTAL)
+    return BlockStateTemplate((("up", BOOLEAN),) + tuple((direction, heights) for direction in HORIZONTAL)
+                              + (("waterlogged", BOOLEAN),), default,
+                              {"_post": ("block/template_wall_post", ("wall",)),
+                               "_side": ("block/template_wall_side", ("wall",)),
+                               "_side_tall": ("block/template_wall_side_tall", ("wall",)),
+                               "_inventory": ("block/wall_inventory", ("wall",))},
+                              parts, item_model="_inventory")
+
+
+def _fence_gate_template():
+    properties = (("facing", HORIZONTAL), ("in_wall", BOOLEAN), ("open", BOOLEAN), ("powered", BOOLEAN))
+    parts = []
+    for state in expand_states(properties[:3]):
+        model = ("_wall" if state["in_wall"] == "true" else "") + ("_open" if state["open"] == "true" else "")
+        parts.append(Part(model, state, y=HORIZONTAL_ANGLE[state["facing"]], uvlock=True))
+    return BlockStateTemplate(properties, {"facing": "north", "in_wall": "false", "open": "false", "powered": "false"},
+                              {"": ("block/template_fence_gate", ("texture",)),
+                               "_open": ("block/template_fence_gate_open", ("texture",)),
+                               "_wall": ("block/template_fence_gate_wall", ("texture",)),
+                               "_wall_open": ("block/template_fence_gate_wall_open", ("texture",))}, parts)
+
+
+def _trapdoor_template():
+    properties = (("facing", HORIZONTAL), ("half", ("bottom", "top")), ("open", BOOLEAN),
+                  ("powered", BOOLEAN), ("waterlogged", BOOLEAN))
+    parts = []
+    for state in expand_states(properties[:3]):
+        x, y = 0, HORIZONTAL_ANGLE[state["facing"]] + 180
+        is_open = state["open"] == "true"
+        if is_open and state["half"] == "top":
+            x, y = x + 180, y + 180
+        model = "_open" if is_open else "_" + state["half"]
+        parts.append(Part(model, state, x=x, y=y))
+    return BlockStateTemplate(properties, {"facing": "north", "half": "bottom", "open": "false",
+                                           "powered": "false", "waterlogged": "false"},
+                              {"_bottom": ("block/template_orientable_trapdoor_bottom", ("texture",)),
+                               "_top": ("block/template_orientable_trapdoor_top", ("texture",)),
+                               "_open": ("block/template_orientable_trapdoor_open", ("texture",))},
+                              parts, item_model="_bottom")
+
+
+def _door_template():
+    properties = (("facing", HORIZONTAL), ("half", ("lower", "upper")), ("hinge", ("left", "right")),
+                  ("open", BOOLEAN), ("powered", BOOLEAN))
+    parts = []
+    for state in expand_states(properties[:4]):
+        right_hinge = state["hinge"] == "right"
+        is_open = state["open"] == "true"
+        y = HORIZONTAL_ANGLE[state["facing"]] + 90
+        if is_open:
+            y += 90
+        if right_hinge and is_open:
+            y += 180
+        model = ("_bottom" if state["half"] == "lower" else "_top") + ("_hinge" if right_hinge != is_open else "")
+        parts.append(Part(model, state, y=y))
+    textures = ("top", "bottom")
+    return BlockStateTemplate(properties, {"facing": "north", "half": "lower", "hinge": "left",
+                                           "open": "false", "powered": "false"},
+                              {"_bottom": ("block/door_bottom", textures), "_bottom_hinge": ("block/door_bottom_rh", textures),
+                               "_top": ("block/door_top", textures), "_top_hinge": ("block/door_top_rh", textures)},
+                              parts, item_model="_bottom")
+
+
+def _toggle_template(name, default, models):
+    """
+    只有一个布尔属性、true时使用另一个模型的方块（模型后缀依次对应false/true）
+    """
+    off, on = models
+    return BlockStateTemplate(((name, BOOLEAN),), {name: default}, {off[0]: off[1], on[0]: on[1]},
+                              [Part(off[0], {name: "false"}), Part(on[0], {name: "true"})], item_model=off[0])
+
+
+# 没有状态的普通方块
+CUBE_TEMPLATE = BlockStateTemplate((), {}, {"": None}, [Part("")])
+
+# 方块类简单类名 -> blockstate模板（沿父类链查找第一个匹配的）
+TEMPLATES = {
+    "RotatedPillarBlock": BlockStateTemplate(
+        (("axis", ("x", "y", "z")),), {"axis": "y"}, {"": None},
+        [Part("", {"axis": "y"}), Part("", {"axis": "z"}, x=90), Part("", {"axis": "x"}, x=90, y=90)]),
+    "HorizontalBlock": _horizontal_template({"": None}),
+    "AbstractFurnaceBlock": _horizontal_template({"": None, "_on": None}, lit=True),
+    "DirectionalBlock": _directional_template(),
+    "StairsBlock": _stairs_template(),
+    "SlabBlock": _slab_template(),
+    "FenceBlock": _fence_template(),
+    "WallBlock": _wall_template(),
+    "FenceGateBlock": _fence_gate_template(),
+    "TrapDoorBlock": _trapdoor_template(),
+    "DoorBlock": _door_template(),
+    "RedstoneLampBlock": _toggle_template("lit", "false", (("", None), ("_on", None))),
+    "PressurePlateBlock": _toggle_template("powered", "false", (("", ("block/pressure_plate_up", ("texture",))),
+                                                                ("_down", ("block/pressure_plate_down", ("texture",))))),
+    "LanternBlock": _toggle_template("hanging", "false", (("", ("block/template_lantern", ("lantern",))),
+                                                          ("_hanging", ("block/template_hanging_lantern", ("lantern",))))),
+}
+
+# 没有方块类索引时也能识别的常见子类
+TEMPLATES["FurnaceBlock"] = TEMPLATES["BlastFurnaceBlock"] = TEMPLATES["SmokerBlock"] = TEMPLATES["AbstractFurnaceBlock"]
+
+
+def template_for(lineage):
+    """
+    选择blockstate模板
+
+    :param lineage: 方块类及其父类的简单类名列表（从子类到父类）
+    :return: BlockStateTemplate
+    """
+    for name in lineage:
+        if name in TEMPLATES:
+            return TEMPLATES[name]
+    return CUBE_TEMPLATE
+
+
+def _variants(template, models):
+    """
+    写成variants形式：与外观无关的属性不出现在键中；有状态对应多个或没有模型时返回None
+    """
+    relevant = template.relevant_properties()
+    variants = {}
+    for state in expand_states(relevant):
+        matched = [part for part in template.parts if part.matches(state)]
+        if len(matched) != 1:
+            return None
+        key = ",".join(f"{name}={state[name]}" for name, _ in relevant)
+        variants[key] = matched[0].apply(models)
+    # 所有状态的模型都相同（如两个模型去重后合并为一个）时只需要一个""状态
+    entries = list(variants.values())
+    if len(entries) > 1 and all(entry == entries[0] for entry in entries):
+        return {"variants": {"": entries[0]}}
+    return {"variants": variants}
+
+
+def _multipart(template, models):
+    """
+    写成multipart形式：条件只有一个属性且模型相同的部件合并为"a|b"
+    """
+    cases = []
+    merged = {}
+    for part in template.parts:
+        apply = part.apply(models)
+        if len(part.when) == 1:
+            (name, value), = part.when.items()
+            key = (name, json.dumps(apply, sort_keys=True))
+            if key in merged:
+                merged[key]["when"][name] += "|" + value
+                continue
+            case = {"when": {name: value}, "apply": apply}
+            merged[key] = case
+        elif part.when:
+            case = {"when": dict(part.when), "apply": apply}
+        else:
+            case = {"apply": apply}
+        cases.append(case)
+    return {"multipart": cases}
+
+
+def dump(data):
+    """
+    生成的资源文件格式（与原有模板一致，4空格缩进）
+    """
+    return json.dumps(data, indent=4, ensure_ascii=False)
+
+
+def build_blockstate(template, models):
+    """
+    生成blockstate：能写成variants时选择variants和multipart中较小的一种
+
+    :param models: {模型后缀: 模型位置}
+    :return: blockstate字典
+    """
+    multipart = _multipart(template, models)
+    variants = _variants(template, models)
+    if variants is not None and len(dump(variants)) <= len(dump(multipart)):
+        return variants
+    return multipart
+
+
+def block_models(template, mod_id, block_name, default_model):
+    """
+    方块需要的模型，贴图变量都指向方块的贴图；
+    基础模型也使用默认父模型时，使用默认父模型的状态模型（如熔炉、红石灯点亮时的"_on"）指向带同样后缀的贴图，
+    否则它与基础模型内容相同，会被合并为同一个模型。
+    其他使用默认父模型的状态模型（如台阶的"_double"，与原版一样是完整方块）使用方块本身的贴图
+
+    :param default_model: 模板中未指定父模型时使用的(父模型, (贴图变量, ...))
+    :return: {模型后缀: 模型字典}
+    """
+    models = {}
+    for suffix, spec in template.models.items():
+        parent, variables = spec or default_model
+        if spec is None and suffix and template.models.get("") is None:
+            texture = f"{mod_id}:block/{block_name}{suffix}"
+        else:
+            texture = f"{mod_id}:block/{block_name}"
+        models[suffix] = {"parent": parent, "textures": {variable: texture for variable in variables}}
+    return models
+
+
+def _digest(model):
+    return hashlib.sha1(json.dumps(model, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class ModelIndex:
+    """
+    项目中方块模型（models/block）的内容索引，用于复用内容相同的模型
+    """
+
+    def __init__(self, project_dir, mod_id):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        :param mod_id: 模组ID
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.mod_id = mod_id
+        self.assets_dir = os.path.join(self.project_dir, MDK_DIR_NAME, "src", "main", "resources", "assets", mod_id)
+        self.models_dir = os.path.join(self.assets_dir, "models", "block")
+        self.index_path = os.path.join(get_state_dir(self.project_dir), INDEX_FILE)
+        self._files = None
+        self._by_digest = {}
+        self._by_name = {}
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path, mod_id):
+        """
+        根据mod.json路径获取项目的模型索引
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)), mod_id)
+
+    def location(self, name):
+        return f"{self.mod_id}:block/{name}"
+
+    def _load_cache(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != INDEX_VERSION or data.get("mod_id") != self.mod_id:
+            return {}
+        return data.get("files", {})
+
+    def refresh(self):
+        """
+        扫描模型目录，只读取大小或修改时间变化了的文件
+        """
+        cached = self._load_cache()
+        files = {}
+        try:
+            entries = sorted(os.scandir(self.models_dir), key=lambda entry: entry.name)
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            name = entry.name[:-len(".json")]
+            stat = entry.stat()
+            record = cached.get(name)
+            if record is None or record[:2] != [stat.st_size, stat.st_mtime_ns]:
+                try:
+                    with open(entry.path, 'rb') as f:
+                        model = json.loads(f.read().decode("utf-8"))
+                except (OSError, ValueError):
+                    continue
+                record = [stat.st_size, stat.st_mtime_ns, _digest(model)]
+            files[name] = record
+        self._files = files
+        self._by_name = {name: record[2] for name, record in files.items()}
+        self._by_digest = {}
+        for name, digest in self._by_name.items():
+            self._by_digest.setdefault(digest, name)
+
+    def save(self):
+        """
+        保存已扫描文件的摘要（事务提交后调用）
+        """
+        if self._files is None:
+            return
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"version": INDEX_VERSION, "mod_id": self.mod_id, "files": self._files},
+                               separators=(",", ":")))
+        os.replace(temp_path, self.index_path)
+
+    def _forget(self, name):
+        digest = self._by_name.pop(name, None)
+        if digest is not None and self._by_digest.get(digest) == name:
+            del self._by_digest[digest]
+            # 还有其他内容相同的模型时改由它们提供
+            for other, other_digest in self._by_name.items():
+                if other_digest == digest:
+                    self._by_digest[digest] = other
+                    break
+
+    def write(self, name, model):
+        """
+        写入方块模型；已有内容相同的模型时不写文件，直接返回已有模型的位置
+
+        :param name: 模型文件名（不含扩展名）
+        :param model: 模型字典
+        :return: (模型位置, 是否写入了新文件)
+        """
+        if self._files is None:
+            self.refresh()
+        digest = _digest(model)
+        existing = self._by_digest.get(digest)
+        if existing is not None and journal.exists(os.path.join(self.models_dir, f"{existing}.json")):
+            return self.location(existing), False
+        if self._by_name.get(name) != digest:
+            self._forget(name)
+        journal.write_text(os.path.join(self.models_dir, f"{name}.json"), dump(model))
+        self._by_name[name] = digest
+        self._by_digest[digest] = name
+        return self.location(name), True
+
+    def write_block(self, template, block_name, default_model):
+        """
+        写入方块需要的所有模型
+
+        :return: {模型后缀: 模型位置}
+        """
+        locations = {}
+        for suffix, model in block_models(template, self.mod_id, block_name, default_model).items():
+            locations[suffix], _ = self.write(f"{block_name}{suffix}", model)
+        return locations
+
+
+def _rewrite_blockstate(data, replace):
+    """
+    替换blockstate中引用的模型位置
+
+    :return: 是否有修改
+    """
+    changed = False
+    entries = []
+    for value in data.get("variants", {}).values():
+        entries.extend(value if isinstance(value, list) else [value])
+    for case in data.get("multipart", []):
+        apply = case.get("apply")
+        entries.extend(apply if isinstance(apply, list) else [apply])
+    for entry in entries:
+        if isinstance(entry, dict) and entry.get("model") in replace:
+            entry["model"] = replace[entry["model"]]
+            changed = True
+    return changed
+
+
+def _normalize_location(location):
+    return location if ":" in location else f"minecraft:{location}"
+
+
+@tracing.traced(category="assets")
+def deduplicate_models(project_dir, mod_id):
+    """
+    对项目中的方块模型去重：内容相同的模型只保留名称最小的一个，
+    把blockstate、物品模型、子模型和mod.json中的引用改到保留的模型上，并删除重复的文件。
+    引用改写后子模型可能也变得相同，重复到没有可合并的模型为止。
+    需要在事务中调用
+
+    :return: (删除的模型数, 修改的引用文件数)
+    """
+    index = ModelIndex(project_dir, mod_id)
+    block_dir = index.models_dir
+    item_dir = os.path.join(index.assets_dir, "models", "item")
+    blockstates_dir = os.path.join(index.assets_dir, "blockstates")
+
+    def load_dir(directory):
+        result = {}
+        try:
+            names = sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+        except OSError:
+            return result
+        for file_name in names:
+            path = os.path.join(directory, file_name)
+            try:
+                result[path] = journal.load_json(path)
+            except (OSError, ValueError):
+                continue
+        return result
+
+    block_models_by_path = load_dir(block_dir)
+    item_models = load_dir(item_dir)
+    blockstates = load_dir(blockstates_dir)
+    names = {path: os.path.basename(path)[:-len(".json")] for path in block_models_by_path}
+
+    replace = {}
+    changed = set()
+    while True:
+        keep = {}
+        merged = {}
+        for path in sorted(block_models_by_path, key=lambda p: names[p]):
+            model = block_models_by_path[path]
+            if not isinstance(model, dict):
+                continue
+            digest = _digest(model)
+            if digest in keep:
+                merged[index.location(names[path])] = index.location(names[keep[digest]])
+            else:
+                keep[digest] = path
+        if not merged:
+            break
+        replace.update(merged)
+        # 已经合并过的目标如果又被合并，指向最终保留的模型
+        for source, target in replace.items():
+            while target in replace:
+                target = replace[target]
+            replace[source] = target
+        for location in merged:
+            path = os.path.join(block_dir, location.split("/", 1)[1] + ".json")
+            del block_models_by_path[path]
+            changed.discard(path)
+            journal.remove(path)
+        for path, model in block_models_by_path.items():
+            parent = model.get("parent") if isinstance(model, dict) else None
+            if isinstance(parent, str) and _normalize_location(parent) in replace:
+                model["parent"] = replace[_normalize_location(parent)]
+                changed.add(path)
+
+    if not replace:
+        return 0, 0
+    for path, model in item_models.items():
+        parent = model.get("parent") if isinstance(model, dict) else None
+        if isinstance(parent, str) and _normalize_location(parent) in replace:
+            model["parent"] = replace[_normalize_location(parent)]
+            changed.add(path)
+    for path, data in blockstates.items():
+        if isinstance(data, dict) and _rewrite_blockstate(data, replace):
+            changed.add(path)
+    for path in changed:
+        data = block_models_by_path.get(path) or item_models.get(path) or blockstates.get(path)
+        journal.write_text(path, dump(data))
+
+    # mod.json中方块的"model"字段
+    rewritten = len(changed)
+    mod_json_path = os.path.join(index.project_dir, "mod.json")
+    if journal.exists(mod_json_path):
+        mod_data = journal.load_json(mod_json_path)
+        mod_json_changed = False
+        for key in ("blocks", "items"):
+            for entry in mod_data.get(key, []):
+                model = entry.get("model") if isinstance(entry, dict) else None
+                if isinstance(model, str) and _normalize_location(model) in replace:
+                    entry["model"] = replace[_normalize_location(model)]
+                    mod_json_changed = True
+        if mod_json_changed:
+            journal.dump_json(mod_json_path, mod_data)
+            rewritten += 1
+    return len(replace), rewritten
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gradle构建耗时分析模块
+逐行解析Gradle输出，提取任务边界（> Task :xxx）、ForgeGradle的环境搭建阶段（MCP下载、反编译、重编译、extractNatives等）、
+配置阶段耗时和缓存命中（UP-TO-DATE / FROM-CACHE），并把每次构建的结果追加到项目的构建历史中：
+{modid}pack/.forgecreator/build_history.jsonl
+
+构建报告列出最近一次构建中耗时最多的阶段和任务，以及与之前几次构建相比的变化
+"""
+
+import os
+import re
+import json
+import time
+import datetime
+import statistics
+
+from journal import get_state_dir
+
+
+# 构建历史文件名
+BUILD_HISTORY_FILE = "build_history.jsonl"
+
+# 构建历史超过该条数时压缩为最近的KEEP_HISTORY条
+MAX_HISTORY = 500
+KEEP_HISTORY = 200
+# 与之前多少次（相同命令的成功）构建比较
+COMPARE_BUILDS = 5
+
+# 任务行：> Task :compileJava UP-TO-DATE
+TASK_LINE = re.compile(r"^> Task (:\S+)(?:\s+(UP-TO-DATE|FROM-CACHE|NO-SOURCE|SKIPPED|FAILED))?\s*$")
+
+# 配置阶段：> Configure project :
+CONFIGURE_LINE = re.compile(r"^> Configure project")
+
+# 构建结果：BUILD SUCCESSFUL in 1m 23s
+RESULT_LINE = re.compile(r"^BUILD (SUCCESSFUL|FAILED) in (.+?)\s*$")
+
+# 结果行中的耗时片段
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)\s*(ms|h|m|s)\b")
+
+# 可执行任务统计：12 actionable tasks: 3 executed, 9 up-to-date
+ACTIONABLE_LINE = re.compile(r"^(\d+) actionable tasks?: (.+)$")
+
+# ForgeGradle在配置阶段（依赖解析时）输出的环境搭建步骤，按顺序匹配
+SETUP_MARKERS = [
+    ("mcp_download", re.compile(r"download(?:ing)?\b.*\b(mcp|mcpconfig|mappings|minecraft|client|server|version)", re.I)),
+    ("decompile", re.compile(r"decompil", re.I)),
+    ("recompile", re.compile(r"recompil", re.I)),
+    ("mcp_setup", re.compile(r"(?:running|executing)\s+'?([\w-]+)'?\s+step|setting up mcp|applying patches|patching", re.I)),
+    ("extract_natives", re.compile(r"extract(?:ing)?\s*natives", re.I)),
+    ("download_assets", re.compile(r"download(?:ing)?\s*assets", re.I)),
+]
+
+# 任务名 -> 阶段（按任务名中的关键字匹配，先匹配先得）
+TASK_PHASES = [
+    ("extract_natives", ("extractNatives",)),
+    ("download_assets", ("downloadAssets",)),
+    ("mcp_download", ("downloadMcpConfig", "downloadMCPConfig", "downloadMappings", "downloadMCPMappings",
+                      "downloadMcpMappings", "downloadClient", "downloadServer", "downloadMCMeta")),
+    ("decompile", ("decompile",)),
+    ("recompile", ("recompile",)),
+    ("mcp_setup", ("setupMCP", "setupMcp", "createMcpToSrg", "createSrgToMcp", "createMcpToObf",
+                   "extractSrg", "createExtraMappings", "extractRangeMap", "applyRangeMap", "applyPatches")),
+    ("compile", ("compileJava", "compileKotlin", "compileScala", "classes")),
+    ("resources", ("processResources",)),
+    ("jar", ("jar", "reobfJar", "assemble")),
+    ("run_configs", ("genIntellijRuns", "genEclipseRuns", "genVSCodeRuns", "prepareRuns", "makeSrcDirs")),
+]
+
+# 阶段显示名称
+PHASE_NAMES = {
+    "configuration": "配置",
+    "mcp_download": "MCP下载",
+    "mcp_setup": "MCP环境搭建",
+    "decompile": "反编译",
+    "recompile": "重编译",
+    "extract_natives": "extractNatives",
+    "download_assets": "下载资源",
+    "compile": "编译",
+    "resources": "处理资源",
+    "jar": "打包",
+    "run_configs": "生成运行配置",
+    "other": "其他任务",
+}
+
+# 任务结果中表示未实际执行（缓存命中）的状态
+CACHED_OUTCOMES = ("UP-TO-DATE", "FROM-CACHE", "NO-SOURCE", "SKIPPED")
+
+
+def parse_gradle_duration(text):
+    """
+    解析Gradle输出的耗时，如"1m 23s"、"850ms"、"1h 2m 3s"
+
+    :return: 秒数，无法解析时返回None
+    """
+    parts = DURATION_PART.findall(text)
+    if not parts:
+        return None
+    factors = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(value) * factors[unit] for value, unit in parts)
+
+
+def task_phase(task_path):
+    """
+    根据任务路径（如:compileJava）确定所属阶段
+    """
+    name = task_path.rsplit(":", 1)[-1]
+    for phase, keywords in TASK_PHASES:
+        for keyword in keywords:
+            if name == keyword or name.startswith(keyword):
+                return phase
+    return "other"
+
+
+class GradleOutputParser:
+    """
+    Gradle输出解析器
+    调用feed()逐行输入输出（附带到达时间），构建结束后调用finish()得到构建记录
+
+    任务的耗时按“本任务行到下一个任务行（或构建结束）”之间的时间计算；
+    第一个任务行之前的时间计为配置阶段，其中ForgeGradle的环境搭建步骤再按输出中的关键字细分
+    """
+
+    def __init__(self, command=None, start_time=None):
+        """
+        :param command: 执行的Gradle命令（列表或字符串），记录到构建历史中
+        :param start_time: 开始时间（time.monotonic()），默认为当前时间
+        """
+        self.command = " ".join(command) if isinstance(command, (list, tuple)) else (command or "")
+        self.start_time = time.monotonic() if start_time is None else start_time
+        self.tasks = []
+        self.phases = {}
+        self.reported_total = None
+        self.reported_result = None
+        self.actionable = None
+        # 当前正在计时的区间：(阶段, 开始时间, 任务字典或None)
+        self._current = ("configuration", self.start_time, None)
+        self._configuration_end = None
+
+    def _close_current(self, now):
+        phase, started, task = self._current
+        duration = max(0.0, now - started)
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+        if task is not None:
+            task["duration"] = round(duration, 3)
+
+    def feed(self, line, now=None):
+        """
+        输入一行Gradle输出
+
+        :param line: 输出行
+        :param now: 该行到达的时间（time.monotonic()），默认为当前时间
+        """
+        now = time.monotonic() if now is None else now
+        line = line.rstrip()
+
+        match = TASK_LINE.match(line)
+        if match:
+            self._close_current(now)
+            if self._configuration_end is None:
+                self._configuration_end = now
+            task = {"name": match.group(1), "outcome": match.group(2) or "EXECUTED", "duration": 0.0}
+            self.tasks.append(task)
+            self._current = (task_phase(task["name"]), now, task)
+            return
+
+        match = RESULT_LINE.match(line)
+        if match:
+            self.reported_result = match.group(1)
+            self.reported_total = parse_gradle_duration(match.group(2))
+            return
+
+        match = ACTIONABLE_LINE.match(line.strip())
+        if match:
+            self.actionable = int(match.group(1))
+            return
+
+        # 配置阶段中的ForgeGradle环境搭建步骤
+        if self._configuration_end is None and not CONFIGURE_LINE.match(line):
+            for phase, pattern in SETUP_MARKERS:
+                if pattern.search(line):
+                    if phase != self._current[0]:
+                        self._close_current(now)
+                        self._current = (phase, now, None)
+                    break
+
+    def finish(self, returncode, now=None):
+        """
+        结束解析并生成构建记录
+
+        :param returncode: Gradle进程的退出码
+        :param now: 结束时间（time.monotonic()），默认为当前时间
+        :return: 构建记录字典
+        """
+        now = time.monotonic() if now is None else now
+        self._close_current(now)
+        configuration_end = self._configuration_end if self._configuration_end is not None else now
+
+        executed = sum(1 for task in self.tasks if task["outcome"] == "EXECUTED")
+        cached = sum(1 for task in self.tasks if task["outcome"] in CACHED_OUTCOMES)
+        return {
+            "time": datetime.datetime.now().isoformat(timespec='seconds'),
+            "command": self.command,
+            "success": returncode == 0,
+            "returncode": returncode,
+            "total": round(now - self.start_time, 3),
+            "reportedTotal": self.reported_total,
+            "configuration": round(configuration_end - self.start_time, 3),
+            "phases": {phase: round(duration, 3) for phase, duration in self.phases.items()},
+            "tasks": self.tasks,
+            "cache": {"executed": executed, "cached": cached, "actionable": self.actionable},
+        }
+
+
+class BuildHistory:
+    """
+    项目的构建历史（JSON Lines，每次构建一行）
+    """
+
+    def __init__(self, project_dir):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.path = os.path.join(get_state_dir(self.project_dir), BUILD_HISTORY_FILE)
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path):
+        """
+        根据mod.json路径获取项目的构建历史
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)))
+
+    def load(self, limit=None):
+        """
+        读取构建历史
+
+        :param limit: 只返回最近的limit条
+        :return: 构建记录列表（从旧到新）
+        """
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # 最后一行可能因崩溃而不完整
+                    continue
+        return records[-limit:] if limit else records
+
+    def append(self, record):
+        """
+        追加一条构建记录，历史过长时只保留最近的记录
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        records = self.load()
+        if len(records) > MAX_HISTORY:
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for kept in records[-KEEP_HISTORY:]:
+                    f.write(json.dumps(kept, ensure_ascii=False) + "\n")
+            os.replace(temp_path, self.path)
+
+
+def _format_seconds(seconds):
+    if seconds is None:
+        return "-"
+    if seconds >= 60:
+        return f"{int(seconds // 60)}m {seconds % 60:04.1f}s"
+    return f"{seconds:.1f}s"
+
+
+def format_build_report(records, top_tasks=10):
+    """
+    生成构建性能报告
+
+    :param records: 构建记录列表（从旧到新），报告最后一条
+    :param top_tasks: 列出耗时最多的任务数
+    :return: 报告文本行列表
+    """
+    if not records:
+        return []
+    latest = records[-1]
+    # 只与相同命令的成功构建比较（失败或runClient的耗时没有可比性）
+    previous = [record for record in records[:-1]
+                if record.get("success") and record.get("command") == latest.get("command")][-COMPARE_BUILDS:]
+
+    cache = latest.get("cache", {})
+    lines = [
+        f"构建时间: {latest.get('time', '')}  {'成功' if latest.get('success') else '失败'}  {latest.get('command', '')}",
+        f"总耗时: {_format_seconds(latest.get('total'))}  配置阶段: {_format_seconds(latest.get('configuration'))}  "
+        f"执行任务: {cache.get('executed', 0)}  缓存命中: {cache.get('cached', 0)}",
+    ]
+    if previous:
+        median_total = statistics.median(record.get("total", 0.0) for record in previous)
+        lines.append(f"与之前{len(previous)}次构建的中位数相比: {_format_seconds(median_total)} -> "
+                     f"{_format_seconds(latest.get('total'))}")
+
+    total = latest.get("total") or 0.0
+    phases = sorted(latest.get("phases", {}).items(), key=lambda item: item[1], reverse=True)
+    if phases:
+        lines.append("")
+        lines.append("阶段耗时:")
+        for phase, duration in phases:
+            share = duration / total * 100 if total > 0 else 0.0
+            history = [record.get("phases", {}).get(phase) for record in previous]
+            history = [value for value in history if value is not None]
+            delta = ""
+            if history:
+                diff = duration - statistics.median(history)
+                delta = f"  ({'+' if diff >= 0 else '-'}{_format_seconds(abs(diff))})"
+            lines.append(f"  {PHASE_NAMES.get(phase, phase):<16}{_format_seconds(duration):>10}  {share:5.1f}%{delta}")
+
+    tasks = sorted(latest.get("tasks", []), key=lambda task: task.get("duration", 0.0), reverse=True)[:top_tasks]
+    if tasks:
+        lines.append("")
+        lines.append("耗时最多的任务:")
+        for task in tasks:
+            lines.append(f"  {task['name']:<32}{_format_seconds(task.get('duration')):>10}  {task.get('outcome', '')}")
+    return lines
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+方块类索引模块
+扫描ForgeGradle生成的映射后的Minecraft/Forge jar（~/.gradle/caches/forge_gradle/minecraft_user_repo下），
+从class文件中提取：
+    - 所有Block子类及其public构造函数的参数类型（优先使用带泛型的Signature属性）
+    - Material、SoundType、ToolType的常量名
+
+索引按当前映射（build.gradle中的mappings）得到的真实名称保存在.forgecreator/class_index.json中，
+jar的大小和修改时间不变时直接读取，不再扫描jar；名称查询使用模糊匹配（子序列+词首/连续加分）
+"""
+
+import os
+import re
+import json
+import glob
+import struct
+import zipfile
+
+import tracing
+from journal import get_state_dir
+
+
+# 索引文件名
+INDEX_FILE = "class_index.json"
+
+# 索引格式变化时修改，使旧索引失效
+INDEX_VERSION = 1
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+FORGE_VERSION = "1.16.5-36.2.34"
+
+# 需要扫描的包（Block的继承链都在这些包中）
+SCAN_PREFIXES = ("net/minecraft/", "net/minecraftforge/")
+
+BLOCK_CLASS = "net/minecraft/block/Block"
+
+# 方块属性参数的类型文本（parameter_types的结果）
+PROPERTIES_TYPE = "AbstractBlock.Properties"
+
+# 常量所在的类 -> 索引中的键
+CONSTANT_CLASSES = {
+    "net/minecraft/block/material/Material": "materials",
+    "net/minecraft/block/SoundType": "sound_types",
+    "net/minecraftforge/common/ToolType": "tool_types",
+}
+
+ACC_PUBLIC = 0x0001
+ACC_PROTECTED = 0x0004
+ACC_STATIC = 0x0008
+ACC_FINAL = 0x0010
+ACC_INTERFACE = 0x0200
+ACC_ABSTRACT = 0x0400
+
+# 常量池各类型条目的长度（不含1字节的tag）；Utf8单独处理
+_CONSTANT_SIZES = {3: 4, 4: 4, 5: 8, 6: 8, 7: 2, 8: 2, 9: 4, 10: 4, 11: 4, 12: 4, 15: 3, 16: 2, 17: 4, 18: 4, 19: 2, 20: 2}
+
+_PRIMITIVES = {"B": "byte", "C": "char", "D": "double", "F": "float", "I": "int",
+               "J": "long", "S": "short", "Z": "boolean", "V": "void"}
+
+_MAPPINGS_PATTERN = re.compile(r"mappings\s+channel\s*:\s*['\"](\w+)['\"]\s*,\s*version\s*:\s*['\"]([\w.\-]+)['\"]")
+
+
+class ClassFormatError(ValueError):
+    """
+    无效的class文件
+    """
+
+
+class ClassFile:
+    """
+    class文件中与索引有关的信息
+    """
+
+    __slots__ = ("name", "super_name", "access", "fields", "constructors")
+
+    def __init__(self, name, super_name, access, fields, constructors):
+        self.name = name                  # 内部名称，如net/minecraft/block/Block
+        self.super_name = super_name
+        self.access = access
+        self.fields = fields              # [(访问标志, 名称, 描述符)]
+        self.constructors = constructors  # [(访问标志, 描述符, 泛型签名或None)]
+
+
+def read_class(data):
+    """
+    解析class文件，只读取类名、父类、字段和构造函数
+
+    :param data: class文件内容
+    :return: ClassFile
+    :raises ClassFormatError: 文件无效
+    """
+    try:
+        magic, _, _, count = struct.unpack_from(">IHHH", data, 0)
+        if magic != 0xCAFEBABE:
+            raise ClassFormatError("不是class文件")
+        # 常量池：只记录Utf8的内容和Class指向的Utf8序号
+        strings = {}
+        classes = {}
+        offset = 10
+        index = 1
+        while index < count:
+            tag = data[offset]
+            if tag == 1:
+                length, = struct.unpack_from(">H", data, offset + 1)
+                strings[index] = data[offset + 3:offset + 3 + length]
+                offset += 3 + length
+            else:
+                if tag == 7:
+                    classes[index], = struct.unpack_from(">H", data, offset + 1)
+                offset += 1 + _CONSTANT_SIZES[tag]
+                if tag in (5, 6):
+                    # long/double占两个常量池位置
+                    index += 1
+            index += 1
+
+        def utf8(position):
+            return strings[position].decode("utf-8", "replace")
+
+        access, this_class, super_class, interface_count = struct.unpack_from(">HHHH", data, offset)
+        offset += 8 + interface_count * 2
+
+        def read_members(offset):
+            members = []
+            member_count, = struct.unpack_from(">H", data, offset)
+            offset += 2
+            for _ in range(member_count):
+                member_access, name_index, descriptor_index, attribute_count = struct.unpack_from(">HHHH", data, offset)
+                offset += 8
+                signature = None
+                for _ in range(attribute_count):
+                    attribute_name, attribute_length = struct.unpack_from(">HI", data, offset)
+                    if strings.get(attribute_name) == b"Signature":
+                        signature_index, = struct.unpack_from(">H", data, offset + 6)
+                        signature = utf8(signature_index)
+                    offset += 6 + attribute_length
+                members.append((member_access, utf8(name_index), utf8(descriptor_index), signature))
+            return members, offset
+
+        fields, offset = read_members(offset)
+        methods, offset = read_members(offset)
+    except (struct.error, IndexError, KeyError) as e:
+        raise ClassFormatError(f"class文件损坏: {e}")
+
+    name = utf8(classes[this_class])
+    super_name = utf8(classes[super_class]) if super_class else None
+    return ClassFile(
+        name, super_name, access,
+        [(field_access, field_name, descriptor) for field_access, field_name, descriptor, _ in fields],
+        [(method_access, descriptor, signature)
+         for method_access, method_name, descriptor, signature in methods if method_name == "<init>"],
+    )
+
+
+def simple_name(internal_name):
+    """
+    内部类名转换为代码中使用的简单名称：net/minecraft/block/AbstractBlock$Properties -> AbstractBlock.Properties
+    """
+    return internal_name.rsplit("/", 1)[-1].replace("$", ".")
+
+
+def _parse_type(text, position):
+    """
+    解析描述符/泛型签名中从position开始的一个类型
+
+    :return: (Java类型文本, 之后的位置)
+    """
+    dimensions = 0
+    while text[position] == "[":
+        dimensions += 1
+        position += 1
+    char = text[position]
+    if char in _PRIMITIVES:
+        return _PRIMITIVES[char] + "[]" * dimensions, position + 1
+    if char == "T":
+        end = text.index(";", position)
+        return text[position + 1:end] + "[]" * dimensions, end + 1
+    if char != "L":
+        raise ClassFormatError(f"无法解析的类型: {text}")
+
+    # 类类型，可能带泛型参数和内部类：Lpkg/Outer<TT;>.Inner;
+    position += 1
+    result = ""
+    name_start = position
+    while True:
+        char = text[position]
+        if char in ";<.":
+            result += simple_name(text[name_start:position]) if not result else text[name_start:position]
+        if char == "<":
+            arguments = []
+            position += 1
+            while text[position] != ">":
+                if text[position] == "*":
+                    arguments.append("?")
+                    position += 1
+                    continue
+                bound = {"+": "? extends ", "-": "? super "}.get(text[position], "")
+                if bound:
+                    position += 1
+                argument, position = _parse_type(text, position)
+                arguments.append(bound + argument)
+            result += "<" + ", ".join(arguments) + ">"
+            position += 1
+            char = text[position]
+        if char == ".":
+            result += "."
+            position += 1
+            name_start = position
+            continue
+        if char == ";":
+            return result + "[]" * dimensions, position + 1
+        position += 1
+
+
+def parameter_types(descriptor, signature=None):
+    """
+    构造函数/方法的参数类型列表（有泛型签名时使用签名）
+
+    :return: Java类型文本列表，如["Supplier<BlockState>", "AbstractBlock.Properties"]
+    """
+    text = signature or descriptor
+    # 跳过方法自身的类型参数声明<T:...>
+    if text.startswith("<"):
+        depth = 0
+        for position, char in enumerate(text):
+            depth += (char == "<") - (char == ">")
+            if depth == 0:
+                text = text[position + 1:]
+                break
+    position = text.index("(") + 1
+    types = []
+    while text[position] != ")":
+        java_type, position = _parse_type(text, position)
+        types.append(java_type)
+    return types
+
+
+def fuzzy_score(query, text):
+    """
+    模糊匹配得分：query的字符按顺序出现在text中时匹配（不区分大小写），
+    匹配到词首（大写字母、开头、下划线之后）和连续匹配时得分更高
+
+    :return: 得分，不匹配时返回None
+    """
+    if not query:
+        return 0
+    lower = text.lower()
+    score = 0
+    position = 0
+    previous = -2
+    for char in query.lower():
+        found = lower.find(char, position)
+        if found < 0:
+            return None
+        score += 1
+        if found == previous + 1:
+            score += 5
+        if found == 0 or text[found].isupper() or text[found - 1] in "_.":
+            score += 3
+        previous = found
+        position = found + 1
+    if lower.startswith(query.lower()):
+        score += 10
+    return score
+
+
+def fuzzy_search(query, names, limit=None):
+    """
+    按模糊匹配得分排序名称
+
+    :return: 匹配的名称列表
+    """
+    scored = []
+    for name in names:
+        score = fuzzy_score(query, name)
+        if score is not None:
+            scored.append((-score, len(name), name))
+    scored.sort()
+    result = [name for _, _, name in scored]
+    return result[:limit] if limit else result
+
+
+def gradle_user_home():
+    return os.environ.get("GRADLE_USER_HOME") or os.path.join(os.path.expanduser("~"), ".gradle")
+
+
+def read_mappings(mdk_path):
+    """
+    读取build.gradle中的映射设置
+
+    :return: (channel, version)，读取失败时返回("official", "1.16.5")
+    """
+    try:
+        with open(os.path.join(mdk_path, "build.gradle"), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.lstrip().startswith("//"):
+                    continue
+                match = _MAPPINGS_PATTERN.search(line)
+                if match:
+                    return match.group(1), match.group(2)
+    except OSError:
+        pass
+    return "official", "1.16.5"
+
+
+def find_mapped_jar(mdk_path):
+    """
+    查找ForgeGradle为项目生成的映射后的Forge jar（执行过一次gradle构建后才存在）
+
+    :return: jar路径，找不到时返回None
+    """
+    channel, version = read_mappings(mdk_path)
+    repo = os.path.join(gradle_user_home(), "caches", "forge_gradle", "minecraft_user_repo",
+                        "net", "minecraftforge", "forge")
+    name = f"{FORGE_VERSION}_mapped_{channel}_{version}"
+    exact = os.path.join(repo, name, f"forge-{name}.jar")
+    if os.path.isfile(exact):
+        return exact
+    # 映射版本不同（如改过build.gradle但没有重新构建）时使用任意一个已映射的jar
+    candidates = [path for path in glob.glob(os.path.join(repo, f"{FORGE_VERSION}_mapped_*", "*.jar"))
+                  if not path.endswith(("-sources.jar", "-extra.jar"))]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def build_index(jar_path):
+    """
+    扫描jar，提取方块类和常量
+
+    :return: 索引字典
+    """
+    classes = {}
+    with zipfile.ZipFile(jar_path) as jar:
+        for info in jar.infolist():
+            name = info.filename
+            if not name.endswith(".class") or not name.startswith(SCAN_PREFIXES):
+                continue
+            try:
+                class_file = read_class(jar.read(info))
+            except ClassFormatError:
+                continue
+            classes[class_file.name] = class_file
+
+    # 沿父类链判断是否是Block子类（记忆化）
+    is_block = {BLOCK_CLASS: True}
+
+    def check(name):
+        chain = []
+        while name not in is_block:
+            class_file = classes.get(name)
+            if class_file is None or class_file.super_name is None:
+                is_block[name] = False
+                break
+            chain.append(name)
+            name = class_file.super_name
+        result = is_block[name]
+        for member in chain:
+            is_block[member] = result
+        return result
+
+    blocks = []
+    for name, class_file in classes.items():
+        if not check(name) or class_file.access & ACC_INTERFACE:
+            continue
+        constructors = [parameter_types(descriptor, signature)
+                        for access, descriptor, signature in class_file.constructors if access & ACC_PUBLIC]
+        blocks.append({
+            "name": simple_name(name),
+            "class": name.replace("/", ".").replace("$", "."),
+            "super": simple_name(class_file.super_name) if class_file.super_name else None,
+            "public": bool(class_file.access & ACC_PUBLIC) and "$" not in name,
+            "abstract": bool(class_file.access & ACC_ABSTRACT),
+            "constructors": constructors,
+        })
+    blocks.sort(key=lambda block: block["name"])
+
+    index = {"version": INDEX_VERSION, "blocks": blocks}
+    for class_name, key in CONSTANT_CLASSES.items():
+        class_file = classes.get(class_name)
+        descriptor = f"L{class_name};"
+        index[key] = [] if class_file is None else [
+            field_name for access, field_name, field_descriptor in class_file.fields
+            if access & ACC_STATIC and access & ACC_PUBLIC and field_descriptor == descriptor
+        ]
+    return index
+
+
+class ClassIndex:
+    """
+    项目使用的Minecraft/Forge版本的方块类索引
+    """
+
+    def __init__(self, project_dir):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.mdk_path = os.path.join(self.project_dir, MDK_DIR_NAME)
+        self.index_path = os.path.join(get_state_dir(self.project_dir), INDEX_FILE)
+        self.data = None
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path):
+        """
+        根据mod.json路径获取项目的方块类索引
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)))
+
+    def load(self, jar_path=None):
+        """
+        读取已保存的索引，jar有变化时视为不存在
+
+        :return: 是否读取成功
+        """
+        jar_path = jar_path or find_mapped_jar(self.mdk_path)
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION:
+            return False
+        if jar_path is not None:
+            stat = os.stat(jar_path)
+            if data.get("jar") != [jar_path, stat.st_size, stat.st_mtime_ns]:
+                return False
+        self.data = data
+        return True
+
+    @tracing.traced(category="codegen")
+    def build(self, jar_path):
+        """
+        扫描jar重新生成索引并保存
+        """
+        stat = os.stat(jar_path)
+        data = build_index(jar_path)
+        data["jar"] = [jar_path, stat.st_size, stat.st_mtime_ns]
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+        os.replace(temp_path, self.index_path)
+        self.data = data
+
+    def ensure(self):
+        """
+        获取索引：已保存且jar未变化时直接读取，否则扫描jar；
+        找不到jar（还没有执行过gradle构建）时使用上次保存的索引
+
+        :return: 是否有可用的索引
+        """
+        if self.data is not None:
+            return True
+        jar_path = find_mapped_jar(self.mdk_path)
+        if jar_path is None:
+            return self.load(None)
+        if not self.load(jar_path):
+            self.build(jar_path)
+        return True
+
+    @property
+    def blocks(self):
+        return self.data["blocks"] if self.data else []
+
+    @property
+    def materials(self):
+        return self.data.get("materials", []) if self.data else []
+
+    @property
+    def sound_types(self):
+        return self.data.get("sound_types", []) if self.data else []
+
+    @property
+    def tool_types(self):
+        return self.data.get("tool_types", []) if self.data else []
+
+    def instantiable_blocks(self):
+        """
+        可以直接new的方块类（public、非抽象、有public构造函数）
+        """
+        return [block for block in self.blocks if block["public"] and not block["abstract"] and block["constructors"]]
+
+    def superclasses(self, class_name):
+        """
+        方块类及其父类的简单类名（从子类到父类），不在索引中的类只返回自身
+
+        :param class_name: 简单类名或完整类名
+        """
+        supers = {}
+        for block in self.blocks:
+            supers.setdefault(block["name"], block["super"])
+        name = class_name.rsplit(".", 1)[-1]
+        lineage = [name]
+        while supers.get(name) and supers[name] not in lineage:
+            name = supers[name]
+            lineage.append(name)
+        return lineage
+
+    def search(self, query, limit=None, properties_only=False):
+        """
+        按类名模糊搜索可以直接new的方块类
+
+        :param properties_only: 只搜索有new X(AbstractBlock.Properties)构造函数的类（BlockSpec生成的注册代码只传入Properties）
+        :return: 索引中的方块类条目列表
+        """
+        by_name = {}
+        for block in self.instantiable_blocks():
+            if properties_only and [PROPERTIES_TYPE] not in block["constructors"]:
+                continue
+            by_name.setdefault(block["name"], block)
+        return [by_name[name] for name in fuzzy_search(query, by_name, limit)]
+
+
+def format_constructor(block, parameters):
+    """
+    构造函数的显示文本，如"new StairsBlock(Supplier<BlockState>, AbstractBlock.Properties)"
+    """
+    return f"new {block['name']}({', '.join(parameters)})"
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+命令生成模块
+把mod.json中commands数组的命令定义（格式同example_commands.json：parameters、aliases、
+permissionLevel、executorClass）编译为Brigadier注册代码和执行类：
+    - 整个模组只生成一个ModCommands.java，在RegisterCommandsEvent中注册所有命令
+    - 同一种参数类型的ArgumentBuilder只生成一个辅助方法，所有命令共用
+    - 可选参数（必须在必填参数之后）展开为逐层的executes，未填写时使用default或类型的默认值
+    - 别名注册为重定向到主命令的节点
+    - 每个命令的注册代码按命令定义的指纹缓存，只修改一个命令时只重新生成这一个命令的代码
+    - 执行类（executorClass，未填写时为{包名}.command.{命令名}Command）只在不存在时生成存根，
+      已有的执行类是手写代码，不会覆盖；参数变化时提示需要修改execute方法的签名
+
+生成记录和代码缓存保存在.forgecreator/commands.json中
+"""
+
+import os
+import re
+import json
+import hashlib
+
+import tracing
+import journal
+from journal import get_state_dir
+
+
+# 生成记录文件名
+MANIFEST_FILE = "commands.json"
+
+# 生成的代码格式变化时修改，使缓存的注册代码失效
+GENERATOR_VERSION = 1
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+# 参数类型：参数的Java类型、ArgumentType表达式及其泛型类型、读取参数值的表达式、未填写时的默认值、需要导入的类
+ARGUMENT_TYPES = {
+    "string": {
+        "java": "String", "argument": "StringArgumentType.string()", "generic": "String",
+        "get": 'StringArgumentType.getString(context, "{name}")', "default": '""',
+        "imports": ["com.mojang.brigadier.arguments.StringArgumentType"],
+    },
+    "word": {
+        "java": "String", "argument": "StringArgumentType.word()", "generic": "String",
+        "get": 'StringArgumentType.getString(context, "{name}")', "default": '""',
+        "imports": ["com.mojang.brigadier.arguments.StringArgumentType"],
+    },
+    "greedy_string": {
+        "java": "String", "argument": "StringArgumentType.greedyString()", "generic": "String",
+        "get": 'StringArgumentType.getString(context, "{name}")', "default": '""',
+        "imports": ["com.mojang.brigadier.arguments.StringArgumentType"],
+    },
+    "integer": {
+        "java": "int", "argument": "IntegerArgumentType.integer({range})", "generic": "Integer",
+        "get": 'IntegerArgumentType.getInteger(context, "{name}")', "default": "0",
+        "imports": ["com.mojang.brigadier.arguments.IntegerArgumentType"],
+    },
+    "float": {
+        "java": "float", "argument": "FloatArgumentType.floatArg({range})", "generic": "Float",
+        "get": 'FloatArgumentType.getFloat(context, "{name}")', "default": "0.0f",
+        "imports": ["com.mojang.brigadier.arguments.FloatArgumentType"],
+    },
+    "double": {
+        "java": "double", "argument": "DoubleArgumentType.doubleArg({range})", "generic": "Double",
+        "get": 'DoubleArgumentType.getDouble(context, "{name}")', "default": "0.0",
+        "imports": ["com.mojang.brigadier.arguments.DoubleArgumentType"],
+    },
+    "boolean": {
+        "java": "boolean", "argument": "BoolArgumentType.bool()", "generic": "Boolean",
+        "get": 'BoolArgumentType.getBool(context, "{name}")', "default": "false",
+        "imports": ["com.mojang.brigadier.arguments.BoolArgumentType"],
+    },
+    "player": {
+        "java": "ServerPlayerEntity", "argument": "EntityArgument.player()", "generic": "EntitySelector",
+        "get": 'EntityArgument.getPlayer(context, "{name}")', "default": "context.getSource().asPlayer()",
+        "imports": ["net.minecraft.command.arguments.EntityArgument", "net.minecraft.command.arguments.EntitySelector",
+                    "net.minecraft.entity.player.ServerPlayerEntity"],
+    },
+    "players": {
+        "java": "Collection<ServerPlayerEntity>", "argument": "EntityArgument.players()", "generic": "EntitySelector",
+        "get": 'EntityArgument.getPlayers(context, "{name}")',
+        "default": "Collections.singleton(context.getSource().asPlayer())",
+        "imports": ["net.minecraft.command.arguments.EntityArgument", "net.minecraft.command.arguments.EntitySelector",
+                    "net.minecraft.entity.player.ServerPlayerEntity", "java.util.Collection", "java.util.Collections"],
+    },
+    "entity": {
+        "java": "Entity", "argument": "EntityArgument.entity()", "generic": "EntitySelector",
+        "get": 'EntityArgument.getEntity(context, "{name}")', "default": "context.getSource().assertIsEntity()",
+        "imports": ["net.minecraft.command.arguments.EntityArgument", "net.minecraft.command.arguments.EntitySelector",
+                    "net.minecraft.entity.Entity"],
+    },
+    "position": {
+        "java": "BlockPos", "argument": "BlockPosArgument.blockPos()", "generic": "ILocationArgument",
+        "get": 'BlockPosArgument.getLoadedBlockPos(context, "{name}")',
+        "default": "new BlockPos(context.getSource().getPos())",
+        "imports": ["net.minecraft.command.arguments.BlockPosArgument", "net.minecraft.command.arguments.ILocationArgument",
+                    "net.minecraft.util.math.BlockPos"],
+    },
+    "item": {
+        "java": "ItemInput", "argument": "ItemArgument.item()", "generic": "ItemInput",
+        "get": 'ItemArgument.getItem(context, "{name}")', "default": "null",
+        "imports": ["net.minecraft.command.arguments.ItemArgument", "net.minecraft.command.arguments.ItemInput"],
+    },
+    "block": {
+        "java": "BlockStateInput", "argument": "BlockStateArgument.blockState()", "generic": "BlockStateInput",
+        "get": 'BlockStateArgument.getBlockState(context, "{name}")', "default": "null",
+        "imports": ["net.minecraft.command.arguments.BlockStateArgument",
+                    "net.minecraft.command.arguments.BlockStateInput"],
+    },
+    "message": {
+        "java": "ITextComponent", "argument": "MessageArgument.message()", "generic": "MessageArgument.Message",
+        "get": 'MessageArgument.getMessage(context, "{name}")', "default": 'new StringTextComponent("")',
+        "imports": ["net.minecraft.command.arguments.MessageArgument", "net.minecraft.util.text.ITextComponent",
+                    "net.minecraft.util.text.StringTextComponent"],
+    },
+    "resource": {
+        "java": "ResourceLocation", "argument": "ResourceLocationArgument.resourceLocation()",
+        "generic": "ResourceLocation",
+        "get": 'ResourceLocationArgument.getResourceLocation(context, "{name}")', "default": "null",
+        "imports": ["net.minecraft.command.arguments.ResourceLocationArgument", "net.minecraft.util.ResourceLocation"],
+    },
+}
+
+# 参数类型的别名
+TYPE_ALIASES = {
+    "int": "integer",
+    "bool": "boolean",
+    "str": "string",
+    "text": "message",
+    "blockpos": "position",
+    "pos": "position",
+    "resource_location": "resource",
+}
+
+_COMMAND_NAME_PATTERN = re.compile(r"^[a-z][a-z0-9_]*$")
+_PARAMETER_NAME_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+_CLASS_NAME_PATTERN = re.compile(r"^([a-zA-Z_]\w*\.)*[A-Z]\w*$")
+_JAVA_KEYWORDS = {
+    "abstract", "assert", "boolean", "break", "byte", "case", "catch", "char", "class", "const", "continue",
+    "default", "do", "double", "else", "enum", "extends", "final", "finally", "float", "for", "goto", "if",
+    "implements", "import", "instanceof", "int", "interface", "long", "native", "new", "package", "private",
+    "protected", "public", "return", "short", "static", "strictfp", "super", "switch", "synchronized", "this",
+    "throw", "throws", "transient", "try", "void", "volatile", "while", "true", "false", "null",
+    "source", "context",
+}
+
+
+def pascal_case(name):
+    """
+    "teleport_to_spawn" -> "TeleportToSpawn"
+    """
+    return "".join(part[:1].upper() + part[1:] for part in name.split("_") if part)
+
+
+def parameter_type(parameter):
+    """
+    参数的类型名（处理别名），未知类型返回None
+    """
+    type_name = str(parameter.get("type", "string")).lower()
+    type_name = TYPE_ALIASES.get(type_name, type_name)
+    return type_name if type_name in ARGUMENT_TYPES else None
+
+
+def _range(parameter, type_name):
+    bounds = [parameter.get(key) for key in ("min", "max")]
+    if bounds[0] is None and bounds[1] is None:
+        return ""
+    suffix = "f" if type_name == "float" else ""
+    if type_name == "integer":
+        low = str(int(bounds[0])) if bounds[0] is not None else "Integer.MIN_VALUE"
+        high = str(int(bounds[1])) if bounds[1] is not None else "Integer.MAX_VALUE"
+    else:
+        box = "Float" if type_name == "float" else "Double"
+        low = f"{float(bounds[0])}{suffix}" if bounds[0] is not None else f"-{box}.MAX_VALUE"
+        high = f"{float(bounds[1])}{suffix}" if bounds[1] is not None else f"{box}.MAX_VALUE"
+    return f"{low}, {high}" if bounds[1] is not None else low
+
+
+def default_value(parameter, type_name):
+    """
+    可选参数未填写时的Java表达式：使用default，没有或类型不支持时使用类型的默认值
+    """
+    value = parameter.get("default")
+    if value is not None:
+        if type_name in ("string", "word", "greedy_string"):
+            return json.dumps(str(value))
+        if type_name == "integer" and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(int(value))
+        if type_name in ("float", "double") and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return f"{float(value)}f" if type_name == "float" else str(float(value))
+        if type_name == "boolean" and isinstance(value, bool):
+            return "true" if value else "false"
+    return ARGUMENT_TYPES[type_name]["default"]
+
+
+def executor_class(command, base_package):
+    """
+    命令的执行类完整类名
+    """
+    return command.get("executorClass") or f"{base_package}.command.{pascal_case(command['name'])}Command"
+
+
+def validate_command(command):
+    """
+    检查命令定义
+
+    :return: 错误信息列表
+    """
+    name = command.get("name")
+    if not isinstance(name, str) or not _COMMAND_NAME_PATTERN.match(name):
+        return [f"命令名称无效: {name!r}"]
+    errors = []
+    seen = set()
+    optional = False
+    for parameter in command.get("parameters", []):
+        parameter_name = parameter.get("name") if isinstance(parameter, dict) else None
+        if not isinstance(parameter_name, str) or not _PARAMETER_NAME_PATTERN.match(parameter_name) \
+                or parameter_name in _JAVA_KEYWORDS:
+            errors.append(f"命令{name}的参数名称无效: {parameter_name!r}")
+            continue
+        if parameter_name in seen:
+            errors.append(f"命令{name}的参数{parameter_name}重复")
+        seen.add(parameter_name)
+        if parameter_type(parameter) is None:
+            errors.append(f"命令{name}的参数{parameter_name}类型未知: {parameter.get('type')}")
+        if parameter.get("required", True):
+            if optional:
+                errors.append(f"命令{name}的必填参数{parameter_name}不能在可选参数之后")
+        else:
+            optional = True
+    for alias in command.get("aliases", []):
+        if not isinstance(alias, str) or not _COMMAND_NAME_PATTERN.match(alias):
+            errors.append(f"命令{name}的别名无效: {alias!r}")
+    if command.get("executorClass") is not None and \
+            not (isinstance(command["executorClass"], str) and _CLASS_NAME_PATTERN.match(command["executorClass"])):
+        errors.append(f"命令{name}的执行类无效: {command['executorClass']!r}")
+    return errors
+
+
+def fingerprint(command, base_package):
+    """
+    命令定义的指纹，相同时注册代码可以直接复用
+    """
+    content = json.dumps([GENERATOR_VERSION, base_package, command], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def signature(command):
+    """
+    执行类execute方法的参数类型（用于判断已有的执行类是否需要修改）
+    """
+    return [ARGUMENT_TYPES[parameter_type(parameter)]["java"] for parameter in command.get("parameters", [])]
+
+
+def permission_level(command):
+    level = int(command.get("permissionLevel", 0) or 0)
+    if command.get("requiresOP") and level < 2:
+        level = 2
+    return level
+
+
+def render_command(command, base_package, helpers):
+    """
+    生成单个命令的注册方法
+
+    :param helpers: 共用的参数构建方法 {ArgumentType表达式: (方法名, 泛型类型)}，新用到的会加入
+    :return: (方法代码, 需要导入的类集合, 用到的ArgumentType表达式列表)
+    """
+    name = command["name"]
+    parameters = command.get("parameters", [])
+    types = [parameter_type(parameter) for parameter in parameters]
+    required = sum(1 for parameter in parameters if parameter.get("required", True))
+    executor = executor_class(command, base_package)
+    if executor.rsplit(".", 1)[0] == f"{base_package}.command":
+        executor = executor.rsplit(".", 1)[1]
+    imports = set()
+    arguments = []
+    level = permission_level(command)
+    requires = f".requires(source -> source.hasPermissionLevel({level}))" if level > 0 else ""
+
+    def call(count):
+        values = ["context.getSource()"]
+        for index, (parameter, type_name) in enumerate(zip(parameters, types)):
+            if index < count:
+                values.append(ARGUMENT_TYPES[type_name]["get"].format(name=parameter["name"]))
+            else:
+                values.append(default_value(parameter, type_name))
+        return f"context -> {executor}.execute({', '.join(values)})"
+
+    def node(index, indent):
+        parameter = parameters[index]
+        type_name = types[index]
+        spec = ARGUMENT_TYPES[type_name]
+        imports.update(spec["imports"])
+        argument = spec["argument"].format(range=_range(parameter, type_name))
+        if argument not in helpers:
+            base_name = f"{pascal_case(type_name)[:1].lower()}{pascal_case(type_name)[1:]}Argument"
+            helper_name = base_name
+            taken = {helper for helper, _ in helpers.values()}
+            number = 2
+            while helper_name in taken:
+                helper_name = f"{base_name}{number}"
+                number += 1
+            helpers[argument] = (helper_name, spec["generic"])
+        arguments.append(argument)
+        pad = " " * indent
+        lines = f'{helpers[argument][0]}("{parameter["name"]}")'
+        if index + 1 >= required:
+            lines += f"\n{pad}.executes({call(index + 1)})"
+        if index + 1 < len(parameters):
+            lines += f"\n{pad}.then({node(index + 1, indent + 8)})"
+        return lines
+
+    body = f'Commands.literal("{name}")'
+    if requires:
+        body += f"\n                {requires}"
+    if required == 0:
+        body += f"\n                .executes({call(0)})"
+    if parameters:
+        body += f"\n                .then({node(0, 24)})"
+
+    description = command.get("description") or name
+    method = [f"    // {description}"]
+    if command.get("usage"):
+        method.append(f"    // 用法: {command['usage']}")
+    method.append(f"    private static void register{pascal_case(name)}(CommandDispatcher<CommandSource> dispatcher) {{")
+    aliases = command.get("aliases", [])
+    if aliases:
+        imports.add("com.mojang.brigadier.tree.LiteralCommandNode")
+        method.append(f"        LiteralCommandNode<CommandSource> node = dispatcher.register({body});")
+        for alias in aliases:
+            # 没有参数的节点重定向后不会执行，所以别名同时设置executes
+            method.append(f'        dispatcher.register(Commands.literal("{alias}"){requires}'
+                          f'.executes(node.getCommand()).redirect(node));')
+    else:
+        method.append(f"        dispatcher.register({body});")
+    method.append("    }")
+    return "\n".join(method), imports, arguments
+
+
+def render_executor_stub(command, base_package):
+    """
+    生成执行类存根
+
+    :return: (类的完整名称, 文件内容)
+    """
+    class_name = executor_class(command, base_package)
+    package, simple_name = class_name.rsplit(".", 1) if "." in class_name else ("", class_name)
+    imports = {
+        "com.mojang.brigadier.exceptions.CommandSyntaxException",
+        "net.minecraft.command.CommandSource",
+        "net.minecraft.util.text.StringTextComponent",
+    }
+    parameters = []
+    for parameter in command.get("parameters", []):
+        spec = ARGUMENT_TYPES[parameter_type(parameter)]
+        # 只导入参数值的类型，ArgumentType相关的类只在ModCommands中使用
+        imports.update(name for name in spec["imports"] if re.search(rf"\b{name.rsplit('.', 1)[1]}\b", spec["java"]))
+        parameters.append(f"{spec['java']} {parameter['name']}")
+    lines = []
+    if package:
+        lines.append(f"package {package};\n")
+    lines += [f"import {name};" for name in sorted(imports)]
+    lines += [
+        "",
+        f"public class {simple_name} {{",
+        "    /**",
+        f"     * {command.get('description') or command['name']}",
+    ]
+    if command.get("usage"):
+        lines.append(f"     * 用法: {command['usage']}")
+    for parameter in command.get("parameters", []):
+        lines.append(f"     * @param {parameter['name']} {parameter.get('description', '')}".rstrip())
+    lines += [
+        "     * @return 命令结果（成功时为正数）",
+        "     */",
+        f"    public static int execute({', '.join(['CommandSource source'] + parameters)}) throws CommandSyntaxException {{",
+        f'        source.sendFeedback(new StringTextComponent("{command["name"]}"), false);',
+        "        return 1;",
+        "    }",
+        "}",
+        "",
+    ]
+    return class_name, "\n".join(lines)
+
+
+class CommandGenerator:
+    """
+    根据mod.json的commands数组生成ModCommands.java和执行类存根
+    """
+
+    def __init__(self, project_dir, mod_id, base_package, main_class_name=None):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        :param mod_id: 模组ID
+        :param base_package: 基础包名
+        :param main_class_name: 带@Mod注解的主类名（MainWindow.find_main_class），默认按模板的命名由modId推导
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.mod_id = mod_id
+        self.base_package = base_package
+        self.main_class_name = main_class_name or mod_id.replace('_', '').title() + "Mod"
+        self.java_dir = os.path.join(self.project_dir, MDK_DIR_NAME, "src", "main", "java")
+        self.commands_path = os.path.join(self.java_dir, *base_package.split("."), "command", "ModCommands.java")
+        self.manifest_path = os.path.join(get_state_dir(self.project_dir), MANIFEST_FILE)
+        self.cache = self._load_manifest()
+        self.rendered = []
+        self.warnings = []
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path, mod_id, base_package, main_class_name=None):
+        """
+        根据mod.json路径获取项目的命令生成器
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)), mod_id, base_package, main_class_name)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get("commands", {}) if isinstance(data, dict) else {}
+
+    def save(self):
+        """
+        保存生成记录和注册代码缓存（事务提交后调用）
+        """
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"commands": self.cache}, ensure_ascii=False, separators=(",", ":")))
+        os.replace(temp_path, self.manifest_path)
+
+    def _class_path(self, class_name):
+        return os.path.join(self.java_dir, *class_name.split(".")) + ".java"
+
+    @tracing.traced(category="codegen")
+    def render(self, mod_data):
+        """
+        在内存中渲染ModCommands.java和需要新建的执行类存根，命令定义未变化时复用缓存的注册代码
+
+        :return: ({文件路径: 内容bytes}, 错误列表)
+        """
+        errors = []
+        commands = []
+        literals = {}
+        for command in mod_data.get("commands", []):
+            if not isinstance(command, dict):
+                continue
+            command_errors = validate_command(command)
+            if not command_errors:
+                for literal in [command["name"]] + list(command.get("aliases", [])):
+                    if literal in literals:
+                        command_errors.append(f"命令{command['name']}的名称或别名{literal}与命令{literals[literal]}重复")
+                    literals.setdefault(literal, command["name"])
+            if command_errors:
+                errors += command_errors
+                continue
+            commands.append(command)
+
+        self.rendered = []
+        self.warnings = []
+        cache = {}
+        helpers = {}
+        imports = set()
+        methods = []
+        outputs = {}
+        for command in commands:
+            name = command["name"]
+            key = fingerprint(command, self.base_package)
+            entry = self.cache.get(name)
+            if entry is not None and entry.get("fingerprint") == key:
+                # 命令定义没有变化，直接复用上次生成的代码，只需要登记用到的参数构建方法
+                for argument, helper_name, generic in entry["helpers"]:
+                    if argument not in helpers and helper_name not in {helper for helper, _ in helpers.values()}:
+                        helpers[argument] = (helper_name, generic)
+                if all(helpers.get(argument, (None,))[0] == helper_name for argument, helper_name, _ in entry["helpers"]):
+                    cache[name] = entry
+                    methods.append(entry["code"])
+                    imports.update(entry["imports"])
+                    continue
+            code, command_imports, arguments = render_command(command, self.base_package, helpers)
+            self.rendered.append(name)
+            cache[name] = {
+                "fingerprint": key,
+                "code": code,
+                "imports": sorted(command_imports),
+                "helpers": [[argument, helpers[argument][0], helpers[argument][1]] for argument in dict.fromkeys(arguments)],
+                "signature": signature(command),
+                "executor": executor_class(command, self.base_package),
+            }
+            methods.append(code)
+            imports.update(command_imports)
+            if entry is not None and entry.get("signature") != cache[name]["signature"] \
+                    and journal.exists(self._class_path(cache[name]["executor"])):
+                self.warnings.append(f"命令{name}的参数已变化，请修改{cache[name]['executor']}.execute的参数为: "
+                                     f"{', '.join(['CommandSource'] + cache[name]['signature'])}")
+        self.cache = cache
+
+        # 执行类是手写代码，只在不存在时生成存根
+        for command in commands:
+            class_name = executor_class(command, self.base_package)
+            stub_path = self._class_path(class_name)
+            if stub_path not in outputs and not journal.exists(stub_path):
+                outputs[stub_path] = render_executor_stub(command, self.base_package)[1].encode("utf-8")
+
+        outputs[self.commands_path] = self._render_mod_commands(commands, methods, imports, helpers).encode("utf-8")
+        return outputs, errors
+
+    def _render_mod_commands(self, commands, methods, imports, helpers):
+        mod_class_name = self.main_class_name
+        imports = set(imports) | {
+            f"{self.base_package}.{mod_class_name}",
+            "com.mojang.brigadier.CommandDispatcher",
+            "net.minecraft.command.CommandSource",
+            "net.minecraft.command.Commands",
+            "net.minecraftforge.event.RegisterCommandsEvent",
+            "net.minecraftforge.eventbus.api.SubscribeEvent",
+            "net.minecraftforge.fml.common.Mod",
+        }
+        if helpers:
+            imports.add("com.mojang.brigadier.builder.RequiredArgumentBuilder")
+        # 与生成类同包的执行类使用简单类名，其他包的使用完整类名，都不需要导入
+        lines = [f"package {self.base_package}.command;\n"]
+        lines += [f"import {name};" for name in sorted(imports)]
+        lines += [
+            "",
+            "// 由mod.json的commands生成，修改请编辑mod.json",
+            f"@Mod.EventBusSubscriber(modid = {mod_class_name}.MOD_ID)",
+            "public class ModCommands {",
+            "    @SubscribeEvent",
+            "    public static void onRegisterCommands(RegisterCommandsEvent event) {",
+            "        CommandDispatcher<CommandSource> dispatcher = event.getDispatcher();",
+        ]
+        lines += [f"        register{pascal_case(command['name'])}(dispatcher);" for command in commands]
+        lines += ["    }", ""]
+        for argument, (helper_name, generic) in sorted(helpers.items(), key=lambda item: item[1][0]):
+            lines += [
+                f"    private static RequiredArgumentBuilder<CommandSource, {generic}> {helper_name}(String name) {{",
+                f"        return Commands.argument(name, {argument});",
+                "    }",
+                "",
+            ]
+        lines.append("\n\n".join(methods))
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    @tracing.traced(category="codegen")
+    def apply(self, outputs):
+        """
+        写入渲染好的文件，内容未变化的不写。需要在事务中调用
+
+        :return: (写入数, 未变化数)
+        """
+        written = unchanged = 0
+        for path, content in outputs.items():
+            if journal.exists(path) and journal.read_bytes(path) == content:
+                unchanged += 1
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            journal.write_bytes(path, content)
+            written += 1
+        return written, unchanged
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+跨项目冲突检查模块
+在工作区索引上检查多个项目一起放进整合包时会互相冲突的内容：
+    - 模组ID相同
+    - 注册名相同（方块、物品、音效等）
+    - Java类的完整类名相同（只有一个类会被加载），物品组类单独标出
+    - 原版或其他模组命名空间下的同一个资源文件被多个项目覆盖（只有一个生效）；
+      语言文件和sounds.json会合并，不算冲突
+    - 标签：多个项目写入同一个标签时有项目使用了"replace": true（会清除其他项目的内容），
+      以及标签目录中不是.json的文件（如模板自带的data/forge/tags/items/gems/1.txt）；
+      标签的值会被合并，多个项目写入相同的值不算冲突
+
+每项检查都是对索引的一次扫描：按键放入字典，再取出属于多个项目的组（哈希连接），耗时与条目数成线性关系
+"""
+
+import tracing
+from workspace import is_tag_path
+
+
+# 多个资源包中的同名文件会合并而不是覆盖的资源
+_MERGED_RESOURCES = ("sounds.json",)
+
+
+class Conflict:
+    """
+    一处冲突
+    """
+
+    __slots__ = ("severity", "kind", "key", "packs", "detail")
+
+    def __init__(self, severity, kind, key, packs, detail=""):
+        self.severity = severity  # "error"/"warning"
+        self.kind = kind          # 检查类别，见SECTIONS
+        self.key = key            # 冲突的模组ID、注册名、类名或资源路径
+        self.packs = packs        # 涉及的项目（显示名称）列表
+        self.detail = detail
+
+
+# 检查类别 -> 报告中的标题
+SECTIONS = {
+    "modId": "模组ID相同",
+    "registryName": "注册名相同",
+    "class": "类名相同",
+    "resource": "覆盖同一个资源文件",
+    "tag": "标签冲突",
+}
+
+
+def _is_merged(path):
+    parts = path.split("/")
+    return parts[-1] in _MERGED_RESOURCES or (len(parts) >= 4 and parts[0] == "assets" and parts[2] == "lang")
+
+
+class ConflictAnalyzer:
+    """
+    在工作区索引上查找跨项目冲突
+    """
+
+    def __init__(self, index):
+        """
+        :param index: 已更新的WorkspaceIndex
+        """
+        self.db = index.db
+        self.packs = {}
+        self.mod_ids = {}
+        for pack_id, path, mod_id in self.db.execute("SELECT id, path, mod_id FROM packs"):
+            self.packs[pack_id] = f"{path}({mod_id})" if mod_id else path
+            self.mod_ids[pack_id] = mod_id
+
+    def _names(self, pack_ids):
+        return sorted(self.packs[pack_id] for pack_id in pack_ids)
+
+    @staticmethod
+    def _groups(rows):
+        """
+        按键分组，只保留属于不同项目的组
+
+        :param rows: (键, 项目id)序列
+        :return: {键: {项目id}}
+        """
+        buckets = {}
+        for key, pack_id in rows:
+            buckets.setdefault(key, set()).add(pack_id)
+        return {key: pack_ids for key, pack_ids in buckets.items() if len(pack_ids) > 1}
+
+    def check_mod_ids(self):
+        groups = self._groups((mod_id, pack_id) for pack_id, mod_id in self.mod_ids.items() if mod_id)
+        return [Conflict("error", "modId", mod_id, self._names(pack_ids)) for mod_id, pack_ids in sorted(groups.items())]
+
+    def check_registry_names(self, duplicate_mod_ids):
+        """
+        :param duplicate_mod_ids: 相同的模组ID，其命名空间下的注册名必然全部相同，只计数不逐个列出
+        """
+        kinds = {}
+        rows = []
+        for pack_id, kind, registry_name in self.db.execute(
+                "SELECT pack_id, kind, registry_name FROM entries WHERE registry_name IS NOT NULL"):
+            rows.append((registry_name, pack_id))
+            kinds.setdefault(registry_name, set()).add(kind)
+        conflicts = []
+        hidden = {}
+        for registry_name, pack_ids in sorted(self._groups(rows).items()):
+            namespace = registry_name.split(":", 1)[0]
+            if namespace in duplicate_mod_ids:
+                hidden[namespace] = hidden.get(namespace, 0) + 1
+                continue
+            conflicts.append(Conflict("error", "registryName", registry_name, self._names(pack_ids),
+                                      "/".join(sorted(kinds[registry_name]))))
+        return conflicts, hidden
+
+    def check_classes(self):
+        item_groups = set(self.db.execute("SELECT pack_id, name FROM entries WHERE kind = 'itemGroup'"))
+        group_classes = set()
+        rows = []
+        for pack_id, name in self.db.execute("SELECT pack_id, name FROM classes"):
+            rows.append((name, pack_id))
+            if (pack_id, name.rsplit(".", 1)[-1]) in item_groups:
+                group_classes.add(name)
+        return [Conflict("error", "class", name, self._names(pack_ids), "物品组类" if name in group_classes else "")
+                for name, pack_ids in sorted(self._groups(rows).items())]
+
+    def check_resources(self):
+        """
+        原版和其他命名空间下的资源（项目自己命名空间下的冲突由模组ID检查报告）
+        """
+        rows = []
+        for pack_id, path in self.db.execute(
+                "SELECT pack_id, path FROM resources WHERE path LIKE 'assets/%' OR path LIKE 'data/%'"):
+            parts = path.split("/")
+            if len(parts) < 3 or parts[1] == self.mod_ids[pack_id] or is_tag_path(path) or _is_merged(path):
+                continue
+            if parts[0] == "data" and parts[2] == "tags":
+                continue
+            rows.append((path, pack_id))
+        conflicts = []
+        for path, pack_ids in sorted(self._groups(rows).items()):
+            if path.split("/")[1] == "minecraft":
+                conflicts.append(Conflict("error", "resource", path, self._names(pack_ids), "覆盖原版资源，只有一个生效"))
+            else:
+                conflicts.append(Conflict("warning", "resource", path, self._names(pack_ids), "只有一个生效"))
+        return conflicts
+
+    def check_tags(self):
+        # 多个项目写入相同的值不是冲突（游戏会合并标签的值），只检查replace
+        files = {}
+        for pack_id, path, replace in self.db.execute("SELECT pack_id, path, replace FROM tags WHERE value IS NULL"):
+            files.setdefault(path, {})[pack_id] = bool(replace)
+
+        conflicts = []
+        for path, packs in sorted(files.items()):
+            replacing = [pack_id for pack_id, replace in packs.items() if replace]
+            namespace = path.split("/")[1]
+            if len(packs) > 1 and replacing:
+                conflicts.append(Conflict("error", "tag", path, self._names(packs),
+                                          f"{'、'.join(self._names(replacing))}使用了replace，会清除其他项目写入的值"))
+            elif replacing and namespace != self.mod_ids[replacing[0]]:
+                conflicts.append(Conflict("warning", "tag", path, self._names(replacing),
+                                          "使用了replace，会清除原版和其他模组写入的值"))
+
+        # 标签目录中不是.json的文件（模板遗留的占位文件等），游戏会忽略，发布前应删除
+        stray = {}
+        for pack_id, path in self.db.execute("SELECT pack_id, path FROM resources WHERE path LIKE 'data/%/tags/%'"):
+            if not path.endswith(".json"):
+                stray.setdefault(path, set()).add(pack_id)
+        for path, pack_ids in sorted(stray.items()):
+            conflicts.append(Conflict("warning", "tag", path, self._names(pack_ids), "标签目录中不是.json的文件"))
+        return conflicts
+
+    @tracing.traced(category="workspace")
+    def analyze(self):
+        """
+        执行所有检查
+
+        :return: (冲突列表, {相同的模组ID: 因此相同的注册名数})
+        """
+        conflicts = self.check_mod_ids()
+        registry_conflicts, hidden = self.check_registry_names({conflict.key for conflict in conflicts})
+        conflicts += registry_conflicts
+        conflicts += self.check_classes()
+        conflicts += self.check_resources()
+        conflicts += self.check_tags()
+        return conflicts, hidden
+
+
+def format_conflicts(conflicts, hidden=None, limit=200):
+    """
+    格式化为文本行，每类最多列出limit项
+
+    :param hidden: {模组ID: 相同的注册名数}，显示在模组ID冲突的说明中
+    """
+    hidden = hidden or {}
+    errors = sum(1 for conflict in conflicts if conflict.severity == "error")
+    lines = [f"冲突: 错误{errors}个，警告{len(conflicts) - errors}个"]
+    for kind, title in SECTIONS.items():
+        items = [conflict for conflict in conflicts if conflict.kind == kind]
+        if not items:
+            continue
+        lines.append("")
+        lines.append(f"{title}（{len(items)}）:")
+        for conflict in items[:limit]:
+            level = "错误" if conflict.severity == "error" else "警告"
+            detail = conflict.detail
+            if kind == "modId" and hidden.get(conflict.key):
+                detail = f"因此有{hidden[conflict.key]}个注册名相同"
+            lines.append(f"    [{level}] {conflict.key}" + (f"（{detail}）" if detail else ""))
+            lines.extend(f"        {pack}" for pack in conflict.packs)
+        if len(items) > limit:
+            lines.append(f"    ……还有{len(items) - limit}项")
+    return lines
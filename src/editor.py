@@ -3,13 +3,128 @@
 """
 JSON编辑器模块
 用于读取和显示mod.json文件的内容，以树形结构展示
+项目启用了项目数据库时直接从数据库读取，blocks等大数组分页显示
+树的内容保存为扁平的节点数组，由JsonTreeModel直接提供给视图，不为每个节点创建QStandardItem；
+较大的mod.json读取后把解析结果和节点数组保存为快照，文件未变化时再次打开直接读取快照，不解析JSON
 """
 
 import json
 import os
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTreeView
-from PyQt5.QtGui import QStandardItemModel, QStandardItem
-from PyQt5.QtCore import Qt
+import sys
+import struct
+import marshal
+import hashlib
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTreeView, QComboBox, QPushButton, QLabel
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+import tracing
+from journal import get_state_dir
+from projectstore import ProjectStore
+
+
+# 从项目数据库读取时每页显示的条目数
+PAGE_SIZE = 100
+
+# 快照文件名（保存在mod.json所在项目的.forgecreator目录中）
+SNAPSHOT_FILE = "editor.snapshot"
+
+# 快照格式变化时修改
+SNAPSHOT_VERSION = 1
+_HEADER_LENGTH = struct.Struct(">I")
+
+# 小于该大小的文件直接解析（比读取快照更快），也不会为程序自带的res/nullpack/mod.json写入快照
+SNAPSHOT_MIN_SIZE = 1024 * 1024
+
+# 节点数不超过该值时展开所有节点；更大的文件只展开到EXPAND_DEPTH层（expandAll的耗时与节点数成正比，
+# 10万个节点时比读取快照和构建树加起来还慢）
+EXPAND_ALL_MAX_NODES = 10000
+EXPAND_DEPTH = 0
+
+
+class JsonTreeModel(QAbstractItemModel):
+    """
+    只读的JSON树模型（键、值两列，没有setData，默认的flags即为只读）
+    节点保存在扁平数组中（父节点序号、键名、值文本），按先序排列，父节点序号-1表示顶层
+    """
+    
+    HEADERS = ('Key', 'Value')
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._set_arrays([], [], [])
+    
+    def _set_arrays(self, parents, keys, values):
+        self.parents = parents
+        self.keys = keys
+        self.values = values
+        # children[父节点序号+1]为子节点序号列表，rows[节点序号]为节点在父节点中的行号
+        self.children = [[] for _ in range(len(parents) + 1)]
+        self.rows = [0] * len(parents)
+        children = self.children
+        rows = self.rows
+        for node, parent in enumerate(parents):
+            siblings = children[parent + 1]
+            rows[node] = len(siblings)
+            siblings.append(node)
+    
+    def set_layout(self, layout):
+        """
+        替换全部内容
+        
+        :param layout: (父节点序号列表, 键名列表, 值文本列表)
+        """
+        self.beginResetModel()
+        self._set_arrays(*layout)
+        self.endResetModel()
+    
+    def clear(self):
+        self.set_layout(([], [], []))
+    
+    def node_index(self, node):
+        """
+        节点序号对应的QModelIndex（第一列）
+        """
+        return self.createIndex(self.rows[node], 0, node)
+    
+    def index(self, row, column, parent=QModelIndex()):
+        siblings = self.children[parent.internalId() + 1 if parent.isValid() else 0]
+        if row < 0 or row >= len(siblings) or column < 0 or column > 1:
+            return QModelIndex()
+        return self.createIndex(row, column, siblings[row])
+    
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent = self.parents[index.internalId()]
+        if parent < 0:
+            return QModelIndex()
+        return self.createIndex(self.rows[parent], 0, parent)
+    
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.children[0])
+        if parent.column() > 0:
+            return 0
+        return len(self.children[parent.internalId() + 1])
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 2
+    
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self.children[0])
+        return parent.column() == 0 and bool(self.children[parent.internalId() + 1])
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        node = index.internalId()
+        return self.keys[node] if index.column() == 0 else self.values[node]
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < 2:
+            return self.HEADERS[section]
+        return None
 
 
 class Editor(QWidget):
@@ -30,6 +145,9 @@ class Editor(QWidget):
         self.model = None       # 树形视图模型
         self.tree_view = None   # 树形视图组件
         self.file_path = None   # 当前加载的文件路径
+        self.store = None       # 项目数据库（项目启用了数据库时）
+        self.page_keys = []     # 分页显示的数组名
+        self.page_offsets = {}  # 分页显示的数组名 -> 当前页的起始序号
         
         # 加载语言文件
         self.load_language('zh_CN')
@@ -105,16 +223,35 @@ class Editor(QWidget):
         self.tree_view.setAlternatingRowColors(True)
         
         # 创建模型
-        self.model = QStandardItemModel()
-        self.model.setHorizontalHeaderLabels(['Key', 'Value'])
+        self.model = JsonTreeModel(self)
         self.tree_view.setModel(self.model)
         
         # 添加树视图到布局
         layout.addWidget(self.tree_view)
         
+        # 分页栏（只在从项目数据库读取时显示）
+        self.pager = QWidget()
+        pager_layout = QHBoxLayout(self.pager)
+        pager_layout.setContentsMargins(0, 0, 0, 0)
+        self.page_combo = QComboBox()
+        self.page_combo.currentIndexChanged.connect(self._update_pager)
+        pager_layout.addWidget(self.page_combo)
+        self.prev_button = QPushButton(self.lang.get('editor_prev_page', '上一页'))
+        self.prev_button.clicked.connect(lambda: self._turn_page(-1))
+        pager_layout.addWidget(self.prev_button)
+        self.page_label = QLabel()
+        pager_layout.addWidget(self.page_label)
+        self.next_button = QPushButton(self.lang.get('editor_next_page', '下一页'))
+        self.next_button.clicked.connect(lambda: self._turn_page(1))
+        pager_layout.addWidget(self.next_button)
+        pager_layout.addStretch()
+        self.pager.hide()
+        layout.addWidget(self.pager)
+        
         # 设置布局
         self.setLayout(layout)
     
+    @tracing.traced(category="editor")
     def read(self, file_path):
         """
         读取JSON文件并以树状结构显示
@@ -123,76 +260,220 @@ class Editor(QWidget):
         :return: 是否读取成功
         """
         try:
+            # 换了文件时从第一页开始显示
+            if file_path != self.file_path:
+                self.page_offsets = {}
+            
             # 存储文件路径
             self.file_path = file_path
+            self._close_store()
             
-            # 打开并读取JSON文件
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.json_data = json.load(f)
+            if ProjectStore.enabled(file_path):
+                return self._read_store(file_path)
             
-            # 清空模型
-            self.model.clear()
-            self.model.setHorizontalHeaderLabels(['Key', 'Value'])
+            # 文件未变化时从快照读取解析结果和树的布局，否则打开并读取JSON文件
+            stat = os.stat(file_path)
+            snapshot = self._load_snapshot(file_path, stat)
+            if snapshot is not None:
+                self.json_data, layout = snapshot
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    self.json_data = json.load(f)
+                layout = self._layout_tree('', self.json_data)
+                if stat.st_size >= SNAPSHOT_MIN_SIZE:
+                    self._save_snapshot(file_path, stat, layout)
             
             # 构建树状结构
-            self._build_tree('', self.json_data, self.model.invisibleRootItem())
+            self.model.set_layout(layout)
             
-            # 展开所有节点
-            self.tree_view.expandAll()
+            # 展开节点（大文件只展开前几层）
+            self._expand_tree()
             
             return True
         except Exception as e:
             print(f"读取JSON文件失败: {e}")
             return False
     
-    def _build_tree(self, key, value, parent_item):
+    def _expand_tree(self):
+        """
+        展开树视图：节点不多时全部展开，否则只展开到EXPAND_DEPTH层
+        """
+        if len(self.model.parents) <= EXPAND_ALL_MAX_NODES:
+            self.tree_view.expandAll()
+        else:
+            self.tree_view.expandToDepth(EXPAND_DEPTH)
+    
+    def _snapshot_key(self, file_path, stat):
+        """
+        快照的有效条件：文件路径、大小、修改时间，以及影响树布局的语言文件和Python的marshal格式
         """
-        递归构建树状结构
+        if getattr(self, '_lang_digest', None) is None:
+            self._lang_digest = hashlib.sha1(json.dumps(self.lang, sort_keys=True).encode('utf-8')).hexdigest()
+        return (SNAPSHOT_VERSION, sys.version_info[:2], os.path.abspath(file_path),
+                stat.st_size, stat.st_mtime_ns, self._lang_digest)
+    
+    @staticmethod
+    def _snapshot_path(file_path):
+        return os.path.join(get_state_dir(os.path.dirname(os.path.abspath(file_path))), SNAPSHOT_FILE)
+    
+    @tracing.traced(category="editor")
+    def _load_snapshot(self, file_path, stat):
+        """
+        读取快照，文件已变化或快照不存在、损坏时返回None
+        
+        :return: (JSON数据, 树的布局)
+        """
+        if stat.st_size < SNAPSHOT_MIN_SIZE:
+            return None
+        try:
+            with open(self._snapshot_path(file_path), 'rb') as f:
+                # 先只读取文件头中的有效条件，不匹配时不读取内容
+                (length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+                if marshal.loads(f.read(length)) != self._snapshot_key(file_path, stat):
+                    return None
+                # 整体读入后再反序列化（marshal.load直接读文件对象时要多次调用read，慢得多）
+                json_data, parents, keys, values = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError, struct.error):
+            return None
+        tracing.count("editor_snapshot_hits")
+        return json_data, (parents, keys, values)
+    
+    def _save_snapshot(self, file_path, stat, layout):
+        """
+        保存快照（写临时文件后原子替换），失败时忽略
+        """
+        snapshot_path = self._snapshot_path(file_path)
+        temp_path = snapshot_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+            header = marshal.dumps(self._snapshot_key(file_path, stat))
+            with open(temp_path, 'wb') as f:
+                f.write(_HEADER_LENGTH.pack(len(header)))
+                f.write(header)
+                f.write(marshal.dumps((self.json_data,) + tuple(layout)))
+            os.replace(temp_path, snapshot_path)
+        except (OSError, ValueError) as e:
+            print(f"保存编辑器快照失败: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def _read_store(self, file_path):
+        """
+        从项目数据库读取：其他顶层键完整显示，blocks等数组只显示当前页
+        mod.json在上次导出后被修改过时数据库会先重新导入
+        
+        :param file_path: mod.json文件路径
+        :return: 是否读取成功
+        """
+        self.store = ProjectStore.for_mod_json(file_path)
+        self.json_data = None
+        self.page_keys = [key for key, paged in self.store.keys() if paged]
+        self._show_store()
+        
+        self.page_combo.blockSignals(True)
+        self.page_combo.clear()
+        for key in self.page_keys:
+            self.page_combo.addItem(self._get_translated_key(key), key)
+        self.page_combo.blockSignals(False)
+        self._update_pager()
+        self.pager.setVisible(bool(self.page_keys))
+        return True
+    
+    def _show_store(self):
+        """
+        按各数组的当前页重建树
+        """
+        layout = ([], [], [])
+        for key, paged in self.store.keys():
+            if not paged:
+                self._layout_tree(key, self.store.value(key), layout)
+                continue
+            count = self.store.count(key)
+            offset = self.page_offsets.get(key, 0)
+            if offset >= count:
+                offset = max(0, (count - 1) // PAGE_SIZE * PAGE_SIZE)
+            self.page_offsets[key] = offset
+            self._add_node(layout, -1, self._get_translated_key(key), f"[{count} items]")
+            parent = len(layout[0]) - 1
+            for i, entry in enumerate(self.store.page(key, offset, PAGE_SIZE)):
+                self._layout_tree(f"[{offset + i}]", entry, layout, parent)
+        self.model.set_layout(layout)
+        self.tree_view.expandAll()
+    
+    def _update_pager(self):
+        """
+        更新分页栏中当前数组的页码和按钮状态
+        """
+        key = self.page_combo.currentData()
+        if key is None or self.store is None:
+            return
+        count = self.store.count(key)
+        offset = self.page_offsets.get(key, 0)
+        self.page_label.setText(self.lang.get('editor_page', '第{page}/{pages}页（共{count}项）').format(
+            page=offset // PAGE_SIZE + 1, pages=max(1, (count + PAGE_SIZE - 1) // PAGE_SIZE), count=count))
+        self.prev_button.setEnabled(offset > 0)
+        self.next_button.setEnabled(offset + PAGE_SIZE < count)
+    
+    def _turn_page(self, step):
+        """
+        分页栏中当前数组翻页
+        
+        :param step: -1为上一页，1为下一页
+        """
+        key = self.page_combo.currentData()
+        if key is None or self.store is None:
+            return
+        self.page_offsets[key] = max(0, self.page_offsets.get(key, 0) + step * PAGE_SIZE)
+        self._show_store()
+        self._update_pager()
+    
+    def _close_store(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        self.page_keys = []
+        self.pager.hide()
+    
+    def _layout_tree(self, key, value, layout=None, parent=-1):
+        """
+        把JSON值展开为扁平的节点数组（先序，键名已翻译）
         
         :param key: 当前键名
         :param value: 当前值
-        :param parent_item: 父节点
-        """
-        if isinstance(value, dict):
-            # 创建字典节点
-            if key:
-                dict_item = QStandardItem(self._get_translated_key(key))
-                dict_item.setEditable(False)
-                parent_item.appendRow([dict_item, QStandardItem("{...}")])
-                parent = dict_item
-            else:
-                parent = parent_item
-            
-            # 递归处理字典中的每个键值对
-            for k, v in value.items():
-                self._build_tree(k, v, parent)
-        elif isinstance(value, list):
-            # 创建列表节点
-            if key:
-                list_item = QStandardItem(self._get_translated_key(key))
-                list_item.setEditable(False)
-                parent_item.appendRow([list_item, QStandardItem(f"[{len(value)} items]")])
-                parent = list_item
-            else:
-                parent = parent_item
-            
-            # 递归处理列表中的每个元素
-            for i, item in enumerate(value):
-                self._build_tree(f"[{i}]", item, parent)
-        else:
-            # 创建值节点
-            if not key:
-                # 处理根节点为非字典/列表的情况
-                key_item = QStandardItem("root")
-                value_item = QStandardItem(str(value))
+        :param layout: 追加到的节点数组，为None时新建
+        :param parent: 当前值的父节点序号，-1表示顶层
+        :return: (父节点序号列表, 键名列表, 值文本列表)
+        """
+        if layout is None:
+            layout = ([], [], [])
+        keys = layout[1]
+        # 迭代展开（深层嵌套的JSON不会超出递归深度）
+        stack = [(key, value, parent)]
+        while stack:
+            key, value, parent = stack.pop()
+            if isinstance(value, dict):
+                # 字典节点
+                if key:
+                    self._add_node(layout, parent, self._get_translated_key(key), "{...}")
+                    parent = len(keys) - 1
+                stack.extend(reversed([(k, v, parent) for k, v in value.items()]))
+            elif isinstance(value, list):
+                # 列表节点
+                if key:
+                    self._add_node(layout, parent, self._get_translated_key(key), f"[{len(value)} items]")
+                    parent = len(keys) - 1
+                stack.extend(reversed([(f"[{i}]", item, parent) for i, item in enumerate(value)]))
             else:
-                key_item = QStandardItem(self._get_translated_key(key))
-                value_item = QStandardItem(str(value))
-            
-            key_item.setEditable(False)
-            value_item.setEditable(False)
-            
-            parent_item.appendRow([key_item, value_item])
+                # 值节点（根节点为非字典/列表时键名为root）
+                self._add_node(layout, parent, self._get_translated_key(key) if key else "root", str(value))
+        return layout
+    
+    @staticmethod
+    def _add_node(layout, parent, key, value):
+        parents, keys, values = layout
+        parents.append(parent)
+        keys.append(key)
+        values.append(value)
     
     def _get_translated_key(self, key):
         """
@@ -213,7 +494,7 @@ class Editor(QWidget):
         """
         获取当前加载的JSON数据
         
-        :return: JSON数据字典
+        :return: JSON数据字典（从项目数据库读取时为None）
         """
         return self.json_data
     
@@ -222,6 +503,6 @@ class Editor(QWidget):
         清空树状视图
         """
         self.model.clear()
-        self.model.setHorizontalHeaderLabels(['Key', 'Value'])
+        self._close_store()
         self.json_data = None
         self.file_path = None
\ No newline at end of file
@@ -0,0 +1,638 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+物品系列模块
+用等级表（每行一种材料）批量定义工具、盔甲和锭/粒等物品系列，并从mod.json一次性生成物品代码和资源：
+    - 等级表展开为mod.json中items数组的条目（带"tier"字段），语言文件和标签由resourcesync统一同步
+    - ModItems.java中由本模块维护的区域根据items数组整体渲染，区域外手写的代码保留
+    - 工具等级和盔甲材料分别生成ModItemTier、ModArmorMaterial两个枚举
+    - 物品模型、Java文件都先在内存中渲染，每个文件只写一次，内容未变化的不写，不再生成的删除
+
+等级表保存在mod.json的itemTiers中，例如：
+    {"name": "copper", "displayName": "铜", "families": ["tools", "armor", "resources"],
+     "level": 1, "uses": 200, "speed": 5.0, "attackDamage": 1.5, "enchantability": 14,
+     "repair": "#forge:ingots/copper", "armorDurability": 12, "armorProtection": [2, 4, 5, 2]}
+armorProtection按靴子、护腿、胸甲、头盔的顺序（与EquipmentSlotType的索引一致）。
+上次生成的文件记录在.forgecreator/item_families.json中
+"""
+
+import os
+import re
+import json
+
+import tracing
+import journal
+from journal import get_state_dir
+from blockstates import dump
+from specs import ItemSpec
+
+
+# 生成记录文件名
+MANIFEST_FILE = "item_families.json"
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+# 系列成员：物品类、模型父级、工具的攻击伤害和攻击速度修正（原版铁工具的数值）、盔甲槽位、标签、中文后缀
+FAMILIES = {
+    "tools": {
+        "sword": {"class": "SwordItem", "model": "item/handheld", "damage": 3, "speed": -2.4, "zh": "剑"},
+        "pickaxe": {"class": "PickaxeItem", "model": "item/handheld", "damage": 1, "speed": -2.8, "zh": "镐"},
+        "shovel": {"class": "ShovelItem", "model": "item/handheld", "damage": 1.5, "speed": -3.0, "zh": "锹"},
+        "axe": {"class": "AxeItem", "model": "item/handheld", "damage": 6.0, "speed": -3.1, "zh": "斧"},
+        "hoe": {"class": "HoeItem", "model": "item/handheld", "damage": -2, "speed": -1.0, "zh": "锄"},
+    },
+    "armor": {
+        "helmet": {"class": "ArmorItem", "model": "item/generated", "slot": "HEAD", "zh": "头盔"},
+        "chestplate": {"class": "ArmorItem", "model": "item/generated", "slot": "CHEST", "zh": "胸甲"},
+        "leggings": {"class": "ArmorItem", "model": "item/generated", "slot": "LEGS", "zh": "护腿"},
+        "boots": {"class": "ArmorItem", "model": "item/generated", "slot": "FEET", "zh": "靴子"},
+    },
+    "resources": {
+        "ingot": {"class": "Item", "model": "item/generated", "tags": ["forge:ingots/{material}"], "zh": "锭"},
+        "nugget": {"class": "Item", "model": "item/generated", "tags": ["forge:nuggets/{material}"], "zh": "粒"},
+    },
+}
+
+# 等级表中没有填写时使用的数值（与原版铁相同）
+TIER_DEFAULTS = {
+    "level": 2,
+    "uses": 250,
+    "speed": 6.0,
+    "attackDamage": 2.0,
+    "enchantability": 14,
+    "armorDurability": 15,
+    "armorProtection": [2, 5, 6, 2],
+    "toughness": 0.0,
+    "knockbackResistance": 0.0,
+    "equipSound": "ITEM_ARMOR_EQUIP_IRON",
+}
+
+# 物品类 -> 完整类名；构造函数中攻击伤害参数为float的工具类
+ITEM_CLASSES = {
+    "Item": "net.minecraft.item.Item",
+    "SwordItem": "net.minecraft.item.SwordItem",
+    "PickaxeItem": "net.minecraft.item.PickaxeItem",
+    "ShovelItem": "net.minecraft.item.ShovelItem",
+    "AxeItem": "net.minecraft.item.AxeItem",
+    "HoeItem": "net.minecraft.item.HoeItem",
+    "ArmorItem": "net.minecraft.item.ArmorItem",
+}
+FLOAT_DAMAGE_CLASSES = {"ShovelItem", "AxeItem"}
+
+# ModItems.java中由本模块维护的区域
+REGION_BEGIN = "    // ---- 以下物品由mod.json生成，修改请编辑mod.json ----\n"
+REGION_END = "    // ---- mod.json生成的物品结束 ----\n"
+
+_NAME_PATTERN = re.compile(r"^[a-z][a-z0-9_]*$")
+
+# Java中已声明的注册字段
+_FIELD_PATTERN = re.compile(r"RegistryObject<[^;=]*>\s+(\w+)\s*=")
+
+
+def _float(value):
+    return f"{float(value)}f"
+
+
+def tier_value(tier, key):
+    """
+    等级表中的数值，没有填写时使用默认值
+    """
+    value = tier.get(key)
+    return TIER_DEFAULTS[key] if value is None else value
+
+
+def tier_families(tier):
+    """
+    等级表选择的系列名称列表
+    """
+    families = tier.get("families", [])
+    return [families] if isinstance(families, str) else list(families)
+
+
+def expand_tier(tier, mod_id):
+    """
+    把一行等级表展开为items数组的条目
+
+    :param tier: 等级表
+    :param mod_id: 模组ID
+    :return: 物品条目列表
+    :raises ValueError: 等级表格式错误
+    """
+    material = tier.get("name")
+    if not isinstance(material, str) or not _NAME_PATTERN.match(material):
+        raise ValueError(f"等级表名称无效: {material!r}")
+    families = tier_families(tier)
+    unknown = [family for family in families if family not in FAMILIES]
+    if unknown:
+        raise ValueError(f"等级表{material}中有未知的系列: {', '.join(map(str, unknown))}")
+    protection = tier_value(tier, "armorProtection")
+    if "armor" in families and (not isinstance(protection, list) or len(protection) != 4):
+        raise ValueError(f"等级表{material}的armorProtection需要4个数值（靴子、护腿、胸甲、头盔）")
+    exclude = set(tier.get("exclude", []))
+    display_name = tier.get("displayName")
+
+    entries = []
+    for family in families:
+        for member, spec in FAMILIES[family].items():
+            if member in exclude:
+                continue
+            item = ItemSpec(f"{material}_{member}", spec["model"], spec["class"], tier=material, family=family)
+            if family == "tools":
+                item.attack_damage = spec["damage"]
+                item.attack_speed = spec["speed"]
+            elif family == "armor":
+                item.slot = spec["slot"]
+            if spec.get("tags"):
+                item.tags = [tag.format(material=material) for tag in spec["tags"]]
+            if display_name:
+                item.display_name = f"{display_name}{spec['zh']}"
+            entries.append(item.to_json(mod_id))
+    return entries
+
+
+def expand_tiers(mod_data, mod_id):
+    """
+    展开mod.json中的所有等级表，替换items数组中上次展开的条目（手写的条目和额外添加的字段保留）
+
+    :param mod_data: mod.json的内容（就地修改items数组）
+    :param mod_id: 模组ID
+    :return: (items是否变化, 错误列表)
+    """
+    items = [item for item in mod_data.get("items", []) if isinstance(item, dict)]
+    previous = {item.get("name"): item for item in items if "tier" in item}
+    result = [item for item in items if "tier" not in item]
+    taken = {item.get("name") for item in result}
+    taken.update(block.get("name") for block in mod_data.get("blocks", []) if isinstance(block, dict))
+    errors = []
+    for tier in mod_data.get("itemTiers", []):
+        try:
+            entries = expand_tier(tier, mod_id)
+        except ValueError as e:
+            errors.append(str(e))
+            continue
+        for entry in entries:
+            if entry["name"] in taken:
+                errors.append(f"物品{entry['name']}与已有的物品或方块重名，已跳过")
+                continue
+            taken.add(entry["name"])
+            merged = dict(previous.get(entry["name"], {}))
+            merged.update(entry)
+            result.append(merged)
+    changed = result != mod_data.get("items", [])
+    mod_data["items"] = result
+    return changed, errors
+
+
+def _split_location(location, default_namespace):
+    namespace, path = location.split(":", 1) if ":" in location else (default_namespace, location)
+    return namespace, path
+
+
+def ingredient_java(ref):
+    """
+    修复材料的Java表达式：#开头的为物品标签，否则为物品ID
+    """
+    if ref.startswith("#"):
+        namespace, path = _split_location(ref[1:], "minecraft")
+        return f'Ingredient.fromTag(ItemTags.createOptional(new ResourceLocation("{namespace}", "{path}")))'
+    namespace, path = _split_location(ref, "minecraft")
+    return f'Ingredient.fromItems(ForgeRegistries.ITEMS.getValue(new ResourceLocation("{namespace}", "{path}")))'
+
+
+def item_properties(item, item_group_class_name):
+    """
+    物品的Item.Properties表达式
+
+    :param item_group_class_name: 物品所在的ItemGroup类名，为None时不设置物品组
+    """
+    properties = "new Item.Properties()"
+    if item_group_class_name:
+        properties += f".group({item_group_class_name}.TAB)"
+    # 工具和盔甲由耐久度决定堆叠数
+    if item.get("itemClass", "Item") == "Item" and item.get("maxStackSize") not in (None, 64):
+        properties += f".maxStackSize({int(item['maxStackSize'])})"
+    rarity = str(item.get("rarity", "COMMON")).upper()
+    if rarity != "COMMON":
+        properties += f".rarity(Rarity.{rarity})"
+    if item.get("fireproof"):
+        properties += ".isImmuneToFire()"
+    return properties
+
+
+def build_item_registry(item, item_group_class_name):
+    """
+    生成单个物品在ModItems.java中的注册代码
+
+    :return: (注册代码字符串（以换行结尾）, 需要导入的类集合)
+    """
+    name = item["name"]
+    item_class = item.get("itemClass", "Item")
+    if item_class not in ITEM_CLASSES:
+        raise ValueError(f"物品{name}的物品类未知: {item_class}")
+    imports = {ITEM_CLASSES[item_class]}
+    properties = item_properties(item, item_group_class_name)
+    if ".rarity(" in properties:
+        imports.add("net.minecraft.item.Rarity")
+
+    if item_class == "ArmorItem":
+        imports.add("net.minecraft.inventory.EquipmentSlotType")
+        constructor = (f"new ArmorItem(ModArmorMaterial.{item['tier'].upper()}, "
+                       f"EquipmentSlotType.{item['slot']}, {properties})")
+    elif item_class != "Item":
+        damage = item.get("attackDamage", 0)
+        damage = _float(damage) if item_class in FLOAT_DAMAGE_CLASSES else str(int(damage))
+        constructor = (f"new {item_class}(ModItemTier.{item['tier'].upper()}, {damage}, "
+                       f"{_float(item.get('attackSpeed', 0))}, {properties})")
+    else:
+        constructor = f"new Item({properties})"
+
+    registry = (f"    public static final RegistryObject<Item> {name.upper()} = ITEMS.register(\"{name}\",\n"
+                f"            () -> {constructor});\n")
+    return registry, imports
+
+
+def render_item_tier_enum(package, tiers):
+    """
+    生成ModItemTier.java（实现IItemTier的枚举，每个带工具系列的等级表一个常量）
+    """
+    constants = []
+    for tier in tiers:
+        repair = tier.get("repair") or f"#forge:ingots/{tier['name']}"
+        constants.append(
+            f"    {tier['name'].upper()}({int(tier_value(tier, 'level'))}, {int(tier_value(tier, 'uses'))}, "
+            f"{_float(tier_value(tier, 'speed'))}, {_float(tier_value(tier, 'attackDamage'))}, "
+            f"{int(tier_value(tier, 'enchantability'))},\n"
+            f"            () -> {ingredient_java(repair)})")
+    return (
+        f"package {package};\n\n"
+        "import net.minecraft.item.IItemTier;\n"
+        "import net.minecraft.item.crafting.Ingredient;\n"
+        "import net.minecraft.tags.ItemTags;\n"
+        "import net.minecraft.util.LazyValue;\n"
+        "import net.minecraft.util.ResourceLocation;\n"
+        "import net.minecraftforge.registries.ForgeRegistries;\n\n"
+        "import java.util.function.Supplier;\n\n"
+        "// 由mod.json的itemTiers生成，修改请编辑mod.json\n"
+        "public enum ModItemTier implements IItemTier {\n"
+        + ",\n".join(constants) + ";\n\n"
+        "    private final int harvestLevel;\n"
+        "    private final int maxUses;\n"
+        "    private final float efficiency;\n"
+        "    private final float attackDamage;\n"
+        "    private final int enchantability;\n"
+        "    private final LazyValue<Ingredient> repairMaterial;\n\n"
+        "    ModItemTier(int harvestLevel, int maxUses, float efficiency, float attackDamage, int enchantability,\n"
+        "                Supplier<Ingredient> repairMaterial) {\n"
+        "        this.harvestLevel = harvestLevel;\n"
+        "        this.maxUses = maxUses;\n"
+        "        this.efficiency = efficiency;\n"
+        "        this.attackDamage = attackDamage;\n"
+        "        this.enchantability = enchantability;\n"
+        "        this.repairMaterial = new LazyValue<>(repairMaterial);\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public int getMaxUses() {\n"
+        "        return this.maxUses;\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public float getEfficiency() {\n"
+        "        return this.efficiency;\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public float getAttackDamage() {\n"
+        "        return this.attackDamage;\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public int getHarvestLevel() {\n"
+        "        return this.harvestLevel;\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public int getEnchantability() {\n"
+        "        return this.enchantability;\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public Ingredient getRepairMaterial() {\n"
+        "        return this.repairMaterial.getValue();\n"
+        "    }\n"
+        "}\n"
+    )
+
+
+def render_armor_material_enum(package, mod_id, tiers):
+    """
+    生成ModArmorMaterial.java（实现IArmorMaterial的枚举，每个带盔甲系列的等级表一个常量）
+    盔甲贴图为assets/{modid}/textures/models/armor/{材料}_layer_1.png和_layer_2.png
+    """
+    constants = []
+    for tier in tiers:
+        repair = tier.get("repair") or f"#forge:ingots/{tier['name']}"
+        protection = ", ".join(str(int(value)) for value in tier_value(tier, "armorProtection"))
+        constants.append(
+            f"    {tier['name'].upper()}(\"{mod_id}:{tier['name']}\", {int(tier_value(tier, 'armorDurability'))}, "
+            f"new int[]{{{protection}}}, {int(tier_value(tier, 'enchantability'))},\n"
+            f"            SoundEvents.{tier_value(tier, 'equipSound')}, {_float(tier_value(tier, 'toughness'))}, "
+            f"{_float(tier_value(tier, 'knockbackResistance'))},\n"
+            f"            () -> {ingredient_java(repair)})")
+    return (
+        f"package {package};\n\n"
+        "import net.minecraft.inventory.EquipmentSlotType;\n"
+        "import net.minecraft.item.IArmorMaterial;\n"
+        "import net.minecraft.item.crafting.Ingredient;\n"
+        "import net.minecraft.tags.ItemTags;\n"
+        "import net.minecraft.util.LazyValue;\n"
+        "import net.minecraft.util.ResourceLocation;\n"
+        "import net.minecraft.util.SoundEvent;\n"
+        "import net.minecraft.util.SoundEvents;\n"
+        "import net.minecraftforge.api.distmarker.Dist;\n"
+        "import net.minecraftforge.api.distmarker.OnlyIn;\n"
+        "import net.minecraftforge.registries.ForgeRegistries;\n\n"
+        "import java.util.function.Supplier;\n\n"
+        "// 由mod.json的itemTiers生成，修改请编辑mod.json\n"
+        "public enum ModArmorMaterial implements IArmorMaterial {\n"
+        + ",\n".join(constants) + ";\n\n"
+        "    private static final int[] MAX_DAMAGE_ARRAY = new int[]{13, 15, 16, 11};\n"
+        "    private final String name;\n"
+        "    private final int maxDamageFactor;\n"
+        "    private final int[] damageReductionAmountArray;\n"
+        "    private final int enchantability;\n"
+        "    private final SoundEvent soundEvent;\n"
+        "    private final float toughness;\n"
+        "    private final float knockbackResistance;\n"
+        "    private final LazyValue<Ingredient> repairMaterial;\n\n"
+        "    ModArmorMaterial(String name, int maxDamageFactor, int[] damageReductionAmountArray, int enchantability,\n"
+        "                     SoundEvent soundEvent, float toughness, float knockbackResistance,\n"
+        "                     Supplier<Ingredient> repairMaterial) {\n"
+        "        this.name = name;\n"
+        "        this.maxDamageFactor = maxDamageFactor;\n"
+        "        this.damageReductionAmountArray = damageReductionAmountArray;\n"
+        "        this.enchantability = enchantability;\n"
+        "        this.soundEvent = soundEvent;\n"
+        "        this.toughness = toughness;\n"
+        "        this.knockbackResistance = knockbackResistance;\n"
+        "        this.repairMaterial = new LazyValue<>(repairMaterial);\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public int getDurability(EquipmentSlotType slot) {\n"
+        "        return MAX_DAMAGE_ARRAY[slot.getIndex()] * this.maxDamageFactor;\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public int getDamageReductionAmount(EquipmentSlotType slot) {\n"
+        "        return this.damageReductionAmountArray[slot.getIndex()];\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public int getEnchantability() {\n"
+        "        return this.enchantability;\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public SoundEvent getSoundEvent() {\n"
+        "        return this.soundEvent;\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public Ingredient getRepairMaterial() {\n"
+        "        return this.repairMaterial.getValue();\n"
+        "    }\n\n"
+        "    @OnlyIn(Dist.CLIENT)\n"
+        "    @Override\n"
+        "    public String getName() {\n"
+        "        return this.name;\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public float getToughness() {\n"
+        "        return this.toughness;\n"
+        "    }\n\n"
+        "    @Override\n"
+        "    public float getKnockbackResistance() {\n"
+        "        return this.knockbackResistance;\n"
+        "    }\n"
+        "}\n"
+    )
+
+
+def item_model(item, mod_id):
+    """
+    物品模型：工具使用item/handheld，其他使用item/generated，贴图为textureName
+    """
+    parent = item.get("model")
+    if not isinstance(parent, str) or not parent.split(":", 1)[-1].startswith("item/"):
+        parent = "item/generated"
+    texture = item.get("textureName")
+    if not isinstance(texture, str) or ":" not in texture:
+        texture = f"{mod_id}:item/{item['name']}"
+    return {"parent": parent, "textures": {"layer0": texture}}
+
+
+class ItemGenerator:
+    """
+    根据mod.json的items数组生成ModItems.java的注册代码、工具等级和盔甲材料枚举以及物品模型
+    """
+
+    def __init__(self, project_dir, mod_id, base_package, item_group_class_name=None, main_class_name=None):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        :param mod_id: 模组ID
+        :param base_package: 基础包名
+        :param item_group_class_name: 物品所在的ItemGroup类名，为None时不设置物品组
+        :param main_class_name: 带@Mod注解的主类名（MainWindow.find_main_class），默认按模板的命名由modId推导
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.mod_id = mod_id
+        self.base_package = base_package
+        self.item_group_class_name = item_group_class_name
+        self.main_class_name = main_class_name or mod_id.replace('_', '').title() + "Mod"
+        mdk_path = os.path.join(self.project_dir, MDK_DIR_NAME)
+        self.item_dir = os.path.join(mdk_path, "src", "main", "java", *base_package.split("."), "item")
+        self.models_dir = os.path.join(mdk_path, "src", "main", "resources", "assets", mod_id, "models", "item")
+        self.manifest_path = os.path.join(get_state_dir(self.project_dir), MANIFEST_FILE)
+        self.generated = self._load_manifest()
+        self.optional = set()
+        self.skipped = []
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path, mod_id, base_package, item_group_class_name=None, main_class_name=None):
+        """
+        根据mod.json路径获取项目的物品生成器
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)), mod_id, base_package, item_group_class_name,
+                   main_class_name)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        return set(data.get("files", [])) if isinstance(data, dict) else set()
+
+    def save(self):
+        """
+        保存生成记录（事务提交后调用）
+        """
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"files": sorted(self.generated)}, separators=(",", ":")))
+        os.replace(temp_path, self.manifest_path)
+
+    def _relpath(self, path):
+        return os.path.relpath(path, self.project_dir).replace(os.sep, "/")
+
+    def render_mod_items(self, items, existing=None, item_groups=()):
+        """
+        渲染ModItems.java：已有文件只替换生成区域并补充导入，区域外的代码保留，
+        区域外已经手写注册的物品不再生成
+
+        :param items: mod.json的items数组
+        :param existing: 现有文件内容，没有时为None
+        :param item_groups: mod.json中的ItemGroup类名，物品的creativeTab是其中之一时使用该物品组
+        :return: 文件内容
+        """
+        mod_class_name = self.main_class_name
+        imports = {
+            f"{self.base_package}.{mod_class_name}",
+            "net.minecraft.item.Item",
+            "net.minecraftforge.eventbus.api.IEventBus",
+            "net.minecraftforge.fml.RegistryObject",
+            "net.minecraftforge.registries.DeferredRegister",
+            "net.minecraftforge.registries.ForgeRegistries",
+        }
+        declared = set()
+        if existing is not None:
+            begin = existing.find(REGION_BEGIN)
+            end = existing.find(REGION_END, begin)
+            outside = existing[:begin] + existing[end + len(REGION_END):] if begin != -1 and end != -1 else existing
+            declared = set(_FIELD_PATTERN.findall(outside))
+        registries = []
+        for item in items:
+            if item["name"].upper() in declared:
+                continue
+            group = item.get("creativeTab") if item.get("creativeTab") in item_groups else self.item_group_class_name
+            registry, item_imports = build_item_registry(item, group)
+            registries.append(registry)
+            imports.update(item_imports)
+            if group:
+                imports.add(f"{self.base_package}.group.{group}")
+        region = REGION_BEGIN + "\n".join(registries) + REGION_END
+
+        if existing is None:
+            return (
+                f"package {self.base_package}.item;\n\n"
+                + "".join(f"import {name};\n" for name in sorted(imports)) + "\n"
+                "public class ModItems {\n"
+                f"    public static final DeferredRegister<Item> ITEMS = DeferredRegister.create(ForgeRegistries.ITEMS, {mod_class_name}.MOD_ID);\n\n"
+                + region + "\n"
+                "    public static void register(IEventBus eventBus) {\n"
+                "        ITEMS.register(eventBus);\n"
+                "    }\n"
+                "}\n"
+            )
+
+        begin = existing.find(REGION_BEGIN)
+        end = existing.find(REGION_END, begin)
+        if begin != -1 and end != -1:
+            content = existing[:begin] + region + existing[end + len(REGION_END):]
+        else:
+            # 手写的ModItems.java：在register方法之前插入生成区域
+            register_index = existing.find("    public static void register(IEventBus eventBus) {")
+            if register_index == -1:
+                register_index = existing.rfind("}")
+            content = existing[:register_index] + region + "\n" + existing[register_index:]
+
+        missing = [name for name in sorted(imports) if f"import {name};" not in content]
+        if missing:
+            import_lines = "".join(f"import {name};\n" for name in missing)
+            last_import = content.rfind("\nimport ")
+            if last_import != -1:
+                insert_at = content.find("\n", last_import + 1) + 1
+            else:
+                insert_at = content.find("\n", content.find("package ")) + 1
+            content = content[:insert_at] + import_lines + content[insert_at:]
+        return content
+
+    @tracing.traced(category="codegen")
+    def render(self, mod_data):
+        """
+        在内存中渲染所有输出文件
+
+        :return: ({文件路径: 内容bytes}, 错误列表)
+        """
+        items = []
+        errors = []
+        for item in mod_data.get("items", []):
+            name = item.get("name") if isinstance(item, dict) else None
+            if not isinstance(name, str) or not _NAME_PATTERN.match(name):
+                errors.append(f"物品名称无效: {name!r}")
+                continue
+            if item.get("itemClass", "Item") not in ITEM_CLASSES:
+                errors.append(f"物品{name}的物品类未知: {item.get('itemClass')}")
+                continue
+            items.append(item)
+
+        tiers = {tier.get("name"): tier for tier in mod_data.get("itemTiers", []) if isinstance(tier, dict)}
+        used_tiers = {(item.get("family"), item.get("tier")) for item in items if "tier" in item}
+        tool_tiers = [tier for name, tier in tiers.items() if ("tools", name) in used_tiers]
+        armor_tiers = [tier for name, tier in tiers.items() if ("armor", name) in used_tiers]
+        # 等级表已删除但条目还在的工具/盔甲没有对应的枚举常量，不能生成注册代码
+        known = {("tools", tier["name"]) for tier in tool_tiers} | {("armor", tier["name"]) for tier in armor_tiers}
+        for item in [item for item in items if item.get("itemClass", "Item") != "Item"]:
+            if (item.get("family"), item.get("tier")) not in known:
+                errors.append(f"物品{item['name']}的等级表不存在: {item.get('tier')}")
+                items.remove(item)
+
+        outputs = {}
+        mod_items_path = os.path.join(self.item_dir, "ModItems.java")
+        existing = journal.read_text(mod_items_path) if journal.exists(mod_items_path) else None
+        item_groups = {group.get("name") for group in mod_data.get("itemGroups", []) if isinstance(group, dict)}
+        outputs[mod_items_path] = self.render_mod_items(items, existing, item_groups).encode("utf-8")
+        package = f"{self.base_package}.item"
+        if tool_tiers:
+            outputs[os.path.join(self.item_dir, "ModItemTier.java")] = \
+                render_item_tier_enum(package, tool_tiers).encode("utf-8")
+        if armor_tiers:
+            outputs[os.path.join(self.item_dir, "ModArmorMaterial.java")] = \
+                render_armor_material_enum(package, self.mod_id, armor_tiers).encode("utf-8")
+        self.optional = set()
+        for item in items:
+            path = os.path.join(self.models_dir, f"{item['name']}.json")
+            outputs[path] = dump(item_model(item, self.mod_id)).encode("utf-8")
+            if "tier" not in item:
+                # 手写物品已有的模型直接保留，不需要报告
+                self.optional.add(path)
+        return outputs, errors
+
+    @tracing.traced(category="codegen")
+    def apply(self, outputs):
+        """
+        写入渲染好的文件：内容未变化的不写，不是由本模块生成的同名文件不覆盖，
+        上次生成、这次不再生成的删除。需要在事务中调用
+
+        :return: (写入数, 未变化数, 删除数)
+        """
+        written = unchanged = removed = 0
+        self.skipped = []
+        generated = set()
+        mod_items_path = os.path.join(self.item_dir, "ModItems.java")
+        for path, content in outputs.items():
+            rel_path = self._relpath(path)
+            exists = journal.exists(path)
+            existing = journal.read_bytes(path) if exists else None
+            if existing is not None and path != mod_items_path and rel_path not in self.generated \
+                    and existing != content:
+                # 手写的模型或枚举，保留不动
+                if path not in self.optional:
+                    self.skipped.append(rel_path)
+                continue
+            if path != mod_items_path:
+                generated.add(rel_path)
+            if existing == content:
+                unchanged += 1
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            journal.write_bytes(path, content)
+            written += 1
+        for rel_path in sorted(self.generated - generated):
+            path = os.path.join(self.project_dir, *rel_path.split("/"))
+            if journal.exists(path):
+                journal.remove(path)
+                removed += 1
+        self.generated = generated
+        return written, unchanged, removed
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+资源快速打包模块
+当自上次成功构建以来只修改了src/main/resources下的文件（blockstate、模型、战利品表、贴图等）时，
+直接改写build/libs中已构建的jar，而不必再执行一次完整的Gradle构建
+
+成功构建后记录清单（.forgecreator/resource_manifest.json）：每个资源文件的sha256、
+Java源码和构建脚本的整体哈希，以及jar本身的哈希。快速打包时：
+    - Java源码或构建脚本有变化、jar被其他方式重新生成 -> 需要完整构建
+    - 否则只重写变化/新增的资源条目，删除已删除资源的条目；
+      其余条目按原始压缩数据直接复制（不解压、不重新压缩）
+"""
+
+import os
+import json
+import zlib
+import time
+import struct
+import hashlib
+import zipfile
+
+from journal import get_state_dir
+
+
+# 清单文件名
+MANIFEST_FILE = "resource_manifest.json"
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+# 除资源以外会影响jar内容的构建输入（相对于MDK目录）
+BUILD_INPUT_FILES = ("build.gradle", "gradle.properties", "settings.gradle")
+BUILD_INPUT_DIRS = (os.path.join("src", "main", "java"),)
+
+# 不是模组主jar的构建产物
+NON_MAIN_JAR_SUFFIXES = ("-sources.jar", "-javadoc.jar", "-api.jar", "-slim.jar")
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+_LOCAL_SIGNATURE = 0x04034b50
+_CENTRAL_SIGNATURE = 0x02014b50
+_END_SIGNATURE = 0x06054b50
+_ZIP32_LIMIT = 0xFFFFFFFF
+_UTF8_FLAG = 0x800
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+
+class FullBuildRequired(Exception):
+    """
+    无法快速打包，需要执行完整的Gradle构建
+    """
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _walk_files(root):
+    """
+    遍历目录下的所有文件
+
+    :return: [(相对路径（/分隔）, 绝对路径)]，按相对路径排序
+    """
+    files = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            files.append((os.path.relpath(path, root).replace(os.sep, "/"), path))
+    files.sort()
+    return files
+
+
+def find_main_jar(mdk_path):
+    """
+    查找build/libs中的模组主jar（最近生成的非sources/javadoc jar）
+
+    :return: jar路径，不存在时返回None
+    """
+    libs_dir = os.path.join(mdk_path, "build", "libs")
+    if not os.path.isdir(libs_dir):
+        return None
+    jars = [os.path.join(libs_dir, name) for name in os.listdir(libs_dir)
+            if name.endswith(".jar") and not name.endswith(NON_MAIN_JAR_SUFFIXES)]
+    if not jars:
+        return None
+    return max(jars, key=os.path.getmtime)
+
+
+def _encode_name(name):
+    """
+    编码条目名称，非ASCII名称使用UTF-8并设置对应标志位
+    """
+    try:
+        return name.encode("ascii"), 0
+    except UnicodeEncodeError:
+        return name.encode("utf-8"), _UTF8_FLAG
+
+
+def _strip_zip64_extra(extra):
+    """
+    去掉extra字段中的zip64扩展块（复制后的条目不使用zip64）
+    """
+    result = bytearray()
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, length = struct.unpack("<HH", extra[position:position + 4])
+        block = extra[position:position + 4 + length]
+        if header_id != 0x0001:
+            result += block
+        position += 4 + length
+    return bytes(result)
+
+
+def _dos_datetime(timestamp):
+    t = time.localtime(timestamp)
+    year = max(t.tm_year, 1980)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+class _JarWriter:
+    """
+    最小的zip写入器：支持按原始压缩数据复制条目，也支持写入新的deflate条目（不支持zip64）
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.central = []
+
+    def _write_entry(self, name, flags, method, dos_time, dos_date, crc, compressed, size, extra,
+                     external_attr, data_chunks):
+        if compressed > _ZIP32_LIMIT or size > _ZIP32_LIMIT or self.fp.tell() > _ZIP32_LIMIT:
+            raise FullBuildRequired("jar过大（需要zip64），无法快速打包")
+        name_bytes, name_flag = _encode_name(name)
+        flags = (flags & ~(_DATA_DESCRIPTOR_FLAG | _UTF8_FLAG)) | name_flag
+        offset = self.fp.tell()
+        self.fp.write(_LOCAL_HEADER.pack(_LOCAL_SIGNATURE, 20, flags, method, dos_time, dos_date,
+                                         crc, compressed, size, len(name_bytes), len(extra)))
+        self.fp.write(name_bytes)
+        self.fp.write(extra)
+        for chunk in data_chunks:
+            self.fp.write(chunk)
+        self.central.append((name_bytes, flags, method, dos_time, dos_date, crc, compressed, size,
+                             extra, external_attr, offset))
+
+    def copy_raw(self, source_fp, info):
+        """
+        按原始压缩数据复制源jar中的条目
+        """
+        source_fp.seek(info.header_offset)
+        header = source_fp.read(_LOCAL_HEADER.size)
+        if len(header) != _LOCAL_HEADER.size or _LOCAL_HEADER.unpack(header)[0] != _LOCAL_SIGNATURE:
+            raise FullBuildRequired(f"jar条目头损坏: {info.filename}")
+        name_length, extra_length = _LOCAL_HEADER.unpack(header)[9:11]
+        source_fp.seek(info.header_offset + _LOCAL_HEADER.size + name_length + extra_length)
+
+        def chunks(remaining=info.compress_size):
+            while remaining > 0:
+                chunk = source_fp.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    raise FullBuildRequired(f"jar条目数据不完整: {info.filename}")
+                remaining -= len(chunk)
+                yield chunk
+
+        dos_time = (info.date_time[3] << 11) | (info.date_time[4] << 5) | (info.date_time[5] // 2)
+        dos_date = ((info.date_time[0] - 1980) << 9) | (info.date_time[1] << 5) | info.date_time[2]
+        self._write_entry(info.filename, info.flag_bits, info.compress_type, dos_time, dos_date,
+                          info.CRC, info.compress_size, info.file_size, _strip_zip64_extra(info.extra),
+                          info.external_attr, chunks())
+
+    def write_file(self, name, data, timestamp):
+        """
+        写入新的条目（deflate压缩）
+        """
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+        dos_time, dos_date = _dos_datetime(timestamp)
+        self._write_entry(name, 0, zipfile.ZIP_DEFLATED, dos_time, dos_date, zlib.crc32(data) & 0xFFFFFFFF,
+                          len(compressed), len(data), b"", 0o100644 << 16, [compressed])
+
+    def close(self, comment=b""):
+        """
+        写入中央目录和结束记录
+        """
+        start = self.fp.tell()
+        for (name_bytes, flags, method, dos_time, dos_date, crc, compressed, size,
+             extra, external_attr, offset) in self.central:
+            self.fp.write(_CENTRAL_HEADER.pack(_CENTRAL_SIGNATURE, 20, 20, flags, method, dos_time, dos_date,
+                                               crc, compressed, size, len(name_bytes), len(extra), 0, 0, 0,
+                                               external_attr, offset))
+            self.fp.write(name_bytes)
+            self.fp.write(extra)
+        size = self.fp.tell() - start
+        if len(self.central) > 0xFFFF or start > _ZIP32_LIMIT:
+            raise FullBuildRequired("jar条目过多（需要zip64），无法快速打包")
+        self.fp.write(_END_RECORD.pack(_END_SIGNATURE, 0, 0, len(self.central), len(self.central),
+                                       size, start, len(comment)))
+        self.fp.write(comment)
+
+
+class ResourcePatchPlan:
+    """
+    一次快速打包需要做的修改
+    """
+
+    def __init__(self, jar_path, changed, removed, resources):
+        """
+        :param jar_path: 要改写的jar
+        :param changed: 变化或新增的资源 {条目名: 文件路径}
+        :param removed: 已删除资源的条目名集合
+        :param resources: 当前所有资源的哈希 {条目名: sha256}
+        """
+        self.jar_path = jar_path
+        self.changed = changed
+        self.removed = removed
+        self.resources = resources
+
+    @property
+    def empty(self) -> bool:
+        return not self.changed and not self.removed
+
+
+class ResourcePatcher:
+    """
+    项目的资源快速打包器
+    """
+
+    def __init__(self, project_dir):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.mdk_path = os.path.join(self.project_dir, MDK_DIR_NAME)
+        self.resources_dir = os.path.join(self.mdk_path, "src", "main", "resources")
+        self.manifest_path = os.path.join(get_state_dir(self.project_dir), MANIFEST_FILE)
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path):
+        """
+        根据mod.json路径获取项目的资源快速打包器
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)))
+
+    def hash_resources(self):
+        """
+        计算所有资源文件的哈希
+
+        :return: {jar条目名: sha256}
+        """
+        return {rel_path: _sha256_file(path) for rel_path, path in _walk_files(self.resources_dir)}
+
+    def hash_build_inputs(self):
+        """
+        计算Java源码和构建脚本的整体哈希（资源以外会影响jar内容的输入）
+        """
+        digest = hashlib.sha256()
+        paths = [(name, os.path.join(self.mdk_path, name)) for name in BUILD_INPUT_FILES]
+        for directory in BUILD_INPUT_DIRS:
+            paths += [(f"{directory}/{rel}", path) for rel, path in _walk_files(os.path.join(self.mdk_path, directory))]
+        for rel_path, path in paths:
+            if os.path.isfile(path):
+                digest.update(rel_path.replace(os.sep, "/").encode("utf-8") + b"\0")
+                digest.update(_sha256_file(path).encode("ascii") + b"\n")
+        return digest.hexdigest()
+
+    def load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return None
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError:
+            return None
+
+    def _save_manifest(self, jar_path, resources, build_inputs):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        manifest = {
+            "jar": os.path.relpath(jar_path, self.mdk_path).replace(os.sep, "/"),
+            "jarSha256": _sha256_file(jar_path),
+            "buildInputs": build_inputs,
+            "resources": resources,
+        }
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def snapshot(self):
+        """
+        在启动构建之前调用：计算资源和构建输入的哈希
+        构建期间被修改的文件不会被记录为“已构建”，之后的快速打包仍会把它们写入jar
+
+        :return: (资源哈希, 构建输入哈希)，传给record_build
+        """
+        return self.hash_resources(), self.hash_build_inputs()
+
+    def record_build(self, snapshot=None):
+        """
+        完整构建成功后调用：记录构建开始前的资源、构建输入和jar的哈希
+
+        :param snapshot: 构建开始前snapshot()的结果，为None时使用当前的哈希
+        :return: 记录的jar路径，没有找到jar时返回None
+        """
+        jar_path = find_main_jar(self.mdk_path)
+        if jar_path is None:
+            return None
+        resources, build_inputs = snapshot if snapshot is not None else self.snapshot()
+        self._save_manifest(jar_path, resources, build_inputs)
+        return jar_path
+
+    def plan(self):
+        """
+        计算快速打包需要的修改
+
+        :return: ResourcePatchPlan
+        :raises FullBuildRequired: 无法快速打包（没有构建记录、jar已变化或修改了Java源码/构建脚本）
+        """
+        manifest = self.load_manifest()
+        if manifest is None:
+            raise FullBuildRequired("还没有成功构建的记录")
+        jar_path = os.path.join(self.mdk_path, manifest["jar"])
+        if not os.path.exists(jar_path):
+            raise FullBuildRequired(f"jar不存在: {jar_path}")
+        if _sha256_file(jar_path) != manifest.get("jarSha256"):
+            raise FullBuildRequired("jar在上次记录之后被重新生成或修改")
+        if self.hash_build_inputs() != manifest.get("buildInputs"):
+            raise FullBuildRequired("Java源码或构建脚本在上次构建之后有修改")
+
+        resources = self.hash_resources()
+        previous = manifest.get("resources", {})
+        changed = {name: os.path.join(self.resources_dir, *name.split("/"))
+                   for name, digest in resources.items() if previous.get(name) != digest}
+        removed = set(previous) - set(resources)
+        return ResourcePatchPlan(jar_path, changed, removed, resources)
+
+    def apply(self, plan):
+        """
+        改写jar：复制未变化的条目（原始压缩数据），写入变化的资源，去掉已删除的资源
+        改写后的jar先写入临时文件再替换原文件
+
+        :param plan: plan()的返回值
+        :return: (写入的条目数, 删除的条目数, 原样复制的条目数)
+        """
+        if plan.empty:
+            return 0, 0, 0
+
+        jar_path = plan.jar_path
+        temp_path = os.path.join(os.path.dirname(jar_path), f".{os.path.basename(jar_path)}.tmp")
+        copied = 0
+        try:
+            with zipfile.ZipFile(jar_path) as source, open(jar_path, 'rb') as source_fp, \
+                    open(temp_path, 'wb') as target_fp:
+                writer = _JarWriter(target_fp)
+                for info in source.infolist():
+                    if info.filename in plan.changed or info.filename in plan.removed:
+                        continue
+                    writer.copy_raw(source_fp, info)
+                    copied += 1
+                for name, path in sorted(plan.changed.items()):
+                    with open(path, 'rb') as f:
+                        writer.write_file(name, f.read(), os.path.getmtime(path))
+                writer.close(source.comment)
+            os.replace(temp_path, jar_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self._save_manifest(jar_path, plan.resources, self.hash_build_inputs())
+        return len(plan.changed), len(plan.removed), copied
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Java源码预检查模块
+在调用Gradle之前，用纯Python的词法分析检查生成的Java代码中的常见错误，每个文件只需几毫秒：
+    - 括号不匹配、注释/字符串未结束
+    - 同一个类中重复的字段名
+    - 重复或冲突的import
+    - 使用了未导入的类型（如SoundType、ToolType、基础方块类）
+    - AbstractBlock.Properties / Item.Properties上不存在的方法（如.waterlogged()）
+
+文件按顶层成员（以类体层级的;或}结束）切分为片段，每个片段的分析结果可以复用。
+再次检查同一文件时，只重新分析与上次内容相比发生变化的区间所在的片段，
+之后一旦片段边界与旧边界重新对齐，就直接复用剩余的旧片段
+"""
+
+import os
+import re
+import bisect
+import difflib
+
+
+# 词法记号
+_TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<open_comment>/\*.*)
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<char>'(?:[^'\\\n]|\\.)+')
+  | (?P<open_string>["'][^\n]*)
+  | (?P<number>\.?\d[\w.]*)
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<op>->|::|\.\.\.|[{}()\[\];,.@=<>?:!~+\-*/&|^%])
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+_OPENING = {"(": ")", "[": "]", "{": "}"}
+_CLOSING = {")": "(", "]": "[", "}": "{"}
+
+# java.lang中无需导入的常用类型
+JAVA_LANG_TYPES = {
+    "Object", "String", "StringBuilder", "Integer", "Long", "Short", "Byte", "Character", "Boolean",
+    "Float", "Double", "Number", "Math", "System", "Thread", "Runnable", "Class", "Enum", "Iterable",
+    "Exception", "RuntimeException", "Error", "Throwable", "IllegalArgumentException",
+    "IllegalStateException", "NullPointerException", "UnsupportedOperationException",
+    "Override", "Deprecated", "SuppressWarnings", "FunctionalInterface", "SafeVarargs", "Void",
+    "Comparable", "CharSequence", "AutoCloseable", "Cloneable",
+}
+
+# 常用类型的完整类名，用于提示缺少的import
+KNOWN_TYPES = {
+    "Block": "net.minecraft.block.Block",
+    "AbstractBlock": "net.minecraft.block.AbstractBlock",
+    "SoundType": "net.minecraft.block.SoundType",
+    "Material": "net.minecraft.block.material.Material",
+    "ToolType": "net.minecraftforge.common.ToolType",
+    "Item": "net.minecraft.item.Item",
+    "BlockItem": "net.minecraft.item.BlockItem",
+    "ItemGroup": "net.minecraft.item.ItemGroup",
+    "ItemStack": "net.minecraft.item.ItemStack",
+    "RegistryObject": "net.minecraftforge.fml.RegistryObject",
+    "DeferredRegister": "net.minecraftforge.registries.DeferredRegister",
+    "ForgeRegistries": "net.minecraftforge.registries.ForgeRegistries",
+    "IEventBus": "net.minecraftforge.eventbus.api.IEventBus",
+    "Supplier": "java.util.function.Supplier",
+    "Arrays": "java.util.Arrays",
+    "List": "java.util.List",
+    "Map": "java.util.Map",
+}
+
+# 1.16.5 AbstractBlock.Properties的方法
+# 生成器使用MCP名称，而MDK模板默认使用官方映射，两种映射中存在的方法都视为有效
+BLOCK_PROPERTIES_METHODS = {
+    # MCP映射
+    "doesNotBlockMovement", "notSolid", "slipperiness", "speedFactor", "jumpFactor", "sound",
+    "setLightLevel", "hardnessAndResistance", "zeroHardnessAndResistance", "tickRandomly",
+    "variableOpacity", "noDrops", "lootFrom", "setAir", "setAllowsSpawn", "setOpaque", "setSuffocates",
+    "setBlocksVision", "setNeedsPostProcessing", "setEmmisiveRendering", "setRequiresTool",
+    # 官方映射
+    "noCollission", "noOcclusion", "friction", "lightLevel", "strength", "instabreak", "randomTicks",
+    "dynamicShape", "dropsLike", "air", "isValidSpawn", "isRedstoneConductor", "isSuffocating",
+    "isViewBlocking", "hasPostProcess", "emissiveRendering", "requiresCorrectToolForDrops",
+    # Forge扩展
+    "harvestLevel", "harvestTool",
+}
+
+# 1.16.5 Item.Properties的方法（MCP映射、官方映射与Forge扩展）
+ITEM_PROPERTIES_METHODS = {
+    "food", "maxStackSize", "defaultMaxDamage", "maxDamage", "containerItem", "group", "rarity",
+    "isImmuneToFire",
+    "stacksTo", "defaultDurability", "durability", "craftRemainder", "tab", "fireResistant",
+    "setNoRepair", "addToolType", "setISTER",
+}
+
+# 有特别说明的错误方法
+PROPERTIES_HINTS = {
+    "waterlogged": "含水方块需要方块类实现IWaterLoggable，不能通过Properties设置",
+}
+
+
+class Issue:
+    """
+    一条检查结果
+    """
+
+    __slots__ = ("path", "line", "column", "severity", "message")
+
+    def __init__(self, path, line, column, severity, message):
+        self.path = path
+        self.line = line
+        self.column = column
+        self.severity = severity  # "error" 或 "warning"
+        self.message = message
+
+    def __str__(self):
+        kind = "错误" if self.severity == "error" else "警告"
+        location = f"{self.path}:{self.line}:{self.column}" if self.path else f"{self.line}:{self.column}"
+        return f"{location}: {kind}: {self.message}"
+
+    def __repr__(self):
+        return f"Issue({self})"
+
+
+class _Segment:
+    """
+    一个顶层片段及其分析结果（偏移量都相对于片段起点）
+    """
+
+    __slots__ = ("start", "end", "depth", "end_depth", "facts", "brackets")
+
+    def __init__(self, start, end, depth, end_depth, facts, brackets):
+        self.start = start
+        self.end = end
+        self.depth = depth          # 片段开始时的花括号层级
+        self.end_depth = end_depth  # 片段结束时的花括号层级
+        self.facts = facts          # [(类型, 值, 相对偏移)]
+        self.brackets = brackets    # [(括号字符, 相对偏移)]
+
+    def shifted(self, delta):
+        return _Segment(self.start + delta, self.end + delta, self.depth, self.end_depth,
+                        self.facts, self.brackets)
+
+
+def _is_type_name(name):
+    """
+    看起来像类型名的标识符：首字母大写且包含小写字母（排除常量和单字母类型参数）
+    """
+    return name[0].isupper() and any(c.islower() for c in name)
+
+
+def _matching(tokens, index):
+    """
+    找到tokens[index]处左括号对应的右括号位置，找不到时返回len(tokens)
+    """
+    depth = 0
+    for i in range(index, len(tokens)):
+        value = tokens[i][1]
+        if value in _OPENING:
+            depth += 1
+        elif value in _CLOSING:
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(tokens)
+
+
+def _analyze(tokens, depth, start):
+    """
+    分析一个片段的记号，提取检查需要的事实
+
+    :param tokens: [(类型, 值, 绝对偏移)]
+    :param depth: 片段开始时的花括号层级
+    :param start: 片段起点（用于计算相对偏移）
+    :return: (facts, brackets)
+    """
+    facts = []
+    brackets = []
+    values = [token[1] for token in tokens]
+    count = len(tokens)
+
+    for kind, value, offset in tokens:
+        if kind in ("open_comment", "open_string"):
+            facts.append(("unterminated", "注释" if kind == "open_comment" else "字符串", offset - start))
+        elif value in _OPENING or value in _CLOSING:
+            brackets.append((value, offset - start))
+
+    if not tokens:
+        return facts, brackets
+
+    # package / import（文件顶层）
+    if depth == 0 and values[0] in ("package", "import"):
+        is_static = count > 1 and values[1] == "static"
+        name_tokens = []
+        for value in values[2 if is_static else 1:]:
+            if value == ";":
+                break
+            name_tokens.append(value)
+        facts.append((values[0], ("".join(name_tokens), is_static), tokens[0][2] - start))
+        return facts, brackets
+
+    # 类型声明与类型参数
+    for i, value in enumerate(values[:-1]):
+        if value in ("class", "interface", "enum") and tokens[i + 1][0] == "ident":
+            facts.append(("declare", values[i + 1], tokens[i + 1][2] - start))
+        elif value == "<" and tokens[i + 1][0] == "ident" and i + 2 < count and values[i + 2] in ("extends", ">", ","):
+            facts.append(("declare", values[i + 1], tokens[i + 1][2] - start))
+
+    # 类体中的字段声明：成员开头到第一个(或{之前出现=，或者以;结束且没有(
+    if depth == 1:
+        paren = 0
+        for i, value in enumerate(values):
+            if value in ("(", "{"):
+                break
+            if value == "=" and i > 0 and tokens[i - 1][0] == "ident":
+                facts.append(("field", values[i - 1], tokens[i - 1][2] - start))
+                break
+            if value == ";" and i > 0 and tokens[i - 1][0] == "ident" and paren == 0:
+                facts.append(("field", values[i - 1], tokens[i - 1][2] - start))
+                break
+
+    # 类型引用（不包括a.B形式的成员访问）
+    for i, (kind, value, offset) in enumerate(tokens):
+        if kind == "ident" and _is_type_name(value) and (i == 0 or values[i - 1] != "."):
+            facts.append(("ref", value, offset - start))
+
+    # Properties调用链：AbstractBlock.Properties.create(...).xxx(...)  /  new Item.Properties().xxx(...)
+    for i in range(count - 3):
+        chain = None
+        if values[i] == "Properties" and values[i + 1] == "." and values[i + 2] in ("create", "from", "of", "copy") \
+                and values[i + 3] == "(" and i > 1 and values[i - 1] == "." and values[i - 2] in ("AbstractBlock", "Block"):
+            chain, call = "block", i + 3
+        elif values[i] == "Properties" and values[i + 1] == "(" and i > 2 and values[i - 1] == "." \
+                and values[i - 2] == "Item" and values[i - 3] == "new":
+            chain, call = "item", i + 1
+        if chain is None:
+            continue
+        j = _matching(tokens, call) + 1
+        while j + 2 < count and values[j] == "." and tokens[j + 1][0] == "ident" and values[j + 2] == "(":
+            facts.append(("call", (chain, values[j + 1]), tokens[j + 1][2] - start))
+            j = _matching(tokens, j + 2) + 1
+
+    return facts, brackets
+
+
+def _common_length(a, b, limit, reverse):
+    """
+    二分查找a、b相同前缀（reverse为True时为相同后缀）的长度，比较在切片上进行，比逐字符循环快得多
+    """
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if reverse:
+            same = a[len(a) - middle:] == b[len(b) - middle:]
+        else:
+            same = a[:middle] == b[:middle]
+        if same:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _scan_segments(text, pos, depth):
+    """
+    从pos开始（必须位于片段边界）逐个生成片段
+
+    :return: 生成器，元素为_Segment
+    """
+    length = len(text)
+    tokens = []
+    segment_start = pos
+    segment_depth = depth
+    match = _TOKEN.match
+    while pos < length:
+        m = match(text, pos)
+        kind = m.lastgroup
+        end = m.end()
+        if kind not in ("ws", "comment"):
+            value = m.group()
+            tokens.append((kind, value, pos))
+            boundary = False
+            if value == "{":
+                depth += 1
+                boundary = depth == 1
+            elif value == "}":
+                depth -= 1
+                boundary = depth <= 1
+            elif value == ";":
+                boundary = depth <= 1
+            if boundary:
+                facts, brackets = _analyze(tokens, segment_depth, segment_start)
+                yield _Segment(segment_start, end, segment_depth, depth, facts, brackets)
+                tokens = []
+                segment_start = end
+                segment_depth = depth
+        pos = end
+    facts, brackets = _analyze(tokens, segment_depth, segment_start)
+    yield _Segment(segment_start, length, segment_depth, depth, facts, brackets)
+
+
+class JavaChecker:
+    """
+    Java源码检查器
+    同一个实例会缓存每个文件上次的内容和片段，重复检查时只重新分析变化的部分
+    """
+
+    def __init__(self):
+        # 文件路径 -> (上次的内容, 片段列表)
+        self._files = {}
+        # 统计：重新分析的片段数 / 复用的片段数
+        self.segments_scanned = 0
+        self.segments_reused = 0
+
+    def _segments(self, text, key):
+        """
+        获取text的片段列表，尽量复用key对应的上次结果
+        """
+        previous = self._files.get(key)
+        if previous is None or not previous[1]:
+            segments = list(_scan_segments(text, 0, 0))
+            self.segments_scanned += len(segments)
+            self._files[key] = (text, segments)
+            return segments
+
+        old_text, old_segments = previous
+        if old_text == text:
+            self.segments_reused += len(old_segments)
+            return old_segments
+
+        # 相同的前缀和后缀
+        limit = min(len(old_text), len(text))
+        prefix = _common_length(old_text, text, limit, reverse=False)
+        suffix = _common_length(old_text, text, limit - prefix, reverse=True)
+        delta = len(text) - len(old_text)
+
+        # 完全位于相同前缀中的片段直接复用（片段末尾的字符也必须未变，边界才可靠）
+        first = 0
+        while first < len(old_segments) and old_segments[first].end < prefix:
+            first += 1
+        segments = old_segments[:first]
+        self.segments_reused += first
+        restart = old_segments[first].start if first < len(old_segments) else len(text)
+        restart_depth = old_segments[first].depth if first < len(old_segments) else 0
+
+        # 旧片段的起点 -> 索引，用于判断新边界能否与旧边界对齐
+        old_starts = {segment.start: index for index, segment in enumerate(old_segments)}
+        unchanged_from = len(text) - suffix
+        for segment in _scan_segments(text, restart, restart_depth):
+            segments.append(segment)
+            self.segments_scanned += 1
+            old_index = old_starts.get(segment.end - delta)
+            if segment.end >= unchanged_from and old_index is not None \
+                    and old_segments[old_index].depth == segment.end_depth and segment.end < len(text):
+                rest = [old.shifted(delta) for old in old_segments[old_index:]]
+                segments.extend(rest)
+                self.segments_reused += len(rest)
+                break
+
+        self._files[key] = (text, segments)
+        return segments
+
+    def check_text(self, text, path=None, same_package_types=()):
+        """
+        检查一段Java源码
+
+        :param text: 源码
+        :param path: 文件路径（用于报告和增量缓存）
+        :param same_package_types: 同一包中其他类的类名（无需导入）
+        :return: Issue列表
+        """
+        segments = self._segments(text, path or "<text>")
+        newlines = [m.start() for m in re.finditer("\n", text)]
+
+        def location(offset):
+            line = bisect.bisect_left(newlines, offset)
+            column = offset - (newlines[line - 1] + 1 if line > 0 else 0)
+            return line + 1, column + 1
+
+        issues = []
+
+        def add(offset, severity, message):
+            line, column = location(offset)
+            issues.append(Issue(path, line, column, severity, message))
+
+        # 括号匹配
+        stack = []
+        for segment in segments:
+            for char, relative in segment.brackets:
+                offset = segment.start + relative
+                if char in _OPENING:
+                    stack.append((char, offset))
+                elif not stack:
+                    add(offset, "error", f"多余的'{char}'")
+                elif stack[-1][0] != _CLOSING[char]:
+                    add(offset, "error", f"'{stack[-1][0]}'与'{char}'不匹配")
+                    stack.pop()
+                else:
+                    stack.pop()
+        for char, offset in stack:
+            add(offset, "error", f"'{char}'没有闭合")
+
+        imports = {}
+        wildcard_import = False
+        declared = set(same_package_types)
+        fields = {}
+        refs = []
+        calls = []
+        for segment in segments:
+            for kind, value, relative in segment.facts:
+                offset = segment.start + relative
+                if kind == "unterminated":
+                    add(offset, "error", f"{value}没有结束")
+                elif kind == "import":
+                    name, is_static = value
+                    if is_static:
+                        continue
+                    simple = name.rsplit(".", 1)[-1]
+                    if simple == "*":
+                        wildcard_import = True
+                    elif simple in imports:
+                        if imports[simple] == name:
+                            add(offset, "warning", f"重复的import: {name}")
+                        else:
+                            add(offset, "error", f"import冲突: {name} 与 {imports[simple]}")
+                    else:
+                        imports[simple] = name
+                elif kind == "declare":
+                    declared.add(value)
+                elif kind == "field":
+                    if value in fields:
+                        line, _ = location(fields[value])
+                        add(offset, "error", f"重复的字段: {value}（第{line}行已定义）")
+                    else:
+                        fields[value] = offset
+                elif kind == "ref":
+                    refs.append((value, offset))
+                elif kind == "call":
+                    calls.append((value, offset))
+
+        # 未导入的类型
+        reported = set()
+        for name, offset in refs:
+            if name in reported or name in imports or name in declared or name in JAVA_LANG_TYPES:
+                continue
+            if wildcard_import and name not in KNOWN_TYPES:
+                continue
+            reported.add(name)
+            suggestion = KNOWN_TYPES.get(name)
+            if suggestion is None and name.endswith("Block"):
+                suggestion = f"net.minecraft.block.{name}"
+            hint = f"，需要 import {suggestion};" if suggestion else ""
+            add(offset, "error", f"未导入的类型: {name}{hint}")
+
+        # Properties上不存在的方法
+        for (chain, method), offset in calls:
+            known = BLOCK_PROPERTIES_METHODS if chain == "block" else ITEM_PROPERTIES_METHODS
+            if method in known:
+                continue
+            owner = "AbstractBlock.Properties" if chain == "block" else "Item.Properties"
+            hint = PROPERTIES_HINTS.get(method)
+            if hint is None:
+                close = difflib.get_close_matches(method, known, n=1)
+                hint = f"是否是 {close[0]}()？" if close else ""
+            add(offset, "error", f"{owner}没有方法 {method}()" + (f"：{hint}" if hint else ""))
+
+        issues.sort(key=lambda issue: (issue.line, issue.column))
+        return issues
+
+    def check_file(self, path):
+        """
+        检查一个Java文件（同目录下的其他类视为同一个包，无需导入）
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        directory = os.path.dirname(os.path.abspath(path))
+        same_package = [name[:-5] for name in os.listdir(directory) if name.endswith(".java")]
+        return self.check_text(text, path, same_package)
+
+    def check_tree(self, root):
+        """
+        检查目录下的所有Java文件
+
+        :return: Issue列表
+        """
+        issues = []
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(".java"):
+                    issues.extend(self.check_file(os.path.join(directory, filename)))
+        return issues
+
+
+# 程序中共用的检查器（保存增量缓存）
+default_checker = JavaChecker()
+
+
+def has_errors(issues) -> bool:
+    """
+    检查结果中是否有错误（警告不阻止构建）
+    """
+    return any(issue.severity == "error" for issue in issues)
+
+
+def format_issues(issues, limit=20, relative_to=None):
+    """
+    把检查结果格式化为文本行，最多limit条
+
+    :param relative_to: 不为None时，文件路径显示为相对于该目录的路径
+    """
+    lines = []
+    for issue in issues[:limit]:
+        if relative_to and issue.path:
+            issue = Issue(os.path.relpath(issue.path, relative_to), issue.line, issue.column,
+                          issue.severity, issue.message)
+        lines.append(str(issue))
+    if len(issues) > limit:
+        lines.append(f"……还有{len(issues) - limit}条")
+    return lines
@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+项目事务日志模块
+为一次项目操作（如添加方块）涉及的多个文件写入提供崩溃安全的预写日志（WAL）
+
+一次事务中的所有写入先暂存在内存中，提交时整体写入一个日志文件并只fsync一次，
+随后再以“写临时文件+重命名”的方式落盘，落盘的文件和目录批量fsync后才删除日志。若程序在落盘过程中崩溃，
+下次打开项目时会根据日志重放（已提交）或丢弃（未提交）该事务。
+"""
+
+import os
+import json
+import struct
+import shutil
+import hashlib
+import threading
+import itertools
+import time
+import uuid
+from contextlib import contextmanager
+
+import tracing
+
+
+# 项目目录下存放本程序附加数据的目录名
+STATE_DIR_NAME = ".forgecreator"
+
+# 日志文件的文件头与记录格式
+WAL_MAGIC = b"FCWAL1\n"
+WAL_SUFFIX = ".wal"
+_LENGTH = struct.Struct(">I")
+
+# 同一进程内日志文件名的序号（时间戳相同时保证提交顺序）
+_wal_sequence = itertools.count()
+
+# 当前线程正在进行的事务
+_local = threading.local()
+
+
+def get_state_dir(project_dir) -> str:
+    """
+    获取项目的附加数据目录（{modid}pack/.forgecreator）
+
+    :param project_dir: 项目根目录（mod.json所在目录）
+    :return: 附加数据目录路径
+    """
+    return os.path.join(os.path.abspath(project_dir), STATE_DIR_NAME)
+
+
+def _fsync_dir(directory):
+    """
+    fsync目录本身，确保目录项（新建/重命名的文件）持久化
+    Windows不支持对目录fsync，直接忽略
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _fsync_paths(paths):
+    """
+    批量fsync已落盘的文件及其所在目录（每个目录只fsync一次）
+    落盘时各文件不单独fsync，删除日志前用这一趟把数据和目录项一起持久化
+
+    :param paths: 写入或删除过的绝对路径
+    """
+    directories = set()
+    for path in paths:
+        directories.add(os.path.dirname(path))
+        if not os.path.isfile(path):
+            continue
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    for directory in directories:
+        _fsync_dir(directory)
+
+
+def _replace_file(target, data):
+    """
+    以“写临时文件+重命名”的方式原子替换文件内容（不单独fsync）
+
+    :param target: 目标文件路径
+    :param data: 文件内容（bytes）
+    """
+    directory = os.path.dirname(target)
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{os.path.basename(target)}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, target)
+        tracing.file_written(target, len(data))
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link_or_replace(source, target, data=None, digest=None):
+    """
+    让target成为source的硬链接（先链接到临时文件再重命名，保证原子性）
+    文件系统不支持硬链接或跨设备时退回为写入内容
+
+    :param source: 链接源文件
+    :param target: 目标文件路径
+    :param data: 期望的文件内容，为None时使用source的内容；source的内容与之不符时不链接
+    :param digest: data的sha256（已算好时传入，避免重复计算）
+    """
+    directory = os.path.dirname(target)
+    os.makedirs(directory, exist_ok=True)
+    if data is not None:
+        # 源文件可能在暂存之后被修改过（大小相同也不代表内容相同），内容一致时才链接
+        expected = digest or hashlib.sha256(data).hexdigest()
+        linkable = os.path.getsize(source) == len(data) and _sha256_file(source) == expected
+    else:
+        linkable = True
+    if linkable:
+        temp_path = os.path.join(directory, f".{os.path.basename(target)}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            os.link(source, temp_path)
+            os.replace(temp_path, target)
+            tracing.count("files_linked")
+            return
+        except OSError:
+            if os.path.lexists(temp_path):
+                os.remove(temp_path)
+    if data is None:
+        with open(source, 'rb') as f:
+            data = f.read()
+    _replace_file(target, data)
+
+
+def _remove_path(target):
+    """
+    删除文件或目录，不存在时忽略
+    """
+    if os.path.isdir(target) and not os.path.islink(target):
+        shutil.rmtree(target)
+    elif os.path.lexists(target):
+        os.remove(target)
+
+
+class Transaction:
+    """
+    一次项目事务
+    记录事务期间对项目文件的所有修改，在提交前不会改动任何项目文件
+    """
+
+    def __init__(self, journal, label=""):
+        """
+        初始化事务
+
+        :param journal: 所属的ProjectJournal
+        :param label: 事务说明（如"添加方块 example_block"）
+        """
+        self.journal = journal
+        self.label = label
+        # 相对路径 -> 新内容（bytes），None表示删除
+        self.changes = {}
+        # 相对路径 -> 事务开始前的内容（bytes），None表示原本不存在
+        self.originals = {}
+        # 相对路径 -> (提交时用于创建硬链接的源文件, 内容的sha256)（内容与changes中相同）
+        self.links = {}
+        # 相对路径 -> 延迟写入的回调（见defer）
+        self.deferred = {}
+
+    def _relpath(self, path):
+        """
+        将路径转换为相对项目根目录的路径，路径必须位于项目内
+        """
+        abs_path = os.path.abspath(path)
+        rel_path = os.path.relpath(abs_path, self.journal.project_dir)
+        if rel_path.startswith(os.pardir) or os.path.isabs(rel_path):
+            raise ValueError(f"路径不在项目目录内: {path}")
+        return rel_path.replace(os.sep, "/")
+
+    def _remember_original(self, rel_path):
+        """
+        在第一次修改某个文件前记录其原始内容（用于撤销）
+        """
+        if rel_path in self.originals:
+            return
+        abs_path = self.journal.abspath(rel_path)
+        if os.path.isfile(abs_path):
+            with open(abs_path, 'rb') as f:
+                self.originals[rel_path] = f.read()
+        else:
+            self.originals[rel_path] = None
+
+    def owns(self, path) -> bool:
+        """
+        判断路径是否位于本事务所属的项目内
+        """
+        try:
+            self._relpath(path)
+            return True
+        except ValueError:
+            return False
+
+    def write_bytes(self, path, data):
+        """
+        暂存一次文件写入
+
+        :param path: 目标文件路径
+        :param data: 文件内容（bytes）
+        """
+        rel_path = self._relpath(path)
+        self._remember_original(rel_path)
+        self.changes[rel_path] = bytes(data)
+        self.links.pop(rel_path, None)
+        self.deferred.pop(rel_path, None)
+
+    def defer(self, path, callback):
+        """
+        暂存一次延迟写入：callback负责写入path，在事务提交前调用一次；
+        同一文件多次延迟只保留最后一个回调，事务中读取该文件时先调用回调，之后的直接写入会取代它
+
+        :param path: 回调写入的文件路径
+        :param callback: 无参数的回调，在事务中调用
+        """
+        self.deferred[self._relpath(path)] = callback
+
+    def flush(self, path=None):
+        """
+        执行延迟写入
+
+        :param path: 只执行该文件的延迟写入，为None时执行全部
+        """
+        if path is not None:
+            callback = self.deferred.pop(self._relpath(path), None)
+            if callback is not None:
+                callback()
+            return
+        while self.deferred:
+            _rel_path, callback = self.deferred.popitem()
+            callback()
+
+    def link(self, source, path):
+        """
+        暂存一次以硬链接方式进行的写入（内容同时暂存，日志与撤销都按内容处理）
+        提交时源文件的sha256与暂存的内容一致才会链接，否则按内容写入
+
+        :param source: 链接源文件（如贴图仓库中的对象）
+        :param path: 目标文件路径
+        """
+        with open(source, 'rb') as f:
+            data = f.read()
+        self.write_bytes(path, data)
+        self.links[self._relpath(path)] = (os.path.abspath(source), hashlib.sha256(data).hexdigest())
+
+    def remove(self, path):
+        """
+        暂存一次文件/目录删除
+
+        删除目录时逐个记录其中的文件（含原始内容），撤销/重做才能还原整个目录；
+        目录本身的删除记录在这些文件之后，只用于清理剩下的空目录
+
+        :param path: 要删除的路径
+        """
+        rel_path = self._relpath(path)
+        abs_path = self.journal.abspath(rel_path)
+        if os.path.isdir(abs_path) and not os.path.islink(abs_path):
+            for root, _dirs, files in os.walk(abs_path):
+                for name in files:
+                    self.remove(os.path.join(root, name))
+            # 本事务中暂存在该目录下的新文件同样删除
+            prefix = rel_path + "/"
+            for staged in [staged for staged in self.changes if staged.startswith(prefix)]:
+                self.changes[staged] = None
+                self.links.pop(staged, None)
+        elif os.path.isfile(abs_path):
+            self._remember_original(rel_path)
+        self.changes.pop(rel_path, None)
+        self.changes[rel_path] = None
+        self.links.pop(rel_path, None)
+        self.deferred.pop(rel_path, None)
+
+    def read_bytes(self, path):
+        """
+        读取文件内容，优先返回本事务中暂存的新内容
+
+        :param path: 文件路径
+        :return: 文件内容（bytes）
+        :raises FileNotFoundError: 文件不存在或已在事务中被删除
+        """
+        self.flush(path)
+        rel_path = self._relpath(path)
+        if rel_path in self.changes:
+            data = self.changes[rel_path]
+            if data is None:
+                raise FileNotFoundError(path)
+            return data
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def modified(self, path) -> bool:
+        """
+        判断本事务中是否暂存了对该文件的修改（包括延迟写入）
+        """
+        rel_path = self._relpath(path)
+        return rel_path in self.changes or rel_path in self.deferred
+
+    def exists(self, path) -> bool:
+        """
+        判断文件是否存在（考虑本事务中暂存的修改）
+        """
+        self.flush(path)
+        rel_path = self._relpath(path)
+        if rel_path in self.changes:
+            return self.changes[rel_path] is not None
+        return os.path.exists(path)
+
+
+class ProjectJournal:
+    """
+    项目事务日志
+    每个项目（mod.json所在目录）对应一个日志目录：{modid}pack/.forgecreator/journal
+    """
+
+    # 项目根目录 -> ProjectJournal，保证同一项目共享提交回调
+    _instances = {}
+
+    def __init__(self, project_dir):
+        """
+        初始化事务日志
+
+        :param project_dir: 项目根目录（mod.json所在目录）
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.journal_dir = os.path.join(get_state_dir(self.project_dir), "journal")
+        # 事务提交后的回调，参数为(transaction)
+        self.commit_listeners = []
+
+    @classmethod
+    def for_project(cls, project_dir):
+        """
+        获取项目的事务日志（同一项目始终返回同一个实例）
+        """
+        project_dir = os.path.abspath(project_dir)
+        if project_dir not in cls._instances:
+            cls._instances[project_dir] = cls(project_dir)
+        return cls._instances[project_dir]
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path):
+        """
+        根据mod.json路径获取对应项目的事务日志
+        """
+        return cls.for_project(os.path.dirname(os.path.abspath(mod_json_path)))
+
+    def abspath(self, rel_path) -> str:
+        """
+        将日志中记录的相对路径转换为绝对路径
+        """
+        return os.path.join(self.project_dir, *rel_path.split("/"))
+
+    @contextmanager
+    def transaction(self, label=""):
+        """
+        开启一个事务，退出with块时提交；块内抛出异常则丢弃全部修改
+
+        嵌套调用（包括同一线程中对同一项目的再次调用）会并入最外层事务，
+        因此批量操作中的成百上千次写入只需要一次提交（一次fsync）。
+
+        :param label: 事务说明
+        """
+        current = getattr(_local, "transaction", None)
+        if current is not None and current.journal.project_dir == self.project_dir:
+            yield current
+            return
+
+        txn = Transaction(self, label)
+        _local.transaction = txn
+        try:
+            yield txn
+            # 延迟写入在事务内执行（写入同样暂存到事务中）
+            txn.flush()
+        except BaseException:
+            _local.transaction = current
+            raise
+        _local.transaction = current
+        self.commit(txn)
+
+    @tracing.traced("ProjectJournal.commit", "journal")
+    def commit(self, txn):
+        """
+        提交事务：写入日志并fsync一次，然后把修改落盘并批量fsync，最后删除日志
+
+        :param txn: 要提交的事务
+        """
+        if not txn.changes:
+            return
+
+        os.makedirs(self.journal_dir, exist_ok=True)
+        # 文件名以时间戳和序号开头，恢复时按文件名排序即为提交顺序
+        wal_name = f"{time.time_ns():020d}-{next(_wal_sequence):08d}-{uuid.uuid4().hex[:8]}{WAL_SUFFIX}"
+        wal_path = os.path.join(self.journal_dir, wal_name)
+
+        digest = hashlib.sha256()
+        wal_span = tracing.span("journal.write_wal", "journal", label=txn.label, files=len(txn.changes))
+        with wal_span, open(wal_path, 'wb') as f:
+            f.write(WAL_MAGIC)
+            for rel_path, data in txn.changes.items():
+                header = {"op": "remove" if data is None else "write", "path": rel_path}
+                if data is not None:
+                    header["size"] = len(data)
+                record = json.dumps(header, ensure_ascii=False).encode('utf-8')
+                for chunk in (_LENGTH.pack(len(record)), record, data or b""):
+                    f.write(chunk)
+                    digest.update(chunk)
+            # 提交记录：只有带有正确校验值的日志才会在恢复时被重放
+            trailer = json.dumps({"op": "commit", "count": len(txn.changes), "sha256": digest.hexdigest()}).encode('utf-8')
+            f.write(_LENGTH.pack(len(trailer)))
+            f.write(trailer)
+            f.flush()
+            os.fsync(f.fileno())
+        _fsync_dir(self.journal_dir)
+
+        with tracing.span("journal.apply", "journal", files=len(txn.changes)):
+            applied = self._apply(txn.changes.items(), txn.links)
+        # 修改全部持久化后才能删除日志，否则断电时可能丢失已重命名的文件且无日志可重放
+        with tracing.span("journal.fsync", "journal", files=len(applied)):
+            _fsync_paths(applied)
+        os.remove(wal_path)
+
+        for listener in self.commit_listeners:
+            listener(txn)
+
+    def _apply(self, changes, links=None):
+        """
+        将修改落盘（重放时同样使用，操作是幂等的）
+
+        :param changes: [(相对路径, 内容)]
+        :param links: {相对路径: (硬链接源文件, 内容的sha256)}，重放时为None（按内容写入）
+        :return: 落盘的绝对路径列表（用于随后的fsync）
+        """
+        applied = []
+        for rel_path, data in changes:
+            target = self.abspath(rel_path)
+            if data is None:
+                _remove_path(target)
+            elif links and rel_path in links:
+                source, digest = links[rel_path]
+                _link_or_replace(source, target, data, digest)
+            else:
+                _replace_file(target, data)
+            applied.append(target)
+        return applied
+
+    def _read_wal(self, wal_path):
+        """
+        读取日志文件
+
+        :return: 修改列表[(相对路径, 内容或None)]；日志不完整（未提交）时返回None
+        """
+        with open(wal_path, 'rb') as f:
+            content = f.read()
+        if not content.startswith(WAL_MAGIC):
+            return None
+
+        changes = []
+        digest = hashlib.sha256()
+        offset = len(WAL_MAGIC)
+        while offset + _LENGTH.size <= len(content):
+            (length,) = _LENGTH.unpack_from(content, offset)
+            record_end = offset + _LENGTH.size + length
+            if record_end > len(content):
+                return None
+            try:
+                header = json.loads(content[offset + _LENGTH.size:record_end].decode('utf-8'))
+            except ValueError:
+                return None
+
+            if header.get("op") == "commit":
+                if header.get("sha256") == digest.hexdigest() and header.get("count") == len(changes):
+                    return changes
+                return None
+
+            data = None
+            data_end = record_end
+            if header.get("op") == "write":
+                data_end = record_end + header.get("size", 0)
+                if data_end > len(content):
+                    return None
+                data = content[record_end:data_end]
+            digest.update(content[offset:data_end])
+            changes.append((header["path"], data))
+            offset = data_end
+        return None
+
+    @tracing.traced("ProjectJournal.recover", "journal")
+    def recover(self):
+        """
+        恢复上次异常退出时遗留的事务
+        已提交的事务会被重放，未提交的事务会被丢弃（项目文件在提交前从未被改动）
+
+        :return: (重放的事务数, 丢弃的事务数)
+        """
+        replayed = 0
+        discarded = 0
+        if not os.path.isdir(self.journal_dir):
+            return replayed, discarded
+
+        for name in sorted(os.listdir(self.journal_dir)):
+            if not name.endswith(WAL_SUFFIX):
+                continue
+            wal_path = os.path.join(self.journal_dir, name)
+            changes = self._read_wal(wal_path)
+            if changes is None:
+                discarded += 1
+            else:
+                _fsync_paths(self._apply(changes))
+                replayed += 1
+            os.remove(wal_path)
+        return replayed, discarded
+
+
+def current_transaction():
+    """
+    获取当前线程正在进行的事务，没有则返回None
+    """
+    return getattr(_local, "transaction", None)
+
+
+def _transaction_for(path):
+    """
+    获取负责指定路径的事务（路径不在当前事务的项目内时返回None）
+    """
+    txn = current_transaction()
+    if txn is not None and txn.owns(path):
+        return txn
+    return None
+
+
+def write_bytes(path, data):
+    """
+    写入文件：处于事务中时暂存到事务，否则直接原子替换
+    """
+    txn = _transaction_for(path)
+    if txn is not None:
+        txn.write_bytes(path, data)
+    else:
+        _replace_file(os.path.abspath(path), bytes(data))
+
+
+def write_text(path, text, encoding='utf-8'):
+    """
+    写入文本文件：处于事务中时暂存到事务，否则直接原子替换
+    """
+    write_bytes(path, text.encode(encoding))
+
+
+def read_bytes(path):
+    """
+    读取文件，处于事务中时能读到事务内尚未提交的修改
+    """
+    txn = _transaction_for(path)
+    if txn is not None:
+        return txn.read_bytes(path)
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def read_text(path, encoding='utf-8'):
+    """
+    读取文本文件，处于事务中时能读到事务内尚未提交的修改
+    """
+    return read_bytes(path).decode(encoding)
+
+
+def exists(path) -> bool:
+    """
+    判断文件是否存在，处于事务中时考虑事务内尚未提交的修改
+    """
+    txn = _transaction_for(path)
+    if txn is not None:
+        return txn.exists(path)
+    return os.path.exists(path)
+
+
+def copy_file(source, target):
+    """
+    复制文件：处于事务中时暂存到事务，否则直接原子替换
+    """
+    with open(source, 'rb') as f:
+        write_bytes(target, f.read())
+
+
+def link_file(source, target):
+    """
+    以硬链接方式放置文件（内容共享同一份存储）：处于事务中时暂存到事务，否则直接原子替换
+    无法创建硬链接时退回为复制
+
+    注意：硬链接的文件共享同一个inode，用原地保存的程序修改其中一个会同时改变所有链接
+    """
+    txn = _transaction_for(target)
+    if txn is not None:
+        txn.link(source, target)
+    else:
+        _link_or_replace(os.path.abspath(source), os.path.abspath(target))
+
+
+def remove(path):
+    """
+    删除文件或目录：处于事务中时暂存到事务，否则直接删除
+    """
+    txn = _transaction_for(path)
+    if txn is not None:
+        txn.remove(path)
+    else:
+        _remove_path(path)
+
+
+def load_json(path):
+    """
+    读取JSON文件，处于事务中时能读到事务内尚未提交的修改
+    """
+    return json.loads(read_text(path))
+
+
+def dump_json(path, data):
+    """
+    以mod.json的格式（indent=2，保留中文）写入JSON文件
+    """
+    write_text(path, json.dumps(data, ensure_ascii=False, indent=2))
@@ -9,10 +9,10 @@ Forge模组构建器主程序
 import sys
 import os
 import json
-import shutil
 import re
 import subprocess
 import tempfile
+import io
 
 # PyQt5导入
 from PyQt5.QtWidgets import (
@@ -20,14 +20,155 @@ from PyQt5.QtWidgets import (
     QAction, QMenu, QDialog, QVBoxLayout, QLabel, QComboBox,
     QPushButton, QHBoxLayout, QListWidget, QListWidgetItem,
     QLineEdit, QGridLayout, QGroupBox, QCheckBox, QSpinBox,
-    QDoubleSpinBox, QInputDialog
+    QDoubleSpinBox, QInputDialog, QTextEdit
 )
+from PyQt5.QtGui import QKeySequence, QIcon, QImage, QPixmap
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QPoint, QTimer
 
 # 本地模块导入
 from Ui_main import Ui_MainWindow  # 导入Qt Designer生成的UI类
 from editor import Editor  # 导入JSON编辑器
 from wizard import ForgeModCreator  # 导入模组创建向导
 from utils import ensure_admin_privileges  # 导入管理员权限工具
+import journal  # 导入项目事务日志
+from oplog import OperationLog, OperationConflict  # 导入撤销/重做操作日志
+import tracing  # 导入性能追踪
+from buildreport import GradleOutputParser, BuildHistory, format_build_report  # 导入构建耗时分析
+from jarpatch import ResourcePatcher, FullBuildRequired  # 导入资源快速打包
+import javacheck  # 导入Java代码预检查
+from assetcheck import AssetValidator  # 导入资源文件验证
+from texturestore import TextureStore, format_size  # 导入贴图仓库
+from textureimport import BatchTextureImporter  # 导入贴图批量导入
+from blockpreview import BlockPreviewRenderer  # 导入方块缩略图渲染
+from classindex import ClassIndex, find_mapped_jar, format_constructor  # 导入方块类索引
+from vanillaassets import VanillaAssetIndex  # 导入原版资源索引
+from blockstates import ModelIndex, template_for, build_blockstate, deduplicate_models, dump as dump_asset  # 导入方块状态生成
+from resourcesync import ResourceSync, tags_for_class  # 导入语言文件和标签文件同步
+from recipetable import RecipeEngine, SHAPES as RECIPE_SHAPES  # 导入配方表
+from itemfamily import ItemGenerator, FAMILIES as ITEM_FAMILIES, TIER_DEFAULTS, expand_tiers  # 导入物品系列
+from commandgen import CommandGenerator, ARGUMENT_TYPES  # 导入命令生成
+from soundimport import SoundRegistry  # 导入音效导入和注册
+from workspace import WorkspaceIndex  # 导入工作区索引
+from conflicts import ConflictAnalyzer, format_conflicts  # 导入跨项目冲突检查
+from projectstore import ProjectStore  # 导入项目数据库
+from specs import BlockSpec, ItemGroupSpec  # 导入方块和物品组记录类型
+
+
+# Gradle任务线程类
+class GradleTaskThread(QThread):
+    """
+    在后台执行Gradle任务（如build）的线程类
+    解析输出并记录构建耗时，构建成功后记录资源快速打包所需的清单
+    """
+    # 信号定义
+    log_signal = pyqtSignal(str)  # 日志信号
+    task_finished = pyqtSignal(bool)  # 任务完成信号
+    
+    def __init__(self, mod_json_path, tasks):
+        """
+        初始化Gradle任务线程
+        
+        :param mod_json_path: mod.json文件路径
+        :param tasks: Gradle任务列表，如['build']
+        """
+        super().__init__()
+        self.project_dir = os.path.dirname(os.path.abspath(mod_json_path))
+        self.forge_dir = os.path.join(self.project_dir, 'forge-1.16.5-36.2.34-mdk')
+        self.tasks = tasks
+    
+    def run(self):
+        """线程执行的Gradle任务"""
+        try:
+            gradle_script = os.path.join(self.forge_dir, 'gradlew.bat' if os.name == 'nt' else 'gradlew')
+            build_command = [gradle_script, *self.tasks, '--no-daemon', '--console=plain']
+            self.log_signal.emit(f"执行命令: {' '.join(build_command)}")
+            
+            # 构建开始前的资源哈希：构建期间修改的资源不能算作已打包
+            patcher = ResourcePatcher(self.project_dir)
+            snapshot = patcher.snapshot()
+            
+            with tracing.span(f"gradle {' '.join(self.tasks)}", "gradle") as gradle_span:
+                process = subprocess.Popen(build_command, cwd=self.forge_dir,
+                                           stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+                parser = GradleOutputParser(build_command)
+                for line in process.stdout:
+                    parser.feed(line)
+                    if line.strip():
+                        self.log_signal.emit(line.strip())
+                process.wait()
+                gradle_span.set("returncode", process.returncode)
+            
+            history = BuildHistory(self.project_dir)
+            history.append(parser.finish(process.returncode))
+            for line in format_build_report(history.load(limit=6)):
+                self.log_signal.emit(line)
+            
+            if process.returncode == 0:
+                patcher.record_build(snapshot)
+            self.task_finished.emit(process.returncode == 0)
+        except Exception as e:
+            self.log_signal.emit(f"执行Gradle任务时出错: {e}")
+            self.task_finished.emit(False)
+
+
+# 方块类索引线程类
+class ClassIndexThread(QThread):
+    """
+    在后台扫描映射后的Forge jar建立方块类索引（第一次扫描需要数秒，不能阻塞界面）
+    """
+    # 信号定义
+    index_ready = pyqtSignal(object)  # 索引建立完成信号，参数为ClassIndex
+    error_signal = pyqtSignal(str)  # 错误信号
+    
+    def __init__(self, class_index, jar_path):
+        """
+        初始化方块类索引线程
+        
+        :param class_index: 要建立的ClassIndex
+        :param jar_path: 映射后的Forge jar路径
+        """
+        super().__init__()
+        self.class_index = class_index
+        self.jar_path = jar_path
+    
+    def run(self):
+        """线程执行的索引扫描"""
+        try:
+            self.class_index.build(self.jar_path)
+            self.index_ready.emit(self.class_index)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
+
+# 工作区索引线程类
+class WorkspaceIndexThread(QThread):
+    """
+    在后台增量更新工作区索引（扫描所有项目，项目多时需要较长时间）
+    """
+    # 信号定义
+    index_updated = pyqtSignal(object)  # 更新完成信号，参数为ScanStats
+    error_signal = pyqtSignal(str)  # 错误信号
+    
+    def __init__(self, root):
+        """
+        初始化工作区索引线程
+        
+        :param root: 工作区目录
+        """
+        super().__init__()
+        self.root = root
+    
+    def run(self):
+        """线程执行的索引更新（SQLite连接不能跨线程使用，线程内单独打开）"""
+        try:
+            index = WorkspaceIndex(self.root)
+            try:
+                stats = index.update()
+            finally:
+                index.close()
+            self.index_updated.emit(stats)
+        except Exception as e:
+            self.error_signal.emit(str(e))
 
 
 class MainWindow(QMainWindow, Ui_MainWindow):
@@ -63,6 +204,12 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # 添加Run菜单
         self.add_run_menu()
         
+        # 添加撤销/重做菜单项
+        self.add_undo_menu()
+        
+        # 添加批量导入贴图菜单项
+        self.add_import_menu()
+        
         # 创建JSON编辑器
         self.editor = Editor()
         
@@ -143,7 +290,6 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                 'check_requires_tool': '需要工具挖掘 (requiresTool)',
                 'check_no_drops': '无掉落 (noDrops)',
                 'check_ticks_randomly': '随机更新 (ticksRandomly)',
-                'check_waterlogged': '可被水淹没 (waterlogged)',
                 'button_create_block': '创建方块',
                 'button_cancel': '取消',
                 'select_itemgroup_title': '选择ItemGroup',
@@ -172,7 +318,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
     
     def add_open_menu(self):
         """
-        在File菜单下添加Open选项
+        在File菜单下添加Open、打开工作区、切换项目和项目数据库选项
         """
         
         # 创建Open动作
@@ -180,8 +326,24 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.Open.setObjectName("Open")
         self.Open.setText(self.lang.get('open_action', 'Open'))
         
+        # 创建打开工作区动作（选择存放多个项目的目录）
+        self.OpenWorkspace = QAction(self.lang.get('open_workspace_action', '打开工作区...'), self)
+        self.OpenWorkspace.setObjectName("OpenWorkspace")
+        
+        # 创建切换项目动作
+        self.SwitchProject = QAction(self.lang.get('switch_project_action', '切换项目...'), self)
+        self.SwitchProject.setObjectName("SwitchProject")
+        self.SwitchProject.setShortcut(QKeySequence("Ctrl+P"))
+        
+        # 创建项目数据库动作（大型项目启用/停用SQLite存储）
+        self.ProjectStore = QAction(self.lang.get('project_store_action', '项目数据库...'), self)
+        self.ProjectStore.setObjectName("ProjectStore")
+        
         # 将Open动作添加到File菜单
         self.File.addAction(self.Open)
+        self.File.addAction(self.OpenWorkspace)
+        self.File.addAction(self.SwitchProject)
+        self.File.addAction(self.ProjectStore)
     
     def modify_block_menu(self):
         """
@@ -226,12 +388,120 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.Compile = QAction(self.lang.get('compile_action', '编译...'), self)
         self.Compile.setObjectName("Compile")
         
+        # 创建构建性能报告动作
+        self.BuildReport = QAction(self.lang.get('build_report_action', '构建性能报告...'), self)
+        self.BuildReport.setObjectName("BuildReport")
+        
+        # 创建构建jar动作（完整Gradle构建）
+        self.BuildJar = QAction(self.lang.get('build_jar_action', '构建jar'), self)
+        self.BuildJar.setObjectName("BuildJar")
+        
+        # 创建快速更新jar资源动作（只修改了资源时跳过Gradle）
+        self.PatchJar = QAction(self.lang.get('patch_jar_action', '快速更新jar资源'), self)
+        self.PatchJar.setObjectName("PatchJar")
+        
+        # 创建验证资源文件动作
+        self.ValidateAssets = QAction(self.lang.get('validate_assets_action', '验证资源文件...'), self)
+        self.ValidateAssets.setObjectName("ValidateAssets")
+        
+        # 创建贴图去重报告动作
+        self.TextureReport = QAction(self.lang.get('texture_report_action', '贴图去重报告...'), self)
+        self.TextureReport.setObjectName("TextureReport")
+        
+        # 创建方块模型去重动作
+        self.DeduplicateModels = QAction(self.lang.get('dedupe_models_action', '合并重复的方块模型'), self)
+        self.DeduplicateModels.setObjectName("DeduplicateModels")
+        
+        # 创建生成配方动作（根据mod.json中的配方和配方表重新生成所有配方文件）
+        self.GenerateRecipes = QAction(self.lang.get('generate_recipes_action', '生成配方文件'), self)
+        self.GenerateRecipes.setObjectName("GenerateRecipes")
+        
+        # 创建生成物品动作（根据mod.json中的物品和等级表重新生成物品代码和模型）
+        self.GenerateItems = QAction(self.lang.get('generate_items_action', '生成物品代码'), self)
+        self.GenerateItems.setObjectName("GenerateItems")
+        
+        # 创建生成命令动作（根据mod.json中的命令重新生成ModCommands.java）
+        self.GenerateCommands = QAction(self.lang.get('generate_commands_action', '生成命令代码'), self)
+        self.GenerateCommands.setObjectName("GenerateCommands")
+        
+        # 创建生成音效注册动作（根据mod.json中的音效事件重新生成sounds.json和ModSounds.java）
+        self.GenerateSounds = QAction(self.lang.get('generate_sounds_action', '生成音效注册'), self)
+        self.GenerateSounds.setObjectName("GenerateSounds")
+        
+        # 创建跨项目冲突检查动作（检查工作区中所有项目一起加载时的冲突）
+        self.WorkspaceConflicts = QAction(self.lang.get('workspace_conflicts_action', '检查跨项目冲突...'), self)
+        self.WorkspaceConflicts.setObjectName("WorkspaceConflicts")
+        
+        # 创建同步语言文件和标签文件动作
+        self.SyncResources = QAction(self.lang.get('sync_resources_action', '同步语言文件和标签'), self)
+        self.SyncResources.setObjectName("SyncResources")
+        
         # 将编译动作添加到Run菜单
         self.Run.addAction(self.Compile)
+        self.Run.addAction(self.BuildJar)
+        self.Run.addAction(self.PatchJar)
+        self.Run.addAction(self.ValidateAssets)
+        self.Run.addAction(self.TextureReport)
+        self.Run.addAction(self.DeduplicateModels)
+        self.Run.addAction(self.SyncResources)
+        self.Run.addAction(self.GenerateItems)
+        self.Run.addAction(self.GenerateRecipes)
+        self.Run.addAction(self.GenerateCommands)
+        self.Run.addAction(self.GenerateSounds)
+        self.Run.addAction(self.WorkspaceConflicts)
+        self.Run.addAction(self.BuildReport)
         
         # 将Run菜单添加到菜单栏
         self.menubar.addAction(self.Run.menuAction())
     
+    def add_undo_menu(self):
+        """
+        在Edit菜单中添加撤销/重做选项
+        """
+        
+        # 创建撤销动作
+        self.Undo = QAction(self.lang.get('undo_action', '撤销'), self)
+        self.Undo.setObjectName("Undo")
+        self.Undo.setShortcut(QKeySequence.Undo)
+        
+        # 创建重做动作
+        self.Redo = QAction(self.lang.get('redo_action', '重做'), self)
+        self.Redo.setObjectName("Redo")
+        self.Redo.setShortcut(QKeySequence.Redo)
+        
+        # 将撤销/重做动作添加到Edit菜单顶部
+        first_action = self.Edit.actions()[0] if self.Edit.actions() else None
+        self.Edit.insertAction(first_action, self.Undo)
+        self.Edit.insertAction(first_action, self.Redo)
+        self.Edit.insertSeparator(first_action)
+    
+    def add_import_menu(self):
+        """
+        在Edit菜单的创建子菜单后添加批量导入贴图、批量导入音效、方块预览和原版资源浏览选项
+        """
+        
+        # 创建批量导入贴图动作
+        self.ImportTextures = QAction(self.lang.get('import_textures_action', '批量导入贴图...'), self)
+        self.ImportTextures.setObjectName("ImportTextures")
+        
+        # 创建批量导入音效动作
+        self.ImportSounds = QAction(self.lang.get('import_sounds_action', '批量导入音效...'), self)
+        self.ImportSounds.setObjectName("ImportSounds")
+        
+        # 创建方块预览动作
+        self.BlockPreviews = QAction(self.lang.get('block_previews_action', '方块预览...'), self)
+        self.BlockPreviews.setObjectName("BlockPreviews")
+        
+        # 创建原版资源浏览动作
+        self.VanillaAssets = QAction(self.lang.get('vanilla_assets_action', '浏览原版资源...'), self)
+        self.VanillaAssets.setObjectName("VanillaAssets")
+        
+        # 添加到Edit菜单中创建子菜单的后面
+        self.Edit.addAction(self.ImportTextures)
+        self.Edit.addAction(self.ImportSounds)
+        self.Edit.addAction(self.BlockPreviews)
+        self.Edit.addAction(self.VanillaAssets)
+    
     def update_menu_texts(self):
         """
         更新所有菜单项的文本为中文翻译
@@ -307,10 +577,52 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.handle_about()
         elif action_name == "Open":
             self.handle_open()
+        elif action_name == "OpenWorkspace":
+            self.handle_open_workspace()
+        elif action_name == "SwitchProject":
+            self.handle_switch_project()
+        elif action_name == "ProjectStore":
+            self.handle_project_store()
         elif action_name == "Compile":
             self.handle_run_client()
         elif action_name == "RunClient":
             self.handle_run_client()
+        elif action_name == "BuildJar":
+            self.handle_build_jar()
+        elif action_name == "PatchJar":
+            self.handle_patch_jar()
+        elif action_name == "BuildReport":
+            self.handle_build_report()
+        elif action_name == "ValidateAssets":
+            self.handle_validate_assets()
+        elif action_name == "TextureReport":
+            self.handle_texture_report()
+        elif action_name == "DeduplicateModels":
+            self.handle_deduplicate_models()
+        elif action_name == "SyncResources":
+            self.handle_sync_resources()
+        elif action_name == "GenerateItems":
+            self.handle_generate_items()
+        elif action_name == "GenerateRecipes":
+            self.handle_generate_recipes()
+        elif action_name == "GenerateCommands":
+            self.handle_generate_commands()
+        elif action_name == "GenerateSounds":
+            self.handle_generate_sounds()
+        elif action_name == "WorkspaceConflicts":
+            self.handle_workspace_conflicts()
+        elif action_name == "ImportTextures":
+            self.handle_import_textures()
+        elif action_name == "ImportSounds":
+            self.handle_import_sounds()
+        elif action_name == "BlockPreviews":
+            self.handle_block_previews()
+        elif action_name == "VanillaAssets":
+            self.handle_vanilla_assets()
+        elif action_name == "Undo":
+            self.handle_undo()
+        elif action_name == "Redo":
+            self.handle_redo()
         else:
             QMessageBox.information(self, self.lang.get('information_title', '提示'), f"未实现的功能: {action_text}")
     
@@ -328,6 +640,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         except Exception as e:
             QMessageBox.critical(self, self.lang.get('error_title', '错误'), f"打开模组创建向导失败: {e}")
     
+    @tracing.traced(category="ui")
     def on_mod_created(self, mod_json_path):
         """
         处理模组创建完成事件
@@ -336,6 +649,9 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         :param mod_json_path: mod.json文件路径
         """
         try:
+            # 恢复上次未完成的项目事务
+            self.recover_project_journal(mod_json_path)
+            
             # 打开并显示mod.json文件
             if self.editor.read(mod_json_path):
                 # 保存当前打开的文件路径
@@ -350,6 +666,30 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             QMessageBox.critical(self, self.lang.get('error_title', '错误'), 
                                f"自动打开模组失败: {e}")
     
+    def get_project_journal(self, mod_json_path):
+        """
+        获取项目的事务日志，并确保撤销/重做操作日志已在记录该项目的事务
+        
+        :param mod_json_path: mod.json文件路径
+        :return: ProjectJournal实例
+        """
+        return OperationLog.for_mod_json(mod_json_path).journal
+    
+    @tracing.traced(category="ui")
+    def recover_project_journal(self, mod_json_path):
+        """
+        恢复项目中上次异常退出时遗留的事务
+        已提交的事务会被重放，未提交的事务会被回滚
+        
+        :param mod_json_path: mod.json文件路径
+        """
+        try:
+            replayed, discarded = self.get_project_journal(mod_json_path).recover()
+            if replayed or discarded:
+                self.log_message(self.lang.get('journal_recovered_message', '已恢复未完成的项目事务: 重放{replayed}个，回滚{discarded}个').format(replayed=replayed, discarded=discarded))
+        except Exception as e:
+            self.log_message(self.lang.get('journal_recover_error_message', '恢复项目事务失败: {e}').format(e=e))
+    
     def check_and_select_item_group(self, mod_json_path):
         """
         检查并选择ItemGroup
@@ -458,8 +798,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                     mod_data = json.load(f)
                 mod_id = mod_data.get("modInfo", {}).get("modid", "unknown")
             
-            base_package = self.get_base_package_from_mod_json(mod_json_path, mod_id)
-            main_class_name = mod_id.replace('_', '').title() + "Mod"
+            base_package, main_class_name = self.find_main_class(mod_json_path, mod_id)
             
             # 创建对话框
             dialog = QDialog(self)
@@ -497,13 +836,22 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                                        self.lang.get('classname_required', '请输入类名'))
                     return None
                 
-                # 创建ItemGroup文件
-                item_group_class_name = self.create_item_group_file(
-                    mod_json_path, base_package, mod_id, main_class_name, class_name
-                )
-                
-                # 更新mod.json
-                self.add_item_group_to_mod_json(mod_json_path, item_group_class_name)
+                project_store = ProjectStore.for_mod_json(mod_json_path)
+                try:
+                    with self.get_project_journal(mod_json_path).transaction(f"创建ItemGroup {class_name}"):
+                        # 创建ItemGroup文件
+                        item_group_class_name = self.create_item_group_file(
+                            mod_json_path, base_package, mod_id, main_class_name, class_name
+                        )
+                        
+                        # 更新mod.json
+                        self.add_item_group_to_mod_json(mod_json_path, item_group_class_name, project_store)
+                    if project_store is not None:
+                        project_store.save()
+                finally:
+                    # 事务失败时也要关闭数据库（丢弃未提交的修改并释放锁）
+                    if project_store is not None:
+                        project_store.close()
                 
                 return item_group_class_name
             
@@ -513,6 +861,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             QMessageBox.critical(self, self.lang.get('error_title', '错误'), f"创建ItemGroup失败: {e}")
             return None
     
+    @tracing.traced(category="codegen")
     def create_item_group_file(self, mod_json_path, base_package, mod_id, main_class_name, item_group_class_name="ExampleItemGroup"):
         """
         创建ItemGroup Java文件
@@ -538,7 +887,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             # 创建ItemGroup文件 - 使用传入的item_group_class_name
             file_path = os.path.join(package_dir, f"{item_group_class_name}.java")
             
-            with open(file_path, 'w', encoding='utf-8') as f:
+            with io.StringIO() as f:
                 f.write(f"package {base_package}.group;\n\n")
                 f.write(f"import {base_package}.{main_class_name};\n")
                 f.write(f"import {base_package}.item.ModItems;\n")
@@ -552,22 +901,35 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                 f.write("        }\n")
                 f.write("    };\n")
                 f.write("}\n")
+                journal.write_text(file_path, f.getvalue())
+                
+                # 检查生成的代码，问题只记录到日志，构建前会再次检查
+                issues = javacheck.default_checker.check_text(f.getvalue(), file_path)
+                for line in javacheck.format_issues(issues, limit=len(issues), relative_to=java_src_path):
+                    self.log_message(line)
             
             return item_group_class_name
             
         except Exception as e:
             raise Exception(f"创建ItemGroup文件失败: {e}")
     
-    def add_item_group_to_mod_json(self, mod_json_path, item_group_class_name):
+    @tracing.traced(category="codegen")
+    def add_item_group_to_mod_json(self, mod_json_path, item_group_class_name, store=None):
         """
         向mod.json添加ItemGroup信息
         
         :param mod_json_path: mod.json文件路径
         :param item_group_class_name: ItemGroup类名
+        :param store: 项目数据库（项目启用了数据库时），按索引查找和添加，mod.json在事务提交前导出
         """
         try:
-            with open(mod_json_path, 'r', encoding='utf-8') as f:
-                mod_data = json.load(f)
+            item_group = ItemGroupSpec(item_group_class_name)
+            if store is not None:
+                if store.put("itemGroups", item_group.to_json(), replace=False):
+                    store.export(mod_json_path)
+                return
+            
+            mod_data = journal.load_json(mod_json_path)
             
             if "itemGroups" not in mod_data:
                 mod_data["itemGroups"] = []
@@ -580,12 +942,9 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                     break
             
             if not exists:
-                mod_data["itemGroups"].append({
-                    "name": item_group_class_name
-                })
+                mod_data["itemGroups"].append(item_group.to_json())
                 
-                with open(mod_json_path, 'w', encoding='utf-8') as f:
-                    json.dump(mod_data, f, ensure_ascii=False, indent=2)
+                journal.dump_json(mod_json_path, mod_data)
             
         except Exception as e:
             raise Exception(f"更新mod.json失败: {e}")
@@ -631,33 +990,34 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.log_message(f"读取mods.toml失败: {e}")
             return None
     
+    def find_main_class(self, mod_json_path, mod_id):
+        """
+        在项目的Java源码中查找带@Mod注解的主类
+        向导重命名后的包名与主类名不一定能从modId推导出来，模板重命名后也会残留空的包目录（如com/yang），
+        因此不按目录名猜测
+        
+        :param mod_json_path: mod.json文件路径
+        :param mod_id: 模组ID（找不到主类时用于推导）
+        :return: (包名, 主类名)，找不到主类时为模板的命名(com.example.{modid}mod, {Modid}Mod)
+        """
+        java_src_path = os.path.join(os.path.dirname(mod_json_path), "forge-1.16.5-36.2.34-mdk", "src", "main", "java")
+        for directory, dirnames, filenames in os.walk(java_src_path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if not filename.endswith(".java"):
+                    continue
+                with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                    text = f.read()
+                package = re.search(r"^\s*package\s+([\w.]+)\s*;", text, re.MULTILINE)
+                if package and re.search(r"^\s*@Mod\(", text, re.MULTILINE):
+                    return package.group(1), filename[:-5]
+        return f"com.example.{mod_id}mod", mod_id.replace('_', '').title() + "Mod"
+
     def get_base_package_from_mod_json(self, mod_json_path, mod_id):
         """
-        从mod.json路径推导基础包名
+        从mod.json路径推导基础包名（主类所在的包）
         """
-        mod_json_dir = os.path.dirname(mod_json_path)
-        mdk_path = os.path.join(mod_json_dir, "forge-1.16.5-36.2.34-mdk")
-        java_src_path = os.path.join(mdk_path, "src", "main", "java")
-        com_dir = os.path.join(java_src_path, "com")
-        
-        if os.path.exists(com_dir):
-            com_subdirs = [d for d in os.listdir(com_dir) if os.path.isdir(os.path.join(com_dir, d))]
-            if com_subdirs:
-                base_package_name = com_subdirs[0]
-                com_base_dir = os.path.join(com_dir, base_package_name)
-                
-                if os.path.exists(com_base_dir):
-                    modid_subdirs = [d for d in os.listdir(com_base_dir) if os.path.isdir(os.path.join(com_base_dir, d))]
-                    if modid_subdirs:
-                        return f"com.{base_package_name}.{modid_subdirs[0]}"
-                    else:
-                        return f"com.{base_package_name}.{mod_id}mod"
-                else:
-                    return f"com.{base_package_name}.{mod_id}mod"
-            else:
-                return f"com.example.{mod_id}mod"
-        else:
-            return f"com.example.{mod_id}mod"
+        return self.find_main_class(mod_json_path, mod_id)[0]
 
     def handle_block_inherit(self):
         """
@@ -761,7 +1121,21 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             
             # 设置默认选择为Block类
             self.block_type_combo.setCurrentIndex(2)
-            basic_layout.addWidget(self.block_type_combo, 2, 1)
+            
+            # 有方块类索引时用映射后jar中的真实类替换内置模板，并提供模糊搜索
+            class_index = self.load_class_index(mod_json_path)
+            self.block_class_index = class_index
+            if class_index is not None:
+                self.block_type_search = QLineEdit()
+                self.block_type_search.setPlaceholderText(self.lang.get('block_type_search', '搜索方块类...'))
+                self.block_type_search.textChanged.connect(self.filter_block_types)
+                block_type_layout = QHBoxLayout()
+                block_type_layout.addWidget(self.block_type_search)
+                block_type_layout.addWidget(self.block_type_combo, 1)
+                basic_layout.addLayout(block_type_layout, 2, 1)
+                self.filter_block_types("")
+            else:
+                basic_layout.addWidget(self.block_type_combo, 2, 1)
             
             # 根据BlockExample.md第65行要求：添加ItemGroup选择项
             basic_layout.addWidget(QLabel(self.lang.get('label_itemgroup', '物品分组 (ItemGroup):')), 3, 0)
@@ -799,6 +1173,23 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.material_combo.setCurrentText("ROCK - 岩石")
             basic_layout.addWidget(self.material_combo, 4, 1)
             
+            # 有原版资源索引时可以选择方块模型的父模型（默认cube_all）
+            self.parent_model_combo = None
+            vanilla_index = self.load_vanilla_index(mod_json_path)
+            if vanilla_index is not None:
+                self.vanilla_index = vanilla_index
+                basic_layout.addWidget(QLabel(self.lang.get('label_parent_model', '父模型:')), 5, 0)
+                self.parent_model_combo = QComboBox()
+                self.parent_model_combo.setEditable(True)
+                self.parent_model_combo.setInsertPolicy(QComboBox.NoInsert)
+                for model_name in vanilla_index.template_models():
+                    variables = vanilla_index.required_textures(model_name)
+                    self.parent_model_combo.addItem(f"{model_name} ({', '.join(variables)})", model_name)
+                default_index = self.parent_model_combo.findData("block/cube_all")
+                if default_index >= 0:
+                    self.parent_model_combo.setCurrentIndex(default_index)
+                basic_layout.addWidget(self.parent_model_combo, 5, 1)
+            
             main_layout.addWidget(basic_group)
             
             # 2. 方块属性设置
@@ -843,6 +1234,12 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.sound_type_combo.addItems(["STONE - 石头", "WOOD - 木头", "METAL - 金属", "GLASS - 玻璃", "GRAVEL - 沙砾", "GRASS - 草", "SNOW - 雪"])
             properties_layout.addWidget(self.sound_type_combo, 2, 3)
             
+            # 有方块类索引时材质、工具、音效也使用当前映射下的真实常量名
+            if class_index is not None:
+                self.replace_constant_items(self.material_combo, class_index.materials, ("ROCK", "STONE"))
+                self.replace_constant_items(self.tool_type_combo, class_index.tool_types, (), keep_first=True)
+                self.replace_constant_items(self.sound_type_combo, class_index.sound_types, ("STONE",))
+            
             # 特殊属性
             properties_layout.addWidget(QLabel(self.lang.get('label_special_properties', '特殊属性:')), 3, 0)
             
@@ -866,10 +1263,6 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.ticks_randomly_check = QCheckBox(self.lang.get('check_ticks_randomly', '随机更新 (ticksRandomly)'))
             properties_layout.addWidget(self.ticks_randomly_check, 4, 2)
             
-            # 可被水淹没
-            self.waterlogged_check = QCheckBox(self.lang.get('check_waterlogged', '可被水淹没 (waterlogged)'))
-            properties_layout.addWidget(self.waterlogged_check, 4, 3)
-            
             main_layout.addWidget(properties_group)
             
             # 创建按钮布局
@@ -894,13 +1287,113 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         except Exception as e:
             QMessageBox.critical(self, self.lang.get('error_title', '错误'), f"打开方块创建对话框失败: {e}")
     
+    def load_class_index(self, mod_json_path):
+        """
+        获取项目的方块类索引
+        第一次使用或jar有变化时在后台线程中扫描映射后的Forge jar，扫描完成前使用内置的方块类列表
+        
+        :param mod_json_path: mod.json文件路径
+        :return: ClassIndex，没有可用索引（还没有执行过gradle构建或正在建立）时返回None
+        """
+        try:
+            class_index = ClassIndex.for_mod_json(mod_json_path)
+            jar_path = find_mapped_jar(class_index.mdk_path)
+            if class_index.load(jar_path):
+                return class_index
+            if jar_path is None:
+                self.log_message(self.lang.get('class_index_missing', '没有找到映射后的Forge jar，使用内置的方块类列表（执行一次编译后可用）'))
+                return None
+            
+            thread = getattr(self, 'class_index_thread', None)
+            if thread is None or not thread.isRunning():
+                self.class_index_thread = ClassIndexThread(class_index, jar_path)
+                self.class_index_thread.index_ready.connect(self.on_class_index_ready)
+                self.class_index_thread.error_signal.connect(
+                    lambda e: self.log_message(self.lang.get('class_index_error', '读取方块类索引失败: {e}').format(e=e)))
+                self.class_index_thread.start()
+            self.log_message(self.lang.get('class_index_building', '正在后台建立方块类索引，暂时使用内置的方块类列表'))
+        except Exception as e:
+            self.log_message(self.lang.get('class_index_error', '读取方块类索引失败: {e}').format(e=e))
+        return None
+    
+    def on_class_index_ready(self, class_index):
+        """
+        方块类索引在后台建立完成
+        
+        :param class_index: 建立好的ClassIndex
+        """
+        self.log_message(self.lang.get('class_index_ready', '方块类索引已建立（{count}个方块类），下次创建方块时可用').format(
+            count=len(class_index.blocks)))
+    
+    def load_vanilla_index(self, mod_json_path):
+        """
+        获取原版资源索引，第一次使用或客户端jar有变化时重新建立
+        
+        :param mod_json_path: mod.json文件路径
+        :return: VanillaAssetIndex，找不到客户端jar时返回None
+        """
+        try:
+            vanilla_index = VanillaAssetIndex.for_mod_json(mod_json_path)
+            if vanilla_index.ensure():
+                return vanilla_index
+            self.log_message(self.lang.get('vanilla_index_missing', '没有找到Minecraft客户端jar（执行一次编译后可用）'))
+        except Exception as e:
+            self.log_message(self.lang.get('vanilla_index_error', '读取原版资源索引失败: {e}').format(e=e))
+        return None
+    
+    def filter_block_types(self, text):
+        """
+        按模糊搜索结果重新填充方块类型下拉框
+        
+        :param text: 搜索文本
+        """
+        self.block_type_combo.clear()
+        for block in self.block_class_index.search(text.strip(), limit=200, properties_only=True):
+            constructors = [format_constructor(block, parameters) for parameters in block["constructors"]]
+            self.block_type_combo.addItem(f"{block['name']} - {constructors[0]}", block["class"])
+            self.block_type_combo.setItemData(self.block_type_combo.count() - 1,
+                                              f"{block['class']}\n" + "\n".join(constructors), Qt.ToolTipRole)
+    
+    def replace_constant_items(self, combo, names, defaults, keep_first=False):
+        """
+        用索引中的常量名替换下拉框内容，保留内置条目中已有的中文说明
+        
+        :param combo: 下拉框
+        :param names: 常量名列表，为空时不修改
+        :param defaults: 依次尝试选中的默认常量名
+        :param keep_first: 是否保留第一项（如"无"）
+        """
+        if not names:
+            return
+        labels = {}
+        for row in range(combo.count()):
+            parts = combo.itemText(row).split(" - ", 1)
+            if len(parts) == 2:
+                labels[parts[0]] = parts[1]
+        first = combo.itemText(0) if keep_first else None
+        combo.clear()
+        if first is not None:
+            combo.addItem(first)
+        for name in names:
+            combo.addItem(f"{name} - {labels[name]}" if name in labels else name)
+        for name in defaults:
+            if name in names:
+                combo.setCurrentIndex(names.index(name) + (1 if first is not None else 0))
+                break
+    
     def handle_block_inherit_confirm(self):
         """
         处理从现有方块继承创建新方块的确认操作
         """
         try:
             # 获取选择的方块类型文本
-            selected_text = self.block_type_combo.currentText()
+            selected_text = self.block_type_combo.currentText().strip()
+            
+            # 搜索结果为空时没有可选的方块类
+            if not selected_text:
+                QMessageBox.warning(self, self.lang.get('warning_title', '警告'),
+                                   self.lang.get('block_type_required', '请选择方块类型'))
+                return
             
             # 检查是否是分类标题
             if selected_text.startswith("--"):
@@ -908,8 +1401,8 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                                    self.lang.get('block_type_warning', '请选择一个实际的方块类型，而不是分类标题'))
                 return
             
-            # 从选择的文本中提取类名
-            selected_block = selected_text.split()[0]
+            # 使用方块类索引时条目数据是完整类名，否则从选择的文本中提取类名
+            selected_block = self.block_type_combo.currentData() or selected_text.split()[0]
             
             # 获取用户输入的方块名称和显示名称
             block_name = self.block_name_edit.text().strip()
@@ -950,17 +1443,25 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             requires_tool = self.requires_tool_check.isChecked()
             no_drops = self.no_drops_check.isChecked()
             ticks_randomly = self.ticks_randomly_check.isChecked()
-            waterlogged = self.waterlogged_check.isChecked()
             
             # 根据BlockExample.md第65行要求：获取对话框中选择的ItemGroup
             selected_item_group = self.itemgroup_combo.currentText()
             self.current_item_group_class_name = selected_item_group
             
+            # 选择的父模型及其需要填写的贴图变量（没有原版资源索引时使用cube_all）
+            self.current_parent_model = None
+            if self.parent_model_combo is not None:
+                # 下拉框可以输入，只接受列表中已有的条目
+                parent_index = self.parent_model_combo.findText(self.parent_model_combo.currentText())
+                if parent_index >= 0:
+                    parent_model = self.parent_model_combo.itemData(parent_index)
+                    self.current_parent_model = (parent_model, self.vanilla_index.required_textures(parent_model))
+            
             # 生成方块代码
-            self.generate_block_code(selected_block, block_name, display_name, material, 
-                                   hardness, resistance, harvest_level, tool_type, 
-                                   light_level, sound_type, not_solid, no_collision, 
-                                   requires_tool, no_drops, ticks_randomly, waterlogged)
+            self.generate_block_code(BlockSpec(block_name, selected_block, display_name, material,
+                                               hardness, resistance, harvest_level, tool_type,
+                                               light_level, sound_type, not_solid, no_collision,
+                                               requires_tool, no_drops, ticks_randomly))
             
             QMessageBox.information(self, self.lang.get('new_project_success', '成功'), 
                                    self.lang.get('new_project_success_message', '方块创建成功！'))
@@ -968,30 +1469,13 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         except Exception as e:
             QMessageBox.critical(self, self.lang.get('error_title', '错误'), f"创建方块失败: {e}")
     
-    def generate_block_code(self, base_block_class, block_name, display_name, material, 
-                          hardness, resistance, harvest_level, tool_type, 
-                          light_level, sound_type, not_solid, no_collision, 
-                          requires_tool, no_drops, ticks_randomly, waterlogged):
+    @tracing.traced(category="codegen")
+    def generate_block_code(self, block):
         """
         生成方块的Java代码
         根据BlockExample.md的要求，使用选择的ItemGroup
         
-        :param base_block_class: 基础方块类名
-        :param block_name: 方块名称
-        :param display_name: 方块显示名称
-        :param material: 方块材质
-        :param hardness: 方块硬度
-        :param resistance: 方块爆炸抗性
-        :param harvest_level: 挖掘等级
-        :param tool_type: 挖掘工具类型
-        :param light_level: 发光等级
-        :param sound_type: 音效类型
-        :param not_solid: 是否为非固体
-        :param no_collision: 是否无碰撞
-        :param requires_tool: 是否需要工具挖掘
-        :param no_drops: 是否无掉落
-        :param ticks_randomly: 是否随机更新
-        :param waterlogged: 是否可被水淹没
+        :param block: BlockSpec
         """
         
         # 获取当前编辑器中打开的mod.json路径
@@ -1022,8 +1506,6 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                 else:
                     item_group_class_name = "ExampleItemGroup"
             
-            # 根据BlockExample.md的要求：当没有block文件夹时，创建一个新的block文件夹
-            
             # 计算mod.json所在目录
             mod_json_dir = os.path.dirname(mod_json_path)
             
@@ -1033,33 +1515,8 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             # 确定Java源文件路径
             java_src_path = os.path.join(mdk_path, "src", "main", "java")
             
-            # 从现有的文件夹结构中提取包名信息
-            com_dir = os.path.join(java_src_path, "com")
-            
-            # 检查com目录是否存在
-            if os.path.exists(com_dir):
-                # 列出com目录下的所有文件夹
-                com_subdirs = [d for d in os.listdir(com_dir) if os.path.isdir(os.path.join(com_dir, d))]
-                
-                if com_subdirs:
-                    # 假设com目录下的第一个文件夹就是basePackageName
-                    base_package_name = com_subdirs[0]
-                    com_base_dir = os.path.join(com_dir, base_package_name)
-                    
-                    # 列出com.basePackageName目录下的所有文件夹
-                    if os.path.exists(com_base_dir):
-                        modid_subdirs = [d for d in os.listdir(com_base_dir) if os.path.isdir(os.path.join(com_base_dir, d))]
-                        
-                        if modid_subdirs:
-                            base_package = f"com.{base_package_name}.{modid_subdirs[0]}"
-                        else:
-                            base_package = f"com.{base_package_name}.{mod_id}mod"
-                    else:
-                        base_package = f"com.{base_package_name}.{mod_id}mod"
-                else:
-                    base_package = f"com.example.{mod_id}mod"
-            else:
-                base_package = f"com.example.{mod_id}mod"
+            # 包名和主类名取自带@Mod注解的主类
+            base_package, main_class_name = self.find_main_class(mod_json_path, mod_id)
             
             # 创建完整的包路径
             package_dir = os.path.join(java_src_path, *base_package.split("."))
@@ -1074,191 +1531,145 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             # 设置正确的包名
             package_path = f"{base_package}.block"
             
-            # 如果文件不存在，创建新文件
-            if not os.path.exists(mod_blocks_path):
-                self.create_mod_blocks_file(mod_blocks_path, package_path, mod_id, item_group_class_name)
-            
-            # 添加新方块到ModBlocks.java
-            self.add_block_to_mod_blocks(mod_blocks_path, base_block_class, block_name, display_name, 
-                                       material, hardness, resistance, harvest_level, tool_type, 
-                                       light_level, sound_type, not_solid, no_collision, 
-                                       requires_tool, no_drops, ticks_randomly, waterlogged,
-                                       item_group_class_name)
-            
-            # 更新mod.json文件，添加方块信息
-            self.update_mod_json(mod_json_path, block_name, mod_id, material, hardness, resistance, 
-                               harvest_level, tool_type, light_level)
-            
-            # 重新加载mod.json文件以显示更新
-            self.editor.read(mod_json_path)
-            
-        except Exception as e:
-            QMessageBox.critical(self, self.lang.get('error_title', '错误'), f"生成方块代码失败: {e}")
-        
-        # 获取当前编辑器中打开的mod.json路径
-        if hasattr(self.editor, 'file_path') and self.editor.file_path:
-            mod_json_path = self.editor.file_path
-        else:
-            QMessageBox.warning(self, self.lang.get('warning_title', '警告'), "没有打开的mod.json文件，无法生成方块代码")
-            return
-        
-        try:
-            # 根据readme.md第6行：从mods.toml读取模组信息
-            mod_id = self.get_modid_from_mods_toml(mod_json_path)
-            if not mod_id:
-                # 如果读取失败，尝试从mod.json读取作为备选
-                with open(mod_json_path, 'r', encoding='utf-8') as f:
-                    mod_data = json.load(f)
-                mod_id = mod_data.get("modInfo", {}).get("modid", "unknown")
-            
-            # 根据BlockExample.md的要求：当没有block文件夹时，创建一个新的block文件夹
-            
-            # 计算mod.json所在目录
-            mod_json_dir = os.path.dirname(mod_json_path)
-            
-            # 查找mdk路径
-            mdk_path = os.path.join(mod_json_dir, "forge-1.16.5-36.2.34-mdk")
-            
-            # 确定Java源文件路径
-            java_src_path = os.path.join(mdk_path, "src", "main", "java")
-            
-            # 从现有的文件夹结构中提取包名信息
-            com_dir = os.path.join(java_src_path, "com")
+            # 一次添加方块会修改mod.json、ModBlocks.java和多个资源文件，
+            # 全部放在同一个事务中，保证中途出错或崩溃时项目不会处于不一致的状态
+            # 根据方块类（沿父类链）选择blockstate模板和默认标签，内容相同的模型复用已有文件
+            block_name = block.name
+            lineage = self.block_class_lineage(block.base_class)
+            template = template_for(lineage)
+            model_index = ModelIndex.for_mod_json(mod_json_path, mod_id)
+            resource_sync = ResourceSync.for_mod_json(mod_json_path, mod_id)
+            project_store = ProjectStore.for_mod_json(mod_json_path)
             
-            # 检查com目录是否存在
-            if os.path.exists(com_dir):
-                # 列出com目录下的所有文件夹
-                com_subdirs = [d for d in os.listdir(com_dir) if os.path.isdir(os.path.join(com_dir, d))]
-                
-                if com_subdirs:
-                    # 假设com目录下的第一个文件夹就是basePackageName
-                    base_package_name = com_subdirs[0]
-                    com_base_dir = os.path.join(com_dir, base_package_name)
+            try:
+                with self.get_project_journal(mod_json_path).transaction(f"添加方块 {block_name}"):
+                    # 如果文件不存在，创建新文件
+                    if not journal.exists(mod_blocks_path):
+                        self.create_mod_blocks_file(mod_blocks_path, package_path, mod_id, item_group_class_name,
+                                                    main_class_name)
                     
-                    # 列出com.basePackageName目录下的所有文件夹
-                    if os.path.exists(com_base_dir):
-                        modid_subdirs = [d for d in os.listdir(com_base_dir) if os.path.isdir(os.path.join(com_base_dir, d))]
-                        
-                        if modid_subdirs:
-                            base_package = f"com.{base_package_name}.{modid_subdirs[0]}"
-                        else:
-                            base_package = f"com.{base_package_name}.{mod_id}mod"
+                    # 添加新方块到ModBlocks.java
+                    self.add_block_to_mod_blocks(mod_blocks_path, block, item_group_class_name)
+                    
+                    # 根据BlockExample.md要求：生成模型文件（复用已有模型时mod.json记录实际使用的模型）
+                    parent_model, texture_variables = getattr(self, 'current_parent_model', None) or ("block/cube_all", ["all"])
+                    models = self.create_block_model_file(mdk_path, mod_id, block_name, parent_model, texture_variables,
+                                                          template, model_index)
+                    self.create_item_model_file(mdk_path, mod_id, block_name, models.get(template.item_model))
+                    
+                    # 更新mod.json文件，添加方块信息
+                    mod_data = self.update_mod_json(mod_json_path, block, mod_id, template, tags_for_class(lineage),
+                                                    project_store, models.get(template.item_model))
+                    
+                    # 语言文件和标签文件由mod.json统一生成，每个文件只写一次，内容不变时不写；
+                    # 使用项目数据库时只同步这个方块涉及的文件，不读取整个mod.json
+                    if project_store is not None:
+                        resource_sync.sync_added(mod_data)
                     else:
-                        base_package = f"com.{base_package_name}.{mod_id}mod"
-                else:
-                    base_package = f"com.example.{mod_id}mod"
-            else:
-                base_package = f"com.example.{mod_id}mod"
-            
-            # 创建完整的包路径
-            package_dir = os.path.join(java_src_path, *base_package.split("."))
-            
-            # 根据BlockExample.md的要求，创建block文件夹
-            block_dir = os.path.join(package_dir, "block")
-            os.makedirs(block_dir, exist_ok=True)
-            
-            # 创建ModBlocks.java文件
-            mod_blocks_path = os.path.join(block_dir, "ModBlocks.java")
-            
-            # 设置正确的包名
-            package_path = f"{base_package}.block"
-            
-            # 如果文件不存在，创建新文件
-            if not os.path.exists(mod_blocks_path):
-                self.create_mod_blocks_file(mod_blocks_path, package_path, mod_id)
-            
-            # 添加新方块到ModBlocks.java
-            self.add_block_to_mod_blocks(mod_blocks_path, base_block_class, block_name, display_name, 
-                                       material, hardness, resistance, harvest_level, tool_type, 
-                                       light_level, sound_type, not_solid, no_collision, 
-                                       requires_tool, no_drops, ticks_randomly, waterlogged)
-            
-            # 更新mod.json文件，添加方块信息
-            self.update_mod_json(mod_json_path, block_name, mod_id, material, hardness, resistance, 
-                               harvest_level, tool_type, light_level)
-            
-            # 根据BlockExample.md要求：生成blockState文件
-            self.create_blockstate_file(mdk_path, mod_id, block_name)
-            
-            # 根据BlockExample.md要求：生成模型文件
-            self.create_block_model_file(mdk_path, mod_id, block_name)
-            self.create_item_model_file(mdk_path, mod_id, block_name)
-            
-            # 根据BlockExample.md要求：生成战利品表文件
-            self.create_loot_table_file(mdk_path, mod_id, block_name)
-            
-            # 根据BlockExample.md要求：提示用户选择贴图文件
-            self.select_and_copy_texture(mdk_path, mod_id, block_name)
+                        resource_sync.sync(mod_data)
+                    
+                    # 根据BlockExample.md要求：生成blockState文件
+                    self.create_blockstate_file(mdk_path, mod_id, block_name, template, models)
+                    
+                    # 根据BlockExample.md要求：生成战利品表文件
+                    self.create_loot_table_file(mdk_path, mod_id, block_name)
+                    
+                    # 根据BlockExample.md要求：提示用户选择贴图文件
+                    self.select_and_copy_texture(mdk_path, mod_id, block_name)
+                model_index.save()
+                resource_sync.save()
+                if project_store is not None:
+                    project_store.save()
+            finally:
+                # 事务失败时也要关闭数据库（丢弃未提交的修改并释放锁）
+                if project_store is not None:
+                    project_store.close()
             
             # 重新加载mod.json文件以显示更新
             self.editor.read(mod_json_path)
             
+            # 检查生成的代码，问题只记录到日志，构建前会再次检查
+            issues = javacheck.default_checker.check_file(mod_blocks_path)
+            for line in javacheck.format_issues(issues, limit=len(issues), relative_to=java_src_path):
+                self.log_message(line)
+            
         except Exception as e:
             QMessageBox.critical(self, self.lang.get('error_title', '错误'), f"生成方块代码失败: {e}")
     
-    def update_mod_json(self, mod_json_path, block_name, mod_id, material, hardness, resistance, 
-                       harvest_level, tool_type, light_level):
+    def block_class_lineage(self, base_block_class):
+        """
+        方块类及其父类的简单类名（用于选择blockstate模板和默认标签）：
+        有方块类索引时沿父类链查找，否则只有类名本身
+        
+        :param base_block_class: 基础方块类名（简单类名或完整类名）
+        :return: 简单类名列表（从子类到父类）
+        """
+        class_index = getattr(self, 'block_class_index', None)
+        if class_index is not None:
+            return class_index.superclasses(base_block_class)
+        return [base_block_class.rsplit(".", 1)[-1]]
+    
+    @tracing.traced(category="codegen")
+    def update_mod_json(self, mod_json_path, block, mod_id, template=None, tags=None, store=None, model=None):
         """
         更新mod.json文件，添加方块信息
         
         :param mod_json_path: mod.json文件路径
-        :param block_name: 方块名称
+        :param block: BlockSpec（显示名称会写入语言文件）
         :param mod_id: 模组ID
-        :param material: 方块材质
-        :param hardness: 方块硬度
-        :param resistance: 方块爆炸抗性
-        :param harvest_level: 挖掘等级
-        :param tool_type: 挖掘工具类型
-        :param light_level: 发光等级
+        :param template: blockstate模板，决定defaultState和variants
+        :param tags: 方块加入的标签{"blocks": [...], "items": [...]}
+        :param store: 项目数据库（项目启用了数据库时），按索引查找和添加方块，mod.json在事务提交前导出
+        :param model: 方块实际使用的模型位置（create_block_model_file的返回值中的模型），默认为方块本身的模型
+        :return: 更新后的mod.json内容；使用项目数据库时只有这个方块（{"blocks": [方块]}，用ResourceSync.sync_added同步）
         """
         
         try:
-            # 读取mod.json文件
-            with open(mod_json_path, 'r', encoding='utf-8') as f:
-                mod_data = json.load(f)
-            
-            # 确保blocks数组存在
-            if "blocks" not in mod_data:
-                mod_data["blocks"] = []
-            
-            # 检查方块是否已存在
-            block_exists = False
-            for block in mod_data["blocks"]:
-                if block["name"] == block_name:
-                    block_exists = True
-                    break
+            if store is not None:
+                # 检查方块是否已存在（索引查找，不解析整个mod.json）
+                existing_block = store.get("blocks", block.name)
+                block_exists = existing_block is not None
+            else:
+                # 读取mod.json文件
+                mod_data = journal.load_json(mod_json_path)
+                
+                # 确保blocks数组存在
+                if "blocks" not in mod_data:
+                    mod_data["blocks"] = []
+                
+                # 检查方块是否已存在
+                block_exists = False
+                for entry in mod_data["blocks"]:
+                    if entry["name"] == block.name:
+                        block_exists = True
+                        break
             
             if not block_exists:
                 # 创建新的方块信息
-                new_block = {
-                    "name": block_name,
-                    "registryName": f"{mod_id}:{block_name}",
-                    "unlocalizedName": f"tile.{mod_id}.{block_name}",
-                    "material": material,
-                    "hardness": float(hardness),  # 确保是浮点数
-                    "resistance": float(resistance),  # 确保是浮点数
-                    "harvestLevel": int(harvest_level),
-                    "harvestTool": tool_type.lower() if tool_type else "",
-                    "lightValue": int(light_level),
-                    "lightOpacity": 255,  # 默认不透明
-                    "creativeTab": mod_id,
-                    "textureName": f"{mod_id}:blocks/{block_name}",
-                    "model": f"{mod_id}:block/{block_name}",
-                    "defaultState": {},
-                    "variants": []
-                }
-                
-                # 添加方块到blocks数组
-                mod_data["blocks"].append(new_block)
+                new_block = block.to_json(mod_id, template, tags, model)
                 
-                # 写入更新后的mod.json文件
-                with open(mod_json_path, 'w', encoding='utf-8') as f:
-                    json.dump(mod_data, f, ensure_ascii=False, indent=2)
+                if store is not None:
+                    # 只添加一行，mod.json由各条目已序列化的文本拼接，在事务提交前导出一次
+                    store.put("blocks", new_block)
+                    store.export(mod_json_path)
+                    existing_block = new_block
+                else:
+                    # 添加方块到blocks数组
+                    mod_data["blocks"].append(new_block)
+                    
+                    # 写入更新后的mod.json文件
+                    journal.dump_json(mod_json_path, mod_data)
+            
+            if store is not None:
+                return {"blocks": [existing_block]}
+            return mod_data
                 
         except Exception as e:
             raise Exception(f"更新mod.json失败: {e}")
     
-    def create_mod_blocks_file(self, file_path, package_path, mod_id, item_group_class_name="ExampleItemGroup"):
+    @tracing.traced(category="codegen")
+    def create_mod_blocks_file(self, file_path, package_path, mod_id, item_group_class_name="ExampleItemGroup",
+                               main_class_name=None):
         """
         创建ModBlocks.java文件
         根据BlockExample.md的要求，使用指定的ItemGroup
@@ -1267,11 +1678,12 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         :param package_path: 包名
         :param mod_id: 模组ID
         :param item_group_class_name: ItemGroup类名
+        :param main_class_name: 主类名（find_main_class的结果），默认按模板的命名由modId推导
         """
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
+            with io.StringIO() as f:
                 # 使用正确的字符串拼接方法
-                mod_class_name = mod_id.replace('_', '').title() + "Mod"
+                mod_class_name = main_class_name or mod_id.replace('_', '').title() + "Mod"
                 
                 # 写入package声明
                 f.write(f"package {package_path};\n\n")
@@ -1323,90 +1735,29 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                 
                 # 写入类结束
                 f.write("}\n")
+                journal.write_text(file_path, f.getvalue())
                 
         except Exception as e:
             raise Exception(f"创建ModBlocks.java文件失败: {e}")
     
-    def add_block_to_mod_blocks(self, file_path, base_block_class, block_name, display_name, material, 
-                               hardness, resistance, harvest_level, tool_type, 
-                               light_level, sound_type, not_solid, no_collision, 
-                               requires_tool, no_drops, ticks_randomly, waterlogged,
-                               item_group_class_name="ExampleItemGroup"):
+    @tracing.traced(category="codegen")
+    def add_block_to_mod_blocks(self, file_path, block, item_group_class_name="ExampleItemGroup"):
         """
         向ModBlocks.java文件添加新方块
         
         :param file_path: ModBlocks.java文件路径
-        :param base_block_class: 基础方块类名
-        :param block_name: 方块名称
-        :param display_name: 方块显示名称
-        :param material: 方块材质
-        :param hardness: 方块硬度
-        :param resistance: 方块爆炸抗性
-        :param harvest_level: 挖掘等级
-        :param tool_type: 挖掘工具类型
-        :param light_level: 发光等级
-        :param sound_type: 音效类型
-        :param not_solid: 是否为非固体
-        :param no_collision: 是否无碰撞
-        :param requires_tool: 是否需要工具挖掘
-        :param no_drops: 是否无掉落
-        :param ticks_randomly: 是否随机更新
-        :param waterlogged: 是否可被水淹没
+        :param block: BlockSpec
         :param item_group_class_name: ItemGroup类名
         """
         try:
             # 读取文件内容
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 生成方块注册代码
-            block_registry = []
-            block_registry.append(f"    public static final RegistryObject<{base_block_class}> {block_name.upper()} = registerBlock(")
-            block_registry.append(f"        \"{block_name}\",")
-            block_registry.append(f"        () -> new {base_block_class}(")
-            block_registry.append(f"            AbstractBlock.Properties.create(Material.{material})")
-            
-            # 添加属性设置
-            if hardness > 0 or resistance > 0:
-                block_registry.append(f"                .hardnessAndResistance({hardness}f, {resistance}f)")
-            elif hardness > 0:
-                block_registry.append(f"                .hardnessAndResistance({hardness}f)")
-            
-            if harvest_level > 0:
-                block_registry.append(f"                .harvestLevel({harvest_level})")
-            
-            if tool_type:
-                block_registry.append(f"                .harvestTool(ToolType.{tool_type})")
-            
-            if light_level > 0:
-                block_registry.append(f"                .setLightLevel(state -> {light_level})")
-            
-            if sound_type:
-                block_registry.append(f"                .sound(SoundType.{sound_type})")
-            
-            if not_solid:
-                block_registry.append(f"                .notSolid()")
-            
-            if no_collision:
-                block_registry.append(f"                .noCollision()")
+            content = journal.read_text(file_path)
             
-            if requires_tool:
-                block_registry.append(f"                .setRequiresTool()")
+            # 基础方块类可以是完整类名（来自方块类索引），也可以是net.minecraft.block包中的简单类名
+            qualified_class = block.qualified_class
             
-            if no_drops:
-                block_registry.append(f"                .noDrops()")
-            
-            if ticks_randomly:
-                block_registry.append(f"                .ticksRandomly()")
-            
-            if waterlogged:
-                block_registry.append(f"                .waterlogged()")
-            
-            block_registry.append(f"            )")
-            block_registry.append(f"    );")
-            
-            # 将列表转换为字符串
-            block_registry_str = "\n".join(block_registry) + "\n"
+            # 生成方块注册代码
+            block_registry_str = block.registry_code()
             
             # 在register方法之前插入新方块
             register_method_index = content.find("    public static void register(IEventBus eventBus) {")
@@ -1418,17 +1769,16 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                 new_content = content[:class_end_index] + "\n" + block_registry_str + "\n" + content[class_end_index:]
             
             # 添加必要的导入
-            if base_block_class not in ["Block"]:
+            if qualified_class != "net.minecraft.block.Block" and f"import {qualified_class};" not in new_content:
                 new_content = new_content.replace("import net.minecraft.block.Block;", 
-                                                f"import net.minecraft.block.Block;\nimport net.minecraft.block.{base_block_class};")
+                                                f"import net.minecraft.block.Block;\nimport {qualified_class};")
             
             if not new_content.__contains__("import net.minecraft.block.SoundType;"):
                 new_content = new_content.replace("import net.minecraft.block.AbstractBlock;", 
                                                 f"import net.minecraft.block.AbstractBlock;\nimport net.minecraft.block.SoundType;")
             
             # 写入更新后的内容
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            journal.write_text(file_path, new_content)
                 
         except Exception as e:
             raise Exception(f"向ModBlocks.java添加方块失败: {e}")
@@ -1441,33 +1791,625 @@ class MainWindow(QMainWindow, Ui_MainWindow):
     
     def handle_create_item(self):
         """
-        处理创建物品动作
-        """
-        QMessageBox.information(self, self.lang.get('information_title', '提示'), "物品创建功能尚未实现")
-    
-    def handle_create_tag(self):
-        """
-        处理创建标签动作
-        """
-        QMessageBox.information(self, self.lang.get('information_title', '提示'), "标签创建功能尚未实现")
-    
-    def handle_create_sound(self):
-        """
-        处理创建声音动作
+        处理创建物品动作：添加一行等级表（一种材料的工具、盔甲、锭/粒系列），保存到mod.json并重新生成物品
         """
-        QMessageBox.information(self, self.lang.get('information_title', '提示'), "声音创建功能尚未实现")
-    
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(self.lang.get('item_tier_title', '添加物品系列'))
+        dialog.resize(520, 600)
+        layout = QVBoxLayout(dialog)
+        
+        basic_layout = QGridLayout()
+        basic_layout.addWidget(QLabel(self.lang.get('item_tier_name', '材料名称:')), 0, 0)
+        name_edit = QLineEdit()
+        name_edit.setPlaceholderText(self.lang.get('item_tier_name_placeholder', '例如: copper'))
+        basic_layout.addWidget(name_edit, 0, 1)
+        basic_layout.addWidget(QLabel(self.lang.get('item_tier_display_name', '显示名称:')), 1, 0)
+        display_name_edit = QLineEdit()
+        display_name_edit.setPlaceholderText(self.lang.get('item_tier_display_name_placeholder', '例如: 铜'))
+        basic_layout.addWidget(display_name_edit, 1, 1)
+        basic_layout.addWidget(QLabel(self.lang.get('item_tier_repair', '修复材料:')), 2, 0)
+        repair_edit = QLineEdit()
+        repair_edit.setPlaceholderText("#forge:ingots/copper")
+        basic_layout.addWidget(repair_edit, 2, 1)
+        layout.addLayout(basic_layout)
+        
+        layout.addWidget(QLabel(self.lang.get('item_tier_families', '系列:')))
+        family_list = QListWidget()
+        for family_name, members in ITEM_FAMILIES.items():
+            item = QListWidgetItem(f"{family_name}  ({', '.join(members)})")
+            item.setData(Qt.UserRole, family_name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            family_list.addItem(item)
+        layout.addWidget(family_list)
+        
+        # 工具等级和盔甲材料的数值，默认与原版铁相同
+        stats_group = QGroupBox(self.lang.get('item_tier_stats', '等级数值'))
+        stats_layout = QGridLayout(stats_group)
+        level_spin = QSpinBox()
+        level_spin.setRange(0, 10)
+        level_spin.setValue(TIER_DEFAULTS["level"])
+        uses_spin = QSpinBox()
+        uses_spin.setRange(1, 100000)
+        uses_spin.setValue(TIER_DEFAULTS["uses"])
+        speed_spin = QDoubleSpinBox()
+        speed_spin.setRange(0, 100)
+        speed_spin.setValue(TIER_DEFAULTS["speed"])
+        damage_spin = QDoubleSpinBox()
+        damage_spin.setRange(0, 100)
+        damage_spin.setValue(TIER_DEFAULTS["attackDamage"])
+        enchantability_spin = QSpinBox()
+        enchantability_spin.setRange(0, 100)
+        enchantability_spin.setValue(TIER_DEFAULTS["enchantability"])
+        durability_spin = QSpinBox()
+        durability_spin.setRange(1, 1000)
+        durability_spin.setValue(TIER_DEFAULTS["armorDurability"])
+        protection_edit = QLineEdit(", ".join(str(value) for value in TIER_DEFAULTS["armorProtection"]))
+        stats = [
+            (self.lang.get('item_tier_level', '挖掘等级:'), level_spin),
+            (self.lang.get('item_tier_uses', '工具耐久:'), uses_spin),
+            (self.lang.get('item_tier_speed', '挖掘速度:'), speed_spin),
+            (self.lang.get('item_tier_attack_damage', '攻击伤害加成:'), damage_spin),
+            (self.lang.get('item_tier_enchantability', '附魔能力:'), enchantability_spin),
+            (self.lang.get('item_tier_armor_durability', '盔甲耐久倍数:'), durability_spin),
+            (self.lang.get('item_tier_armor_protection', '护甲值（靴子, 护腿, 胸甲, 头盔）:'), protection_edit),
+        ]
+        for row, (label, widget) in enumerate(stats):
+            stats_layout.addWidget(QLabel(label), row, 0)
+            stats_layout.addWidget(widget, row, 1)
+        layout.addWidget(stats_group)
+        
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        ok_button = QPushButton(self.lang.get('button_create', '创建'))
+        ok_button.clicked.connect(dialog.accept)
+        button_layout.addWidget(ok_button)
+        cancel_button = QPushButton(self.lang.get('button_cancel', '取消'))
+        cancel_button.clicked.connect(dialog.reject)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        
+        tier_name = name_edit.text().strip()
+        families = [family_list.item(row).data(Qt.UserRole) for row in range(family_list.count())
+                    if family_list.item(row).checkState() == Qt.Checked]
+        try:
+            protection = [int(value) for value in protection_edit.text().replace("，", ",").split(",")]
+        except ValueError:
+            protection = []
+        if not tier_name or not families or len(protection) != 4:
+            QMessageBox.warning(self, self.lang.get('warning_title', '警告'),
+                                self.lang.get('item_tier_incomplete', '请填写材料名称、至少选择一个系列，护甲值需要4个整数'))
+            return
+        
+        tier = {
+            "name": tier_name,
+            "families": families,
+            "level": level_spin.value(),
+            "uses": uses_spin.value(),
+            "speed": speed_spin.value(),
+            "attackDamage": damage_spin.value(),
+            "enchantability": enchantability_spin.value(),
+        }
+        if "armor" in families:
+            tier["armorDurability"] = durability_spin.value()
+            tier["armorProtection"] = protection
+        if display_name_edit.text().strip():
+            tier["displayName"] = display_name_edit.text().strip()
+        if repair_edit.text().strip():
+            tier["repair"] = repair_edit.text().strip()
+        self.generate_items(self.current_mod_json_path, tier)
+    
+    def handle_generate_items(self):
+        """
+        根据mod.json中的物品和等级表重新生成物品代码、模型、语言文件和标签（手动修改mod.json后使用）
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        self.generate_items(self.current_mod_json_path)
+    
+    def get_item_group_class_name(self, mod_json_path):
+        """
+        生成代码使用的ItemGroup类名：当前选择的，其次是mod.json中的第一个
+        """
+        item_group_class_name = getattr(self, 'current_item_group_class_name', None)
+        if item_group_class_name:
+            return item_group_class_name
+        item_groups = journal.load_json(mod_json_path).get("itemGroups", [])
+        return item_groups[0].get("name", "ExampleItemGroup") if item_groups else "ExampleItemGroup"
+    
+    def generate_items(self, mod_json_path, tier=None):
+        """
+        展开等级表，在一个事务中生成ModItems.java、工具等级和盔甲材料枚举、物品模型、语言文件和标签，
+        每个文件只写一次
+        
+        :param mod_json_path: mod.json文件路径
+        :param tier: 要添加（或替换同名）的等级表，为None时只重新生成
+        """
+        try:
+            mod_id = self.get_modid_from_mods_toml(mod_json_path)
+            if not mod_id:
+                mod_id = journal.load_json(mod_json_path).get("modInfo", {}).get("modid", "unknown")
+            base_package, main_class_name = self.find_main_class(mod_json_path, mod_id)
+            generator = ItemGenerator.for_mod_json(mod_json_path, mod_id, base_package,
+                                                   self.get_item_group_class_name(mod_json_path), main_class_name)
+            resource_sync = ResourceSync.for_mod_json(mod_json_path, mod_id)
+            
+            with self.get_project_journal(mod_json_path).transaction(
+                    f"添加物品系列 {tier['name']}" if tier else "生成物品代码"):
+                mod_data = journal.load_json(mod_json_path)
+                if tier is not None:
+                    tiers = [t for t in mod_data.get("itemTiers", []) if t.get("name") != tier["name"]]
+                    mod_data["itemTiers"] = tiers + [tier]
+                changed, errors = expand_tiers(mod_data, mod_id)
+                if changed or tier is not None:
+                    journal.dump_json(mod_json_path, mod_data)
+                outputs, render_errors = generator.render(mod_data)
+                errors += render_errors
+                written, unchanged, removed = generator.apply(outputs)
+                # 语言文件和标签文件同样每个只写一次
+                synced, _ = resource_sync.sync(mod_data)
+            generator.save()
+            resource_sync.save()
+            if changed or tier is not None:
+                self.editor.read(mod_json_path)
+            
+            mod_items_path = os.path.join(generator.item_dir, "ModItems.java")
+            issues = javacheck.default_checker.check_file(mod_items_path)
+            java_src_path = os.path.join(os.path.dirname(mod_json_path), "forge-1.16.5-36.2.34-mdk", "src", "main", "java")
+            for line in javacheck.format_issues(issues, limit=len(issues), relative_to=java_src_path):
+                self.log_message(line)
+            
+            summary = self.lang.get('generate_items_done', '物品：{items}个，代码和模型写入{written}个，{unchanged}个无变化，删除{removed}个；语言文件和标签写入{synced}个').format(
+                items=len(mod_data.get("items", [])), written=written, unchanged=unchanged,
+                removed=removed, synced=synced)
+            self.log_message(summary)
+            if errors or generator.skipped:
+                lines = [summary, ""] + errors
+                if generator.skipped:
+                    lines += ["", self.lang.get('generate_items_skipped', '以下文件不是由生成器创建的，没有覆盖:')]
+                    lines += [f"  {rel_path}" for rel_path in generator.skipped]
+                self.show_text_report(self.lang.get('generate_items_title', '物品生成结果'), lines)
+            else:
+                self.statusbar.showMessage(summary, 5000)
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('generate_items_error', '生成物品失败: {e}').format(e=e))
+    
+    def handle_create_tag(self):
+        """
+        处理创建标签动作
+        """
+        QMessageBox.information(self, self.lang.get('information_title', '提示'), "标签创建功能尚未实现")
+    
+    def handle_create_sound(self):
+        """
+        处理创建声音动作：选择一个或多个.ogg文件，检查后复制到项目并注册为音效事件
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        files, _ = QFileDialog.getOpenFileNames(self, self.lang.get('create_sound_dialog', '选择音效文件'),
+                                                "", "Ogg Vorbis (*.ogg)")
+        if files:
+            self.import_sounds(self.current_mod_json_path, files)
+    
+    def handle_import_sounds(self):
+        """
+        从一个目录批量导入音效，子目录作为事件名的前缀
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        directory = QFileDialog.getExistingDirectory(self, self.lang.get('import_sounds_dialog', '选择音效所在的目录'))
+        if directory:
+            self.import_sounds(self.current_mod_json_path, directory)
+    
+    def import_sounds(self, mod_json_path, paths):
+        """
+        检查音效文件（只读取文件头，结果按内容缓存），确认后在一个事务中复制文件、更新mod.json的sounds，
+        并重新生成sounds.json、ModSounds.java和字幕翻译
+        
+        :param mod_json_path: mod.json文件路径
+        :param paths: 音效目录，或者.ogg文件列表
+        """
+        try:
+            mod_id = self.get_modid_from_mods_toml(mod_json_path)
+            if not mod_id:
+                mod_id = journal.load_json(mod_json_path).get("modInfo", {}).get("modid", "unknown")
+            base_package, main_class_name = self.find_main_class(mod_json_path, mod_id)
+            registry = SoundRegistry.for_mod_json(mod_json_path, mod_id, base_package, main_class_name)
+            plan = registry.scan(paths)
+            self.show_text_report(self.lang.get('import_sounds_title', '导入音效'), plan.format_lines())
+            if not plan.ready:
+                # 检查结果仍然值得缓存，下次导入时不用重新检查
+                registry.save()
+                return
+            
+            reply = QMessageBox.question(self, self.lang.get('information_title', '提示'),
+                                         self.lang.get('import_sounds_question', '是否导入{count}个音效文件（{events}个音效事件）？').format(
+                                             count=len(plan.ready), events=len(plan.events)),
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+            if reply != QMessageBox.Yes:
+                registry.save()
+                return
+            resource_sync = ResourceSync.for_mod_json(mod_json_path, mod_id)
+            with self.get_project_journal(mod_json_path).transaction("导入音效"):
+                mod_data = journal.load_json(mod_json_path)
+                imported, unchanged = registry.apply(plan, mod_data)
+                journal.dump_json(mod_json_path, mod_data)
+                outputs, errors, warnings = registry.render(mod_data)
+                written, _ = registry.write(outputs)
+                synced, _ = resource_sync.sync(mod_data)
+            registry.save()
+            resource_sync.save()
+            self.editor.read(mod_json_path)
+            
+            if os.path.exists(registry.java_path):
+                java_src_path = os.path.join(os.path.dirname(mod_json_path), "forge-1.16.5-36.2.34-mdk", "src", "main", "java")
+                issues = javacheck.default_checker.check_file(registry.java_path)
+                for line in javacheck.format_issues(issues, limit=len(issues), relative_to=java_src_path):
+                    self.log_message(line)
+            message = self.lang.get('import_sounds_done', '已导入{imported}个音效文件，{unchanged}个内容未变化；sounds.json和ModSounds.java写入{written}个，语言文件写入{synced}个').format(
+                imported=imported, unchanged=unchanged, written=written, synced=synced)
+            self.log_message(message)
+            if errors or warnings:
+                self.show_text_report(self.lang.get('generate_sounds_title', '音效注册生成结果'), [message, ""] + errors + warnings)
+            else:
+                self.statusbar.showMessage(message, 5000)
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('import_sounds_error', '导入音效失败: {e}').format(e=e))
+    
+    def handle_generate_sounds(self):
+        """
+        根据mod.json中的音效事件重新生成sounds.json和ModSounds.java（手动修改mod.json后使用）
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        mod_json_path = self.current_mod_json_path
+        try:
+            mod_id = self.get_modid_from_mods_toml(mod_json_path)
+            if not mod_id:
+                mod_id = journal.load_json(mod_json_path).get("modInfo", {}).get("modid", "unknown")
+            base_package, main_class_name = self.find_main_class(mod_json_path, mod_id)
+            registry = SoundRegistry.for_mod_json(mod_json_path, mod_id, base_package, main_class_name)
+            resource_sync = ResourceSync.for_mod_json(mod_json_path, mod_id)
+            with self.get_project_journal(mod_json_path).transaction("生成音效注册"):
+                mod_data = journal.load_json(mod_json_path)
+                outputs, errors, warnings = registry.render(mod_data)
+                written, unchanged = registry.write(outputs)
+                synced, _ = resource_sync.sync(mod_data)
+            registry.save()
+            resource_sync.save()
+            
+            if os.path.exists(registry.java_path):
+                java_src_path = os.path.join(os.path.dirname(mod_json_path), "forge-1.16.5-36.2.34-mdk", "src", "main", "java")
+                issues = javacheck.default_checker.check_file(registry.java_path)
+                for line in javacheck.format_issues(issues, limit=len(issues), relative_to=java_src_path):
+                    self.log_message(line)
+            summary = self.lang.get('generate_sounds_done', '音效事件：{events}个，写入{written}个文件，{unchanged}个无变化；语言文件写入{synced}个').format(
+                events=len(registry.events), written=written, unchanged=unchanged, synced=synced)
+            self.log_message(summary)
+            if errors or warnings:
+                self.show_text_report(self.lang.get('generate_sounds_title', '音效注册生成结果'), [summary, ""] + errors + warnings)
+            else:
+                self.statusbar.showMessage(summary, 5000)
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('generate_sounds_error', '生成音效注册失败: {e}').format(e=e))
+    
     def handle_create_command(self):
         """
-        处理创建命令动作
+        处理创建命令动作：添加（或替换同名）一个命令定义到mod.json的commands，并重新生成命令代码
         """
-        QMessageBox.information(self, self.lang.get('information_title', '提示'), "命令创建功能尚未实现")
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(self.lang.get('command_title', '添加命令'))
+        dialog.resize(520, 480)
+        layout = QVBoxLayout(dialog)
+        
+        basic_layout = QGridLayout()
+        basic_layout.addWidget(QLabel(self.lang.get('command_name', '命令名称:')), 0, 0)
+        name_edit = QLineEdit()
+        name_edit.setPlaceholderText(self.lang.get('command_name_placeholder', '例如: set_home'))
+        basic_layout.addWidget(name_edit, 0, 1)
+        basic_layout.addWidget(QLabel(self.lang.get('command_description', '描述:')), 1, 0)
+        description_edit = QLineEdit()
+        basic_layout.addWidget(description_edit, 1, 1)
+        basic_layout.addWidget(QLabel(self.lang.get('command_aliases', '别名（用逗号分隔）:')), 2, 0)
+        aliases_edit = QLineEdit()
+        aliases_edit.setPlaceholderText("sh, home_set")
+        basic_layout.addWidget(aliases_edit, 2, 1)
+        basic_layout.addWidget(QLabel(self.lang.get('command_permission_level', '权限等级 (0-4):')), 3, 0)
+        permission_spin = QSpinBox()
+        permission_spin.setRange(0, 4)
+        basic_layout.addWidget(permission_spin, 3, 1)
+        layout.addLayout(basic_layout)
+        
+        layout.addWidget(QLabel(self.lang.get('command_parameters', '参数（每行一个，格式: 名称:类型，可选参数在类型后加?，可用=指定默认值）:')))
+        layout.addWidget(QLabel(", ".join(ARGUMENT_TYPES)))
+        parameters_edit = QTextEdit()
+        parameters_edit.setPlaceholderText("target:player?\nname:string?=home")
+        layout.addWidget(parameters_edit)
+        
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        ok_button = QPushButton(self.lang.get('button_create', '创建'))
+        ok_button.clicked.connect(dialog.accept)
+        button_layout.addWidget(ok_button)
+        cancel_button = QPushButton(self.lang.get('button_cancel', '取消'))
+        cancel_button.clicked.connect(dialog.reject)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        
+        command_name = name_edit.text().strip()
+        if not command_name:
+            QMessageBox.warning(self, self.lang.get('warning_title', '警告'),
+                                self.lang.get('command_incomplete', '请填写命令名称'))
+            return
+        
+        parameters = []
+        usage = [f"/{command_name}"]
+        for line in parameters_edit.toPlainText().splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            default = None
+            if "=" in line:
+                line, default = (part.strip() for part in line.split("=", 1))
+            parameter_name, _, type_name = (part.strip() for part in line.partition(":"))
+            required = not type_name.endswith("?")
+            parameter = {"name": parameter_name, "type": type_name.rstrip("?") or "string", "required": required}
+            if default is not None:
+                try:
+                    parameter["default"] = json.loads(default)
+                except ValueError:
+                    parameter["default"] = default
+            parameters.append(parameter)
+            usage.append(f"<{parameter_name}>" if required else f"[{parameter_name}]")
+        
+        command = {
+            "name": command_name,
+            "description": description_edit.text().strip(),
+            "usage": " ".join(usage),
+            "permissionLevel": permission_spin.value(),
+            "aliases": [alias.strip() for alias in aliases_edit.text().replace("，", ",").split(",") if alias.strip()],
+            "parameters": parameters,
+        }
+        self.generate_commands(self.current_mod_json_path, command)
+    
+    def handle_generate_commands(self):
+        """
+        根据mod.json中的命令重新生成命令代码（手动修改mod.json后使用）
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        self.generate_commands(self.current_mod_json_path)
+    
+    def generate_commands(self, mod_json_path, command=None):
+        """
+        在一个事务中生成ModCommands.java和新命令的执行类存根，
+        只重新生成定义发生变化的命令的注册代码
+        
+        :param mod_json_path: mod.json文件路径
+        :param command: 要添加（或替换同名）的命令定义，为None时只重新生成
+        """
+        try:
+            mod_id = self.get_modid_from_mods_toml(mod_json_path)
+            if not mod_id:
+                mod_id = journal.load_json(mod_json_path).get("modInfo", {}).get("modid", "unknown")
+            base_package, main_class_name = self.find_main_class(mod_json_path, mod_id)
+            generator = CommandGenerator.for_mod_json(mod_json_path, mod_id, base_package, main_class_name)
+            
+            with self.get_project_journal(mod_json_path).transaction(
+                    f"添加命令 {command['name']}" if command else "生成命令代码"):
+                mod_data = journal.load_json(mod_json_path)
+                if command is not None:
+                    commands = mod_data.get("commands", [])
+                    for index, existing in enumerate(commands):
+                        if isinstance(existing, dict) and existing.get("name") == command["name"]:
+                            # 保留手动添加的字段（如executorClass）
+                            commands[index] = dict(existing, **command)
+                            break
+                    else:
+                        commands.append(command)
+                    mod_data["commands"] = commands
+                    journal.dump_json(mod_json_path, mod_data)
+                outputs, errors = generator.render(mod_data)
+                written, unchanged = generator.apply(outputs)
+            generator.save()
+            if command is not None:
+                self.editor.read(mod_json_path)
+            
+            java_src_path = os.path.join(os.path.dirname(mod_json_path), "forge-1.16.5-36.2.34-mdk", "src", "main", "java")
+            issues = javacheck.default_checker.check_file(generator.commands_path)
+            for line in javacheck.format_issues(issues, limit=len(issues), relative_to=java_src_path):
+                self.log_message(line)
+            
+            summary = self.lang.get('generate_commands_done', '命令：{commands}个，重新生成{rendered}个，写入{written}个文件，{unchanged}个无变化').format(
+                commands=len(generator.cache), rendered=len(generator.rendered), written=written, unchanged=unchanged)
+            self.log_message(summary)
+            if errors or generator.warnings:
+                self.show_text_report(self.lang.get('generate_commands_title', '命令生成结果'),
+                                      [summary, ""] + errors + generator.warnings)
+            else:
+                self.statusbar.showMessage(summary, 5000)
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('generate_commands_error', '生成命令失败: {e}').format(e=e))
     
     def handle_create_recipe(self):
         """
-        处理创建配方动作
+        处理创建配方动作：添加一个配方表（材料 × 形状），保存到mod.json并重新生成所有配方文件
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(self.lang.get('recipe_table_title', '添加配方表'))
+        dialog.resize(520, 560)
+        layout = QVBoxLayout(dialog)
+        
+        layout.addWidget(QLabel(self.lang.get('recipe_table_name', '配方表名称:')))
+        name_edit = QLineEdit()
+        name_edit.setPlaceholderText(self.lang.get('recipe_table_name_placeholder', '例如: stone'))
+        layout.addWidget(name_edit)
+        
+        layout.addWidget(QLabel(self.lang.get('recipe_table_materials', '材料（每行一个，格式: 材料名=物品ID或#标签）:')))
+        materials_edit = QTextEdit()
+        materials_edit.setPlaceholderText("granite=minecraft:granite\nmarble=#forge:stone")
+        layout.addWidget(materials_edit)
+        
+        layout.addWidget(QLabel(self.lang.get('recipe_table_shapes', '形状:')))
+        shape_list = QListWidget()
+        for shape_name, shape in RECIPE_SHAPES.items():
+            item = QListWidgetItem(f"{shape_name}  ({shape['output']} x{shape['count']})")
+            item.setData(Qt.UserRole, shape_name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            shape_list.addItem(item)
+        layout.addWidget(shape_list)
+        
+        stonecutting_check = QCheckBox(self.lang.get('recipe_table_stonecutting', '同时生成切石机配方'))
+        layout.addWidget(stonecutting_check)
+        
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        ok_button = QPushButton(self.lang.get('button_create', '创建'))
+        ok_button.clicked.connect(dialog.accept)
+        button_layout.addWidget(ok_button)
+        cancel_button = QPushButton(self.lang.get('button_cancel', '取消'))
+        cancel_button.clicked.connect(dialog.reject)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        
+        table_name = name_edit.text().strip()
+        materials = {}
+        for line in materials_edit.toPlainText().splitlines():
+            if "=" in line:
+                material_name, ref = (part.strip() for part in line.split("=", 1))
+                if material_name and ref:
+                    materials[material_name] = ref
+        shapes = [shape_list.item(row).data(Qt.UserRole) for row in range(shape_list.count())
+                  if shape_list.item(row).checkState() == Qt.Checked]
+        if not table_name or not materials or not shapes:
+            QMessageBox.warning(self, self.lang.get('warning_title', '警告'),
+                                self.lang.get('recipe_table_incomplete', '请填写配方表名称、至少一种材料和一种形状'))
+            return
+        
+        table = {"name": table_name, "materials": materials, "shapes": shapes}
+        if stonecutting_check.isChecked():
+            table["stonecutting"] = True
+        self.generate_recipes(self.current_mod_json_path, table)
+    
+    def handle_generate_recipes(self):
+        """
+        根据mod.json中的配方和配方表重新生成所有配方文件（手动修改mod.json后使用）
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        self.generate_recipes(self.current_mod_json_path)
+    
+    def generate_recipes(self, mod_json_path, table=None):
+        """
+        展开配方表、去重并检查冲突，在一个事务中写入所有配方文件
+        
+        :param mod_json_path: mod.json文件路径
+        :param table: 要添加（或替换同名）的配方表，为None时只重新生成
+        """
+        try:
+            with self.get_project_journal(mod_json_path).transaction(
+                    f"添加配方表 {table['name']}" if table else "生成配方文件"):
+                mod_data = journal.load_json(mod_json_path)
+                mod_id = self.get_modid_from_mods_toml(mod_json_path) or mod_data.get("modInfo", {}).get("modid", "unknown")
+                if table is not None:
+                    tables = [t for t in mod_data.get("recipeTables", []) if t.get("name") != table["name"]]
+                    mod_data["recipeTables"] = tables + [table]
+                    journal.dump_json(mod_json_path, mod_data)
+                engine = RecipeEngine.for_mod_json(mod_json_path, mod_id)
+                plan = engine.plan(mod_data)
+                written, unchanged, removed = engine.apply(plan)
+            engine.save()
+            if table is not None:
+                self.editor.read(mod_json_path)
+            
+            summary = self.lang.get('generate_recipes_done', '配方文件：写入{written}个，{unchanged}个无变化，删除{removed}个').format(
+                written=written, unchanged=unchanged, removed=removed)
+            self.log_message(summary)
+            if plan.conflicts or plan.errors or plan.duplicates:
+                self.show_text_report(self.lang.get('generate_recipes_title', '配方生成结果'), [summary, ""] + plan.format_lines())
+            else:
+                self.statusbar.showMessage(summary, 5000)
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('generate_recipes_error', '生成配方失败: {e}').format(e=e))
+    
+    def handle_undo(self):
+        """
+        撤销当前项目的最近一次操作
+        """
+        self._handle_undo_redo(undo=True)
+    
+    def handle_redo(self):
+        """
+        重做当前项目最近一次被撤销的操作
+        """
+        self._handle_undo_redo(undo=False)
+    
+    @tracing.traced(category="ui")
+    def _handle_undo_redo(self, undo):
+        """
+        执行撤销或重做，并重新加载mod.json
+        
+        :param undo: True为撤销，False为重做
         """
-        QMessageBox.information(self, self.lang.get('information_title', '提示'), "配方创建功能尚未实现")
+        if not self.editor.file_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        try:
+            operation_log = OperationLog.for_mod_json(self.editor.file_path)
+            label = operation_log.undo() if undo else operation_log.redo()
+            if label is None:
+                message_key, default = ('nothing_to_undo', '没有可撤销的操作') if undo else ('nothing_to_redo', '没有可重做的操作')
+                self.statusbar.showMessage(self.lang.get(message_key, default), 3000)
+                return
+            
+            message_key, default = ('undo_done_message', '已撤销: {label}') if undo else ('redo_done_message', '已重做: {label}')
+            message = self.lang.get(message_key, default).format(label=label)
+            self.log_message(message)
+            self.statusbar.showMessage(message, 3000)
+            
+            # 重新加载mod.json文件以显示更新
+            self.editor.read(self.editor.file_path)
+        except OperationConflict as e:
+            QMessageBox.warning(self, self.lang.get('warning_title', '警告'), self.lang.get('undo_conflict_message', '文件已在外部被修改，无法撤销/重做: {e}').format(e=e))
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('undo_error_message', '撤销/重做失败: {e}').format(e=e))
     
     def handle_help(self):
         """
@@ -1481,6 +2423,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         QMessageBox.information(self, self.lang.get('about_title', '关于'), self.lang.get('about_content', 'Forge模组构建器\n\n版本: 1.0.0\n基于Minecraft Forge 1.16.5\n(c) Copyright by 华为'))
     
+    @tracing.traced(category="ui")
     def handle_open(self):
         """
         处理打开模组JSON文件动作
@@ -1492,17 +2435,245 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             )
             
             if file_path:
-                # 读取并显示JSON文件
-                if self.editor.read(file_path):
-                    # 保存当前打开的文件路径
-                    self.current_mod_json_path = file_path
-                    self.log_message(self.lang.get('file_opened_message', '已打开文件: {file_path}').format(file_path=file_path))
-                else:
-                    QMessageBox.warning(self, self.lang.get('warning_title', '警告'), self.lang.get('file_read_warning', '无法读取选择的文件'))
+                self.open_project(file_path)
                     
         except Exception as e:
             QMessageBox.critical(self, self.lang.get('error_title', '错误'), f"打开文件失败: {e}")
     
+    def open_project(self, file_path):
+        """
+        打开一个项目的mod.json（先恢复上次未完成的项目事务）
+        
+        :param file_path: mod.json文件路径
+        :return: 是否成功打开
+        """
+        # 恢复上次未完成的项目事务
+        self.recover_project_journal(file_path)
+        
+        # 读取并显示JSON文件
+        if self.editor.read(file_path):
+            # 保存当前打开的文件路径
+            self.current_mod_json_path = file_path
+            self.log_message(self.lang.get('file_opened_message', '已打开文件: {file_path}').format(file_path=file_path))
+            return True
+        QMessageBox.warning(self, self.lang.get('warning_title', '警告'), self.lang.get('file_read_warning', '无法读取选择的文件'))
+        return False
+    
+    def handle_open_workspace(self):
+        """
+        选择工作区目录（存放多个{modid}pack项目的目录），建立索引后打开项目切换器
+        """
+        directory = QFileDialog.getExistingDirectory(self, self.lang.get('open_workspace_dialog', '选择存放项目的工作区目录'))
+        if not directory:
+            return
+        self.workspace_root = directory
+        self.handle_switch_project()
+    
+    def get_workspace_root(self):
+        """
+        当前的工作区目录：打开过的工作区，没有时使用当前项目所在的目录
+        
+        :return: 目录路径，都没有时返回None
+        """
+        root = getattr(self, 'workspace_root', None)
+        if not root and getattr(self, 'current_mod_json_path', None):
+            root = os.path.dirname(os.path.dirname(os.path.abspath(self.current_mod_json_path)))
+        return root
+    
+    def handle_switch_project(self):
+        """
+        项目切换器：直接列出已有工作区索引中的所有项目，同时在后台增量更新索引，更新完成后刷新列表。
+        可以按模组ID/名称过滤，也可以输入属性查询（如Material.ROCK）或注册名（如modid:name）查找项目，双击打开
+        """
+        root = self.get_workspace_root()
+        if not root:
+            self.handle_open_workspace()
+            return
+        
+        try:
+            index = WorkspaceIndex(root)
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('workspace_index_error', '更新工作区索引失败: {e}').format(e=e))
+            return
+        self.workspace_root = root
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(self.lang.get('switch_project_title', '切换项目'))
+        dialog.resize(760, 520)
+        layout = QVBoxLayout(dialog)
+        
+        search_edit = QLineEdit()
+        search_edit.setPlaceholderText(self.lang.get('switch_project_search', '模组ID、名称，或者Material.ROCK、material=ROCK、modid:name'))
+        layout.addWidget(search_edit)
+        
+        pack_list = QListWidget()
+        pack_list.setUniformItemSizes(True)
+        layout.addWidget(pack_list)
+        
+        count_label = QLabel()
+        layout.addWidget(count_label)
+        
+        def describe(pack, note):
+            if pack["buildSuccess"] is None:
+                build = self.lang.get('switch_project_never_built', '未构建')
+            elif pack["buildSuccess"]:
+                build = self.lang.get('switch_project_build_ok', '构建成功 {time}').format(time=pack["buildTime"] or "")
+            else:
+                build = self.lang.get('switch_project_build_failed', '构建失败 {time}').format(time=pack["buildTime"] or "")
+            text = f"{pack['modId'] or '?'}  {pack['displayName'] or ''}  [{build}]  " \
+                   f"{pack['blocks']}方块/{pack['items']}物品  {os.path.relpath(pack['path'], root)}"
+            return f"{text}  — {note}" if note else text
+        
+        def populate():
+            matches = index.search(search_edit.text())
+            pack_list.clear()
+            for pack, note in matches:
+                item = QListWidgetItem(describe(pack, note))
+                item.setData(Qt.UserRole, os.path.join(pack["path"], "mod.json"))
+                pack_list.addItem(item)
+            if pack_list.count():
+                pack_list.setCurrentRow(0)
+            count_label.setText(self.lang.get('switch_project_count', '{count}/{total}个项目').format(
+                count=len(matches), total=index.count()))
+        
+        def open_selected(item=None):
+            item = item or pack_list.currentItem()
+            if item is not None:
+                dialog.accept()
+                self.open_project(item.data(Qt.UserRole))
+        
+        def on_index_updated(stats):
+            self.log_message(self.lang.get('workspace_indexed', '工作区{root}: {stats}').format(root=root, stats=stats.format()))
+            for error in stats.errors:
+                self.log_message(error)
+            if stats.added or stats.updated or stats.removed:
+                populate()
+        
+        search_edit.textChanged.connect(populate)
+        search_edit.returnPressed.connect(open_selected)
+        pack_list.itemDoubleClicked.connect(open_selected)
+        populate()
+        
+        # 在后台更新索引（已经在更新时不重复启动）
+        thread = getattr(self, 'workspace_index_thread', None)
+        if thread is None or not thread.isRunning():
+            thread = self.workspace_index_thread = WorkspaceIndexThread(root)
+            thread.error_signal.connect(
+                lambda e: self.log_message(self.lang.get('workspace_index_error', '更新工作区索引失败: {e}').format(e=e)))
+            thread.start()
+        thread.index_updated.connect(on_index_updated)
+        
+        close_button = QPushButton(self.lang.get('button_close', '关闭'))
+        close_button.clicked.connect(dialog.reject)
+        layout.addWidget(close_button)
+        
+        dialog.exec_()
+        try:
+            thread.index_updated.disconnect(on_index_updated)
+        except TypeError:
+            pass
+        index.close()
+    
+    def handle_workspace_conflicts(self):
+        """
+        增量更新工作区索引，检查所有项目一起放进整合包时的冲突：模组ID、注册名、类名、
+        被多个项目覆盖的原版资源和标签
+        """
+        root = self.get_workspace_root()
+        if not root:
+            root = QFileDialog.getExistingDirectory(self, self.lang.get('open_workspace_dialog', '选择存放项目的工作区目录'))
+            if not root:
+                return
+        
+        try:
+            index = WorkspaceIndex(root)
+            try:
+                stats = index.update()
+                conflicts, hidden = ConflictAnalyzer(index).analyze()
+            finally:
+                index.close()
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('workspace_conflicts_error', '检查跨项目冲突失败: {e}').format(e=e))
+            return
+        self.workspace_root = root
+        
+        summary = self.lang.get('workspace_indexed', '工作区{root}: {stats}').format(root=root, stats=stats.format())
+        self.log_message(summary)
+        lines = [summary] + stats.errors + [""]
+        if conflicts:
+            lines += format_conflicts(conflicts, hidden)
+        else:
+            lines.append(self.lang.get('workspace_no_conflicts', '没有发现冲突'))
+        self.show_text_report(self.lang.get('workspace_conflicts_title', '跨项目冲突'), lines)
+    
+    def handle_project_store(self):
+        """
+        为当前项目启用或停用项目数据库
+        启用时导入mod.json；停用时先导出mod.json再删除数据库文件（mod.json始终是完整的项目文件）
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        mod_json_path = self.current_mod_json_path
+        title = self.lang.get('project_store_title', '项目数据库')
+        try:
+            if not ProjectStore.enabled(mod_json_path):
+                answer = QMessageBox.question(self, title, self.lang.get(
+                    'project_store_enable_confirm',
+                    '把mod.json导入项目数据库？\n启用后添加方块和物品组只修改数据库中的一行，mod.json由数据库导出，编辑器分页显示。'))
+                if answer != QMessageBox.Yes:
+                    return
+                store = ProjectStore.create(mod_json_path)
+                counts = {key: store.count(key) for key in ("blocks", "items", "recipes", "itemGroups")}
+                store.close()
+                self.log_message(self.lang.get('project_store_enabled', '已启用项目数据库: 方块{blocks}个，物品{items}个，配方{recipes}个，物品组{itemGroups}个').format(**counts))
+            else:
+                answer = QMessageBox.question(self, title, self.lang.get(
+                    'project_store_disable_confirm', '停用项目数据库？mod.json会保持最新，数据库文件将被删除。'))
+                if answer != QMessageBox.Yes:
+                    return
+                store = ProjectStore.for_mod_json(mod_json_path)
+                store.close()
+                os.remove(store.db_path)
+                self.log_message(self.lang.get('project_store_disabled', '已停用项目数据库'))
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('project_store_error', '项目数据库操作失败: {e}').format(e=e))
+            return
+        
+        self.editor.read(mod_json_path)
+    
+    @tracing.traced(category="codegen")
+    def check_java_sources(self, mod_json_path):
+        """
+        在调用Gradle之前检查项目的Java源码（括号、重复字段、缺少的import、不存在的方法等）
+        结果记录到日志，有错误时弹窗列出并返回False以取消构建
+        
+        :param mod_json_path: mod.json文件路径
+        :return: 是否可以继续构建
+        """
+        java_src_path = os.path.join(os.path.dirname(mod_json_path), 'forge-1.16.5-36.2.34-mdk', 'src', 'main', 'java')
+        if not os.path.isdir(java_src_path):
+            return True
+        
+        issues = javacheck.default_checker.check_tree(java_src_path)
+        for line in javacheck.format_issues(issues, limit=len(issues), relative_to=java_src_path):
+            self.log_message(line)
+        if not javacheck.has_errors(issues):
+            return True
+        
+        errors = [issue for issue in issues if issue.severity == "error"]
+        self.log_message(self.lang.get('java_check_failed_log', 'Java代码检查发现{count}个错误，已取消构建').format(count=len(errors)))
+        QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                             self.lang.get('java_check_failed_message', 'Java代码检查发现{count}个错误，已取消构建:\n{issues}').format(
+                                 count=len(errors),
+                                 issues="\n".join(javacheck.format_issues(errors, limit=10, relative_to=java_src_path))))
+        return False
+    
+    @tracing.traced(category="gradle")
     def handle_run_client(self):
         """
         执行gradle runClient任务
@@ -1534,6 +2705,10 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                 QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('gradle_script_not_found', 'Gradle脚本不存在: {gradle_script}').format(gradle_script=gradle_script))
                 return
             
+            # 先检查Java代码，有错误时不启动Gradle
+            if not self.check_java_sources(self.current_mod_json_path):
+                return
+            
             # 构建runClient命令
             build_command = [gradle_script, 'runClient', '--no-daemon']
             
@@ -1576,14 +2751,436 @@ pause"""
             self.log_message(self.lang.get('client_error_message', '运行客户端时出错: {e}').format(e=e))
             QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('client_error_message', '运行客户端时出错: {e}').format(e=e))
     
-    def create_blockstate_file(self, mdk_path, mod_id, block_name):
+    def handle_build_jar(self):
+        """
+        在后台执行完整的Gradle构建（build任务）
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        if getattr(self, 'gradle_thread', None) is not None and self.gradle_thread.isRunning():
+            self.statusbar.showMessage(self.lang.get('gradle_running_message', 'Gradle任务正在运行'), 3000)
+            return
+        
+        if not self.check_java_sources(self.current_mod_json_path):
+            return
+        
+        self.gradle_thread = GradleTaskThread(self.current_mod_json_path, ['build'])
+        self.gradle_thread.log_signal.connect(self.log_message)
+        self.gradle_thread.task_finished.connect(self.on_build_jar_finished)
+        self.BuildJar.setEnabled(False)
+        self.statusbar.showMessage(self.lang.get('build_jar_started_message', '正在构建jar...'))
+        self.gradle_thread.start()
+    
+    def on_build_jar_finished(self, success):
+        """
+        处理构建jar完成事件
+        
+        :param success: 构建是否成功
+        """
+        self.BuildJar.setEnabled(True)
+        if success:
+            message = self.lang.get('build_jar_success_message', '构建jar成功')
+        else:
+            message = self.lang.get('build_jar_failed_message', '构建jar失败，请查看日志')
+        self.log_message(message)
+        self.statusbar.showMessage(message, 5000)
+    
+    @tracing.traced(category="gradle")
+    def handle_patch_jar(self):
+        """
+        只修改了资源文件时，直接把变化的资源写入已构建的jar
+        Java源码或构建脚本有修改时提示执行完整构建
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        try:
+            patcher = ResourcePatcher.for_mod_json(self.current_mod_json_path)
+            try:
+                plan = patcher.plan()
+            except FullBuildRequired as e:
+                reply = QMessageBox.question(self, self.lang.get('information_title', '提示'),
+                                             self.lang.get('full_build_required_message', '无法快速更新jar（{reason}），是否执行完整构建？').format(reason=e),
+                                             QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+                if reply == QMessageBox.Yes:
+                    self.handle_build_jar()
+                return
+            
+            if plan.empty:
+                self.statusbar.showMessage(self.lang.get('patch_jar_unchanged_message', '资源没有变化，jar已是最新'), 3000)
+                return
+            
+            written, removed, copied = patcher.apply(plan)
+            message = self.lang.get('patch_jar_done_message', '已更新jar资源: 写入{written}个，删除{removed}个，复制{copied}个').format(
+                written=written, removed=removed, copied=copied)
+            self.log_message(message)
+            self.statusbar.showMessage(message, 5000)
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('patch_jar_error_message', '快速更新jar失败: {e}').format(e=e))
+    
+    def handle_build_report(self):
+        """
+        显示当前项目的构建性能报告（各阶段耗时及与之前构建的对比）
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        try:
+            records = BuildHistory.for_mod_json(self.current_mod_json_path).load(limit=6)
+            if not records:
+                QMessageBox.information(self, self.lang.get('information_title', '提示'),
+                                        self.lang.get('no_build_history', '该项目还没有构建记录'))
+                return
+            
+            self.show_text_report(self.lang.get('build_report_title', '构建性能报告'), format_build_report(records))
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), f"读取构建记录失败: {e}")
+    
+    @tracing.traced(category="assets")
+    def handle_validate_assets(self):
+        """
+        验证当前项目的所有资源文件（Schema检查和交叉引用检查），只重新验证内容有变化的文件
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        try:
+            report = AssetValidator.for_mod_json(self.current_mod_json_path).validate()
+            summary = self.lang.get('asset_validation_summary', '资源文件验证：共{files}个文件（重新验证{validated}个），{errors}个错误，{warnings}个警告').format(
+                files=report.files, validated=report.validated, errors=len(report.errors), warnings=len(report.warnings))
+            self.log_message(summary)
+            if not report.issues:
+                self.statusbar.showMessage(summary, 5000)
+                return
+            self.show_text_report(self.lang.get('asset_validation_title', '资源文件验证结果'),
+                                  [summary, ""] + report.format_lines())
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('asset_validation_error', '验证资源文件失败: {e}').format(e=e))
+    
+    def handle_texture_report(self):
+        """
+        显示当前项目中内容重复的贴图，并可将重复的贴图替换为同一份存储的硬链接
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        try:
+            store = TextureStore.for_mod_json(self.current_mod_json_path)
+            report = store.report()
+            store.save()
+            self.show_text_report(self.lang.get('texture_report_title', '贴图去重报告'), report.format_lines())
+            if report.reclaimable_bytes <= 0:
+                return
+            
+            reply = QMessageBox.question(self, self.lang.get('information_title', '提示'),
+                                         self.lang.get('texture_dedupe_question', '是否将内容相同的贴图合并为同一份存储（可节省{size}）？\n合并后用原地保存的图片编辑器修改其中一个，其余相同的贴图也会一起改变。').format(
+                                             size=format_size(report.reclaimable_bytes)),
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+            if reply != QMessageBox.Yes:
+                return
+            with self.get_project_journal(self.current_mod_json_path).transaction("合并重复贴图"):
+                replaced = store.deduplicate(report)
+            store.save()
+            self.log_message(self.lang.get('texture_dedupe_done', '已合并{count}个重复贴图，节省{size}').format(
+                count=replaced, size=format_size(report.reclaimable_bytes)))
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('texture_report_error', '统计重复贴图失败: {e}').format(e=e))
+    
+    def handle_deduplicate_models(self):
+        """
+        合并当前项目中内容相同的方块模型，引用改到保留的模型上并删除重复的文件
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        try:
+            mod_json_path = self.current_mod_json_path
+            mod_id = self.get_modid_from_mods_toml(mod_json_path)
+            if not mod_id:
+                mod_id = journal.load_json(mod_json_path).get("modInfo", {}).get("modid", "unknown")
+            with self.get_project_journal(mod_json_path).transaction("合并重复的方块模型"):
+                removed, rewritten = deduplicate_models(os.path.dirname(os.path.abspath(mod_json_path)), mod_id)
+            message = self.lang.get('dedupe_models_done', '已合并{removed}个重复的方块模型，更新了{rewritten}个引用文件').format(
+                removed=removed, rewritten=rewritten)
+            self.log_message(message)
+            self.statusbar.showMessage(message, 5000)
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('dedupe_models_error', '合并重复的方块模型失败: {e}').format(e=e))
+    
+    def handle_sync_resources(self):
+        """
+        根据mod.json重新生成语言文件和标签文件（手动修改mod.json后使用）
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        try:
+            mod_json_path = self.current_mod_json_path
+            mod_data = journal.load_json(mod_json_path)
+            mod_id = self.get_modid_from_mods_toml(mod_json_path) or mod_data.get("modInfo", {}).get("modid", "unknown")
+            resource_sync = ResourceSync.for_mod_json(mod_json_path, mod_id)
+            with self.get_project_journal(mod_json_path).transaction("同步语言文件和标签"):
+                written, unchanged = resource_sync.sync(mod_data)
+            resource_sync.save()
+            message = self.lang.get('sync_resources_done', '已同步语言文件和标签：更新{written}个文件，{unchanged}个文件无变化').format(
+                written=written, unchanged=unchanged)
+            self.log_message(message)
+            self.statusbar.showMessage(message, 5000)
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('sync_resources_error', '同步语言文件和标签失败: {e}').format(e=e))
+    
+    @tracing.traced(category="assets")
+    def handle_import_textures(self):
+        """
+        从一个目录批量导入贴图：检查尺寸和动画.mcmeta，按文件名匹配方块/物品，确认后在一个事务中全部写入
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        directory = QFileDialog.getExistingDirectory(self, self.lang.get('import_textures_dialog', '选择贴图所在的目录'))
+        if not directory:
+            return
+        
+        try:
+            max_size, ok = QInputDialog.getItem(
+                self,
+                self.lang.get('import_textures_action', '批量导入贴图...'),
+                self.lang.get('import_textures_max_size', '贴图边长上限（超过时缩小）:'),
+                ["16", "32", "64", "128", "256", "512", self.lang.get('import_textures_no_limit', '不限制')],
+                6, False
+            )
+            if not ok:
+                return
+            max_size = int(max_size) if max_size.isdigit() else None
+            
+            mod_id = self.get_modid_from_mods_toml(self.current_mod_json_path)
+            importer = BatchTextureImporter(self.current_mod_json_path, mod_id)
+            plan = importer.scan(directory, max_size)
+            self.show_text_report(self.lang.get('import_textures_title', '批量导入贴图'), plan.format_lines())
+            if not plan.ready:
+                return
+            
+            reply = QMessageBox.question(self, self.lang.get('information_title', '提示'),
+                                         self.lang.get('import_textures_question', '是否导入{count}张贴图？').format(count=len(plan.ready)),
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+            if reply != QMessageBox.Yes:
+                return
+            with self.get_project_journal(self.current_mod_json_path).transaction("批量导入贴图"):
+                imported, unchanged = importer.apply(plan)
+            importer.store.save()
+            message = self.lang.get('import_textures_done', '已导入{imported}张贴图，{unchanged}张内容未变化').format(
+                imported=imported, unchanged=unchanged)
+            self.log_message(message)
+            self.statusbar.showMessage(message, 5000)
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('import_textures_error', '批量导入贴图失败: {e}').format(e=e))
+    
+    @tracing.traced(category="assets")
+    def handle_block_previews(self):
+        """
+        以缩略图网格显示项目中的所有方块（缩略图按模型和贴图内容缓存，只渲染有变化的方块）
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        try:
+            with open(self.current_mod_json_path, 'r', encoding='utf-8') as f:
+                mod_data = json.load(f)
+            blocks = [block for block in mod_data.get("blocks", []) if block.get("name")]
+            if not blocks:
+                QMessageBox.information(self, self.lang.get('information_title', '提示'),
+                                        self.lang.get('block_previews_empty', '项目中还没有方块'))
+                return
+            
+            renderer = BlockPreviewRenderer.for_mod_json(self.current_mod_json_path)
+            models = [block.get("model") or block.get("registryName") or block["name"] for block in blocks]
+            thumbnails = renderer.thumbnails(models)
+            self.log_message(self.lang.get('block_previews_log', '方块缩略图: 渲染{rendered}个，使用缓存{cached}个').format(
+                rendered=renderer.rendered, cached=renderer.cached))
+        except Exception as e:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'),
+                                 self.lang.get('block_previews_error', '生成方块预览失败: {e}').format(e=e))
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(self.lang.get('block_previews_title', '方块预览'))
+        dialog.resize(720, 540)
+        layout = QVBoxLayout(dialog)
+        
+        # 按名称过滤
+        filter_edit = QLineEdit()
+        filter_edit.setPlaceholderText(self.lang.get('block_previews_filter', '按名称过滤...'))
+        layout.addWidget(filter_edit)
+        
+        block_list = QListWidget()
+        block_list.setViewMode(QListWidget.IconMode)
+        block_list.setIconSize(QSize(renderer.size, renderer.size))
+        block_list.setResizeMode(QListWidget.Adjust)
+        block_list.setUniformItemSizes(True)
+        for block, model in zip(blocks, models):
+            item = QListWidgetItem(block["name"])
+            if thumbnails[model]:
+                item.setIcon(QIcon(thumbnails[model]))
+            block_list.addItem(item)
+        layout.addWidget(block_list)
+        
+        def apply_filter(text):
+            text = text.strip().lower()
+            for row in range(block_list.count()):
+                item = block_list.item(row)
+                item.setHidden(bool(text) and text not in item.text().lower())
+        
+        filter_edit.textChanged.connect(apply_filter)
+        
+        close_button = QPushButton(self.lang.get('button_close', '关闭'))
+        close_button.clicked.connect(dialog.accept)
+        layout.addWidget(close_button)
+        
+        dialog.exec_()
+    
+    def handle_vanilla_assets(self):
+        """
+        浏览原版的贴图、模型和blockstate：模糊搜索，贴图缩略图只在滚动到可见时才解码，
+        双击条目把资源位置（如minecraft:block/stone）复制到剪贴板
+        """
+        if not hasattr(self, 'current_mod_json_path') or not self.current_mod_json_path:
+            QMessageBox.critical(self, self.lang.get('error_title', '错误'), self.lang.get('no_file_error', '请先打开/创建文件'))
+            return
+        
+        vanilla_index = self.load_vanilla_index(self.current_mod_json_path)
+        if vanilla_index is None:
+            QMessageBox.information(self, self.lang.get('information_title', '提示'),
+                                    self.lang.get('vanilla_index_missing', '没有找到Minecraft客户端jar（执行一次编译后可用）'))
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(self.lang.get('vanilla_assets_title', '原版资源'))
+        dialog.resize(760, 560)
+        layout = QVBoxLayout(dialog)
+        
+        # 搜索框和资源类型
+        search_layout = QHBoxLayout()
+        search_edit = QLineEdit()
+        search_edit.setPlaceholderText(self.lang.get('vanilla_assets_search', '搜索...'))
+        kind_combo = QComboBox()
+        kinds = [("textures", self.lang.get('vanilla_kind_textures', '贴图')),
+                 ("models", self.lang.get('vanilla_kind_models', '模型')),
+                 ("blockstates", self.lang.get('vanilla_kind_blockstates', '方块状态'))]
+        for kind, label in kinds:
+            kind_combo.addItem(label, kind)
+        search_layout.addWidget(search_edit, 1)
+        search_layout.addWidget(kind_combo)
+        layout.addLayout(search_layout)
+        
+        asset_list = QListWidget()
+        asset_list.setIconSize(QSize(32, 32))
+        asset_list.setUniformItemSizes(True)
+        layout.addWidget(asset_list)
+        
+        count_label = QLabel()
+        layout.addWidget(count_label)
+        
+        def load_visible_icons():
+            # 只为可见范围内的贴图解码缩略图
+            if kind_combo.currentData() != "textures" or asset_list.count() == 0:
+                return
+            viewport = asset_list.viewport().rect()
+            first = max(asset_list.indexAt(QPoint(0, 0)).row(), 0)
+            for row in range(first, asset_list.count()):
+                item = asset_list.item(row)
+                # 条目按从左到右、从上到下排列，遇到第一个在可见区域下方的条目即可停止
+                if asset_list.visualItemRect(item).top() > viewport.bottom():
+                    break
+                if not item.icon().isNull():
+                    continue
+                image = vanilla_index.thumbnail(item.text())
+                if image is None:
+                    continue
+                qimage = QImage(bytes(image.pixels), image.width, image.height, image.width * 4, QImage.Format_RGBA8888).copy()
+                item.setIcon(QIcon(QPixmap.fromImage(qimage).scaled(32, 32)))
+        
+        def populate():
+            kind = kind_combo.currentData()
+            names = vanilla_index.search(search_edit.text().strip(), kind)
+            asset_list.setViewMode(QListWidget.IconMode if kind == "textures" else QListWidget.ListMode)
+            asset_list.setResizeMode(QListWidget.Adjust)
+            asset_list.clear()
+            asset_list.addItems(names)
+            count_label.setText(self.lang.get('vanilla_assets_count', '共{count}项').format(count=len(names)))
+            QTimer.singleShot(0, load_visible_icons)
+        
+        def copy_location(item):
+            if item is None:
+                return
+            location = f"minecraft:{item.text()}"
+            QApplication.clipboard().setText(location)
+            self.statusbar.showMessage(self.lang.get('vanilla_assets_copied', '已复制: {location}').format(location=location), 3000)
+        
+        search_edit.textChanged.connect(populate)
+        kind_combo.currentIndexChanged.connect(populate)
+        asset_list.verticalScrollBar().valueChanged.connect(load_visible_icons)
+        asset_list.itemDoubleClicked.connect(copy_location)
+        populate()
+        
+        close_button = QPushButton(self.lang.get('button_close', '关闭'))
+        close_button.clicked.connect(dialog.accept)
+        layout.addWidget(close_button)
+        
+        dialog.exec_()
+        vanilla_index.close()
+    
+    def show_text_report(self, title, lines):
+        """
+        在只读文本对话框中显示多行报告
+        
+        :param title: 对话框标题
+        :param lines: 文本行列表
+        """
+        dialog = QDialog(self)
+        dialog.setWindowTitle(title)
+        dialog.resize(640, 480)
+        layout = QVBoxLayout(dialog)
+        
+        report_view = QTextEdit()
+        report_view.setReadOnly(True)
+        report_view.setLineWrapMode(QTextEdit.NoWrap)
+        report_view.setFontFamily("monospace")
+        report_view.setPlainText("\n".join(lines))
+        layout.addWidget(report_view)
+        
+        close_button = QPushButton(self.lang.get('button_close', '关闭'))
+        close_button.clicked.connect(dialog.accept)
+        layout.addWidget(close_button)
+        
+        dialog.exec_()
+    
+    @tracing.traced(category="codegen")
+    def create_blockstate_file(self, mdk_path, mod_id, block_name, template=None, models=None):
         """
         创建blockState文件
-        根据BlockExample.md第206-216行
+        根据BlockExample.md第206-216行，有状态的方块按模板展开属性组合，写成variants或multipart中较小的一种
         
         :param mdk_path: MDK路径
         :param mod_id: 模组ID
         :param block_name: 方块名称
+        :param template: blockstate模板，为None时只有一个""状态
+        :param models: {模型后缀: 模型位置}（create_block_model_file的返回值）
         """
         try:
             blockstates_dir = os.path.join(mdk_path, "src", "main", "resources", "assets", mod_id, "blockstates")
@@ -1591,53 +3188,51 @@ pause"""
             
             blockstate_file = os.path.join(blockstates_dir, f"{block_name}.json")
             
-            blockstate_content = f'''{{
-    "variants": {{
-        "": {{
-            "model": "{mod_id}:block/{block_name}"
-        }}
-    }}
-}}'''
+            template = template or template_for([])
+            models = models or {suffix: f"{mod_id}:block/{block_name}{suffix}" for suffix in template.models}
+            blockstate_content = dump_asset(build_blockstate(template, models))
             
-            with open(blockstate_file, 'w', encoding='utf-8') as f:
-                f.write(blockstate_content)
+            journal.write_text(blockstate_file, blockstate_content)
             
             self.log_message(f"已创建blockState文件: {blockstate_file}")
             
         except Exception as e:
             self.log_message(f"创建blockState文件失败: {e}")
     
-    def create_block_model_file(self, mdk_path, mod_id, block_name):
+    @tracing.traced(category="codegen")
+    def create_block_model_file(self, mdk_path, mod_id, block_name, parent_model="block/cube_all", texture_variables=("all",),
+                                template=None, model_index=None):
         """
         创建方块模型文件
-        根据BlockExample.md第218-227行
+        根据BlockExample.md第218-227行，有状态的方块按模板创建所有需要的模型；
+        与项目中已有模型内容相同时不创建新文件，直接引用已有模型
         
         :param mdk_path: MDK路径
         :param mod_id: 模组ID
         :param block_name: 方块名称
-        """
+        :param parent_model: 父模型（模板未指定父模型的模型使用）
+        :param texture_variables: 父模型需要填写的贴图变量，都指向方块的贴图
+        :param template: blockstate模板，为None时只创建一个模型
+        :param model_index: 项目的模型索引，为None时临时创建
+        :return: {模型后缀: 模型位置}
+        """
+        template = template or template_for([])
+        models = {suffix: f"{mod_id}:block/{block_name}{suffix}" for suffix in template.models}
         try:
             models_block_dir = os.path.join(mdk_path, "src", "main", "resources", "assets", mod_id, "models", "block")
             os.makedirs(models_block_dir, exist_ok=True)
             
-            model_file = os.path.join(models_block_dir, f"{block_name}.json")
-            
-            model_content = f'''{{
-    "parent": "block/cube_all",
-    "textures": {{
-        "all": "{mod_id}:textures/block/{block_name}"
-    }}
-}}'''
-            
-            with open(model_file, 'w', encoding='utf-8') as f:
-                f.write(model_content)
+            model_index = model_index or ModelIndex(os.path.dirname(os.path.abspath(mdk_path)), mod_id)
+            models = model_index.write_block(template, block_name, (parent_model, texture_variables))
             
-            self.log_message(f"已创建方块模型文件: {model_file}")
+            self.log_message(f"已创建方块模型文件: {', '.join(models.values())}")
             
         except Exception as e:
             self.log_message(f"创建方块模型文件失败: {e}")
+        return models
     
-    def create_item_model_file(self, mdk_path, mod_id, block_name):
+    @tracing.traced(category="codegen")
+    def create_item_model_file(self, mdk_path, mod_id, block_name, model_location=None):
         """
         创建物品模型文件（掉落物模型）
         根据BlockExample.md第229-235行
@@ -1645,25 +3240,27 @@ pause"""
         :param mdk_path: MDK路径
         :param mod_id: 模组ID
         :param block_name: 方块名称
+        :param model_location: 物品使用的方块模型，默认为方块本身的模型
         """
         try:
             models_item_dir = os.path.join(mdk_path, "src", "main", "resources", "assets", mod_id, "models", "item")
             os.makedirs(models_item_dir, exist_ok=True)
             
             item_model_file = os.path.join(models_item_dir, f"{block_name}.json")
+            model_location = model_location or f"{mod_id}:block/{block_name}"
             
             item_model_content = f'''{{
-    "parent": "{mod_id}:block/{block_name}"
+    "parent": "{model_location}"
 }}'''
             
-            with open(item_model_file, 'w', encoding='utf-8') as f:
-                f.write(item_model_content)
+            journal.write_text(item_model_file, item_model_content)
             
             self.log_message(f"已创建物品模型文件: {item_model_file}")
             
         except Exception as e:
             self.log_message(f"创建物品模型文件失败: {e}")
     
+    @tracing.traced(category="codegen")
     def create_loot_table_file(self, mdk_path, mod_id, block_name):
         """
         创建战利品表文件
@@ -1694,8 +3291,7 @@ pause"""
     ]
 }}'''
             
-            with open(loot_table_file, 'w', encoding='utf-8') as f:
-                f.write(loot_table_content)
+            journal.write_text(loot_table_file, loot_table_content)
             
             self.log_message(f"已创建战利品表文件: {loot_table_file}")
             
@@ -1738,9 +3334,13 @@ pause"""
                     
                     target_file = os.path.join(textures_dir, f"{block_name}.png")
                     
-                    # 复制文件
-                    shutil.copy2(texture_file, target_file)
-                    self.log_message(f"已复制贴图文件: {texture_file} -> {target_file}")
+                    # 放入贴图仓库并链接到目标位置，内容未变化时不写入
+                    store = TextureStore(os.path.dirname(mdk_path))
+                    if store.import_texture(texture_file, target_file) == "unchanged":
+                        self.log_message(f"贴图内容未变化，跳过导入: {target_file}")
+                    else:
+                        self.log_message(f"已导入贴图文件: {texture_file} -> {target_file}")
+                    store.save()
                 else:
                     self.log_message("用户取消了贴图选择")
             else:
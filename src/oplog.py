@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+撤销/重做操作日志模块
+把每次项目事务记录为结构化补丁（mod.json使用JSON Patch，其他文件使用文件片段补丁），
+追加写入{modid}pack/.forgecreator/oplog.jsonl，并定期压缩为快照，可跨会话撤销/重做
+"""
+
+import os
+import json
+import base64
+
+import journal
+import tracing
+from journal import ProjectJournal, get_state_dir
+
+
+# 每追加多少条记录写一次快照并截断日志
+SNAPSHOT_INTERVAL = 64
+
+# 快照中最多保留的撤销步数
+MAX_HISTORY = 200
+
+
+class OperationConflict(Exception):
+    """
+    撤销/重做时发现文件已被外部修改，补丁无法应用
+    """
+
+
+# ========== JSON Patch ==========
+
+def _escape_pointer(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _split_pointer(pointer):
+    if not pointer:
+        return []
+    return [part.replace("~1", "/").replace("~0", "~") for part in pointer[1:].split("/")]
+
+
+def diff_json(old, new, pointer=""):
+    """
+    计算从old到new的JSON Patch（RFC 6902的add/remove/replace子集）
+    列表只比较公共前缀和公共后缀之外的部分，因此追加一个方块只产生一条add
+
+    :param old: 修改前的JSON值
+    :param new: 修改后的JSON值
+    :param pointer: 当前位置的JSON Pointer
+    :return: 补丁操作列表
+    """
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": pointer, "value": new}]
+
+    if isinstance(old, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{pointer}/{_escape_pointer(key)}"})
+        for key, value in new.items():
+            child = f"{pointer}/{_escape_pointer(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            elif old[key] != value:
+                ops.extend(diff_json(old[key], value, child))
+        return ops
+
+    if isinstance(old, list):
+        prefix = 0
+        while prefix < len(old) and prefix < len(new) and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < len(old) - prefix and suffix < len(new) - prefix
+               and old[-1 - suffix] == new[-1 - suffix]):
+            suffix += 1
+
+        old_middle = len(old) - prefix - suffix
+        new_middle = len(new) - prefix - suffix
+        ops = []
+        common = min(old_middle, new_middle)
+        for i in range(prefix, prefix + common):
+            ops.extend(diff_json(old[i], new[i], f"{pointer}/{i}"))
+        # 从后往前删除，保证下标不变
+        for i in range(prefix + old_middle - 1, prefix + common - 1, -1):
+            ops.append({"op": "remove", "path": f"{pointer}/{i}"})
+        for i in range(prefix + common, prefix + new_middle):
+            ops.append({"op": "add", "path": f"{pointer}/{i}", "value": new[i]})
+        return ops
+
+    if old != new:
+        return [{"op": "replace", "path": pointer, "value": new}]
+    return []
+
+
+def apply_json_patch(document, ops):
+    """
+    把JSON Patch应用到document上（原地修改）
+
+    :param document: JSON文档
+    :param ops: 补丁操作列表
+    :return: 修改后的文档（根节点被replace时为新对象）
+    :raises OperationConflict: 补丁路径在文档中不存在
+    """
+    for op in ops:
+        parts = _split_pointer(op["path"])
+        if not parts:
+            if op["op"] != "replace":
+                raise OperationConflict(f"无法对根节点执行{op['op']}")
+            document = op["value"]
+            continue
+
+        parent = document
+        try:
+            for part in parts[:-1]:
+                parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+            last = parts[-1]
+            if isinstance(parent, list):
+                index = len(parent) if last == "-" else int(last)
+                if op["op"] == "add":
+                    if index > len(parent):
+                        raise IndexError(index)
+                    parent.insert(index, op["value"])
+                elif op["op"] == "remove":
+                    del parent[index]
+                else:
+                    parent[index] = op["value"]
+            else:
+                if op["op"] == "add":
+                    parent[last] = op["value"]
+                elif op["op"] == "remove":
+                    del parent[last]
+                else:
+                    if last not in parent:
+                        raise KeyError(last)
+                    parent[last] = op["value"]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise OperationConflict(f"mod.json中找不到路径: {op['path']}")
+    return document
+
+
+# ========== 文件片段补丁 ==========
+
+def _encode(data):
+    """
+    把文件片段编码为可写入JSON的形式
+    """
+    try:
+        return data.decode('utf-8'), None
+    except UnicodeDecodeError:
+        return base64.b64encode(data).decode('ascii'), "base64"
+
+
+def _decode(text, encoding):
+    if encoding == "base64":
+        return base64.b64decode(text)
+    return text.encode('utf-8')
+
+
+def _is_continuation(data, index):
+    """
+    判断data[index]是否为UTF-8多字节字符的后续字节
+    """
+    return index < len(data) and 0x80 <= data[index] < 0xC0
+
+
+def diff_file(rel_path, old, new):
+    """
+    计算文件修改的补丁
+
+    :param rel_path: 相对项目根目录的路径
+    :param old: 修改前内容（bytes），None表示原本不存在
+    :param new: 修改后内容（bytes），None表示被删除
+    :return: 补丁字典
+    """
+    if rel_path.endswith("mod.json") and old is not None and new is not None:
+        try:
+            old_doc = json.loads(old.decode('utf-8'))
+            new_doc = json.loads(new.decode('utf-8'))
+            return {
+                "kind": "json",
+                "path": rel_path,
+                "redo": diff_json(old_doc, new_doc),
+                "undo": diff_json(new_doc, old_doc),
+            }
+        except ValueError:
+            pass
+
+    old_bytes = old or b""
+    new_bytes = new or b""
+    # 只记录公共前缀和公共后缀之间被替换的片段
+    limit = min(len(old_bytes), len(new_bytes))
+    prefix = 0
+    while prefix < limit and old_bytes[prefix] == new_bytes[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_bytes[-1 - suffix] == new_bytes[-1 - suffix]:
+        suffix += 1
+    # 不要把UTF-8多字节字符从中间切开
+    while prefix > 0 and (_is_continuation(old_bytes, prefix) or _is_continuation(new_bytes, prefix)):
+        prefix -= 1
+    while suffix > 0 and (_is_continuation(old_bytes, len(old_bytes) - suffix)
+                          or _is_continuation(new_bytes, len(new_bytes) - suffix)):
+        suffix -= 1
+
+    old_span, old_encoding = _encode(old_bytes[prefix:len(old_bytes) - suffix])
+    new_span, new_encoding = _encode(new_bytes[prefix:len(new_bytes) - suffix])
+    return {
+        "kind": "span",
+        "path": rel_path,
+        "offset": prefix,
+        "old": old_span,
+        "old_encoding": old_encoding,
+        "new": new_span,
+        "new_encoding": new_encoding,
+        "existed_before": old is not None,
+        "exists_after": new is not None,
+    }
+
+
+class OperationLog:
+    """
+    项目的撤销/重做操作日志
+    通过监听ProjectJournal的提交，自动记录每次项目事务
+    """
+
+    # 项目根目录 -> OperationLog
+    _instances = {}
+
+    def __init__(self, project_dir):
+        """
+        初始化操作日志并从磁盘加载历史
+
+        :param project_dir: 项目根目录（mod.json所在目录）
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.journal = ProjectJournal.for_project(self.project_dir)
+        state_dir = get_state_dir(self.project_dir)
+        self.log_path = os.path.join(state_dir, "oplog.jsonl")
+        self.snapshot_path = os.path.join(state_dir, "oplog_snapshot.json")
+
+        self.undo_stack = []
+        self.redo_stack = []
+        self.next_seq = 1
+        self.records_since_snapshot = 0
+        # 撤销/重做自身产生的事务不记录为新操作
+        self._replaying = False
+
+        self.load()
+        self.journal.commit_listeners.append(self.record_transaction)
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path):
+        """
+        获取mod.json所在项目的操作日志（同一项目始终返回同一个实例）
+        """
+        project_dir = os.path.dirname(os.path.abspath(mod_json_path))
+        if project_dir not in cls._instances:
+            cls._instances[project_dir] = cls(project_dir)
+        return cls._instances[project_dir]
+
+    @tracing.traced(category="journal")
+    def load(self):
+        """
+        读取快照，再按顺序重放快照之后追加的日志记录
+        """
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self.undo_stack = snapshot.get("undo", [])
+            self.redo_stack = snapshot.get("redo", [])
+            self.next_seq = snapshot.get("next_seq", 1)
+
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 最后一行可能因崩溃而不完整
+                    break
+                self._replay_record(record)
+                self.records_since_snapshot += 1
+
+    def _replay_record(self, record):
+        """
+        把一条日志记录作用到内存中的撤销/重做栈上
+        """
+        record_type = record.get("type")
+        if record_type == "op":
+            if record["seq"] < self.next_seq:
+                return
+            self.undo_stack.append(record)
+            self.redo_stack = []
+            self.next_seq = max(self.next_seq, record["seq"] + 1)
+        elif record_type == "undo":
+            if self.undo_stack and self.undo_stack[-1]["seq"] == record["seq"]:
+                self.redo_stack.append(self.undo_stack.pop())
+        elif record_type == "redo":
+            if self.redo_stack and self.redo_stack[-1]["seq"] == record["seq"]:
+                self.undo_stack.append(self.redo_stack.pop())
+
+    def _append(self, record):
+        """
+        追加一条日志记录，达到间隔后写快照
+        """
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+        self.records_since_snapshot += 1
+        if self.records_since_snapshot >= SNAPSHOT_INTERVAL:
+            self.snapshot()
+
+    def snapshot(self):
+        """
+        把当前撤销/重做栈写入快照并清空追加日志
+        快照只保留最近MAX_HISTORY步，日志因此不会无限增长
+        """
+        del self.undo_stack[:-MAX_HISTORY]
+        snapshot = {
+            "next_seq": self.next_seq,
+            "undo": self.undo_stack,
+            "redo": self.redo_stack,
+        }
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.snapshot_path)
+        # 快照落盘后再截断日志；两步之间崩溃时，重放已包含在快照中的记录会因seq不匹配被跳过
+        with open(self.log_path, 'w', encoding='utf-8'):
+            pass
+        self.records_since_snapshot = 0
+
+    @tracing.traced(category="journal")
+    def record_transaction(self, txn):
+        """
+        ProjectJournal提交回调：把事务转换为补丁并记录为一次操作
+
+        :param txn: 已提交的事务
+        """
+        if self._replaying:
+            return
+        patches = []
+        for rel_path, new in txn.changes.items():
+            if rel_path not in txn.originals:
+                # 没有记录原始内容的修改（目录本身的删除，目录中的文件已单独记录）不记录
+                continue
+            old = txn.originals[rel_path]
+            if old == new:
+                continue
+            patches.append(diff_file(rel_path, old, new))
+        if not patches:
+            return
+
+        record = {"type": "op", "seq": self.next_seq, "label": txn.label, "patches": patches}
+        self.next_seq += 1
+        self.undo_stack.append(record)
+        self.redo_stack = []
+        self._append(record)
+
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    @tracing.traced(category="journal")
+    def undo(self):
+        """
+        撤销最近一次操作
+
+        :return: 被撤销操作的说明，没有可撤销的操作时返回None
+        :raises OperationConflict: 文件已被外部修改
+        """
+        if not self.undo_stack:
+            return None
+        record = self.undo_stack[-1]
+        self._apply(record, reverse=True)
+        self.redo_stack.append(self.undo_stack.pop())
+        self._append({"type": "undo", "seq": record["seq"]})
+        return record.get("label", "")
+
+    @tracing.traced(category="journal")
+    def redo(self):
+        """
+        重做最近一次被撤销的操作
+
+        :return: 被重做操作的说明，没有可重做的操作时返回None
+        :raises OperationConflict: 文件已被外部修改
+        """
+        if not self.redo_stack:
+            return None
+        record = self.redo_stack[-1]
+        self._apply(record, reverse=False)
+        self.undo_stack.append(self.redo_stack.pop())
+        self._append({"type": "redo", "seq": record["seq"]})
+        return record.get("label", "")
+
+    def _apply(self, record, reverse):
+        """
+        在一个事务中应用一次操作的全部补丁（撤销时按相反顺序应用逆补丁）
+        """
+        patches = reversed(record["patches"]) if reverse else record["patches"]
+        self._replaying = True
+        try:
+            with self.journal.transaction(record.get("label", "")):
+                for patch in patches:
+                    self._apply_patch(patch, reverse)
+        finally:
+            self._replaying = False
+
+    def _apply_patch(self, patch, reverse):
+        """
+        应用单个补丁
+        """
+        target = self.journal.abspath(patch["path"])
+
+        if patch["kind"] == "json":
+            document = journal.load_json(target)
+            document = apply_json_patch(document, patch["undo"] if reverse else patch["redo"])
+            journal.dump_json(target, document)
+            return
+
+        if reverse:
+            expected, expected_encoding = patch["new"], patch["new_encoding"]
+            replacement, replacement_encoding = patch["old"], patch["old_encoding"]
+            should_exist = patch["existed_before"]
+        else:
+            expected, expected_encoding = patch["old"], patch["old_encoding"]
+            replacement, replacement_encoding = patch["new"], patch["new_encoding"]
+            should_exist = patch["exists_after"]
+
+        expected = _decode(expected, expected_encoding)
+        replacement = _decode(replacement, replacement_encoding)
+        content = journal.read_bytes(target) if journal.exists(target) else b""
+        offset = patch["offset"]
+        if content[offset:offset + len(expected)] != expected:
+            raise OperationConflict(f"文件已被修改，无法应用补丁: {patch['path']}")
+
+        if not should_exist:
+            journal.remove(target)
+        else:
+            journal.write_bytes(target, content[:offset] + replacement + content[offset + len(expected):])
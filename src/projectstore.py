@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+项目数据库模块
+可选的mod.json存储：把mod.json中的blocks、items、recipes、itemGroups数组逐条保存到SQLite中，
+供条目数达到数万的大型项目使用：
+    - 每个条目一行，按名称和注册名建立索引，查找、添加、修改单个条目只需一次索引查找（O(log n)），
+      不再需要解析整个mod.json
+    - 每行保存条目在mod.json中的文本片段（已按indent=2缩进），导出时只是按顺序拼接片段，
+      逐行写出，结果与json.dumps(..., ensure_ascii=False, indent=2)逐字节相同，
+      不需要对整个文档重新做带缩进的序列化（带缩进时json只能使用纯Python的编码器）
+    - 其他顶层键（modInfo、commands等）整体保存为一行
+
+mod.json仍然是项目文件，每次修改后都会导出，其他功能照常读取。
+记录上次导出时mod.json的大小和修改时间，mod.json被其他功能或手动修改后，下次打开数据库时重新导入。
+
+数据库保存在{modid}pack/.forgecreator/project.db中，文件存在即表示项目启用了数据库
+"""
+
+import os
+import json
+import uuid
+import sqlite3
+
+import tracing
+import journal
+from journal import get_state_dir
+
+
+# 数据库文件名
+STORE_FILE = "project.db"
+
+# 表结构变化时修改，旧数据库会被删除并从mod.json重新导入
+SCHEMA_VERSION = 1
+
+# 逐条保存的mod.json数组 -> 表名
+COLLECTIONS = {
+    "blocks": "blocks",
+    "items": "items",
+    "recipes": "recipes",
+    "itemGroups": "item_groups",
+}
+
+_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS "{table}" (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    registry_name TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS "{table}_name" ON "{table}" (name);
+CREATE INDEX IF NOT EXISTS "{table}_registry_name" ON "{table}" (registry_name);
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS document (
+    position INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    value TEXT
+);
+""" + "".join(_TABLE_SCHEMA.format(table=table) for table in COLLECTIONS.values())
+
+# 条目在mod.json中的缩进（顶层键2个空格，数组元素4个空格）
+_ENTRY_INDENT = "    "
+_VALUE_INDENT = "  "
+
+
+def _fragment(value, indent):
+    """
+    把值序列化为在mod.json中对应缩进层级的文本（首行不含缩进）
+    """
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + indent)
+
+
+def _mod_json_stat(mod_json_path):
+    try:
+        stat = os.stat(mod_json_path)
+    except OSError:
+        return None
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class ProjectStore:
+    """
+    项目数据库（一个项目一个SQLite文件）
+
+    修改条目后调用export把mod.json写入当前事务（在事务提交前只导出一次），事务提交后调用save提交数据库；
+    事务失败时不调用save，关闭数据库即丢弃未提交的修改
+    """
+
+    def __init__(self, mod_json_path):
+        """
+        打开（不存在时创建）项目数据库，不会自动导入mod.json，见for_mod_json和create
+
+        :param mod_json_path: mod.json文件路径
+        """
+        self.mod_json_path = os.path.abspath(mod_json_path)
+        self.db_path = self.path_for(self.mod_json_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.db = sqlite3.connect(self.db_path)
+        self._ensure_schema()
+
+    @staticmethod
+    def path_for(mod_json_path):
+        """
+        项目数据库文件路径
+        """
+        return os.path.join(get_state_dir(os.path.dirname(os.path.abspath(mod_json_path))), STORE_FILE)
+
+    @classmethod
+    def enabled(cls, mod_json_path):
+        """
+        项目是否启用了数据库
+        """
+        return os.path.exists(cls.path_for(mod_json_path))
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path):
+        """
+        打开项目数据库，mod.json在上次导出后被修改过时先重新导入
+
+        :return: ProjectStore，项目没有启用数据库时返回None
+        """
+        if not cls.enabled(mod_json_path):
+            return None
+        store = cls(mod_json_path)
+        store.refresh()
+        return store
+
+    @classmethod
+    def create(cls, mod_json_path):
+        """
+        为项目启用数据库：导入mod.json的全部内容
+        """
+        store = cls(mod_json_path)
+        try:
+            store.import_mod_json()
+        except Exception:
+            store.close()
+            os.remove(store.db_path)
+            raise
+        return store
+
+    def close(self):
+        self.db.close()
+
+    def _ensure_schema(self):
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.DatabaseError:
+            row = None
+        if row is not None and row[0] == str(SCHEMA_VERSION):
+            return
+        tables = [name for (name,) in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        with self.db:
+            for name in tables:
+                self.db.execute(f'DROP TABLE "{name}"')
+            self.db.executescript(_SCHEMA)
+            self.db.execute("INSERT INTO meta VALUES ('version', ?)", (str(SCHEMA_VERSION),))
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def is_current(self):
+        """
+        mod.json自上次导入/导出后是否没有被修改过
+        """
+        stat = self._meta("mod_json")
+        return stat is not None and stat == _mod_json_stat(self.mod_json_path)
+
+    def refresh(self):
+        """
+        mod.json被修改过时重新导入
+
+        :return: 是否重新导入
+        """
+        if self.is_current():
+            return False
+        self.import_mod_json()
+        return True
+
+    @tracing.traced(category="store")
+    def import_mod_json(self):
+        """
+        从mod.json导入全部内容（替换数据库中的现有内容）并提交
+
+        :raises ValueError: mod.json的顶层不是对象，或blocks等键不是数组
+        """
+        with open(self.mod_json_path, 'r', encoding='utf-8') as f:
+            mod_data = json.load(f)
+        if not isinstance(mod_data, dict):
+            raise ValueError("mod.json的顶层不是对象")
+        for key in COLLECTIONS:
+            if key in mod_data and not isinstance(mod_data[key], list):
+                raise ValueError(f"mod.json中的{key}不是数组")
+
+        with self.db:
+            self.db.execute("DELETE FROM document")
+            for table in COLLECTIONS.values():
+                self.db.execute(f'DELETE FROM "{table}"')
+            for position, (key, value) in enumerate(mod_data.items()):
+                table = COLLECTIONS.get(key)
+                if table is None:
+                    self.db.execute("INSERT INTO document VALUES (?, ?, ?)",
+                                    (position, key, _fragment(value, _VALUE_INDENT)))
+                    continue
+                # 数组本身只占一个位置，元素保存在对应的表中
+                self.db.execute("INSERT INTO document VALUES (?, ?, NULL)", (position, key))
+                self.db.executemany(f'INSERT INTO "{table}" (name, registry_name, data) VALUES (?, ?, ?)',
+                                    (self._row(entry) for entry in value))
+            self._set_meta("mod_json", _mod_json_stat(self.mod_json_path))
+        tracing.count("store_imports")
+
+    @staticmethod
+    def _row(entry):
+        if isinstance(entry, dict):
+            name = entry.get("name")
+            registry_name = entry.get("registryName")
+        else:
+            name = registry_name = None
+        return (name if isinstance(name, str) else None,
+                registry_name if isinstance(registry_name, str) else None,
+                _fragment(entry, _ENTRY_INDENT))
+
+    def _table(self, key):
+        table = COLLECTIONS.get(key)
+        if table is None:
+            raise KeyError(f"{key}不是逐条保存的数组")
+        return table
+
+    def get(self, key, name):
+        """
+        按名称查找条目
+
+        :param key: 数组名，如"blocks"
+        :return: 条目内容，不存在时返回None
+        """
+        row = self.db.execute(f'SELECT data FROM "{self._table(key)}" WHERE name = ? ORDER BY id LIMIT 1',
+                              (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_registry_name(self, registry_name):
+        """
+        按注册名在所有数组中查找条目
+
+        :return: [(数组名, 条目内容)]
+        """
+        found = []
+        for key, table in COLLECTIONS.items():
+            for (data,) in self.db.execute(f'SELECT data FROM "{table}" WHERE registry_name = ? ORDER BY id',
+                                           (registry_name,)):
+                found.append((key, json.loads(data)))
+        return found
+
+    def put(self, key, entry, replace=True):
+        """
+        添加或修改一个条目（按名称匹配，已存在时原位替换，不存在时添加到数组末尾），不提交
+
+        :param key: 数组名，如"blocks"
+        :param entry: 条目内容（带name字段的字典）
+        :param replace: 条目已存在时是否替换
+        :return: 是否有修改
+        """
+        table = self._table(key)
+        name, registry_name, data = self._row(entry)
+        row = self.db.execute(f'SELECT id, data FROM "{table}" WHERE name = ? ORDER BY id LIMIT 1',
+                              (name,)).fetchone() if name is not None else None
+        if row is not None:
+            if not replace or row[1] == data:
+                return False
+            self.db.execute(f'UPDATE "{table}" SET registry_name = ?, data = ? WHERE id = ?',
+                            (registry_name, data, row[0]))
+            return True
+        if self.db.execute("SELECT 1 FROM document WHERE key = ?", (key,)).fetchone() is None:
+            # 与直接修改mod.json时一样，新数组添加在文档末尾
+            self.db.execute("INSERT INTO document VALUES ((SELECT IFNULL(MAX(position), -1) + 1 FROM document), ?, NULL)",
+                            (key,))
+        self.db.execute(f'INSERT INTO "{table}" (name, registry_name, data) VALUES (?, ?, ?)',
+                        (name, registry_name, data))
+        return True
+
+    def remove(self, key, name):
+        """
+        按名称删除条目，不提交
+
+        :return: 删除的条目数
+        """
+        return self.db.execute(f'DELETE FROM "{self._table(key)}" WHERE name = ?', (name,)).rowcount
+
+    def count(self, key):
+        """
+        数组中的条目数
+        """
+        return self.db.execute(f'SELECT COUNT(*) FROM "{self._table(key)}"').fetchone()[0]
+
+    def page(self, key, offset, limit):
+        """
+        按顺序读取数组中的一页条目
+
+        :return: 条目内容列表
+        """
+        return [json.loads(data) for (data,) in self.db.execute(
+            f'SELECT data FROM "{self._table(key)}" ORDER BY id LIMIT ? OFFSET ?', (limit, offset))]
+
+    def keys(self):
+        """
+        mod.json的顶层键（按文档中的顺序）
+
+        :return: [(键, 是否为逐条保存的数组)]
+        """
+        return [(key, value is None) for key, value in
+                self.db.execute("SELECT key, value FROM document ORDER BY position")]
+
+    def value(self, key):
+        """
+        读取不是逐条保存的顶层键的值
+        """
+        row = self.db.execute("SELECT value FROM document WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def iter_json(self):
+        """
+        按mod.json的格式逐段生成文档文本，拼接结果与json.dumps(mod_data, ensure_ascii=False, indent=2)相同
+        """
+        documents = self.db.execute("SELECT key, value FROM document ORDER BY position").fetchall()
+        if not documents:
+            yield "{}"
+            return
+        yield "{"
+        for index, (key, value) in enumerate(documents):
+            yield ("\n" if index == 0 else ",\n") + _VALUE_INDENT + json.dumps(key, ensure_ascii=False) + ": "
+            if value is not None:
+                yield value
+                continue
+            empty = True
+            for (data,) in self.db.execute(f'SELECT data FROM "{COLLECTIONS[key]}" ORDER BY id'):
+                yield ("[\n" if empty else ",\n") + _ENTRY_INDENT + data
+                empty = False
+            yield "[]" if empty else "\n" + _VALUE_INDENT + "]"
+        yield "\n}"
+
+    @tracing.traced(category="store")
+    def _export_to_transaction(self, path):
+        journal.write_text(path, "".join(self.iter_json()))
+
+    @tracing.traced(category="store")
+    def export(self, path=None):
+        """
+        导出为mod.json：处于事务中时延迟到事务提交前写入事务（同一事务中多次修改只拼接一次整个文档，
+        事务中读取mod.json时会先导出），否则逐段写入临时文件后原子替换
+
+        :param path: 导出路径，默认为项目的mod.json
+        """
+        path = os.path.abspath(path or self.mod_json_path)
+        txn = journal.current_transaction()
+        if txn is not None and txn.owns(path):
+            txn.defer(path, lambda: self._export_to_transaction(path))
+            return
+        temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+                for chunk in self.iter_json():
+                    f.write(chunk)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def save(self):
+        """
+        记录导出后mod.json的状态并提交数据库，在写入mod.json的事务提交之后调用
+        """
+        self._set_meta("mod_json", _mod_json_stat(self.mod_json_path))
+        self.db.commit()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+配方表模块
+用紧凑的配方表（材料 × 形状）批量生成1.16.5的配方JSON：
+    - 每种形状只编译一次配方模板，再对整列材料展开
+    - 内容相同（或同一原料图案得到同一产物）的配方只保留一个
+    - 以原料图案为键建立哈希索引（有序配方按图案裁剪和左右镜像归一化），
+      同一图案得到不同产物的配方视为冲突，保留先出现的一个并报告
+    - 所有配方文件在一个事务中写入，内容未变化的文件不写，不再生成的文件删除
+
+配方表保存在mod.json的recipeTables中，例如：
+    {"name": "stone", "materials": {"granite": "modid:granite", "andesite": "#forge:stone"},
+     "shapes": ["stairs", "slab", "wall"], "stonecutting": true}
+mod.json中recipes数组里手写的配方优先于配方表展开的配方。
+上次生成的配方文件记录在.forgecreator/recipe_tables.json中
+"""
+
+import os
+import json
+
+import tracing
+import journal
+from journal import get_state_dir
+from blockstates import dump
+
+
+# 生成记录文件名
+MANIFEST_FILE = "recipe_tables.json"
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+# 形状：有序配方的图案（X为材料）或无序配方的原料、其他原料、产物数量、产物名称、切石机产物数量
+SHAPES = {
+    "stairs": {"pattern": ["X  ", "XX ", "XXX"], "count": 4, "output": "{material}_stairs", "stonecutting": 1},
+    "slab": {"pattern": ["XXX"], "count": 6, "output": "{material}_slab", "stonecutting": 2},
+    "wall": {"pattern": ["XXX", "XXX"], "count": 6, "output": "{material}_wall", "stonecutting": 1},
+    "bricks": {"pattern": ["XX", "XX"], "count": 4, "output": "{material}_bricks", "stonecutting": 1},
+    "pillar": {"pattern": ["X", "X"], "count": 2, "output": "{material}_pillar", "stonecutting": 1},
+    "block": {"pattern": ["XXX", "XXX", "XXX"], "count": 1, "output": "{material}_block"},
+    "fence": {"pattern": ["X#X", "X#X"], "key": {"#": "minecraft:stick"}, "count": 3, "output": "{material}_fence"},
+    "fence_gate": {"pattern": ["#X#", "#X#"], "key": {"#": "minecraft:stick"}, "count": 1,
+                   "output": "{material}_fence_gate"},
+    "door": {"pattern": ["XX", "XX", "XX"], "count": 3, "output": "{material}_door"},
+    # 与原版相同，活板门的图案与墙相同，不能在同一个配方表中同时选择（见expand_table）
+    "trapdoor": {"pattern": ["XXX", "XXX"], "count": 2, "output": "{material}_trapdoor"},
+    "pressure_plate": {"pattern": ["XX"], "count": 1, "output": "{material}_pressure_plate"},
+    "button": {"ingredients": ["X"], "count": 1, "output": "{material}_button"},
+}
+
+# 烧炼类配方：配方表"smelting"字段 {材料: 原料} 生成"原料 -> 材料"
+COOKING_TYPES = {
+    "smelting": 200,
+    "blasting": 100,
+}
+
+
+def ingredient(ref):
+    """
+    把"modid:name"或"#tag"转为配方原料对象
+    """
+    if ref.startswith("#"):
+        return {"tag": ref[1:]}
+    return {"item": ref}
+
+
+def ingredient_key(value):
+    """
+    配方原料的规范字符串（用于比较），多个可选原料排序后用"|"连接
+    """
+    if isinstance(value, list):
+        return "|".join(sorted(ingredient_key(option) for option in value))
+    if isinstance(value, dict):
+        if "tag" in value:
+            return f"#{value['tag']}"
+        return str(value.get("item", ""))
+    return str(value)
+
+
+def _namespaced(value):
+    return value if ":" in value else f"minecraft:{value}"
+
+
+def _result_key(recipe):
+    """
+    配方产物及数量
+    """
+    result = recipe.get("result")
+    if isinstance(result, dict):
+        return _namespaced(str(result.get("item", ""))), int(result.get("count", 1))
+    return _namespaced(str(result)), int(recipe.get("count", 1))
+
+
+def _shrink(grid):
+    """
+    去掉图案四周的空行和空列（与游戏匹配有序配方时相同）
+    """
+    rows = [row for row in grid if any(row)]
+    if not rows:
+        return ()
+    columns = [index for index in range(max(len(row) for row in rows)) if any(index < len(row) and row[index] for row in rows)]
+    return tuple(tuple(row[index] if index < len(row) else "" for index in range(columns[0], columns[-1] + 1))
+                 for row in rows)
+
+
+def signature(recipe):
+    """
+    配方的原料图案键：原料图案相同的两个配方在游戏中无法区分
+
+    :return: 元组，无法识别的配方类型返回None
+    """
+    recipe_type = _namespaced(str(recipe.get("type", "")))
+    if recipe_type == "minecraft:crafting_shaped":
+        keys = {symbol: ingredient_key(value) for symbol, value in recipe.get("key", {}).items()}
+        grid = _shrink([[keys.get(symbol, "") if symbol != " " else "" for symbol in row]
+                        for row in recipe.get("pattern", [])])
+        cells = [cell for row in grid for cell in row if cell]
+        if len(cells) == 1:
+            return ("crafting", "shapeless", (cells[0],))
+        mirrored = tuple(tuple(reversed(row)) for row in grid)
+        return ("crafting", "shaped", min(grid, mirrored))
+    if recipe_type == "minecraft:crafting_shapeless":
+        return ("crafting", "shapeless", tuple(sorted(ingredient_key(value) for value in recipe.get("ingredients", []))))
+    if recipe_type == "minecraft:stonecutting":
+        # 同一原料可以在切石机中切出多种产物，只有产物也相同时才是同一个配方
+        return (recipe_type, ingredient_key(recipe.get("ingredient")), _result_key(recipe)[0])
+    if "ingredient" in recipe:
+        return (recipe_type, ingredient_key(recipe.get("ingredient")))
+    return None
+
+
+def _compile_shape(shape, stonecutting):
+    """
+    把形状编译为一个函数：(材料原料, 产物) -> [(名称后缀, 配方)]
+    形状中与材料无关的部分（图案、其他原料）只构造一次
+    """
+    count = shape["count"]
+    extra_key = {symbol: ingredient(ref) for symbol, ref in shape.get("key", {}).items()}
+    cutting_count = shape.get("stonecutting") if stonecutting else None
+
+    if "pattern" in shape:
+        pattern = list(shape["pattern"])
+
+        def craft(material, output):
+            key = {"X": material}
+            key.update(extra_key)
+            result = {"item": output, "count": count} if count > 1 else {"item": output}
+            return {"type": "minecraft:crafting_shaped", "pattern": pattern, "key": key, "result": result}
+    else:
+        symbols = shape["ingredients"]
+
+        def craft(material, output):
+            ingredients = [material if symbol == "X" else extra_key[symbol] for symbol in symbols]
+            result = {"item": output, "count": count} if count > 1 else {"item": output}
+            return {"type": "minecraft:crafting_shapeless", "ingredients": ingredients, "result": result}
+
+    def expand(material_name, material, output):
+        recipes = [("", craft(material, output))]
+        if cutting_count:
+            cutting = {"type": "minecraft:stonecutting", "ingredient": material, "result": output}
+            if cutting_count > 1:
+                cutting["count"] = cutting_count
+            recipes.append((f"_from_{material_name}_stonecutting", cutting))
+        return recipes
+
+    return expand
+
+
+def expand_table(table, mod_id):
+    """
+    展开一个配方表
+
+    :param table: mod.json中recipeTables的元素
+    :param mod_id: 模组ID（产物默认使用该命名空间）
+    :return: (名称, 配方)的生成器
+    :raises ValueError: 配方表格式错误
+    """
+    materials = table.get("materials")
+    if not isinstance(materials, dict):
+        raise ValueError(f"配方表{table.get('name', '')}缺少materials")
+    unknown = [shape for shape in table.get("shapes", []) if shape not in SHAPES]
+    if unknown:
+        raise ValueError(f"配方表{table.get('name', '')}中有未知的形状: {', '.join(unknown)}")
+    # 原料图案相同的形状（如墙和活板门）对同一种材料只有一个配方生效
+    seen = {}
+    for shape_name in table.get("shapes", []):
+        (_, recipe), *_ = _compile_shape(SHAPES[shape_name], False)("x", {"item": "x"}, "x")
+        key = signature(recipe)
+        if seen.get(key, shape_name) != shape_name:
+            raise ValueError(f"配方表{table.get('name', '')}中的形状{seen[key]}和{shape_name}的原料图案相同，不能同时选择")
+        seen[key] = shape_name
+
+    def output_for(template, material_name, shape_name):
+        output = template.format(modid=mod_id, material=material_name, shape=shape_name)
+        return output if ":" in output else f"{mod_id}:{output}"
+
+    # 按形状编译一次，再对整列材料展开
+    for shape_name in table.get("shapes", []):
+        shape = SHAPES[shape_name]
+        expand = _compile_shape(shape, bool(table.get("stonecutting")))
+        template = table.get("output") or shape["output"]
+        for material_name, ref in materials.items():
+            output = output_for(template, material_name, shape_name)
+            material = ingredient(ref)
+            for suffix, recipe in expand(material_name, material, output):
+                yield output.split(":", 1)[1] + suffix, recipe
+
+    # 烧炼：{材料: 原料}，产物是材料本身
+    smelting = table.get("smelting") or {}
+    for cooking_type, cooking_time in COOKING_TYPES.items():
+        if cooking_type != "smelting" and not table.get(cooking_type):
+            continue
+        for material_name, source in smelting.items():
+            output = materials.get(material_name, material_name)
+            if output.startswith("#"):
+                continue
+            output = output if ":" in output else f"{mod_id}:{output}"
+            yield f"{output.split(':', 1)[1]}_from_{cooking_type}", {
+                "type": f"minecraft:{cooking_type}", "ingredient": ingredient(source), "result": output,
+                "experience": float(table.get("experience", 0.1)), "cookingtime": cooking_time}
+
+
+class RecipePlan:
+    """
+    一次生成的结果：要写入的配方、去掉的重复配方和冲突
+    """
+
+    def __init__(self):
+        self.recipes = {}       # 名称 -> 配方
+        self.duplicates = []    # (名称, 保留的配方名称)
+        self.conflicts = []     # (名称, 冲突的配方名称, 原料图案描述)
+        self.errors = []        # 配方表格式错误
+
+    def format_lines(self):
+        lines = [f"配方: {len(self.recipes)}个，重复: {len(self.duplicates)}个，冲突: {len(self.conflicts)}个"]
+        for message in self.errors:
+            lines.append(f"错误: {message}")
+        if self.conflicts:
+            lines.append("")
+            lines.append("冲突（原料图案相同但产物不同，已跳过后者）:")
+            for name, other, description in self.conflicts:
+                lines.append(f"  {name} <-> {other}: {description}")
+        if self.duplicates:
+            lines.append("")
+            lines.append("重复（已合并）:")
+            for name, kept in self.duplicates:
+                lines.append(f"  {name} -> {kept}")
+        return lines
+
+
+def _describe(key):
+    if key[0] == "crafting" and key[1] == "shaped":
+        return " / ".join(",".join(cell or "_" for cell in row) for row in key[2])
+    if key[0] == "crafting":
+        return "无序: " + ", ".join(key[2])
+    return f"{key[0]}: {key[1]}"
+
+
+class RecipeEngine:
+    """
+    项目的配方生成器
+    """
+
+    def __init__(self, project_dir, mod_id):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        :param mod_id: 模组ID
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.mod_id = mod_id
+        self.recipes_dir = os.path.join(self.project_dir, MDK_DIR_NAME, "src", "main", "resources",
+                                        "data", mod_id, "recipes")
+        self.manifest_path = os.path.join(get_state_dir(self.project_dir), MANIFEST_FILE)
+        self.generated = self._load_manifest()
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path, mod_id):
+        """
+        根据mod.json路径获取项目的配方生成器
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)), mod_id)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        return set(data.get("recipes", [])) if isinstance(data, dict) else set()
+
+    def save(self):
+        """
+        保存生成记录（事务提交后调用）
+        """
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"recipes": sorted(self.generated)}, separators=(",", ":")))
+        os.replace(temp_path, self.manifest_path)
+
+    def _foreign_recipes(self, owned):
+        """
+        配方目录中不是由本模块生成的配方文件（手写的），参与冲突检查但不会被修改
+
+        :param owned: mod.json中手写配方的名称（对应的文件由本模块生成）
+        """
+        try:
+            names = sorted(name for name in os.listdir(self.recipes_dir) if name.endswith(".json"))
+        except OSError:
+            return
+        for file_name in names:
+            name = file_name[:-len(".json")]
+            if name in self.generated or name in owned:
+                continue
+            try:
+                with open(os.path.join(self.recipes_dir, file_name), 'r', encoding='utf-8') as f:
+                    recipe = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if isinstance(recipe, dict):
+                yield name, recipe
+
+    @tracing.traced(category="codegen")
+    def plan(self, mod_data):
+        """
+        收集mod.json中的手写配方和配方表展开的配方，去重并检查冲突
+
+        :return: RecipePlan
+        """
+        plan = RecipePlan()
+        index = {}      # 原料图案 -> (名称, 产物)
+        by_content = {}  # 配方内容 -> 名称
+        foreign = set()
+
+        def add(name, recipe, write=True):
+            if write and (name in plan.recipes or name in foreign):
+                if name in foreign:
+                    plan.conflicts.append((name, name, "与手写的配方文件同名"))
+                elif plan.recipes[name] != recipe:
+                    plan.conflicts.append((name, name, "配方名称重复"))
+                return
+            content = json.dumps(recipe, sort_keys=True)
+            if content in by_content:
+                plan.duplicates.append((name, by_content[content]))
+                return
+            key = signature(recipe)
+            if key is not None:
+                result = _result_key(recipe)
+                if key in index:
+                    other, other_result = index[key]
+                    if other_result == result:
+                        plan.duplicates.append((name, other))
+                    else:
+                        plan.conflicts.append((name, other, _describe(key)))
+                    return
+                index[key] = (name, result)
+            by_content[content] = name
+            if write:
+                plan.recipes[name] = recipe
+
+        owned = {recipe["name"] for recipe in mod_data.get("recipes", []) if isinstance(recipe, dict) and recipe.get("name")}
+        for name, recipe in self._foreign_recipes(owned):
+            foreign.add(name)
+            add(name, recipe, write=False)
+
+        for recipe in mod_data.get("recipes", []):
+            if isinstance(recipe, dict) and recipe.get("name"):
+                body = {key: value for key, value in recipe.items() if key != "name"}
+                if "type" in body:
+                    body["type"] = _namespaced(str(body["type"]))
+                add(recipe["name"], body)
+
+        for table in mod_data.get("recipeTables", []):
+            try:
+                for name, recipe in expand_table(table, self.mod_id):
+                    add(name, recipe)
+            except ValueError as e:
+                plan.errors.append(str(e))
+        return plan
+
+    @tracing.traced(category="codegen")
+    def apply(self, plan):
+        """
+        写入配方文件：内容未变化的不写，上次生成、这次不再生成的删除。需要在事务中调用
+
+        :return: (写入数, 未变化数, 删除数)
+        """
+        written = unchanged = removed = 0
+        os.makedirs(self.recipes_dir, exist_ok=True)
+        for name, recipe in plan.recipes.items():
+            path = os.path.join(self.recipes_dir, f"{name}.json")
+            content = dump(recipe).encode("utf-8")
+            if journal.exists(path) and journal.read_bytes(path) == content:
+                unchanged += 1
+                continue
+            journal.write_bytes(path, content)
+            written += 1
+        for name in sorted(self.generated - set(plan.recipes)):
+            path = os.path.join(self.recipes_dir, f"{name}.json")
+            if journal.exists(path):
+                journal.remove(path)
+                removed += 1
+        self.generated = set(plan.recipes)
+        return written, unchanged, removed
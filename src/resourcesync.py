@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享资源文件同步模块
+多个方块/物品共同写入的文件（语言文件、标签文件）不在添加每个方块时读改写，而是从mod.json中
+收集所有方块、物品、物品组和音效事件贡献的翻译与标签成员，每次同步时每个文件只渲染一次：
+    - 语言文件：zh_cn.json使用displayName，en_us.json使用englishName（没有时由名称生成）
+    - 标签文件：方块/物品条目的"tags"字段，方块的为{"blocks": [...], "items": [...]}，物品的为标签列表
+    - 输出顺序固定（键、标签值排序），内容没有变化的文件不写入
+    - 文件中不是由本模块写入的条目（手动添加的翻译、标签值）保留不动；
+      上次同步写入、这次不再贡献的条目会被删除
+
+上次同步写入的条目记录在.forgecreator/resource_sync.json中
+"""
+
+import os
+import json
+
+import tracing
+import journal
+from journal import get_state_dir
+from blockstates import dump
+
+
+# 同步记录文件名
+MANIFEST_FILE = "resource_sync.json"
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+# 方块类 -> 原版标签（沿父类链查找第一个匹配的）
+CLASS_TAGS = {
+    "StairsBlock": {"blocks": ["minecraft:stairs"], "items": ["minecraft:stairs"]},
+    "SlabBlock": {"blocks": ["minecraft:slabs"], "items": ["minecraft:slabs"]},
+    "WallBlock": {"blocks": ["minecraft:walls"], "items": ["minecraft:walls"]},
+    "FenceBlock": {"blocks": ["minecraft:fences"]},
+    "FenceGateBlock": {"blocks": ["minecraft:fence_gates"]},
+    "DoorBlock": {"blocks": ["minecraft:doors"], "items": ["minecraft:doors"]},
+    "TrapDoorBlock": {"blocks": ["minecraft:trapdoors"], "items": ["minecraft:trapdoors"]},
+    "AbstractButtonBlock": {"blocks": ["minecraft:buttons"], "items": ["minecraft:buttons"]},
+    "PressurePlateBlock": {"blocks": ["minecraft:pressure_plates"]},
+}
+
+# 没有方块类索引时也能识别的常见子类
+CLASS_TAGS["StoneButtonBlock"] = CLASS_TAGS["WoodButtonBlock"] = CLASS_TAGS["AbstractButtonBlock"]
+
+
+def tags_for_class(lineage):
+    """
+    方块类默认加入的原版标签
+
+    :param lineage: 方块类及其父类的简单类名列表（从子类到父类）
+    :return: {"blocks": [...], "items": [...]}，没有时返回空字典
+    """
+    for name in lineage:
+        if name in CLASS_TAGS:
+            return {kind: list(values) for kind, values in CLASS_TAGS[name].items()}
+    return {}
+
+
+def english_name(name):
+    """
+    由注册名生成英文显示名称，如"example_block" -> "Example Block"
+    """
+    return name.replace("_", " ").title()
+
+
+def _tag_path(resources_dir, tag, kind):
+    namespace, path = tag.split(":", 1) if ":" in tag else ("minecraft", tag)
+    return os.path.join(resources_dir, "data", namespace, "tags", kind, *f"{path}.json".split("/"))
+
+
+class ResourceSync:
+    """
+    从mod.json同步语言文件和标签文件
+    """
+
+    def __init__(self, project_dir, mod_id):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        :param mod_id: 模组ID
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.mod_id = mod_id
+        self.resources_dir = os.path.join(self.project_dir, MDK_DIR_NAME, "src", "main", "resources")
+        self.manifest_path = os.path.join(get_state_dir(self.project_dir), MANIFEST_FILE)
+        self.manifest = self._load_manifest()
+        self.written = 0
+        self.unchanged = 0
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path, mod_id):
+        """
+        根据mod.json路径获取项目的资源同步器
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)), mod_id)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self):
+        """
+        保存同步记录（事务提交后调用）
+        """
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self.manifest, ensure_ascii=False, sort_keys=True, separators=(",", ":")))
+        os.replace(temp_path, self.manifest_path)
+
+    def collect(self, mod_data):
+        """
+        收集mod.json中所有翻译和标签成员
+
+        :return: ({语言文件路径: {键: 文本}}, {标签文件路径: set(成员)})
+        """
+        mod_id = self.mod_id
+        lang_dir = os.path.join(self.resources_dir, "assets", mod_id, "lang")
+        zh_cn = {}
+        en_us = {}
+        tags = {}
+
+        def add_tags(kind, values, member):
+            for tag in values or ():
+                if isinstance(tag, str) and tag:
+                    tags.setdefault(_tag_path(self.resources_dir, tag, kind), set()).add(member)
+
+        for block in mod_data.get("blocks", []):
+            name = block.get("name")
+            if not isinstance(name, str) or not name:
+                continue
+            key = f"block.{mod_id}.{name}"
+            en_us[key] = block.get("englishName") or english_name(name)
+            if block.get("displayName"):
+                zh_cn[key] = block["displayName"]
+            block_tags = block.get("tags")
+            if isinstance(block_tags, dict):
+                add_tags("blocks", block_tags.get("blocks"), f"{mod_id}:{name}")
+                add_tags("items", block_tags.get("items"), f"{mod_id}:{name}")
+
+        for item in mod_data.get("items", []):
+            name = item.get("name")
+            if not isinstance(name, str) or not name:
+                continue
+            key = f"item.{mod_id}.{name}"
+            en_us[key] = item.get("englishName") or english_name(name)
+            if item.get("displayName"):
+                zh_cn[key] = item["displayName"]
+            if isinstance(item.get("tags"), list):
+                add_tags("items", item["tags"], f"{mod_id}:{name}")
+
+        # 音效事件的字幕，英文名由事件名的最后一段生成，如"block.anvil_hit" -> "Anvil Hit"
+        for sound in mod_data.get("sounds", []):
+            name = sound.get("name") if isinstance(sound, dict) else None
+            if not isinstance(name, str) or not name or sound.get("subtitle") is False:
+                continue
+            key = f"subtitles.{mod_id}.{name}"
+            en_us[key] = sound.get("englishName") or english_name(name.rsplit(".", 1)[-1])
+            if sound.get("displayName"):
+                zh_cn[key] = sound["displayName"]
+
+        # 生成的ItemGroup都使用"{modid}_tab"作为标签名
+        if mod_data.get("itemGroups"):
+            mod_name = mod_data.get("modInfo", {}).get("name") or english_name(mod_id)
+            en_us[f"itemGroup.{mod_id}_tab"] = mod_name
+            for group in mod_data["itemGroups"]:
+                if isinstance(group, dict) and group.get("displayName"):
+                    zh_cn[f"itemGroup.{mod_id}_tab"] = group["displayName"]
+                    break
+
+        lang = {os.path.join(lang_dir, "en_us.json"): en_us}
+        zh_cn_path = os.path.join(lang_dir, "zh_cn.json")
+        if zh_cn or self._relpath(zh_cn_path) in self.manifest:
+            lang[zh_cn_path] = zh_cn
+        return lang, tags
+
+    def _relpath(self, path):
+        return os.path.relpath(path, self.project_dir).replace(os.sep, "/")
+
+    def _read(self, path):
+        if not journal.exists(path):
+            return None, None
+        content = journal.read_bytes(path)
+        try:
+            return content, json.loads(content.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError) as e:
+            # 不能覆盖无法解析的文件（其中可能有手动添加的内容）
+            raise ValueError(f"无法解析{self._relpath(path)}: {e}")
+
+    def _write(self, path, content, existing):
+        if content == existing:
+            self.unchanged += 1
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        journal.write_bytes(path, content)
+        self.written += 1
+
+    def _sync_lang(self, path, entries, merge=False):
+        rel_path = self._relpath(path)
+        existing, data = self._read(path)
+        if not isinstance(data, dict):
+            data = {}
+        if merge:
+            keys = set(self.manifest.get(rel_path, []))
+            keys.update(entries)
+        else:
+            keys = entries
+            for key in self.manifest.get(rel_path, []):
+                if key not in entries:
+                    data.pop(key, None)
+        data.update(entries)
+        self.manifest[rel_path] = sorted(keys)
+        if existing is None and not data:
+            return
+        self._write(path, dump(dict(sorted(data.items()))).encode("utf-8"), existing)
+
+    def _sync_tag(self, path, members):
+        rel_path = self._relpath(path)
+        existing, data = self._read(path)
+        if not isinstance(data, dict) or not isinstance(data.get("values"), list):
+            data = {"replace": False, "values": []}
+        previous = set(self.manifest.get(rel_path, []))
+        values = {value for value in data["values"] if isinstance(value, str) and value not in previous}
+        others = [value for value in data["values"] if not isinstance(value, str)]
+        values.update(members)
+        if members:
+            self.manifest[rel_path] = sorted(members)
+        else:
+            self.manifest.pop(rel_path, None)
+        if not values and not others:
+            # 只包含本模块写入的成员、现在已经没有成员的标签文件直接删除
+            if existing is not None:
+                journal.remove(path)
+                self.written += 1
+            return
+        data["values"] = sorted(values) + others
+        self._write(path, dump(data).encode("utf-8"), existing)
+
+    @tracing.traced(category="codegen")
+    def sync(self, mod_data):
+        """
+        同步所有语言文件和标签文件，需要在事务中调用
+
+        :param mod_data: mod.json的内容
+        :return: (写入的文件数, 内容未变化的文件数)
+        """
+        self.written = 0
+        self.unchanged = 0
+        lang, tags = self.collect(mod_data)
+        for path, entries in lang.items():
+            self._sync_lang(path, entries)
+        # 上次同步写入过、这次没有成员的标签也要处理（删除其中本模块写入的成员）
+        tag_root = self._relpath(os.path.join(self.resources_dir, "data"))
+        for rel_path in list(self.manifest):
+            path = os.path.join(self.project_dir, *rel_path.split("/"))
+            if rel_path.startswith(tag_root + "/") and path not in tags:
+                tags[path] = set()
+        for path in sorted(tags):
+            self._sync_tag(path, tags[path])
+        return self.written, self.unchanged
+
+    @tracing.traced(category="codegen")
+    def sync_added(self, mod_data):
+        """
+        只同步新添加或修改的条目（不删除其他条目写入的内容），需要在事务中调用
+        只读写这些条目涉及的语言文件和标签文件，不需要整个mod.json（如项目数据库中添加的一个方块）
+
+        :param mod_data: 只包含这些条目的mod.json片段，如{"blocks": [方块]}
+        :return: (写入的文件数, 内容未变化的文件数)
+        """
+        self.written = 0
+        self.unchanged = 0
+        lang, tags = self.collect(mod_data)
+        for path, entries in lang.items():
+            if entries:
+                self._sync_lang(path, entries, merge=True)
+        for path in sorted(tags):
+            self._sync_tag(path, tags[path] | set(self.manifest.get(self._relpath(path), [])))
+        return self.written, self.unchanged
@@ -0,0 +1,688 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+音效导入和注册模块
+从一个目录中批量导入.ogg音效，生成合并的sounds.json和SoundEvent注册类：
+    - 在进程池中并行检查每个文件：只解析Ogg页头和Vorbis识别头（声道数、采样率），
+      由最后一页的granule position计算时长，不解码音频数据；Minecraft只支持Vorbis编码的.ogg
+    - 检查结果按文件内容的sha256缓存，文件大小和修改时间没有变化时连哈希也不重新计算，
+      重新导入同一个目录时只检查新增或修改过的文件
+    - 子目录和文件名决定音效事件名：block/anvil_hit.ogg -> block.anvil_hit；
+      同一目录中只有末尾数字不同的文件（step1.ogg、step2.ogg）合并为同一个事件的随机变体
+    - 音效事件记录在mod.json的sounds数组中，sounds.json和ModSounds.java都由它整体渲染，
+      内容未变化的文件（包括复制的.ogg）不写入；字幕的翻译由资源同步写入语言文件
+    - sounds.json中不是由本模块写入的事件（手动添加的）保留不动
+
+检查结果缓存和上次写入的事件记录保存在.forgecreator/sounds.json中
+"""
+
+import os
+import re
+import json
+import struct
+import hashlib
+import concurrent.futures
+
+import tracing
+import journal
+from journal import get_state_dir
+from blockstates import dump
+from textureimport import normalize_name
+
+
+# 缓存文件名
+MANIFEST_FILE = "sounds.json"
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+# 待检查的文件数不少于该值时才使用进程池（进程启动本身就要几十毫秒）
+POOL_MIN_FILES = 32
+
+# 时长超过该值（秒）的音效以流的方式播放（"stream": true），避免整个载入内存
+STREAM_MIN_SECONDS = 20.0
+
+# Ogg页头：capture pattern、版本、页类型、granule position、流序号、页序号、校验和、分段数
+_PAGE_HEADER = struct.Struct("<4sBBqIIIB")
+
+# 一页最大的长度（页头 + 255个分段长度 + 255 * 255字节的数据），查找最后一页时只需要读文件末尾这么多
+_MAX_PAGE_SIZE = 27 + 255 + 255 * 255
+
+# 页类型标志
+_FLAG_BOS = 0x02
+_FLAG_EOS = 0x04
+
+# Vorbis识别头：版本、声道数、采样率、最大/标称/最小比特率、块大小、帧标志
+_VORBIS_ID = struct.Struct("<IBIiiiBB")
+
+# 音效事件名和文件路径只能使用资源路径允许的字符
+_NAME_PATTERN = re.compile(r"^[a-z0-9_.\-]+$")
+_PATH_PATTERN = re.compile(r"^[a-z0-9_.\-/]+$")
+
+# 末尾带编号的文件名：step1、step_2
+_VARIANT_PATTERN = re.compile(r"^(.*[a-z])_?(\d+)$")
+
+
+def _crc_table():
+    table = []
+    for index in range(256):
+        crc = index << 24
+        for _ in range(8):
+            crc = (crc << 1) ^ 0x04C11DB7 if crc & 0x80000000 else crc << 1
+        table.append(crc & 0xFFFFFFFF)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def page_crc(page):
+    """
+    Ogg页的校验和（CRC-32，多项式0x04C11DB7，不反转，初值为0；计算时校验和字段按0处理）
+    """
+    crc = 0
+    table = _CRC_TABLE
+    for byte in page[:22] + b"\0\0\0\0" + page[26:]:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ table[(crc >> 24) ^ byte]
+    return crc
+
+
+def _read_page(data, offset):
+    """
+    解析offset处的一页
+
+    :return: (页类型, granule position, 流序号, 数据起始位置, 页结束位置)，不是完整的有效页时返回None
+    """
+    if offset + _PAGE_HEADER.size > len(data):
+        return None
+    capture, version, flags, granule, serial, _, crc, segments = _PAGE_HEADER.unpack_from(data, offset)
+    if capture != b"OggS" or version != 0:
+        return None
+    body = offset + _PAGE_HEADER.size + segments
+    end = body + sum(data[offset + _PAGE_HEADER.size:body])
+    if body > len(data) or end > len(data) or page_crc(data[offset:end]) != crc:
+        return None
+    return flags, granule, serial, body, end
+
+
+def probe_sound(path):
+    """
+    检查一个.ogg文件并读取声道数、采样率和时长（在工作进程中执行），不解码音频数据
+
+    :param path: 文件路径
+    :return: 结果字典，只包含可以在进程间传递的基本类型
+    """
+    result = {"path": path, "size": 0, "mtime": 0, "digest": None,
+              "channels": 0, "sampleRate": 0, "duration": 0.0, "issues": []}
+    issues = result["issues"]
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        issues.append(("error", f"无法读取文件: {e}"))
+        return result
+    result["size"], result["mtime"] = stat.st_size, stat.st_mtime_ns
+    result["digest"] = hashlib.sha256(data).hexdigest()
+
+    if not data.startswith(b"OggS"):
+        issues.append(("error", "不是Ogg文件"))
+        return result
+    first = _read_page(data, 0)
+    if first is None:
+        issues.append(("error", "第一页不完整或校验和错误，文件已损坏"))
+        return result
+    flags, _, serial, body, end = first
+    packet = data[body:end]
+    if packet.startswith(b"OpusHead"):
+        issues.append(("error", "使用Opus编码，Minecraft只支持Vorbis编码的.ogg"))
+        return result
+    if packet.startswith(b"\x7fFLAC") or packet.startswith(b"Speex"):
+        issues.append(("error", "不是Vorbis编码，Minecraft只支持Vorbis编码的.ogg"))
+        return result
+    if not flags & _FLAG_BOS or not packet.startswith(b"\x01vorbis") or len(packet) < 7 + _VORBIS_ID.size:
+        issues.append(("error", "缺少Vorbis识别头"))
+        return result
+    version, channels, sample_rate, _, _, _, blocksizes, framing = _VORBIS_ID.unpack_from(packet, 7)
+    small, large = blocksizes & 0x0F, blocksizes >> 4
+    if version != 0 or not channels or not sample_rate or not framing & 1 or not 6 <= small <= large <= 13:
+        issues.append(("error", "Vorbis识别头无效"))
+        return result
+    result["channels"], result["sampleRate"] = channels, sample_rate
+
+    # 从文件末尾向前找属于同一个流、校验和正确的最后一页（音频数据中也可能碰巧出现"OggS"）
+    start = max(end, len(data) - _MAX_PAGE_SIZE)
+    offset = data.rfind(b"OggS", start)
+    last = None
+    while offset != -1:
+        page = _read_page(data, offset)
+        if page is not None and page[2] == serial and page[1] >= 0:
+            last = page
+            break
+        offset = data.rfind(b"OggS", start, offset)
+    if last is None:
+        issues.append(("error", "找不到音频数据页，文件可能被截断"))
+        return result
+    last_flags, granule, _, _, last_end = last
+    result["duration"] = round(granule / sample_rate, 3)
+    if granule == 0:
+        issues.append(("error", "时长为0"))
+        return result
+    if last_end != len(data) or not last_flags & _FLAG_EOS:
+        issues.append(("warning", "最后一页没有结束标记，文件可能被截断"))
+    if channels > 1:
+        issues.append(("warning", f"{channels}声道的音效在游戏中不会随距离衰减，方块和实体音效应使用单声道"))
+    return result
+
+
+def _probe_batch(batch):
+    """
+    在工作进程中检查一批文件
+    """
+    return [probe_sound(path) for path in batch]
+
+
+def sound_location(mod_id, sound):
+    """
+    sounds数组中的一项对应的资源位置（没有命名空间时属于本模组）
+    """
+    name = sound.get("name") if isinstance(sound, dict) else sound
+    if not isinstance(name, str) or not name:
+        return None
+    return name if ":" in name else f"{mod_id}:{name}"
+
+
+def constant_name(event):
+    """
+    音效事件名对应的Java常量名，如"block.anvil_hit" -> "BLOCK_ANVIL_HIT"
+    """
+    return re.sub(r"[^A-Z0-9]", "_", event.upper())
+
+
+class SoundImport:
+    """
+    一个待导入的音效文件
+    """
+
+    __slots__ = ("source", "path", "event", "target", "size", "mtime", "digest",
+                 "channels", "sample_rate", "duration", "issues")
+
+    def __init__(self, source, path, result):
+        self.source = source
+        self.path = path    # 相对于assets/{modid}/sounds的路径，不含扩展名
+        self.event = None   # 所属的音效事件名
+        self.target = None  # 相对于resources目录的目标路径
+        self.size = result["size"]
+        self.mtime = result["mtime"]
+        self.digest = result["digest"]
+        self.channels = result["channels"]
+        self.sample_rate = result["sampleRate"]
+        self.duration = result["duration"]
+        self.issues = [tuple(issue) for issue in result["issues"]]
+
+    @property
+    def ok(self):
+        return self.target is not None and not any(severity == "error" for severity, _ in self.issues)
+
+    @property
+    def stream(self):
+        return self.duration >= STREAM_MIN_SECONDS
+
+
+class SoundImportPlan:
+    """
+    批量导入的检查结果
+    """
+
+    def __init__(self, directory, sounds, probed):
+        self.directory = directory
+        self.sounds = sounds
+        self.probed = probed  # 实际检查了的文件数（其余的使用缓存的结果）
+
+    @property
+    def ready(self):
+        """
+        可以导入的音效
+        """
+        return [sound for sound in self.sounds if sound.ok]
+
+    @property
+    def failed(self):
+        return [sound for sound in self.sounds if any(severity == "error" for severity, _ in sound.issues)]
+
+    @property
+    def warnings(self):
+        return [sound for sound in self.sounds
+                if sound.ok and any(severity == "warning" for severity, _ in sound.issues)]
+
+    @property
+    def events(self):
+        """
+        {事件名: [音效]}，按事件名排序
+        """
+        events = {}
+        for sound in self.ready:
+            events.setdefault(sound.event, []).append(sound)
+        return dict(sorted(events.items()))
+
+    def format_lines(self, limit=200):
+        """
+        格式化为文本行，每类最多列出limit项
+        """
+        events = self.events
+        lines = [f"音效: {len(self.sounds)}个（检查{self.probed}个，其余使用缓存），可导入{len(self.ready)}个，"
+                 f"错误{len(self.failed)}个；音效事件{len(events)}个"]
+
+        def section(title, items, describe):
+            if not items:
+                return
+            lines.append("")
+            lines.append(f"{title}（{len(items)}）:")
+            for item in items[:limit]:
+                lines.extend(describe(item))
+            if len(items) > limit:
+                lines.append(f"    ……还有{len(items) - limit}项")
+
+        def issues_of(severity):
+            def describe(sound):
+                rel_path = os.path.relpath(sound.source, self.directory)
+                return [f"    {rel_path}: {message}" for level, message in sound.issues if level == severity]
+            return describe
+
+        def event_of(item):
+            name, sounds = item
+            return [f"    {name}:"] + [
+                f"        {os.path.relpath(sound.source, self.directory)} -> {sound.target}"
+                f"（{sound.duration:.2f}秒{'，流式播放' if sound.stream else ''}）"
+                for sound in sounds]
+
+        section("错误", self.failed, issues_of("error"))
+        section("警告", self.warnings, issues_of("warning"))
+        section("将导入", list(events.items()), event_of)
+        return lines
+
+
+class SoundRegistry:
+    """
+    导入音效文件，根据mod.json的sounds数组生成sounds.json和ModSounds.java
+    """
+
+    def __init__(self, project_dir, mod_id, base_package, main_class_name=None):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        :param mod_id: 模组ID
+        :param base_package: 基础包名
+        :param main_class_name: 带@Mod注解的主类名（MainWindow.find_main_class），默认按模板的命名由modId推导
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.mod_id = mod_id
+        self.base_package = base_package
+        self.main_class_name = main_class_name or mod_id.replace('_', '').title() + "Mod"
+        self.resources_dir = os.path.join(self.project_dir, MDK_DIR_NAME, "src", "main", "resources")
+        self.sounds_dir = os.path.join(self.resources_dir, "assets", mod_id, "sounds")
+        self.sounds_json_path = os.path.join(self.resources_dir, "assets", mod_id, "sounds.json")
+        self.java_path = os.path.join(self.project_dir, MDK_DIR_NAME, "src", "main", "java",
+                                      *base_package.split("."), "sound", "ModSounds.java")
+        self.manifest_path = os.path.join(get_state_dir(self.project_dir), MANIFEST_FILE)
+        manifest = self._load_manifest()
+        # {文件路径: [大小, 修改时间, sha256]}，路径为相对项目目录（项目外的文件为绝对路径）
+        self.files = manifest.get("files", {})
+        # {sha256: 检查结果}
+        self.metadata = manifest.get("metadata", {})
+        # 上次写入sounds.json的事件名
+        self.events = manifest.get("events", [])
+        self._copied = {}
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path, mod_id, base_package, main_class_name=None):
+        """
+        根据mod.json路径获取项目的音效注册器
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)), mod_id, base_package, main_class_name)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self):
+        """
+        保存检查结果缓存和事件记录（事务提交后调用）
+        """
+        # 复制到项目中的文件在提交后才有最终的修改时间
+        for path, digest in self._copied.items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            self.files[self._key(path)] = [stat.st_size, stat.st_mtime_ns, digest]
+        self._copied = {}
+        used = {entry[2] for entry in self.files.values()}
+        self.metadata = {digest: meta for digest, meta in self.metadata.items() if digest in used}
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"files": self.files, "metadata": self.metadata, "events": self.events},
+                               ensure_ascii=False, separators=(",", ":")))
+        os.replace(temp_path, self.manifest_path)
+
+    def _key(self, path):
+        rel_path = os.path.relpath(path, self.project_dir)
+        if rel_path.startswith(".."):
+            return os.path.abspath(path)
+        return rel_path.replace(os.sep, "/")
+
+    def _cached_digest(self, path, stat):
+        entry = self.files.get(self._key(path))
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        return None
+
+    @staticmethod
+    def find_sounds(directory):
+        """
+        目录（含子目录）中的所有.ogg文件
+        """
+        sounds = []
+        pending = [directory]
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        pending.append(entry.path)
+                    elif entry.name.lower().endswith(".ogg"):
+                        sounds.append(entry.path)
+        sounds.sort()
+        return sounds
+
+    def _run(self, pending, workers):
+        """
+        检查所有文件，文件较多时使用进程池
+
+        :return: 与pending顺序相同的结果字典列表
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(pending) < POOL_MIN_FILES:
+            return [probe_sound(path) for path in pending]
+
+        batch_size = max(8, len(pending) // (workers * 4))
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        results = []
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                for batch_result in executor.map(_probe_batch, batches):
+                    results.extend(batch_result)
+        except (OSError, concurrent.futures.process.BrokenProcessPool):
+            # 无法创建子进程时退回单进程处理
+            results = [probe_sound(path) for path in pending]
+        return results
+
+    def _probe_all(self, paths, workers):
+        """
+        检查文件，大小和修改时间都没有变化、内容已检查过的文件直接使用缓存
+
+        :return: {路径: 结果字典}, 实际检查的文件数
+        """
+        results = {}
+        pending = []
+        for path in paths:
+            stat = os.stat(path)
+            digest = self._cached_digest(path, stat)
+            if digest is not None and digest in self.metadata:
+                results[path] = dict(self.metadata[digest], path=path, size=stat.st_size,
+                                     mtime=stat.st_mtime_ns, digest=digest)
+            else:
+                pending.append(path)
+        with tracing.span("probe_sounds", "assets"):
+            for result in self._run(pending, workers):
+                results[result["path"]] = result
+                if result["digest"] is None:
+                    continue
+                self.files[self._key(result["path"])] = [result["size"], result["mtime"], result["digest"]]
+                self.metadata[result["digest"]] = {
+                    key: result[key] for key in ("channels", "sampleRate", "duration", "issues")}
+        return results, len(pending)
+
+    def scan(self, paths, directory=None, workers=None):
+        """
+        检查音效文件并确定事件名和导入位置（不写入任何文件）
+
+        :param paths: 音效目录，或者.ogg文件列表
+        :param directory: paths是文件列表时，计算子目录（事件名前缀）的根目录，为None时使用文件所在目录
+        :param workers: 工作进程数，为None时使用CPU核数
+        :return: SoundImportPlan
+        """
+        if isinstance(paths, str):
+            directory = os.path.abspath(paths)
+            with tracing.span("find_sounds", "assets"):
+                files = self.find_sounds(directory)
+        else:
+            files = sorted(os.path.abspath(path) for path in paths)
+            directory = os.path.abspath(directory) if directory else os.path.commonpath(
+                [os.path.dirname(path) for path in files] or [os.getcwd()])
+        results, probed = self._probe_all(files, workers)
+
+        sounds = []
+        for source in files:
+            parts = [normalize_name(part) for part in os.path.relpath(os.path.dirname(source), directory).split(os.sep)
+                     if part not in ("", ".")]
+            stem = normalize_name(os.path.splitext(os.path.basename(source))[0])
+            sound = SoundImport(source, "/".join(parts + [stem]), results[source])
+            sounds.append(sound)
+            if not _PATH_PATTERN.match(sound.path):
+                sound.issues.append(("error", "文件名只能包含小写字母、数字、下划线、连字符和点"))
+
+        # 同一目录中只有末尾编号不同的文件是同一个事件的随机变体
+        groups = {}
+        for sound in sounds:
+            match = _VARIANT_PATTERN.match(sound.path)
+            if match:
+                groups.setdefault(match.group(1), []).append(sound)
+        targets = {}
+        for sound in sounds:
+            match = _VARIANT_PATTERN.match(sound.path)
+            base = match.group(1) if match and len(groups[match.group(1)]) > 1 else sound.path
+            target = f"assets/{self.mod_id}/sounds/{sound.path}.ogg"
+            if target in targets:
+                other = os.path.relpath(targets[target].source, directory)
+                sound.issues.append(("error", f"与{other}的目标相同: {target}"))
+                continue
+            targets[target] = sound
+            sound.event = base.replace("/", ".")
+            sound.target = target
+        return SoundImportPlan(directory, sounds, probed)
+
+    def apply(self, plan, mod_data):
+        """
+        复制可以导入的音效文件，并把事件合并到mod_data的sounds数组（在调用方的事务中调用），
+        完成后需调用self.save()
+
+        导入的事件的变体列表以这次导入的文件为准，变体上手动添加的字段（volume、pitch、weight等）保留
+
+        :return: (导入的文件数, 内容未变化的文件数)
+        """
+        imported = unchanged = 0
+        for sound in plan.ready:
+            target = os.path.join(self.resources_dir, *sound.target.split("/"))
+            if journal.exists(target):
+                try:
+                    stat = os.stat(target)
+                except OSError:
+                    stat = None
+                digest = self._cached_digest(target, stat) if stat else None
+                if digest is None:
+                    digest = hashlib.sha256(journal.read_bytes(target)).hexdigest()
+                if digest == sound.digest:
+                    unchanged += 1
+                    continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            journal.copy_file(sound.source, target)
+            self._copied[target] = sound.digest
+            imported += 1
+
+        entries = mod_data.setdefault("sounds", [])
+        by_name = {entry.get("name"): entry for entry in entries if isinstance(entry, dict)}
+        for name, sounds in plan.events.items():
+            entry = by_name.get(name)
+            if entry is None:
+                entry = {"name": name}
+                entries.append(entry)
+            previous = {sound.get("name"): sound for sound in entry.get("sounds", []) if isinstance(sound, dict)}
+            variants = []
+            for sound in sounds:
+                if sound.path in previous:
+                    variant = dict(previous[sound.path])
+                elif sound.stream:
+                    variant = {"name": sound.path}
+                else:
+                    variants.append(sound.path)
+                    continue
+                if sound.stream:
+                    variant["stream"] = True
+                else:
+                    variant.pop("stream", None)
+                variants.append(variant)
+            entry["sounds"] = variants
+        return imported, unchanged
+
+    def validate(self, mod_data):
+        """
+        检查mod.json的sounds数组
+
+        :return: (有效的事件列表, 错误列表, 警告列表)
+        """
+        events = []
+        errors = []
+        warnings = []
+        names = set()
+        constants = {}
+        for index, entry in enumerate(mod_data.get("sounds", [])):
+            name = entry.get("name") if isinstance(entry, dict) else None
+            if not isinstance(name, str) or not _NAME_PATTERN.match(name):
+                errors.append(f"sounds[{index}]: 事件名{name!r}无效，只能包含小写字母、数字、下划线、连字符和点")
+                continue
+            if name in names:
+                errors.append(f"音效事件{name}重复")
+                continue
+            constant = constant_name(name)
+            if constant in constants:
+                errors.append(f"音效事件{name}和{constants[constant]}的常量名相同: {constant}")
+                continue
+            sounds = entry.get("sounds")
+            if not isinstance(sounds, list) or not sounds or None in [sound_location(self.mod_id, s) for s in sounds]:
+                errors.append(f"音效事件{name}: sounds必须是非空的文件列表")
+                continue
+            for sound in sounds:
+                location = sound_location(self.mod_id, sound)
+                namespace, path = location.split(":", 1)
+                is_event = isinstance(sound, dict) and sound.get("type") == "event"
+                if namespace == self.mod_id and not is_event and not journal.exists(
+                        os.path.join(self.sounds_dir, *f"{path}.ogg".split("/"))):
+                    warnings.append(f"音效事件{name}: 缺少音效文件assets/{self.mod_id}/sounds/{path}.ogg")
+            names.add(name)
+            constants[constant] = name
+            events.append(entry)
+        return events, errors, warnings
+
+    def _render_event(self, entry):
+        event = {}
+        if entry.get("replace"):
+            event["replace"] = True
+        sounds = []
+        for sound in entry["sounds"]:
+            if isinstance(sound, dict):
+                sounds.append(dict(sound, name=sound_location(self.mod_id, sound)))
+            else:
+                sounds.append(sound_location(self.mod_id, sound))
+        event["sounds"] = sounds
+        if entry.get("subtitle", True):
+            event["subtitle"] = f"subtitles.{self.mod_id}.{entry['name']}"
+        return event
+
+    def _render_sounds_json(self, events):
+        existing = None
+        if journal.exists(self.sounds_json_path):
+            try:
+                existing = json.loads(journal.read_text(self.sounds_json_path))
+            except ValueError as e:
+                # 不能覆盖无法解析的文件（其中可能有手动添加的事件）
+                raise ValueError(f"无法解析assets/{self.mod_id}/sounds.json: {e}")
+        data = {}
+        if isinstance(existing, dict):
+            previous = set(self.events)
+            data = {name: event for name, event in existing.items() if name not in previous}
+        for entry in events:
+            data[entry["name"]] = self._render_event(entry)
+        self.events = sorted(entry["name"] for entry in events)
+        return dump(dict(sorted(data.items())))
+
+    def _render_mod_sounds(self, events):
+        mod_class_name = self.main_class_name
+        imports = [
+            f"{self.base_package}.{mod_class_name}",
+            "net.minecraft.util.ResourceLocation",
+            "net.minecraft.util.SoundEvent",
+            "net.minecraftforge.eventbus.api.IEventBus",
+            "net.minecraftforge.fml.RegistryObject",
+            "net.minecraftforge.registries.DeferredRegister",
+            "net.minecraftforge.registries.ForgeRegistries",
+        ]
+        lines = [f"package {self.base_package}.sound;\n"]
+        lines += [f"import {name};" for name in sorted(imports)]
+        lines += [
+            "",
+            "// 由mod.json的sounds生成，修改请编辑mod.json",
+            "public class ModSounds {",
+            "    public static final DeferredRegister<SoundEvent> SOUND_EVENTS = "
+            f"DeferredRegister.create(ForgeRegistries.SOUND_EVENTS, {mod_class_name}.MOD_ID);",
+            "",
+        ]
+        lines += [f'    public static final RegistryObject<SoundEvent> {constant_name(entry["name"])} = '
+                  f'registerSoundEvent("{entry["name"]}");' for entry in events]
+        if events:
+            lines.append("")
+        lines += [
+            "    private static RegistryObject<SoundEvent> registerSoundEvent(String name) {",
+            f"        return SOUND_EVENTS.register(name, () -> new SoundEvent(new ResourceLocation({mod_class_name}.MOD_ID, name)));",
+            "    }",
+            "",
+            "    public static void register(IEventBus eventBus) {",
+            "        SOUND_EVENTS.register(eventBus);",
+            "    }",
+            "}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    @tracing.traced(category="codegen")
+    def render(self, mod_data):
+        """
+        在内存中渲染sounds.json和ModSounds.java
+
+        :return: ({文件路径: 内容bytes}, 错误列表, 警告列表)
+        """
+        events, errors, warnings = self.validate(mod_data)
+        outputs = {}
+        if events or journal.exists(self.sounds_json_path):
+            outputs[self.sounds_json_path] = self._render_sounds_json(events).encode("utf-8")
+        if events or journal.exists(self.java_path):
+            outputs[self.java_path] = self._render_mod_sounds(events).encode("utf-8")
+        return outputs, errors, warnings
+
+    @tracing.traced(category="codegen")
+    def write(self, outputs):
+        """
+        写入渲染好的文件，内容未变化的不写。需要在事务中调用
+
+        :return: (写入数, 未变化数)
+        """
+        written = unchanged = 0
+        for path, content in outputs.items():
+            if journal.exists(path) and journal.read_bytes(path) == content:
+                unchanged += 1
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            journal.write_bytes(path, content)
+            written += 1
+        return written, unchanged
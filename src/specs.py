@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+mod.json条目记录类型
+方块、物品和物品组在代码生成过程中使用带__slots__的记录类（没有每个实例的__dict__），
+生成Java注册代码和mod.json条目都通过这些类完成，不再在各函数之间传递十几个位置参数或临时字典。
+mod.json文档本身仍然是普通的JSON数据（手动添加的字段原样保留）
+"""
+
+# 方块基础类不带包名时所在的包
+BLOCK_PACKAGE = "net.minecraft.block"
+
+
+class BlockSpec:
+    """
+    一个方块：mod.json中保存的属性，加上只用于生成ModBlocks.java的属性（音效、非固体等）
+    """
+
+    __slots__ = ("name", "base_class", "display_name", "material", "hardness", "resistance",
+                 "harvest_level", "tool_type", "light_level", "sound_type", "not_solid", "no_collision",
+                 "requires_tool", "no_drops", "ticks_randomly")
+
+    def __init__(self, name, base_class="Block", display_name="", material="ROCK", hardness=0.0, resistance=0.0,
+                 harvest_level=0, tool_type="", light_level=0, sound_type="", not_solid=False, no_collision=False,
+                 requires_tool=False, no_drops=False, ticks_randomly=False):
+        """
+        :param name: 方块名称（注册名的路径部分）
+        :param base_class: 基础方块类名（net.minecraft.block中的简单类名或完整类名）
+        :param display_name: 方块显示名称
+        :param material: 方块材质（Material中的常量名）
+        :param hardness: 方块硬度
+        :param resistance: 方块爆炸抗性
+        :param harvest_level: 挖掘等级
+        :param tool_type: 挖掘工具类型（ToolType中的常量名，""表示不指定）
+        :param light_level: 发光等级
+        :param sound_type: 音效类型（SoundType中的常量名，""表示不指定）
+        :param not_solid: 是否为非固体
+        :param no_collision: 是否无碰撞
+        :param requires_tool: 是否需要工具挖掘
+        :param no_drops: 是否无掉落
+        :param ticks_randomly: 是否随机更新
+        """
+        self.name = name
+        self.base_class = base_class
+        self.display_name = display_name
+        self.material = material
+        self.hardness = hardness
+        self.resistance = resistance
+        self.harvest_level = harvest_level
+        self.tool_type = tool_type
+        self.light_level = light_level
+        self.sound_type = sound_type
+        self.not_solid = not_solid
+        self.no_collision = no_collision
+        self.requires_tool = requires_tool
+        self.no_drops = no_drops
+        self.ticks_randomly = ticks_randomly
+
+    @classmethod
+    def from_json(cls, entry, **codegen):
+        """
+        由mod.json中的方块条目创建
+
+        :param entry: 方块条目
+        :param codegen: mod.json中没有保存的属性（base_class、sound_type、not_solid等）
+        """
+        return cls(entry["name"], display_name=entry.get("displayName", ""), material=entry.get("material", "ROCK"),
+                   hardness=entry.get("hardness", 0.0), resistance=entry.get("resistance", 0.0),
+                   harvest_level=entry.get("harvestLevel", 0), tool_type=entry.get("harvestTool", "").upper(),
+                   light_level=entry.get("lightValue", 0), **codegen)
+
+    @property
+    def simple_class(self):
+        """
+        基础方块类的简单类名
+        """
+        return self.base_class.rsplit(".", 1)[-1]
+
+    @property
+    def qualified_class(self):
+        """
+        基础方块类的完整类名
+        """
+        if "." in self.base_class:
+            return self.base_class
+        return f"{BLOCK_PACKAGE}.{self.base_class}"
+
+    def to_json(self, mod_id, template=None, tags=None, model=None):
+        """
+        mod.json中的方块条目
+
+        :param mod_id: 模组ID
+        :param template: blockstate模板，决定defaultState和variants
+        :param tags: 方块加入的标签{"blocks": [...], "items": [...]}
+        :param model: 方块实际使用的模型位置（复用了已有模型时与方块名不同），默认为方块本身的模型
+        :return: 方块条目（字段顺序与mod.json相同）
+        """
+        name = self.name
+        entry = {
+            "name": name,
+            "registryName": f"{mod_id}:{name}",
+            "unlocalizedName": f"tile.{mod_id}.{name}",
+            "material": self.material,
+            "hardness": float(self.hardness),  # 确保是浮点数
+            "resistance": float(self.resistance),  # 确保是浮点数
+            "harvestLevel": int(self.harvest_level),
+            "harvestTool": self.tool_type.lower() if self.tool_type else "",
+            "lightValue": int(self.light_level),
+            "lightOpacity": 255,  # 默认不透明
+            "creativeTab": mod_id,
+            "textureName": f"{mod_id}:blocks/{name}",
+            "model": model or f"{mod_id}:block/{name}",
+            "defaultState": dict(template.default) if template else {},
+            "variants": template.variant_properties() if template else []
+        }
+        if self.display_name:
+            entry["displayName"] = self.display_name
+        if tags:
+            entry["tags"] = tags
+        return entry
+
+    def registry_code(self):
+        """
+        方块在ModBlocks.java中的注册代码
+
+        :return: 注册代码字符串（以换行结尾）
+        """
+        base_class = self.simple_class
+        lines = [
+            f"    public static final RegistryObject<{base_class}> {self.name.upper()} = registerBlock(",
+            f"        \"{self.name}\",",
+            f"        () -> new {base_class}(",
+            f"            AbstractBlock.Properties.create(Material.{self.material})",
+        ]
+
+        # 添加属性设置
+        if self.hardness > 0 or self.resistance > 0:
+            lines.append(f"                .hardnessAndResistance({self.hardness}f, {self.resistance}f)")
+        if self.harvest_level > 0:
+            lines.append(f"                .harvestLevel({self.harvest_level})")
+        if self.tool_type:
+            lines.append(f"                .harvestTool(ToolType.{self.tool_type})")
+        if self.light_level > 0:
+            lines.append(f"                .setLightLevel(state -> {self.light_level})")
+        if self.sound_type:
+            lines.append(f"                .sound(SoundType.{self.sound_type})")
+        if self.not_solid:
+            lines.append("                .notSolid()")
+        if self.no_collision:
+            lines.append("                .doesNotBlockMovement()")
+        if self.requires_tool:
+            lines.append("                .setRequiresTool()")
+        if self.no_drops:
+            lines.append("                .noDrops()")
+        if self.ticks_randomly:
+            lines.append("                .tickRandomly()")
+
+        lines.append("            )")
+        lines.append("    );")
+        return "\n".join(lines) + "\n"
+
+
+class ItemSpec:
+    """
+    一个物品（mod.json的items数组中的条目）
+    """
+
+    __slots__ = ("name", "model", "item_class", "tier", "family", "attack_damage", "attack_speed", "slot",
+                 "tags", "display_name")
+
+    def __init__(self, name, model="item/generated", item_class="Item", tier=None, family=None,
+                 attack_damage=None, attack_speed=None, slot=None, tags=None, display_name=None):
+        """
+        :param name: 物品名称（注册名的路径部分）
+        :param model: 物品模型的父模型
+        :param item_class: 物品类（ItemClass中的简单类名）
+        :param tier: 由等级表展开时的材料名称
+        :param family: 由等级表展开时的系列名称
+        :param attack_damage: 工具的攻击伤害
+        :param attack_speed: 工具的攻击速度
+        :param slot: 盔甲的槽位
+        :param tags: 物品加入的标签
+        :param display_name: 物品显示名称
+        """
+        self.name = name
+        self.model = model
+        self.item_class = item_class
+        self.tier = tier
+        self.family = family
+        self.attack_damage = attack_damage
+        self.attack_speed = attack_speed
+        self.slot = slot
+        self.tags = tags
+        self.display_name = display_name
+
+    def to_json(self, mod_id):
+        """
+        mod.json中的物品条目（没有设置的可选字段不写入）
+
+        :param mod_id: 模组ID
+        """
+        name = self.name
+        entry = {
+            "name": name,
+            "registryName": f"{mod_id}:{name}",
+            "unlocalizedName": f"item.{mod_id}.{name}",
+            "creativeTab": mod_id,
+            "textureName": f"{mod_id}:item/{name}",
+            "model": self.model,
+            "itemClass": self.item_class,
+        }
+        if self.tier is not None:
+            entry["tier"] = self.tier
+        if self.family is not None:
+            entry["family"] = self.family
+        if self.attack_damage is not None:
+            entry["attackDamage"] = self.attack_damage
+        if self.attack_speed is not None:
+            entry["attackSpeed"] = self.attack_speed
+        if self.slot is not None:
+            entry["slot"] = self.slot
+        if self.tags:
+            entry["tags"] = self.tags
+        if self.display_name:
+            entry["displayName"] = self.display_name
+        return entry
+
+
+class ItemGroupSpec:
+    """
+    一个物品组（mod.json的itemGroups数组中的条目）
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        """
+        :param name: 物品组类名
+        """
+        self.name = name
+
+    @classmethod
+    def from_json(cls, entry):
+        return cls(entry.get("name", ""))
+
+    def to_json(self):
+        return {"name": self.name}
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+贴图批量导入模块
+从一个目录中批量导入贴图：
+    - 在进程池中并行解码和检查每张图片：必须是正方形，或者是带.mcmeta的竖直动画条（高度为宽度的整数倍）；
+      边长不是2的幂时给出警告
+    - 统一转换为8位RGBA，边长超过上限时按整数倍缩小
+    - 按文件名匹配mod.json中的方块/物品：name.png是主贴图，name_top.png等带后缀的文件按最长的名称前缀匹配
+    - 所有文件在同一个事务中写入（可整体撤销），贴图通过贴图仓库写入，内容未变化的文件不产生写入
+"""
+
+import os
+import json
+import hashlib
+import concurrent.futures
+
+import journal
+import tracing
+import pngcodec
+from texturestore import TextureStore, MDK_DIR_NAME
+
+
+# 待处理的图片数不少于该值时才使用进程池（进程启动本身就要几十毫秒）
+POOL_MIN_FILES = 32
+
+# 重新编码时的zlib压缩级别
+COMPRESS_LEVEL = 6
+
+# 目录名 -> 贴图类别，用于名称同时匹配方块和物品时的区分
+_KIND_DIRS = {"block": "block", "blocks": "block", "item": "item", "items": "item"}
+
+
+def normalize_name(stem):
+    """
+    把文件名转换为注册名的形式：小写，空格和连字符替换为下划线
+    """
+    return "_".join(stem.strip().lower().replace("-", " ").split())
+
+
+def _is_power_of_two(value):
+    return value > 0 and value & (value - 1) == 0
+
+
+def _check_mcmeta(data, frame_count):
+    """
+    检查动画贴图的.mcmeta内容
+
+    :return: 问题列表[(级别, 信息)]
+    """
+    try:
+        meta = json.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as e:
+        return [("error", f".mcmeta不是有效的JSON: {e}")]
+    animation = meta.get("animation") if isinstance(meta, dict) else None
+    if not isinstance(animation, dict):
+        return [("error", ".mcmeta缺少animation对象")]
+
+    issues = []
+    frametime = animation.get("frametime", 1)
+    if not isinstance(frametime, int) or isinstance(frametime, bool) or frametime < 1:
+        issues.append(("error", f".mcmeta的frametime必须是正整数: {frametime!r}"))
+    if not isinstance(animation.get("interpolate", False), bool):
+        issues.append(("error", ".mcmeta的interpolate必须是布尔值"))
+    frames = animation.get("frames")
+    if frames is None:
+        return issues
+    if not isinstance(frames, list):
+        return issues + [("error", ".mcmeta的frames必须是数组")]
+    for position, frame in enumerate(frames):
+        index = frame.get("index") if isinstance(frame, dict) else frame
+        if not isinstance(index, int) or isinstance(index, bool):
+            issues.append(("error", f".mcmeta的frames[{position}]不是有效的帧序号"))
+        elif not 0 <= index < frame_count:
+            issues.append(("error", f".mcmeta的frames[{position}]={index}超出了帧数{frame_count}"))
+    return issues
+
+
+def process_texture(path, max_size=None):
+    """
+    读取、检查并转换一张贴图（在工作进程中执行）
+
+    :param path: 图片路径
+    :param max_size: 边长上限（按帧宽计算），超过时缩小，为None时不缩小
+    :return: 结果字典，只包含可以在进程间传递的基本类型
+    """
+    result = {"path": path, "width": 0, "height": 0, "frames": 1, "scale": 1,
+              "data": None, "digest": None, "mcmeta": None, "issues": []}
+    issues = result["issues"]
+    try:
+        with open(path, 'rb') as f:
+            source = f.read()
+        image, info = pngcodec.decode(source)
+    except (OSError, pngcodec.PNGError) as e:
+        issues.append(("error", f"无法读取图片: {e}"))
+        return result
+
+    width, height = image.width, image.height
+    result["width"], result["height"] = width, height
+    if width == height:
+        frames = 1
+    elif height > width and height % width == 0:
+        frames = height // width
+    else:
+        issues.append(("error", f"尺寸{width}x{height}既不是正方形也不是竖直的动画条"))
+        return result
+    result["frames"] = frames
+
+    mcmeta_path = path + ".mcmeta"
+    if os.path.exists(mcmeta_path):
+        with open(mcmeta_path, 'rb') as f:
+            result["mcmeta"] = f.read()
+        issues += _check_mcmeta(result["mcmeta"], frames)
+    elif frames > 1:
+        issues.append(("error", f"动画贴图（{frames}帧）缺少{os.path.basename(mcmeta_path)}"))
+    if any(severity == "error" for severity, _ in issues):
+        return result
+
+    if not _is_power_of_two(width):
+        issues.append(("warning", f"边长{width}不是2的幂，游戏中可能出现模糊或错位"))
+
+    # 缩小为不超过上限的最大整数分之一
+    factor = 1
+    if max_size and width > max_size:
+        factor = -(-width // max_size)
+        while width % factor:
+            factor += 1
+        image = pngcodec.downscale(image, factor)
+        result["scale"] = factor
+
+    # 已经是8位RGBA且不需要缩小时保留原文件，否则重新编码
+    if factor == 1 and info.color_type == 6 and info.bit_depth == 8 and not info.interlace:
+        data = source
+    else:
+        data = pngcodec.encode(image, COMPRESS_LEVEL)
+    result["data"] = data
+    result["digest"] = hashlib.sha256(data).hexdigest()
+    return result
+
+
+def _process_batch(batch):
+    """
+    在工作进程中处理一批贴图
+    """
+    return [process_texture(path, max_size) for path, max_size in batch]
+
+
+class TextureImport:
+    """
+    一张待导入的贴图
+    """
+
+    __slots__ = ("source", "name", "kind", "owner", "target", "width", "height", "frames", "scale",
+                 "data", "digest", "mcmeta", "issues")
+
+    def __init__(self, result, name):
+        self.source = result["path"]
+        self.name = name
+        self.kind = None    # "block"/"item"，未匹配时为None
+        self.owner = None   # 匹配到的方块/物品名称
+        self.target = None  # 相对于resources目录的目标路径
+        self.width = result["width"]
+        self.height = result["height"]
+        self.frames = result["frames"]
+        self.scale = result["scale"]
+        self.data = result["data"]
+        self.digest = result["digest"]
+        self.mcmeta = result["mcmeta"]
+        self.issues = result["issues"]
+
+    @property
+    def ok(self):
+        return self.target is not None and not any(severity == "error" for severity, _ in self.issues)
+
+
+class ImportPlan:
+    """
+    批量导入的检查结果
+    """
+
+    def __init__(self, directory, textures):
+        self.directory = directory
+        self.textures = textures
+
+    @property
+    def ready(self):
+        """
+        可以导入的贴图
+        """
+        return [texture for texture in self.textures if texture.ok]
+
+    @property
+    def unmatched(self):
+        return [texture for texture in self.textures if texture.target is None and texture.data is not None]
+
+    @property
+    def failed(self):
+        return [texture for texture in self.textures
+                if any(severity == "error" for severity, _ in texture.issues)]
+
+    @property
+    def warnings(self):
+        return [texture for texture in self.textures
+                if texture.ok and any(severity == "warning" for severity, _ in texture.issues)]
+
+    def format_lines(self, limit=200):
+        """
+        格式化为文本行，每类最多列出limit项
+        """
+        lines = [f"图片: {len(self.textures)}张，可导入{len(self.ready)}张，"
+                 f"未匹配{len(self.unmatched)}张，错误{len(self.failed)}张"]
+
+        def section(title, items, describe):
+            if not items:
+                return
+            lines.append("")
+            lines.append(f"{title}（{len(items)}）:")
+            for texture in items[:limit]:
+                lines.extend(describe(texture))
+            if len(items) > limit:
+                lines.append(f"    ……还有{len(items) - limit}项")
+
+        def issues_of(severity):
+            def describe(texture):
+                rel_path = os.path.relpath(texture.source, self.directory)
+                return [f"    {rel_path}: {message}" for level, message in texture.issues if level == severity]
+            return describe
+
+        def target_of(texture):
+            note = f"（{texture.frames}帧）" if texture.frames > 1 else ""
+            if texture.scale > 1:
+                note += f"（缩小为1/{texture.scale}）"
+            return [f"    {os.path.relpath(texture.source, self.directory)} -> {texture.target}{note}"]
+
+        section("错误", self.failed, issues_of("error"))
+        section("警告", self.warnings, issues_of("warning"))
+        section("没有匹配的方块或物品", self.unmatched,
+                lambda texture: [f"    {os.path.relpath(texture.source, self.directory)}"])
+        section("将导入", self.ready, target_of)
+        return lines
+
+
+class BatchTextureImporter:
+    """
+    把一个目录中的贴图批量导入到项目
+    """
+
+    def __init__(self, mod_json_path, mod_id=None):
+        """
+        :param mod_json_path: mod.json路径
+        :param mod_id: 模组ID，为None时从mod.json中读取
+        """
+        self.mod_json_path = os.path.abspath(mod_json_path)
+        self.project_dir = os.path.dirname(self.mod_json_path)
+        self.resources_dir = os.path.join(self.project_dir, MDK_DIR_NAME, "src", "main", "resources")
+        with open(self.mod_json_path, 'r', encoding='utf-8') as f:
+            mod_data = json.load(f)
+        self.mod_id = mod_id or self._mod_id_from(mod_data)
+        self.names = {
+            "block": [entry["name"] for entry in mod_data.get("blocks", []) if entry.get("name")],
+            "item": [entry["name"] for entry in mod_data.get("items", []) if entry.get("name")],
+        }
+        self.store = TextureStore(self.project_dir)
+
+    @staticmethod
+    def _mod_id_from(mod_data):
+        mod_id = mod_data.get("modInfo", {}).get("modid")
+        if mod_id:
+            return mod_id
+        for entry in mod_data.get("blocks", []) + mod_data.get("items", []):
+            if ":" in entry.get("registryName", ""):
+                return entry["registryName"].split(":", 1)[0]
+        return "unknown"
+
+    @staticmethod
+    def find_images(directory):
+        """
+        目录（含子目录）中的所有PNG图片
+        """
+        images = []
+        pending = [directory]
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        pending.append(entry.path)
+                    elif entry.name.lower().endswith(".png"):
+                        images.append(entry.path)
+        images.sort()
+        return images
+
+    def match(self, name, kind_hint=None):
+        """
+        按名称匹配方块或物品
+
+        :param name: 规范化后的文件名
+        :param kind_hint: 图片所在目录暗示的类别（"block"/"item"），名称同时匹配两者时优先
+        :return: (类别, 方块/物品名称)，不匹配时返回(None, None)
+        """
+        kinds = ("block", "item")
+        if kind_hint == "item":
+            kinds = ("item", "block")
+        # 完全相同的名称
+        for kind in kinds:
+            if name in self.names[kind]:
+                return kind, name
+        # name_top、name_side等：按最长的名称前缀匹配
+        best = (None, None)
+        for kind in kinds:
+            for candidate in self.names[kind]:
+                if name.startswith(candidate + "_") and len(candidate) > len(best[1] or ""):
+                    best = (kind, candidate)
+        return best
+
+    def _run(self, pending, workers):
+        """
+        处理所有图片，图片较多时使用进程池
+
+        :return: 与pending顺序相同的结果字典列表
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(pending) < POOL_MIN_FILES:
+            return [process_texture(path, max_size) for path, max_size in pending]
+
+        batch_size = max(8, len(pending) // (workers * 4))
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        results = []
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                for batch_result in executor.map(_process_batch, batches):
+                    results.extend(batch_result)
+        except (OSError, concurrent.futures.process.BrokenProcessPool):
+            # 无法创建子进程时退回单进程处理
+            results = [process_texture(path, max_size) for path, max_size in pending]
+        return results
+
+    def scan(self, directory, max_size=None, workers=None):
+        """
+        检查目录中的所有贴图并确定导入位置（不写入任何文件）
+
+        :param directory: 图片目录
+        :param max_size: 边长上限，为None时不缩小
+        :param workers: 工作进程数，为None时使用CPU核数
+        :return: ImportPlan
+        """
+        directory = os.path.abspath(directory)
+        with tracing.span("find_images", "assets"):
+            images = self.find_images(directory)
+        with tracing.span("process_textures", "assets"):
+            results = self._run([(path, max_size) for path in images], workers)
+
+        textures = []
+        targets = {}
+        for result in results:
+            texture = TextureImport(result, normalize_name(os.path.splitext(os.path.basename(result["path"]))[0]))
+            textures.append(texture)
+            if texture.data is None:
+                continue
+            parent = os.path.basename(os.path.dirname(texture.source)).lower()
+            kind, owner = self.match(texture.name, _KIND_DIRS.get(parent))
+            if kind is None:
+                continue
+            target = f"assets/{self.mod_id}/textures/{kind}/{texture.name}.png"
+            if target in targets:
+                other = os.path.relpath(targets[target].source, directory)
+                texture.issues.append(("error", f"与{other}的目标相同: {target}"))
+                continue
+            targets[target] = texture
+            texture.kind, texture.owner, texture.target = kind, owner, target
+        return ImportPlan(directory, textures)
+
+    def apply(self, plan):
+        """
+        写入可以导入的贴图（在调用方的事务中调用时随事务一起提交），完成后需调用self.store.save()
+
+        :return: (导入的贴图数, 内容未变化的贴图数)
+        """
+        imported = unchanged = 0
+        for texture in plan.ready:
+            target = os.path.join(self.resources_dir, *texture.target.split("/"))
+            if self.store.import_bytes(texture.data, target, texture.digest) == "unchanged":
+                unchanged += 1
+            else:
+                imported += 1
+            if texture.mcmeta is not None:
+                mcmeta_path = target + ".mcmeta"
+                if not journal.exists(mcmeta_path) or journal.read_bytes(mcmeta_path) != texture.mcmeta:
+                    journal.write_bytes(mcmeta_path, texture.mcmeta)
+        return imported, unchanged
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+贴图仓库模块
+以内容的sha256为键，把导入的贴图保存在.forgecreator/texture_store/objects中，
+项目中的贴图文件都是仓库对象的硬链接：内容相同的贴图（如颜色变体复用同一张图）在磁盘上只占一份空间，
+重复导入未变化的文件不会产生任何写入。
+
+本程序对项目文件的写入都是“写临时文件+重命名”，不会原地修改硬链接共享的内容；
+外部程序原地修改了某个贴图时，仓库对象的哈希会随之改变，下次使用前会被发现并重新建立。
+但链接到同一对象的所有贴图共享一个inode：用原地保存的图片编辑器修改其中一个（如某个颜色变体），
+其余内容相同的贴图也会一起改变。需要单独编辑某个变体时，应先另存为新文件再导入。
+文件系统不支持硬链接时退回为普通复制
+"""
+
+import os
+import json
+import uuid
+import hashlib
+
+import journal
+from journal import get_state_dir
+
+
+# 仓库目录名（位于.forgecreator下）
+STORE_DIR_NAME = "texture_store"
+
+# 文件哈希缓存
+INDEX_FILE = "index.json"
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def format_size(size):
+    """
+    把字节数格式化为易读的形式
+    """
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class DuplicateGroup:
+    """
+    内容相同的一组贴图
+    """
+
+    def __init__(self, digest, size, paths, copies):
+        self.digest = digest
+        self.size = size
+        self.paths = paths    # 相对于resources目录的路径
+        self.copies = copies  # 实际占用的存储份数（链接到同一inode的文件只计一份）
+
+    @property
+    def saved_bytes(self):
+        """
+        已经通过硬链接节省的字节数
+        """
+        return self.size * (len(self.paths) - self.copies)
+
+    @property
+    def reclaimable_bytes(self):
+        """
+        仍可通过去重节省的字节数
+        """
+        return self.size * (self.copies - 1)
+
+
+class DuplicateReport:
+    """
+    项目贴图的重复情况
+    """
+
+    def __init__(self, files, total_bytes, groups):
+        self.files = files
+        self.total_bytes = total_bytes
+        self.groups = groups
+
+    @property
+    def duplicate_bytes(self):
+        """
+        重复内容的总字节数（每组除第一份以外的部分）
+        """
+        return sum(group.size * (len(group.paths) - 1) for group in self.groups)
+
+    @property
+    def saved_bytes(self):
+        return sum(group.saved_bytes for group in self.groups)
+
+    @property
+    def reclaimable_bytes(self):
+        return sum(group.reclaimable_bytes for group in self.groups)
+
+    def format_lines(self, limit=50):
+        """
+        格式化为文本行，最多列出limit组
+        """
+        lines = [
+            f"贴图文件: {self.files}个，共{format_size(self.total_bytes)}",
+            f"重复内容: {len(self.groups)}组，{format_size(self.duplicate_bytes)}",
+            f"已通过硬链接节省: {format_size(self.saved_bytes)}",
+            f"仍可节省: {format_size(self.reclaimable_bytes)}",
+        ]
+        groups = sorted(self.groups, key=lambda g: g.size * (len(g.paths) - 1), reverse=True)
+        for group in groups[:limit]:
+            lines.append("")
+            lines.append(f"{group.digest[:12]}  {format_size(group.size)} x {len(group.paths)}（实际存储{group.copies}份）")
+            lines += [f"    {path}" for path in group.paths]
+        if len(groups) > limit:
+            lines.append("")
+            lines.append(f"……还有{len(groups) - limit}组")
+        return lines
+
+
+class TextureStore:
+    """
+    项目的内容寻址贴图仓库
+    """
+
+    def __init__(self, project_dir):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.store_dir = os.path.join(get_state_dir(self.project_dir), STORE_DIR_NAME)
+        self.objects_dir = os.path.join(self.store_dir, "objects")
+        self.index_path = os.path.join(self.store_dir, INDEX_FILE)
+        self.resources_dir = os.path.join(self.project_dir, MDK_DIR_NAME, "src", "main", "resources")
+        self._hashes = None
+        self._dirty = False
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path):
+        """
+        根据mod.json路径获取项目的贴图仓库
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)))
+
+    def _load(self):
+        if self._hashes is not None:
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._hashes = json.load(f).get("hashes", {})
+        except (OSError, ValueError):
+            self._hashes = {}
+
+    def save(self):
+        """
+        保存文件哈希缓存（已不存在的文件的条目同时删除）
+        """
+        if self._hashes is None:
+            return
+        stale = [path for path in self._hashes if not os.path.exists(path)]
+        for path in stale:
+            del self._hashes[path]
+        if stale:
+            self._dirty = True
+        if not self._dirty:
+            return
+        os.makedirs(self.store_dir, exist_ok=True)
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"hashes": self._hashes}, ensure_ascii=False))
+        os.replace(temp_path, self.index_path)
+        self._dirty = False
+
+    def hash_file(self, path):
+        """
+        计算文件的sha256，大小和修改时间都没变时使用缓存
+        """
+        self._load()
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        cached = self._hashes.get(path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = _sha256_file(path)
+        self._hashes[path] = [stat.st_size, stat.st_mtime_ns, digest]
+        self._dirty = True
+        return digest
+
+    def object_path(self, digest):
+        """
+        仓库对象的路径
+        """
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.png")
+
+    def add(self, source):
+        """
+        把文件放入仓库（内容已存在时不复制）
+
+        :return: (sha256, 仓库对象路径)
+        """
+        digest = self.hash_file(source)
+        object_path = self.object_path(digest)
+        if os.path.exists(object_path):
+            # 对象被外部程序通过某个硬链接原地修改过时重新建立
+            if self.hash_file(object_path) == digest:
+                return digest, object_path
+            os.remove(object_path)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        temp_path = f"{object_path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(source, 'rb') as src, open(temp_path, 'wb') as dst:
+            for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                dst.write(chunk)
+        os.replace(temp_path, object_path)
+        self.hash_file(object_path)
+        return digest, object_path
+
+    def add_bytes(self, data, digest=None):
+        """
+        把内存中的图片内容放入仓库（内容已存在时不写入）
+
+        :param digest: 已经算好的sha256，为None时现算
+        :return: (sha256, 仓库对象路径)
+        """
+        digest = digest or hashlib.sha256(data).hexdigest()
+        object_path = self.object_path(digest)
+        if os.path.exists(object_path):
+            if self.hash_file(object_path) == digest:
+                return digest, object_path
+            os.remove(object_path)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        temp_path = f"{object_path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, object_path)
+        self.hash_file(object_path)
+        return digest, object_path
+
+    def _current_digest(self, target):
+        """
+        目标文件当前内容的哈希（考虑当前事务中暂存的修改），不存在时返回None
+        """
+        if not journal.exists(target):
+            return None
+        txn = journal.current_transaction()
+        if txn is not None and txn.owns(target) and txn.modified(target):
+            return hashlib.sha256(journal.read_bytes(target)).hexdigest()
+        return self.hash_file(target)
+
+    def import_texture(self, source, target):
+        """
+        导入一张贴图：放入仓库并把目标文件链接到仓库对象
+        目标文件内容已与源文件相同时什么也不做
+
+        :param source: 源图片路径
+        :param target: 项目中的目标路径
+        :return: "unchanged"（内容相同，未写入）或"imported"
+        """
+        digest = self.hash_file(source)
+        if self._current_digest(target) == digest:
+            return "unchanged"
+        digest, object_path = self.add(source)
+        journal.link_file(object_path, target)
+        return "imported"
+
+    def import_bytes(self, data, target, digest=None):
+        """
+        同import_texture，但内容来自内存（如批量导入时转换过的图片）
+
+        :return: "unchanged"或"imported"
+        """
+        digest = digest or hashlib.sha256(data).hexdigest()
+        if self._current_digest(target) == digest:
+            return "unchanged"
+        digest, object_path = self.add_bytes(data, digest)
+        journal.link_file(object_path, target)
+        return "imported"
+
+    def _texture_files(self):
+        """
+        项目中的所有贴图
+
+        :return: [(相对于resources目录的路径, 绝对路径)]
+        """
+        files = []
+        assets_dir = os.path.join(self.resources_dir, "assets")
+        if not os.path.isdir(assets_dir):
+            return files
+        for namespace in sorted(os.listdir(assets_dir)):
+            textures_dir = os.path.join(assets_dir, namespace, "textures")
+            for directory, dirnames, filenames in os.walk(textures_dir):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith(".png"):
+                        path = os.path.join(directory, filename)
+                        files.append((os.path.relpath(path, self.resources_dir).replace(os.sep, "/"), path))
+        return files
+
+    def report(self):
+        """
+        统计项目中内容重复的贴图
+
+        :return: DuplicateReport
+        """
+        by_digest = {}
+        total_bytes = 0
+        files = self._texture_files()
+        for rel_path, path in files:
+            stat = os.stat(path)
+            total_bytes += stat.st_size
+            by_digest.setdefault(self.hash_file(path), []).append((rel_path, stat))
+
+        groups = []
+        for digest, members in by_digest.items():
+            if len(members) < 2:
+                continue
+            # 链接到同一inode的文件只占一份存储
+            copies = len({(stat.st_dev, stat.st_ino) for _, stat in members})
+            groups.append(DuplicateGroup(digest, members[0][1].st_size, [rel for rel, _ in members], copies))
+        return DuplicateReport(len(files), total_bytes, groups)
+
+    def deduplicate(self, report=None):
+        """
+        把内容相同的贴图都替换为同一个仓库对象的硬链接
+        在事务中调用时随事务一起提交（可撤销）
+
+        :param report: report()的结果，为None时重新统计
+        :return: 替换的文件数
+        """
+        report = report or self.report()
+        replaced = 0
+        for group in report.groups:
+            if group.reclaimable_bytes <= 0:
+                continue
+            paths = [os.path.join(self.resources_dir, *rel.split("/")) for rel in group.paths]
+            digest, object_path = self.add(paths[0])
+            object_stat = os.stat(object_path)
+            for path in paths:
+                stat = os.stat(path)
+                if (stat.st_dev, stat.st_ino) == (object_stat.st_dev, object_stat.st_ino):
+                    continue
+                journal.link_file(object_path, path)
+                replaced += 1
+        return replaced
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能追踪模块
+为向导、代码生成、编辑器和Gradle构建等操作记录嵌套的计时区间（span）和计数器（写入字节数、文件数等），
+并导出为Chrome trace / Perfetto可直接打开的JSON文件（chrome://tracing 或 ui.perfetto.dev）
+
+默认关闭。设置环境变量FORGECREATOR_TRACE为输出文件路径即可开启，程序退出时自动导出:
+    FORGECREATOR_TRACE=/tmp/forgecreator.trace.json python src/main.py
+
+关闭时span()直接返回一个共享的空上下文管理器，traced装饰的函数只多一次布尔判断，几乎没有额外开销
+"""
+
+import os
+import json
+import time
+import atexit
+import shutil
+import functools
+import threading
+
+
+# 开启追踪的环境变量，值为导出文件路径
+ENV_VAR = "FORGECREATOR_TRACE"
+
+_enabled = False
+_output_path = None
+
+# Chrome trace事件列表与计数器当前值
+_events = []
+_counters = {}
+_lock = threading.Lock()
+
+# 追踪开始的时间点，事件时间戳都相对于它（微秒）
+_origin_ns = time.perf_counter_ns()
+
+# 已记录名称的线程
+_named_threads = set()
+
+_exit_hook_registered = False
+
+
+def is_enabled() -> bool:
+    """
+    是否正在追踪
+    """
+    return _enabled
+
+
+def enable(output_path=None):
+    """
+    开启追踪
+
+    :param output_path: 程序退出时导出的文件路径，为None时需要手动调用export()
+    """
+    global _enabled, _output_path, _exit_hook_registered
+    _output_path = output_path
+    _enabled = True
+    if output_path and not _exit_hook_registered:
+        atexit.register(_export_at_exit)
+        _exit_hook_registered = True
+
+
+def disable():
+    """
+    关闭追踪（已记录的事件保留，仍可导出）
+    """
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """
+    清空已记录的事件和计数器
+    """
+    global _origin_ns
+    with _lock:
+        _events.clear()
+        _counters.clear()
+        _named_threads.clear()
+        _origin_ns = time.perf_counter_ns()
+
+
+def _now_us() -> float:
+    return (time.perf_counter_ns() - _origin_ns) / 1000.0
+
+
+def _record(event):
+    """
+    记录一个事件（首次出现的线程同时记录线程名）
+    """
+    thread = threading.current_thread()
+    tid = thread.ident
+    event["pid"] = os.getpid()
+    event["tid"] = tid
+    with _lock:
+        if tid not in _named_threads:
+            _named_threads.add(tid)
+            _events.append({"name": "thread_name", "ph": "M", "pid": event["pid"], "tid": tid,
+                            "args": {"name": thread.name}})
+        _events.append(event)
+
+
+class _Span:
+    """
+    一个计时区间，作为上下文管理器使用
+    以完整事件（ph="X"）记录，Chrome trace会按时间自动显示嵌套关系
+    """
+
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+
+    def set(self, key, value):
+        """
+        为区间附加参数（如文件路径、返回码），显示在trace查看器的详情中
+        """
+        self.args[key] = value
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _now_us()
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        event = {"name": self.name, "cat": self.category, "ph": "X", "ts": self.start, "dur": end - self.start}
+        if self.args:
+            event["args"] = self.args
+        _record(event)
+        return False
+
+
+class _NullSpan:
+    """
+    追踪关闭时使用的空区间
+    """
+
+    __slots__ = ()
+
+    def set(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, category="app", **args):
+    """
+    创建一个计时区间
+
+        with tracing.span("copy_template", "wizard", source=source_dir) as s:
+            ...
+            s.set("files", count)
+
+    :param name: 区间名称
+    :param category: 分类（wizard、codegen、editor、journal、gradle……）
+    :param args: 附加参数
+    :return: 上下文管理器
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def traced(name=None, category="app"):
+    """
+    用计时区间包裹整个函数的装饰器，名称默认为函数的限定名（如MainWindow.generate_block_code）
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, value=1):
+    """
+    累加计数器，并以计数器事件（ph="C"）记录当前值
+
+    :param name: 计数器名称，如bytes_written、files_written
+    :param value: 增量
+    """
+    if not _enabled:
+        return
+    with _lock:
+        total = _counters.get(name, 0) + value
+        _counters[name] = total
+    _record({"name": name, "ph": "C", "ts": _now_us(), "args": {name: total}})
+
+
+def counters() -> dict:
+    """
+    获取所有计数器的当前值
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def file_written(path, size=None):
+    """
+    追踪开启时累计写入的文件数和字节数
+
+    :param path: 写入的文件路径
+    :param size: 写入的字节数，为None时读取文件大小
+    """
+    if not _enabled:
+        return
+    count("files_written")
+    count("bytes_written", os.path.getsize(path) if size is None else size)
+
+
+def copy2(source, target):
+    """
+    与shutil.copy2相同，追踪开启时同时累计复制的文件数和字节数
+    可作为shutil.copytree的copy_function
+    """
+    result = shutil.copy2(source, target)
+    if _enabled:
+        count("files_copied")
+        count("bytes_copied", os.path.getsize(target))
+    return result
+
+
+def export(path=None) -> str:
+    """
+    导出Chrome trace JSON
+
+    :param path: 导出路径，为None时使用enable()时指定的路径
+    :return: 导出路径，没有可用路径时返回None
+    """
+    path = path or _output_path
+    if not path:
+        return None
+    with _lock:
+        data = {
+            "traceEvents": list(_events),
+            "displayTimeUnit": "ms",
+            "otherData": {"counters": dict(_counters)},
+        }
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    return path
+
+
+def _export_at_exit():
+    if _events:
+        try:
+            path = export()
+            if path:
+                print(f"已导出性能追踪文件: {path}")
+        except Exception as e:
+            print(f"导出性能追踪文件失败: {e}")
+
+
+if os.environ.get(ENV_VAR):
+    enable(os.environ[ENV_VAR])
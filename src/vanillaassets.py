@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+原版资源索引模块
+为客户端jar中的assets/minecraft（模型、blockstate、贴图）建立可搜索的索引，供选择父模型和浏览原版贴图使用：
+    - jar不解压，通过zip的中央目录按需读取单个条目
+    - 模型索引记录父模型、贴图变量以及元素中用到的贴图变量，可以算出一个父模型还需要填写哪些贴图
+    - 贴图缩略图在需要显示时才解码，保存在有容量上限的LRU缓存中
+
+索引保存在.forgecreator/vanilla_assets.json中，jar的大小和修改时间不变时直接读取
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import zipfile
+from collections import OrderedDict
+
+import tracing
+import pngcodec
+from journal import get_state_dir
+from classindex import fuzzy_search, gradle_user_home
+
+
+# 索引文件名
+INDEX_FILE = "vanilla_assets.json"
+
+# 索引格式变化时修改，使旧索引失效
+INDEX_VERSION = 1
+
+MINECRAFT_VERSION = "1.16.5"
+
+ASSETS_PREFIX = "assets/minecraft/"
+
+# 缩略图LRU缓存的容量（张）
+THUMBNAIL_CACHE_SIZE = 512
+
+# 模型元素中引用的贴图变量，如"#side"
+_VARIABLE_PATTERN = re.compile(r'"texture"\s*:\s*"#(\w+)"')
+
+
+def _minecraft_dirs():
+    """
+    官方启动器的.minecraft目录（按平台）
+    """
+    if sys.platform.startswith("win"):
+        return [os.path.join(os.environ.get("APPDATA", ""), ".minecraft")]
+    if sys.platform == "darwin":
+        return [os.path.expanduser("~/Library/Application Support/minecraft")]
+    return [os.path.expanduser("~/.minecraft")]
+
+
+def find_client_jar():
+    """
+    查找包含原版资源的客户端jar：优先使用ForgeGradle下载的，其次是官方启动器的
+
+    :return: jar路径，找不到时返回None
+    """
+    forge_gradle = os.path.join(gradle_user_home(), "caches", "forge_gradle")
+    candidates = [os.path.join(forge_gradle, "minecraft_repo", "versions", MINECRAFT_VERSION, "client.jar")]
+    candidates += sorted(glob.glob(os.path.join(forge_gradle, "mcp_repo", "net", "minecraft", "client",
+                                                f"{MINECRAFT_VERSION}*", f"client-{MINECRAFT_VERSION}*-extra.jar")))
+    candidates += [os.path.join(directory, "versions", MINECRAFT_VERSION, f"{MINECRAFT_VERSION}.jar")
+                   for directory in _minecraft_dirs()]
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _model_entry(data):
+    """
+    从模型JSON中提取索引需要的信息
+    """
+    try:
+        model = json.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if not isinstance(model, dict):
+        return None
+    textures = model.get("textures") if isinstance(model.get("textures"), dict) else {}
+    used = sorted(set(_VARIABLE_PATTERN.findall(json.dumps(model.get("elements", [])))))
+    entry = {"textures": textures, "uses": used}
+    if isinstance(model.get("parent"), str):
+        entry["parent"] = model["parent"].split(":", 1)[-1]
+    return entry
+
+
+def build_index(jar_path):
+    """
+    读取jar的中央目录，索引所有模型、blockstate和贴图（只有模型需要读取内容）
+
+    :return: 索引字典
+    """
+    models = {}
+    blockstates = []
+    textures = []
+    with zipfile.ZipFile(jar_path) as jar:
+        for info in jar.infolist():
+            name = info.filename
+            if not name.startswith(ASSETS_PREFIX):
+                continue
+            rel_path = name[len(ASSETS_PREFIX):]
+            if rel_path.startswith("models/") and rel_path.endswith(".json"):
+                entry = _model_entry(jar.read(info))
+                if entry is not None:
+                    models[rel_path[len("models/"):-len(".json")]] = entry
+            elif rel_path.startswith("blockstates/") and rel_path.endswith(".json"):
+                blockstates.append(rel_path[len("blockstates/"):-len(".json")])
+            elif rel_path.startswith("textures/") and rel_path.endswith(".png"):
+                textures.append(rel_path[len("textures/"):-len(".png")])
+    return {"version": INDEX_VERSION, "models": models,
+            "blockstates": sorted(blockstates), "textures": sorted(textures)}
+
+
+class VanillaAssetIndex:
+    """
+    原版资源索引
+    """
+
+    def __init__(self, project_dir):
+        """
+        :param project_dir: 项目根目录（mod.json所在目录）
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.index_path = os.path.join(get_state_dir(self.project_dir), INDEX_FILE)
+        self.jar_path = None
+        self.data = None
+        self._jar = None
+        self._thumbnails = OrderedDict()
+
+    @classmethod
+    def for_mod_json(cls, mod_json_path):
+        """
+        根据mod.json路径获取原版资源索引
+        """
+        return cls(os.path.dirname(os.path.abspath(mod_json_path)))
+
+    def _load(self, jar_path):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        stat = os.stat(jar_path)
+        if data.get("version") != INDEX_VERSION or data.get("jar") != [jar_path, stat.st_size, stat.st_mtime_ns]:
+            return False
+        self.data = data
+        return True
+
+    @tracing.traced(category="assets")
+    def _build(self, jar_path):
+        stat = os.stat(jar_path)
+        data = build_index(jar_path)
+        data["jar"] = [jar_path, stat.st_size, stat.st_mtime_ns]
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+        os.replace(temp_path, self.index_path)
+        self.data = data
+
+    def ensure(self):
+        """
+        获取索引：已保存且jar未变化时直接读取，否则重新建立
+
+        :return: 是否有可用的索引（找不到客户端jar时为False）
+        """
+        if self.data is not None:
+            return True
+        jar_path = find_client_jar()
+        if jar_path is None:
+            return False
+        self.jar_path = jar_path
+        if not self._load(jar_path):
+            self._build(jar_path)
+        return True
+
+    def close(self):
+        if self._jar is not None:
+            self._jar.close()
+            self._jar = None
+
+    def read(self, rel_path):
+        """
+        按需读取assets/minecraft下的一个文件（只在第一次读取时打开jar并解析中央目录）
+
+        :param rel_path: 相对于assets/minecraft的路径，如"textures/block/stone.png"
+        :return: 文件内容
+        :raises KeyError: 文件不存在
+        """
+        if self._jar is None:
+            self._jar = zipfile.ZipFile(self.jar_path)
+        return self._jar.read(ASSETS_PREFIX + rel_path)
+
+    @property
+    def models(self):
+        return self.data["models"] if self.data else {}
+
+    @property
+    def textures(self):
+        return self.data["textures"] if self.data else []
+
+    @property
+    def blockstates(self):
+        return self.data["blockstates"] if self.data else []
+
+    def search(self, query, kind="textures", limit=None):
+        """
+        模糊搜索资源名称
+
+        :param kind: "textures"、"models"或"blockstates"
+        :return: 名称列表，如["block/stone", ...]
+        """
+        names = self.models.keys() if kind == "models" else getattr(self, kind)
+        return fuzzy_search(query, names, limit)
+
+    def required_textures(self, model_name):
+        """
+        以该模型为父模型时还需要填写的贴图变量：元素中用到的变量沿父模型链解析，
+        解析不到具体贴图的（包括指向另一个未定义变量的，如"all"）
+
+        :param model_name: 模型名称，如"block/cube_column"
+        :return: 变量名列表
+        """
+        used = set()
+        textures = {}
+        name = model_name
+        for _ in range(16):
+            entry = self.models.get(name)
+            if entry is None:
+                break
+            used.update(entry["uses"])
+            # 子模型的定义优先
+            for variable, value in entry["textures"].items():
+                textures.setdefault(variable, value)
+            name = entry.get("parent")
+            if name is None:
+                break
+
+        required = set()
+        for variable in used:
+            seen = set()
+            while variable in textures and variable not in seen:
+                seen.add(variable)
+                value = textures[variable]
+                if not (isinstance(value, str) and value.startswith("#")):
+                    variable = None
+                    break
+                variable = value[1:]
+            if variable is not None:
+                required.add(variable)
+        return sorted(required)
+
+    def template_models(self):
+        """
+        可以作为方块父模型的模板（block/下需要填写贴图变量的模型），按名称排序
+        """
+        return sorted(name for name in self.models
+                      if name.startswith("block/") and self.required_textures(name))
+
+    def thumbnail(self, texture_name):
+        """
+        解码贴图（动画贴图只取第一帧），结果保存在LRU缓存中
+
+        :param texture_name: 贴图名称，如"block/stone"
+        :return: pngcodec.Image，无法读取时返回None
+        """
+        image = self._thumbnails.get(texture_name)
+        if image is not None:
+            self._thumbnails.move_to_end(texture_name)
+            return image
+        try:
+            image, _ = pngcodec.decode(self.read(f"textures/{texture_name}.png"))
+        except (KeyError, OSError, pngcodec.PNGError):
+            return None
+        if image.height > image.width:
+            image = pngcodec.Image(image.width, image.width, image.pixels[:image.width * image.width * 4])
+        self._thumbnails[texture_name] = image
+        if len(self._thumbnails) > THUMBNAIL_CACHE_SIZE:
+            self._thumbnails.popitem(last=False)
+        return image
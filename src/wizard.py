@@ -22,10 +22,12 @@ from PyQt5.QtWidgets import (
     QHBoxLayout, QLabel, QLineEdit, QPushButton, QCheckBox, 
     QComboBox, QTextEdit, QGroupBox, QFileDialog, QMessageBox
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, pyqtSlot
 
 # 导入工具函数
 from utils import is_admin, run_as_admin, ensure_admin_privileges, validate_modid, create_main_class_name, create_package_name
+import tracing  # 导入性能追踪
+from buildreport import GradleOutputParser, BuildHistory, format_build_report  # 导入构建耗时分析
 
 
 # 构建线程类
@@ -323,6 +325,8 @@ class ForgeModCreator(QMainWindow):
         if directory:
             self.save_path.setText(directory)
     
+    @pyqtSlot()
+    @tracing.traced(category="wizard")
     def create_mod(self):
         """
         开始创建模组项目
@@ -468,14 +472,15 @@ class ForgeModCreator(QMainWindow):
             
             # 然后复制nullpack的内容到目标目录
             try:
-                for item in os.listdir(source_dir):
-                    source_item = os.path.join(source_dir, item)
-                    target_item = os.path.join(target_dir, item)
-
-                    if os.path.isdir(source_item):
-                        shutil.copytree(source_item, target_item)
-                    else:
-                        shutil.copy2(source_item, target_item)
+                with tracing.span("copy_template", "wizard", source=source_dir):
+                    for item in os.listdir(source_dir):
+                        source_item = os.path.join(source_dir, item)
+                        target_item = os.path.join(target_dir, item)
+
+                        if os.path.isdir(source_item):
+                            shutil.copytree(source_item, target_item, copy_function=tracing.copy2)
+                        else:
+                            tracing.copy2(source_item, target_item)
             except Exception as e:
                 error_msg = f"复制模板文件失败\n源: {source_dir}\n目标: {target_dir}\n错误: {str(e)}"
                 self.log_message(error_msg)
@@ -502,15 +507,16 @@ class ForgeModCreator(QMainWindow):
             self.config_mod(target_dir, modid, self.base_package.text(), main_class, mod_name, mod_author, mod_description)
 
             # 删除不需要的路径
-            for path_to_remove in willremoved:
-                abs_path = os.path.join(target_dir, path_to_remove)
-                if os.path.exists(abs_path):
-                    if os.path.isfile(abs_path):
-                        os.remove(abs_path)
-                        self.log_message(f'已删除文件: {abs_path}')
-                    elif os.path.isdir(abs_path):
-                        shutil.rmtree(abs_path)
-                        self.log_message(f'已删除目录: {abs_path}')
+            with tracing.span("delete_resources", "wizard", paths=len(willremoved)):
+                for path_to_remove in willremoved:
+                    abs_path = os.path.join(target_dir, path_to_remove)
+                    if os.path.exists(abs_path):
+                        if os.path.isfile(abs_path):
+                            os.remove(abs_path)
+                            self.log_message(f'已删除文件: {abs_path}')
+                        elif os.path.isdir(abs_path):
+                            shutil.rmtree(abs_path)
+                            self.log_message(f'已删除目录: {abs_path}')
 
             self.log_message(self.lang.get('create_mod_success', '模组项目创建完成!'))
             QMessageBox.information(self, self.lang.get('create_mod_success_box', '成功'), 
@@ -706,6 +712,7 @@ class ForgeModCreator(QMainWindow):
             self.log_message(f"查找Java 8时出错: {e}")
             return None
 
+    @tracing.traced(category="wizard")
     def set_environment_variables(self):
         """
         设置或修改JAVA_HOME环境变量，并更新PATH环境变量
@@ -833,6 +840,7 @@ class ForgeModCreator(QMainWindow):
                 
             return False
 
+    @tracing.traced(category="wizard")
     def fix_build_pack(self, directory):
         """
         修复nullpack，使其使用JAVA_HOME中的JDK而不是自动下载
@@ -848,13 +856,16 @@ class ForgeModCreator(QMainWindow):
                 # 添加或修改org.gradle.java.home属性
                 java_home = os.path.dirname(self.java_path) if (self.java_path.endswith('\\bin') or self.java_path.endswith('/bin')) else self.java_path
 
+                # f-string表达式中不能包含反斜杠（Python 3.12之前），先转换好路径
+                java_home_posix = java_home.replace("\\", "/")
                 if 'org.gradle.java.home' in content:
-                    content = re.sub(r'org\\.gradle\\.java\\.home=.*', f'org.gradle.java.home={java_home.replace("\\", "/")}', content)
+                    content = re.sub(r'org\\.gradle\\.java\\.home=.*', f'org.gradle.java.home={java_home_posix}', content)
                 else:
-                    content += f'\norg.gradle.java.home={java_home.replace("\\", "/")}\n'
+                    content += f'\norg.gradle.java.home={java_home_posix}\n'
 
                 with open(gradle_properties_path, 'w') as f:
                     f.write(content)
+                tracing.file_written(gradle_properties_path)
 
                 self.log_message(self.lang.get('fixing_build_pack_message', '已修改gradle.properties文件，使用JAVA_HOME: {java_home}').format(java_home=java_home))
 
@@ -870,6 +881,7 @@ class ForgeModCreator(QMainWindow):
                     content = content.replace('https://services.gradle.org/distributions/', 'https://mirrors.cloud.tencent.com/gradle/')
                     with open(gradle_wrapper_path, 'w') as f:
                         f.write(content)
+                    tracing.file_written(gradle_wrapper_path)
                     self.log_message(self.lang.get('gradle_wrapper_updated_message', '已修改gradle-wrapper.properties文件，使用腾讯云镜像源'))
 
             return True
@@ -878,6 +890,7 @@ class ForgeModCreator(QMainWindow):
             self.log_message(self.lang.get('fix_build_pack_error_message', '修复nullpack时出错: {e}').format(e=e))
             return False
     
+    @tracing.traced(category="wizard")
     def execute_build(self, directory):
         """
         执行Forge模组项目的构建命令
@@ -919,25 +932,33 @@ class ForgeModCreator(QMainWindow):
             
             # 构建命令
             # 根据CreateModExample.md第101行：应执行genIntellijRuns而非build
-            build_command = [gradle_script_path, 'genIntellijRuns', '--no-daemon']
+            # --console=plain保证每个任务都输出"> Task :xxx"行，用于统计各阶段耗时
+            build_command = [gradle_script_path, 'genIntellijRuns', '--no-daemon', '--console=plain']
             self.log_message(f"执行构建命令: {' '.join(build_command)}")
             
             # 执行构建并捕获输出，确保在Forge目录中执行
-            process = subprocess.Popen(
-                build_command, 
-                cwd=forge_dir,  # 确保在正确的目录中执行
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.STDOUT, 
-                text=True
-            )
-            
-            # 实时输出构建日志
-            for line in process.stdout:
-                if line.strip():
-                    self.log_message(line.strip())
+            with tracing.span("gradle genIntellijRuns", "gradle", command=" ".join(build_command)) as gradle_span:
+                process = subprocess.Popen(
+                    build_command, 
+                    cwd=forge_dir,  # 确保在正确的目录中执行
+                    stdout=subprocess.PIPE, 
+                    stderr=subprocess.STDOUT, 
+                    text=True
+                )
+                
+                # 实时输出构建日志，同时解析任务和阶段的耗时
+                parser = GradleOutputParser(build_command)
+                for line in process.stdout:
+                    parser.feed(line)
+                    if line.strip():
+                        self.log_message(line.strip())
+                
+                # 等待构建完成
+                process.wait()
+                gradle_span.set("returncode", process.returncode)
             
-            # 等待构建完成
-            process.wait()
+            # 记录本次构建的耗时并输出报告
+            self.record_build(directory, parser.finish(process.returncode))
             
             if process.returncode == 0:
                 self.log_message("构建成功完成！")
@@ -966,6 +987,22 @@ class ForgeModCreator(QMainWindow):
             traceback.print_exc()
             return False
 
+    def record_build(self, directory, record):
+        """
+        把构建记录追加到项目的构建历史，并在日志中输出构建性能报告
+        
+        :param directory: 模组项目目录
+        :param record: GradleOutputParser.finish()返回的构建记录
+        """
+        try:
+            history = BuildHistory(directory)
+            history.append(record)
+            for line in format_build_report(history.load(limit=6)):
+                self.log_message(line)
+        except Exception as e:
+            self.log_message(f"记录构建耗时失败: {e}")
+
+    @tracing.traced(category="wizard")
     def config_mod(self, directory, modid, basename, main_class, mod_name="", mod_author="", mod_description=""):
         """
         配置模组项目并执行构建
@@ -995,6 +1032,7 @@ class ForgeModCreator(QMainWindow):
         """
         self.config_mod(directory, modid, basename, main_class)
     
+    @tracing.traced(category="wizard")
     def replace_file_dir_name(self, directory, modid, basename, main_class, mod_name="", mod_author="", mod_description=""):
         """
         替换文件和目录名，修改mods.toml和Java文件内容
@@ -1109,6 +1147,7 @@ class ForgeModCreator(QMainWindow):
                 # 写入修改后的内容
                 with open(mods_toml_path, 'w', encoding='utf-8') as f:
                     f.write(content)
+                tracing.file_written(mods_toml_path)
 
                 self.log_message(f"已修改mods.toml文件: {mods_toml_path}")
 
@@ -1138,6 +1177,7 @@ class ForgeModCreator(QMainWindow):
                 # 写入修改后的内容
                 with open(new_java_file, 'w', encoding='utf-8') as f:
                     f.write(content)
+                tracing.file_written(new_java_file)
 
                 self.log_message(f"已修改主类文件内容: {new_java_file}")
 
@@ -1165,6 +1205,7 @@ class ForgeModCreator(QMainWindow):
                 # 写入修改后的内容
                 with open(build_gradle_path, 'w', encoding='utf-8') as f:
                     f.write(content)
+                tracing.file_written(build_gradle_path)
 
                 self.log_message(f"已修改build.gradle文件: {build_gradle_path}")
 
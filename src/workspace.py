@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工作区索引模块
+工作区是存放多个{modid}pack项目的目录。把每个项目的mod.json、mods.toml、注册名、资源文件、
+Java类名、标签内容和最近一次构建的结果索引到SQLite数据库中，用于快速切换项目和跨项目查询：
+    - 在线程池中并行用os.scandir查找项目并遍历resources目录（只读取目录项和文件属性，不读取文件内容）
+    - 增量更新：mod.json、mods.toml和构建历史的修改时间没有变化时不重新解析；
+      资源文件按(大小, 修改时间)比较，只更新有变化的行，标签文件只在变化时重新解析；
+      已经不存在的项目从索引中删除
+    - mod.json条目的标量字段（如方块的material）保存在带索引的属性表中，
+      "哪些项目使用了Material.ROCK"这样的查询只是一次索引查找
+
+索引保存在{工作区}/.forgecreator/workspace.db中
+"""
+
+import os
+import re
+import json
+import sqlite3
+import concurrent.futures
+
+import tracing
+from journal import get_state_dir
+from buildreport import BuildHistory
+
+
+# 索引数据库文件名
+INDEX_FILE = "workspace.db"
+
+# 表结构变化时修改，旧索引会被删除重建
+SCHEMA_VERSION = 2
+
+MDK_DIR_NAME = "forge-1.16.5-36.2.34-mdk"
+
+# 查找项目的最大目录深度（工作区/项目为1，工作区/分组/项目为2）
+MAX_DEPTH = 2
+
+# 遍历目录的线程数（os.scandir和stat主要是等待IO，线程数可以多于CPU核数）
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# mod.json中的数组 -> 条目类别
+ENTRY_KINDS = {
+    "blocks": "block",
+    "items": "item",
+    "itemGroups": "itemGroup",
+    "recipes": "recipe",
+    "commands": "command",
+    "sounds": "sound",
+    "entities": "entity",
+    "biomes": "biome",
+}
+
+# 有注册名的条目类别（没有registryName字段时为"{modid}:{name}"）
+REGISTRY_KINDS = ("block", "item", "sound", "entity", "biome")
+
+# 查询中的Java类名 -> mod.json的字段名，如"ToolType.PICKAXE"查询harvestTool字段
+PROPERTY_ALIASES = {
+    "toolType": "harvestTool",
+    "itemGroup": "creativeTab",
+}
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE packs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mod_id TEXT,
+    display_name TEXT,
+    version TEXT,
+    mod_json_mtime INTEGER,
+    mods_toml_mtime INTEGER,
+    history_mtime INTEGER,
+    build_time TEXT,
+    build_success INTEGER,
+    build_total REAL,
+    blocks INTEGER DEFAULT 0,
+    items INTEGER DEFAULT 0
+);
+CREATE TABLE entries (pack_id INTEGER NOT NULL, kind TEXT NOT NULL, name TEXT, registry_name TEXT);
+CREATE INDEX entries_pack ON entries (pack_id);
+CREATE INDEX entries_registry_name ON entries (registry_name);
+CREATE TABLE properties (pack_id INTEGER NOT NULL, kind TEXT NOT NULL, name TEXT, key TEXT NOT NULL, value TEXT);
+CREATE INDEX properties_pack ON properties (pack_id);
+CREATE INDEX properties_value ON properties (key, value COLLATE NOCASE);
+CREATE TABLE resources (
+    pack_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER,
+    mtime INTEGER,
+    PRIMARY KEY (pack_id, path)
+) WITHOUT ROWID;
+CREATE TABLE tags (pack_id INTEGER NOT NULL, path TEXT NOT NULL, value TEXT, replace INTEGER);
+CREATE INDEX tags_pack_path ON tags (pack_id, path);
+CREATE TABLE classes (pack_id INTEGER NOT NULL, name TEXT NOT NULL);
+CREATE INDEX classes_pack ON classes (pack_id);
+"""
+
+_TOML_FIELDS = {key: re.compile(rf'^\s*{key}\s*=\s*"([^"]*)"', re.M) for key in ("modId", "displayName", "version")}
+
+# "Material.ROCK"形式的查询
+_CONSTANT_QUERY = re.compile(r"^([A-Z][A-Za-z0-9]*)\.([A-Za-z0-9_]+)$")
+
+
+def parse_query(text):
+    """
+    解析属性查询：
+        "material=ROCK"  -> ("material", "ROCK")
+        "Material.ROCK"  -> ("material", "ROCK")，类名转换为首字母小写的字段名
+
+    :return: (字段名, 值)，不是属性查询时返回None
+    """
+    text = text.strip()
+    if "=" in text:
+        key, value = (part.strip() for part in text.split("=", 1))
+        return (key, value) if key and value else None
+    match = _CONSTANT_QUERY.match(text)
+    if not match:
+        return None
+    key = match.group(1)[0].lower() + match.group(1)[1:]
+    return PROPERTY_ALIASES.get(key, key), match.group(2)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def is_tag_path(path):
+    """
+    是否是标签文件，如"data/forge/tags/items/gems.json"
+    """
+    parts = path.split("/")
+    return len(parts) >= 5 and parts[0] == "data" and parts[2] == "tags" and path.endswith(".json")
+
+
+def _list_files(directory):
+    """
+    目录下的所有文件
+
+    :return: {相对路径: (大小, 修改时间)}
+    """
+    files = {}
+    pending = [directory]
+    prefix = len(directory) + 1
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files[entry.path[prefix:].replace(os.sep, "/")] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            continue
+    return files
+
+
+def _read_mods_toml(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError):
+        return {}
+    return {key: match.group(1) for key, pattern in _TOML_FIELDS.items() for match in [pattern.search(content)] if match}
+
+
+def _scan_pack(pack_dir, known):
+    """
+    读取一个项目中有变化的部分（在线程中执行）
+
+    :param known: 索引中记录的(mod.json, mods.toml, 构建历史)修改时间，新项目为None
+    :return: 结果字典，没有变化的部分为None
+    """
+    mdk_dir = os.path.join(pack_dir, MDK_DIR_NAME)
+    resources_dir = os.path.join(mdk_dir, "src", "main", "resources")
+    mod_json_path = os.path.join(pack_dir, "mod.json")
+    mods_toml_path = os.path.join(resources_dir, "META-INF", "mods.toml")
+    history = BuildHistory(pack_dir)
+    mtimes = (_mtime(mod_json_path), _mtime(mods_toml_path), _mtime(history.path))
+    known = known or (None, None, None)
+    java_files = _list_files(os.path.join(mdk_dir, "src", "main", "java"))
+    result = {"path": pack_dir, "mtimes": mtimes, "mod_data": None, "mods_toml": None, "build": None,
+              "resources": _list_files(resources_dir), "error": None,
+              "classes": sorted(path[:-5].replace("/", ".") for path in java_files if path.endswith(".java"))}
+    # 没有registryName的条目的注册名由mods.toml的modId决定，mods.toml变化时也要重新解析mod.json
+    if mtimes[0] != known[0] or mtimes[1] != known[1]:
+        try:
+            with open(mod_json_path, 'r', encoding='utf-8') as f:
+                result["mod_data"] = json.load(f)
+        except (OSError, ValueError) as e:
+            result["mod_data"] = {}
+            result["error"] = f"无法解析mod.json: {e}"
+    if mtimes[1] != known[1]:
+        result["mods_toml"] = _read_mods_toml(mods_toml_path)
+    if mtimes[2] != known[2]:
+        records = history.load(limit=1)
+        result["build"] = records[-1] if records else {}
+    return result
+
+
+def _read_tag(path):
+    """
+    读取标签文件
+
+    :return: (replace, [值])，值为标签成员的ID（{"id": ..., "required": false}形式的取id）
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("values", []), list):
+        raise ValueError("不是有效的标签文件")
+    values = []
+    for value in data.get("values", []):
+        if isinstance(value, dict):
+            value = value.get("id")
+        if isinstance(value, str):
+            values.append(value)
+    return bool(data.get("replace", False)), values
+
+
+def _find_packs(directory, depth):
+    """
+    查找目录下的项目（包含mod.json的目录），不进入项目内部和隐藏目录
+    """
+    packs = []
+    try:
+        with os.scandir(directory) as entries:
+            subdirs = [entry.path for entry in entries
+                       if entry.is_dir() and not entry.name.startswith(".") and entry.name != MDK_DIR_NAME]
+    except OSError:
+        return packs
+    for path in subdirs:
+        if os.path.isfile(os.path.join(path, "mod.json")):
+            packs.append(path)
+        elif depth < MAX_DEPTH:
+            packs.extend(_find_packs(path, depth + 1))
+    return packs
+
+
+def _entry_rows(mod_data, mod_id):
+    """
+    mod.json中所有条目的(类别, 名称, 注册名)和标量属性(类别, 名称, 字段, 值)
+    """
+    entries = []
+    properties = []
+    for array, kind in ENTRY_KINDS.items():
+        values = mod_data.get(array)
+        if not isinstance(values, list):
+            continue
+        for entry in values:
+            if not isinstance(entry, dict):
+                continue
+            name = entry.get("name")
+            name = name if isinstance(name, str) else None
+            registry_name = entry.get("registryName")
+            if not isinstance(registry_name, str) and kind in REGISTRY_KINDS and name:
+                registry_name = f"{mod_id}:{name}" if mod_id else None
+            entries.append((kind, name, registry_name if isinstance(registry_name, str) else None))
+            for key, value in entry.items():
+                if isinstance(value, bool):
+                    value = "true" if value else "false"
+                elif isinstance(value, (int, float)):
+                    value = str(value)
+                elif not isinstance(value, str):
+                    continue
+                properties.append((kind, name, key, value))
+    return entries, properties
+
+
+class ScanStats:
+    """
+    一次增量更新的统计
+    """
+
+    def __init__(self):
+        self.packs = 0
+        self.added = 0
+        self.updated = 0
+        self.removed = 0
+        self.resources = 0
+        self.errors = []
+
+    def format(self):
+        return (f"项目{self.packs}个（新增{self.added}个，更新{self.updated}个，删除{self.removed}个），"
+                f"资源文件变化{self.resources}个")
+
+
+class WorkspaceIndex:
+    """
+    工作区中所有项目的索引
+    """
+
+    def __init__(self, root):
+        """
+        :param root: 工作区目录
+        """
+        self.root = os.path.abspath(root)
+        self.db_path = os.path.join(get_state_dir(self.root), INDEX_FILE)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.db = sqlite3.connect(self.db_path)
+        self._ensure_schema()
+
+    def close(self):
+        self.db.close()
+
+    def _ensure_schema(self):
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.DatabaseError:
+            row = None
+        if row is not None and row[0] == str(SCHEMA_VERSION):
+            return
+        tables = [name for (name,) in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        with self.db:
+            for name in tables:
+                self.db.execute(f'DROP TABLE "{name}"')
+            self.db.executescript(_SCHEMA)
+            self.db.execute("INSERT INTO meta VALUES ('version', ?)", (str(SCHEMA_VERSION),))
+
+    def _relpath(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    @tracing.traced(category="workspace")
+    def update(self, workers=None):
+        """
+        增量更新索引：查找所有项目，只重新读取有变化的部分
+
+        :param workers: 线程数，为None时使用SCAN_WORKERS
+        :return: ScanStats
+        """
+        stats = ScanStats()
+        known = {path: (pack_id, (mod_json, mods_toml, history))
+                 for pack_id, path, mod_json, mods_toml, history in self.db.execute(
+                     "SELECT id, path, mod_json_mtime, mods_toml_mtime, history_mtime FROM packs")}
+        with tracing.span("find_packs", "workspace"):
+            pack_dirs = _find_packs(self.root, 1)
+        with tracing.span("scan_packs", "workspace"):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers or SCAN_WORKERS) as executor:
+                results = list(executor.map(
+                    lambda path: _scan_pack(path, known.get(self._relpath(path), (None, None))[1]), pack_dirs))
+
+        with tracing.span("write_index", "workspace"), self.db:
+            seen = set()
+            for result in results:
+                rel_path = self._relpath(result["path"])
+                seen.add(rel_path)
+                self._store(rel_path, result, known.get(rel_path, (None,))[0], stats)
+            for rel_path, (pack_id, _) in known.items():
+                if rel_path not in seen:
+                    for table in ("entries", "properties", "resources", "tags", "classes"):
+                        self.db.execute(f"DELETE FROM {table} WHERE pack_id = ?", (pack_id,))
+                    self.db.execute("DELETE FROM packs WHERE id = ?", (pack_id,))
+                    stats.removed += 1
+        stats.packs = len(results)
+        return stats
+
+    def _store(self, rel_path, result, pack_id, stats):
+        db = self.db
+        changed = False
+        is_new = pack_id is None
+        if is_new:
+            pack_id = db.execute("INSERT INTO packs (path) VALUES (?)", (rel_path,)).lastrowid
+            stats.added += 1
+        if result["error"]:
+            stats.errors.append(f"{rel_path}: {result['error']}")
+
+        if result["mods_toml"] is not None:
+            toml = result["mods_toml"]
+            db.execute("UPDATE packs SET mod_id = ?, display_name = ?, version = ? WHERE id = ?",
+                       (toml.get("modId"), toml.get("displayName"), toml.get("version"), pack_id))
+            changed = True
+        if result["build"] is not None:
+            build = result["build"]
+            db.execute("UPDATE packs SET build_time = ?, build_success = ?, build_total = ? WHERE id = ?",
+                       (build.get("time"), build.get("success"), build.get("total"), pack_id))
+            changed = True
+        if result["mod_data"] is not None:
+            mod_data = result["mod_data"]
+            mod_id = db.execute("SELECT mod_id FROM packs WHERE id = ?", (pack_id,)).fetchone()[0]
+            mod_id = mod_id or (mod_data.get("modInfo") or {}).get("modid")
+            entries, properties = _entry_rows(mod_data, mod_id)
+            db.execute("DELETE FROM entries WHERE pack_id = ?", (pack_id,))
+            db.execute("DELETE FROM properties WHERE pack_id = ?", (pack_id,))
+            db.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)", [(pack_id,) + row for row in entries])
+            db.executemany("INSERT INTO properties VALUES (?, ?, ?, ?, ?)", [(pack_id,) + row for row in properties])
+            db.execute("UPDATE packs SET blocks = ?, items = ? WHERE id = ?",
+                       (sum(1 for row in entries if row[0] == "block"), sum(1 for row in entries if row[0] == "item"), pack_id))
+            changed = True
+
+        stored = {path: (size, mtime) for path, size, mtime in
+                  db.execute("SELECT path, size, mtime FROM resources WHERE pack_id = ?", (pack_id,))}
+        resources = result["resources"]
+        removed = [(pack_id, path) for path in stored if path not in resources]
+        upserts = [(pack_id, path, size, mtime) for path, (size, mtime) in resources.items()
+                   if stored.get(path) != (size, mtime)]
+        if removed:
+            db.executemany("DELETE FROM resources WHERE pack_id = ? AND path = ?", removed)
+        if upserts:
+            db.executemany("INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?)", upserts)
+        stats.resources += len(removed) + len(upserts)
+
+        # 标签文件只在变化时重新解析
+        changed_tags = [path for _, path in removed if is_tag_path(path)]
+        changed_tags += [path for _, path, _, _ in upserts if is_tag_path(path)]
+        if changed_tags:
+            db.executemany("DELETE FROM tags WHERE pack_id = ? AND path = ?", [(pack_id, path) for path in changed_tags])
+            resources_dir = os.path.join(result["path"], MDK_DIR_NAME, "src", "main", "resources")
+            for path in changed_tags:
+                if path not in resources:
+                    continue
+                try:
+                    replace, values = _read_tag(os.path.join(resources_dir, *path.split("/")))
+                except (OSError, ValueError) as e:
+                    stats.errors.append(f"{rel_path}: 无法解析{path}: {e}")
+                    continue
+                # value为NULL的一行代表标签文件本身（values为空时也能知道replace）
+                db.executemany("INSERT INTO tags VALUES (?, ?, ?, ?)",
+                               [(pack_id, path, value, replace) for value in [None] + values])
+
+        stored_classes = [name for (name,) in db.execute(
+            "SELECT name FROM classes WHERE pack_id = ? ORDER BY name", (pack_id,))]
+        if stored_classes != result["classes"]:
+            db.execute("DELETE FROM classes WHERE pack_id = ?", (pack_id,))
+            db.executemany("INSERT INTO classes VALUES (?, ?)", [(pack_id, name) for name in result["classes"]])
+            changed = True
+
+        db.execute("UPDATE packs SET mod_json_mtime = ?, mods_toml_mtime = ?, history_mtime = ? WHERE id = ?",
+                   result["mtimes"] + (pack_id,))
+        if not is_new and (changed or removed or upserts):
+            stats.updated += 1
+
+    def count(self):
+        """
+        索引中的项目数
+        """
+        return self.db.execute("SELECT COUNT(*) FROM packs").fetchone()[0]
+
+    def packs(self):
+        """
+        所有项目，按模组ID排序
+
+        :return: [{"path", "modId", "displayName", "version", "buildTime", "buildSuccess", "blocks", "items"}]
+        """
+        rows = self.db.execute("""
+            SELECT path, mod_id, display_name, version, build_time, build_success, blocks, items
+            FROM packs ORDER BY mod_id, path""")
+        return [{"path": os.path.join(self.root, *path.split("/")), "modId": mod_id, "displayName": display_name,
+                 "version": version, "buildTime": build_time,
+                 "buildSuccess": None if build_success is None else bool(build_success),
+                 "blocks": blocks, "items": items}
+                for path, mod_id, display_name, version, build_time, build_success, blocks, items in rows]
+
+    def find_property(self, key, value, limit=None):
+        """
+        字段值等于value（不区分大小写）的条目
+
+        :return: [(项目目录, 类别, 条目名)]
+        """
+        sql = """SELECT p.path, q.kind, q.name FROM properties q JOIN packs p ON p.id = q.pack_id
+                 WHERE q.key = ? AND q.value = ? COLLATE NOCASE ORDER BY p.path, q.kind, q.name"""
+        params = (key, value)
+        if limit:
+            sql += " LIMIT ?"
+            params += (limit,)
+        return [(os.path.join(self.root, *path.split("/")), kind, name)
+                for path, kind, name in self.db.execute(sql, params)]
+
+    def packs_with_property(self, key, value):
+        """
+        使用了某个字段值的项目，如packs_with_property("material", "ROCK")
+
+        :return: {项目目录: 条目数}
+        """
+        rows = self.db.execute("""
+            SELECT p.path, COUNT(*) FROM properties q JOIN packs p ON p.id = q.pack_id
+            WHERE q.key = ? AND q.value = ? COLLATE NOCASE GROUP BY p.path ORDER BY p.path""", (key, value))
+        return {os.path.join(self.root, *path.split("/")): count for path, count in rows}
+
+    def find_registry_name(self, registry_name):
+        """
+        注册了某个注册名的项目
+
+        :return: [(项目目录, 类别, 条目名)]
+        """
+        rows = self.db.execute("""
+            SELECT p.path, e.kind, e.name FROM entries e JOIN packs p ON p.id = e.pack_id
+            WHERE e.registry_name = ? ORDER BY p.path""", (registry_name,))
+        return [(os.path.join(self.root, *path.split("/")), kind, name) for path, kind, name in rows]
+
+    def search(self, text):
+        """
+        项目切换器的搜索：属性查询（"Material.ROCK"、"material=ROCK"）返回使用该值的项目，
+        注册名（"modid:name"）返回注册了它的项目，其他文本按模组ID、名称和路径过滤
+
+        :return: [(项目信息字典, 说明)]，说明为匹配的条目数等，没有时为空字符串
+        """
+        packs = self.packs()
+        text = text.strip()
+        if not text:
+            return [(pack, "") for pack in packs]
+        query = parse_query(text)
+        if query is not None:
+            counts = self.packs_with_property(*query)
+            return [(pack, f"{counts[pack['path']]}个条目") for pack in packs if pack["path"] in counts]
+        if ":" in text:
+            matches = {}
+            for path, kind, name in self.find_registry_name(text):
+                matches.setdefault(path, f"{kind} {name}")
+            if matches:
+                return [(pack, matches[pack["path"]]) for pack in packs if pack["path"] in matches]
+        lowered = text.lower()
+        return [(pack, "") for pack in packs
+                if lowered in (pack["modId"] or "").lower() or lowered in (pack["displayName"] or "").lower()
+                or lowered in self._relpath(pack["path"]).lower()]